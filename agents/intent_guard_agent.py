@@ -6,6 +6,8 @@ import json
 from pathlib import Path
 from typing import Any, Dict
 
+from agents.prompts.loader import read_text_cached
+
 class IntentGuardAgent:
     """
     Intent Guard Agent
@@ -30,8 +32,8 @@ class IntentGuardAgent:
         self.model = model
         self.prompt_path = Path(prompt_path)
 
-        # Prompt 템플릿 -> 1회만 로드
-        self._prompt_template = self.prompt_path.read_text(encoding="utf-8")
+        # Prompt 템플릿 -> 프로세스당 1회만 로드
+        self._prompt_template = read_text_cached(str(self.prompt_path.resolve()))
 
     def _build_prompt(self, user_input: str) -> str:
         """
@@ -1,6 +1,14 @@
 # agents/orchestrator.py
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
+
+# 진행 상황 콜백: on_stage(stage, info)  stage = "intent" | "symptoms" | "candidates" | "safety" | "explanation" | "hospital"
+StageCallback = Callable[[str, Dict[str, Any]], None]
+
+
+def _emit(on_stage: Optional[StageCallback], stage: str, **info) -> None:
+    if on_stage is not None:
+        on_stage(stage, info)
 
 
 class Orchestrator:
@@ -8,6 +16,8 @@ class Orchestrator:
     Stateless Coordinator
     - 파이프라인 제어만 담당
     - 판단/설명/검색 로직 없음
+    - 세션 상태(대화 기록 / 마지막 결과)는 호출하는 쪽(UI session_state)이 보관
+      → 에이전트와 함께 프로세스당 1개를 여러 세션/스레드가 공유 (app.main.get_orchestrator)
     """
 
     def __init__(
@@ -33,11 +43,14 @@ class Orchestrator:
         self,
         user_input: str,
         user_location: Optional[str] = None,
+        on_stage: Optional[StageCallback] = None,
     ) -> Dict[str, Any]:
-        
+        """on_stage 가 있으면 단계가 끝날 때마다 호출(UI 진행 표시용, 백그라운드 스레드에서 불릴 수 있음)"""
+
         # 0️⃣ Intent Guard (의도 먼저)
         ig = self.intent_guard_agent.run(user_input)
         intent = ig.get("intent")
+        _emit(on_stage, "intent", intent=intent)
 
         # 의료 의도 아님 → redirect (여기서 끝)
         if intent == "redirect":
@@ -64,10 +77,7 @@ class Orchestrator:
         # 여기부터는 medical intent 확정
         # 1️⃣ 증상 추출 (LLM)
         normalized_symptoms = self.symptom_agent.run(user_input)
-
-        print("=== [DEBUG] SymptomAgent Output ===")
-        print(type(normalized_symptoms), normalized_symptoms)
-        print("==================================")
+        _emit(on_stage, "symptoms", symptoms=normalized_symptoms)
 
         # medical인데도 증상 추출 실패하면 → clarify로 강제 전환 (여기서 끝)
         if not normalized_symptoms:
@@ -89,12 +99,14 @@ class Orchestrator:
 
         # 👉 ExplainAgent용: label만 전달
         topk_labels = [d["label"] for d in topk_raw]
+        _emit(on_stage, "candidates", topk=topk_labels)
 
         # 3️⃣ Safety 판단 (GPT가 점수 계산)
         safety_result = self.safety_agent.run(
             symptoms=normalized_symptoms,
             topk=topk_labels,
         )
+        _emit(on_stage, "safety", is_emergency=bool(safety_result["is_emergency"]))
 
         # =====================================================
         # 🚨 응급 분기
@@ -106,6 +118,7 @@ class Orchestrator:
                 location=user_location,
                 emergency=True,
             )
+            _emit(on_stage, "hospital", status=hospital_info.get("status"))
 
             return {
                 "type": "emergency",
@@ -125,6 +138,7 @@ class Orchestrator:
                 "topk": topk_labels,  # 🔥 점수 없음
             }
         )
+        _emit(on_stage, "explanation")
 
         return {
             "type": "explanation",
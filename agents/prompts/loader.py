@@ -1,8 +1,19 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=None)
+def read_text_cached(path: str, encoding: str = "utf-8") -> str:
+    """
+    프롬프트 / vocab 같은 읽기 전용 파일을 프로세스당 1번만 읽음(세션/에이전트가 여러 개여도 공유).
+    - path: 절대경로 권장(상대경로면 CWD 기준으로 풀어서 캐시 키로 사용)
+    """
+    return Path(path).resolve().read_text(encoding=encoding)
+
+
+@lru_cache(maxsize=None)
 def load_prompt(prompt_filename: str, encoding: str = "utf-8") -> str:
     """
     agents/prompts/ 아래의 프롬프트 파일(.md)을 읽어 문자열로 반환합니다.
@@ -13,6 +24,7 @@ def load_prompt(prompt_filename: str, encoding: str = "utf-8") -> str:
 
     - prompt_filename: 파일명만 전달(권장). 예: "safety_notice.prompt.md"
     - encoding: 기본 utf-8
+    - 같은 파일은 프로세스당 1번만 읽음(반환 문자열은 불변이라 공유해도 안전)
     """
     # 이 loader.py 파일이 있는 폴더 = agents/prompts
     prompts_dir = Path(__file__).resolve().parent
@@ -21,4 +33,4 @@ def load_prompt(prompt_filename: str, encoding: str = "utf-8") -> str:
     if not path.exists():
         raise FileNotFoundError(f"Prompt file not found: {path}")
 
-    return path.read_text(encoding=encoding)
+    return read_text_cached(str(path), encoding)
@@ -6,6 +6,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from agents.prompts.loader import read_text_cached
+
 @dataclass
 class SymptomExtractResult:
     # ML에 넘길 canonical 영문 증상명 리스트(377개 vocab 중에서만)
@@ -17,6 +19,7 @@ class SymptomAgent:
     - 사용자 자연어(다국어) 입력을 받아
     - symptom_vocab.json에 정의된 377개 canonical 중에서 증상을 골라내어
     - {"symptoms":[...]} 형태로 반환
+    - 스레드 안전: __init__ 이후 인스턴스 상태는 읽기 전용(요청별 값은 지역 변수로만) → 세션 간 공유 가능
     """
 
     def __init__(
@@ -33,8 +36,8 @@ class SymptomAgent:
         self.prompt_path = Path(prompt_path)
         self.vocab_path = Path(vocab_path)
 
-        # Prompt 템플릿 load (한 번만)
-        self._prompt_template = self.prompt_path.read_text(encoding="utf-8")
+        # Prompt 템플릿 load (프로세스당 한 번만, 같은 경로면 다른 인스턴스와 공유)
+        self._prompt_template = read_text_cached(str(self.prompt_path.resolve()))
 
         # Symptom_vocab.json에서 canonical 리스트 로드
         self._allowed_symptoms = self._load_allowed_symptoms(self.vocab_path)
@@ -52,7 +55,7 @@ class SymptomAgent:
         여기서 canonical만 추출
         """
 
-        data = json.loads(vocab_path.read_text(encoding="utf-8"))
+        data = json.loads(read_text_cached(str(vocab_path.resolve())))
         symptoms = data.get("symptoms", [])
 
         canonicals: list[str] = []
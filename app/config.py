@@ -1,7 +1,6 @@
-# app/config.py
 import os
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
 
 # .env 로드
 # Streamlit의 경우 ui/ 폴더에서 진행 -> CWD가 ui/가 될 수도 있음
@@ -9,16 +8,33 @@ from dotenv import load_dotenv
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 ENV_PATH = PROJECT_ROOT / ".env"
 
-# .env가 있으면 로드, 없어도 환경변수로 동작 가능
-# overried=False란? - OS 환경변수로 설정된 값이 있으면 그걸 우선시
-# 배포 환경(EC2, EB, Docker 등)에서는 보통 시스템 환경 변수로 키를 주입하기 때문 (경우에 따라서는 .env를 환경변수로 사용하도록 주입할 수 있음)
-load_dotenv(dotenv_path=ENV_PATH, override=False)
 
-# OpenAI Key
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+@lru_cache(maxsize=1)
+def load_env() -> None:
+    """
+    .env가 있으면 로드, 없어도 환경변수로 동작 가능 (import 시점이 아니라 처음 설정값을 읽을 때 1회)
+    overried=False란? - OS 환경변수로 설정된 값이 있으면 그걸 우선시
+    배포 환경(EC2, EB, Docker 등)에서는 보통 시스템 환경 변수로 키를 주입하기 때문 (경우에 따라서는 .env를 환경변수로 사용하도록 주입할 수 있음)
+    """
+    from dotenv import load_dotenv
 
-if not OPENAI_API_KEY:
-    raise RuntimeError(
-        "OPENAI_API_KEY is missing. "
-        "Please set it in .env (PROJECT_ROOT/.env) or environment variables."
-    )
\ No newline at end of file
+    load_dotenv(dotenv_path=ENV_PATH, override=False)
+
+
+def get_openai_api_key() -> str:
+    # OpenAI Key
+    load_env()
+    key = os.getenv("OPENAI_API_KEY")
+    if not key:
+        raise RuntimeError(
+            "OPENAI_API_KEY is missing. "
+            "Please set it in .env (PROJECT_ROOT/.env) or environment variables."
+        )
+    return key
+
+
+def __getattr__(name):
+    # 기존 `from app.config import OPENAI_API_KEY` 호환(값을 읽는 시점에 로드/검증)
+    if name == "OPENAI_API_KEY":
+        return get_openai_api_key()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
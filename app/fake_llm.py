@@ -0,0 +1,490 @@
+"""
+app/fake_llm.py
+
+OpenAI Responses API 대역(fake) — API 키 / 네트워크 없이 Orchestrator 전체 파이프라인 실행(벤치 / 부하 테스트용)
+
+사용:
+- 프로세스 내부: HIGHFOUR_FAKE_LLM=1 → create_orchestrator() 가 OpenAI client 대신 FakeLLMClient 사용
+- 로컬 HTTP 서버: python -m app.fake_llm --port 8808
+                  HIGHFOUR_FAKE_LLM=http://127.0.0.1:8808/v1 → 실제 openai SDK 가 이 서버를 호출(HTTP / 직렬화 비용 포함)
+
+동작:
+- 에이전트 종류(kind)를 요청 내용으로 판별: intent / symptom / safety / explain / hospital
+  (프롬프트 파일의 고정 문구 + hospital 은 web_search tool 사용 여부)
+- kind별 스크립트 응답(기본: 입력에 맞춘 그럴듯한 JSON/텍스트, --script JSON 으로 덮어쓰기 가능)
+- kind별 지연 분포(fixed / uniform / normal / lognormal, ms), 오류율(429 / 500), stream=True 지원
+- 같은 seed + 같은 요청(같은 프롬프트의 n번째 호출)이면 지연 / 오류 / 응답이 항상 같음(스레드 실행 순서와 무관)
+
+환경 변수(from_env):
+- HIGHFOUR_FAKE_LLM_LATENCY        "intent=lognormal:600,0.35;hospital=fixed:3000;*=uniform:100,300"
+- HIGHFOUR_FAKE_LLM_LATENCY_SCALE  지연 배율(기본 1.0, 0이면 지연 없음)
+- HIGHFOUR_FAKE_LLM_ERROR_RATE     호출당 오류 확률(기본 0)
+- HIGHFOUR_FAKE_LLM_SEED           난수 seed(기본 0)
+- HIGHFOUR_FAKE_LLM_SCRIPT         kind -> 응답(문자열 / JSON 객체 / 목록이면 차례로 순환) JSON 파일 경로
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional
+
+KINDS = ("intent", "symptom", "safety", "explain", "hospital")
+
+# 실제 gpt-5.2 호출 체감치에 맞춘 기본값(ms). 부하 테스트에서는 LATENCY / LATENCY_SCALE 로 조정
+DEFAULT_LATENCY = {
+    "intent": "lognormal:600,0.35",
+    "symptom": "lognormal:900,0.35",
+    "safety": "lognormal:1200,0.4",
+    "explain": "lognormal:2500,0.4",
+    "hospital": "lognormal:6000,0.5",
+}
+
+# 첫 토큰까지 걸리는 비율(stream=True 일 때 나머지 지연은 delta 사이에 나눠서 흘림)
+FIRST_TOKEN_FRAC = 0.3
+STREAM_CHUNK_CHARS = 24
+
+_EMERGENCY_TERMS = ("chest pain", "seizure", "loss of consciousness", "shortness of breath", "fainting",
+                    "vomiting blood", "흉통", "경련", "의식", "호흡곤란")
+
+
+class FakeLLMError(RuntimeError):
+    """주입된 API 오류(openai.APIStatusError 대역: status_code 보유)."""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+# =========================
+# 응답 객체(openai Response 의 에이전트가 쓰는 부분만)
+# =========================
+@dataclass
+class FakeUsage:
+    input_tokens: int
+    output_tokens: int
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+
+@dataclass
+class FakeResponse:
+    id: str
+    model: str
+    output_text: str
+    usage: FakeUsage
+    kind: str = ""
+    latency_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """OpenAI Responses API JSON 형태(HTTP 모드, SDK 가 output 에서 output_text 를 조립)."""
+        return {
+            "id": self.id,
+            "object": "response",
+            "created_at": int(time.time()),
+            "status": "completed",
+            "model": self.model,
+            "output": [{
+                "type": "message",
+                "id": "msg_" + self.id[5:],
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": self.output_text, "annotations": []}],
+            }],
+            "usage": {
+                "input_tokens": self.usage.input_tokens,
+                "output_tokens": self.usage.output_tokens,
+                "total_tokens": self.usage.total_tokens,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens_details": {"reasoning_tokens": 0},
+            },
+        }
+
+
+@dataclass
+class FakeStreamEvent:
+    type: str
+    delta: str = ""
+    response: Optional[FakeResponse] = None
+
+
+class FakeStream:
+    """stream=True 결과: 이벤트 이터레이터(openai Stream 처럼 with / close 지원)."""
+
+    def __init__(self, events: Iterator[FakeStreamEvent]):
+        self._events = events
+
+    def __iter__(self) -> Iterator[FakeStreamEvent]:
+        return self._events
+
+    def __enter__(self) -> "FakeStream":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._events.close()
+
+
+# =========================
+# 지연 분포
+# =========================
+def sample_latency_ms(spec: str, rng: random.Random) -> float:
+    """"fixed:ms" | "uniform:lo,hi" | "normal:mean,sd" | "lognormal:median,sigma" → ms(음수면 0)."""
+    dist, _, params = spec.partition(":")
+    vals = [float(v) for v in params.split(",") if v.strip()]
+    dist = dist.strip().lower()
+    if dist == "fixed":
+        ms = vals[0]
+    elif dist == "uniform":
+        ms = rng.uniform(vals[0], vals[1])
+    elif dist == "normal":
+        ms = rng.gauss(vals[0], vals[1])
+    elif dist == "lognormal":
+        ms = vals[0] * math.exp(rng.gauss(0.0, vals[1]))
+    else:
+        raise ValueError(f"알 수 없는 지연 분포: {spec!r}")
+    return max(ms, 0.0)
+
+
+def parse_latency(spec: str) -> Dict[str, str]:
+    """"intent=fixed:100;*=uniform:50,80" → kind별 분포(없는 kind는 DEFAULT_LATENCY, '*'는 나머지 전부)."""
+    out = dict(DEFAULT_LATENCY)
+    for part in (spec or "").split(";"):
+        if "=" not in part:
+            continue
+        k, v = (s.strip() for s in part.split("=", 1))
+        for kind in (KINDS if k == "*" else [k]):
+            if kind not in KINDS:
+                raise ValueError(f"알 수 없는 kind: {kind!r} (가능: {KINDS})")
+            out[kind] = v
+    return out
+
+
+# =========================
+# 요청 → kind / 기본 스크립트 응답
+# =========================
+def input_text(input: Any) -> str:
+    if isinstance(input, str):
+        return input
+    parts = []
+    for msg in input or []:
+        content = msg.get("content") if isinstance(msg, dict) else msg
+        if isinstance(content, list):
+            parts.extend(str(c.get("text", "")) if isinstance(c, dict) else str(c) for c in content)
+        else:
+            parts.append(str(content))
+    return "\n".join(parts)
+
+
+def detect_kind(text: str, tools: Optional[List[Dict[str, Any]]] = None) -> str:
+    if any((t or {}).get("type") == "web_search" for t in tools or []) or "의료기관 3곳" in text:
+        return "hospital"
+    if "Intent Guard Prompt" in text:
+        return "intent"
+    if "ALLOWED_SYMPTOMS:" in text:
+        return "symptom"
+    if "응급 상황 여부를 판단하라" in text:
+        return "safety"
+    return "explain"
+
+
+def _user_input(text: str) -> str:
+    # intent / symptom 프롬프트는 모두 "USER_INPUT:\n{{user_input}}" 로 끝남
+    return text.rsplit("USER_INPUT:", 1)[-1].strip()
+
+
+def _list_after(text: str, marker: str) -> List[str]:
+    # 에이전트 프롬프트의 "marker\n['a', 'b']" 줄
+    m = re.search(re.escape(marker) + r"\s*\n(\[.*?\])", text)
+    return re.findall(r"'([^']*)'|\"([^\"]*)\"", m.group(1)) if m else []
+
+
+def default_output(kind: str, text: str, rng: random.Random) -> str:
+    if kind == "intent":
+        user = _user_input(text)
+        if len(user) < 4:
+            return json.dumps({"intent": "clarify", "message": "증상을 조금 더 자세히 알려주세요.",
+                               "questions": ["언제부터 시작됐나요?", "어느 부위가 불편한가요?"]}, ensure_ascii=False)
+        return json.dumps({"intent": "medical", "message": "", "questions": []})
+
+    if kind == "symptom":
+        m = re.search(r"ALLOWED_SYMPTOMS:\s*\n(\[.*?\])\s*\n", text, re.S)
+        vocab = json.loads(m.group(1)) if m else []
+        user = _user_input(text).lower()
+        picked = [s for s in vocab if s.replace("_", " ").lower() in user]
+        if not picked and vocab:
+            picked = rng.sample(vocab, k=min(len(vocab), rng.randint(2, 4)))
+        return json.dumps({"symptoms": picked[:6]}, ensure_ascii=False)
+
+    if kind == "safety":
+        symptoms = " ".join(a or b for a, b in _list_after(text, "증상 목록:")).lower()
+        hits = [t for t in _EMERGENCY_TERMS if t in symptoms]
+        score = 5 * len(hits) + rng.randint(0, 2)
+        return json.dumps({
+            "is_emergency": bool(hits),
+            "total_score": score,
+            "technical_reason": f"응급 키워드 {hits}" if hits else "응급 키워드 없음",
+            "user_reason": "즉시 응급실 방문이 필요할 수 있어요." if hits else "현재 증상만으로는 응급 상황으로 보이지 않아요.",
+        }, ensure_ascii=False)
+
+    if kind == "hospital":
+        loc = re.match(r"(.*?) 근처에서", text)
+        where = loc.group(1) if loc else "서울시"
+        base = int(hashlib.sha1(where.encode("utf-8")).hexdigest()[:6], 16)
+        lat, lon = 37.45 + (base % 1000) / 10000.0, 126.90 + (base // 1000 % 1000) / 5000.0
+        hospitals = [{
+            "name": f"{where} 하이포 의원 {i + 1}",
+            "address": f"{where} 중앙로 {10 + i * 7}",
+            "phone": f"02-{1000 + base % 9000:04d}-{1000 + i:04d}",
+            "latitude": round(lat + 0.002 * i, 6),
+            "longitude": round(lon - 0.0015 * i, 6),
+            "department": "",
+        } for i in range(3)]
+        return json.dumps({"hospitals": hospitals}, ensure_ascii=False)
+
+    topk = [a or b for a, b in _list_after(text, "의심되는 질환 후보 (순서만 의미 있음):")]
+    lines = ["이 안내는 의료 진단이 아니며, 정확한 판단은 의료진 상담이 필요합니다.", ""]
+    for name in topk or ["관련 질환"]:
+        lines.append(f"- {name}: 말씀하신 증상과 함께 나타날 수 있어 일반적으로 고려되는 경우가 있어요.")
+    lines += ["", "증상이 지속되거나 심해지면 가까운 의료기관을 방문해 주세요."]
+    return "\n".join(lines)
+
+
+def _approx_tokens(text: str) -> int:
+    # 한/영 혼합 대략치(토크나이저 없이): 3자당 1토큰
+    return max(1, len(text) // 3)
+
+
+def stream_events(resp: FakeResponse, sleep=time.sleep) -> Iterator[FakeStreamEvent]:
+    """응답 1건을 stream=True 이벤트로(첫 토큰까지 FIRST_TOKEN_FRAC, 나머지 지연은 delta 사이에 분배)."""
+    chunks = [resp.output_text[i:i + STREAM_CHUNK_CHARS]
+              for i in range(0, len(resp.output_text), STREAM_CHUNK_CHARS)] or [""]
+    gap = resp.latency_ms * (1.0 - FIRST_TOKEN_FRAC) / len(chunks) / 1000.0
+    yield FakeStreamEvent("response.created")
+    sleep(resp.latency_ms * FIRST_TOKEN_FRAC / 1000.0)
+    for i, chunk in enumerate(chunks):
+        if i:
+            sleep(gap)
+        yield FakeStreamEvent("response.output_text.delta", delta=chunk)
+    sleep(gap)
+    yield FakeStreamEvent("response.output_text.done")
+    yield FakeStreamEvent("response.completed", response=resp)
+
+
+# =========================
+# Fake client
+# =========================
+@dataclass
+class FakeLLMConfig:
+    latency: Dict[str, str] = field(default_factory=lambda: dict(DEFAULT_LATENCY))
+    latency_scale: float = 1.0
+    error_rate: float = 0.0
+    seed: int = 0
+    script: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_env(cls) -> "FakeLLMConfig":
+        script_path = os.getenv("HIGHFOUR_FAKE_LLM_SCRIPT", "")
+        script = {}
+        if script_path:
+            with open(script_path, "r", encoding="utf-8") as f:
+                script = json.load(f)
+        return cls(
+            latency=parse_latency(os.getenv("HIGHFOUR_FAKE_LLM_LATENCY", "")),
+            latency_scale=float(os.getenv("HIGHFOUR_FAKE_LLM_LATENCY_SCALE", "1.0")),
+            error_rate=float(os.getenv("HIGHFOUR_FAKE_LLM_ERROR_RATE", "0")),
+            seed=int(os.getenv("HIGHFOUR_FAKE_LLM_SEED", "0")),
+            script=script,
+        )
+
+
+class _FakeResponses:
+    def __init__(self, client: "FakeLLMClient"):
+        self._client = client
+
+    def create(self, model: str = "gpt-5.2", input: Any = None, tools=None, stream: bool = False, **kwargs):
+        return self._client._create(model=model, input=input, tools=tools, stream=stream)
+
+
+class FakeLLMClient:
+    """openai.OpenAI 대역: client.responses.create(...) 만 제공(에이전트는 수정 없이 사용)."""
+
+    def __init__(self, config: Optional[FakeLLMConfig] = None, sleep=time.sleep):
+        self.config = config or FakeLLMConfig()
+        self.responses = _FakeResponses(self)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._seen: Dict[str, int] = {}
+        self._script_pos: Dict[str, int] = {}
+        self.stats = {"calls": {k: 0 for k in KINDS}, "errors": 0, "sleep_ms": 0.0}
+
+    @classmethod
+    def from_env(cls) -> "FakeLLMClient":
+        return cls(FakeLLMConfig.from_env())
+
+    def _scripted(self, kind: str) -> Optional[str]:
+        entry = self.config.script.get(kind)
+        if entry is None:
+            return None
+        if isinstance(entry, list):
+            with self._lock:
+                pos = self._script_pos.get(kind, 0)
+                self._script_pos[kind] = pos + 1
+            entry = entry[pos % len(entry)]
+        return entry if isinstance(entry, str) else json.dumps(entry, ensure_ascii=False)
+
+    def _create(self, model: str, input: Any, tools, stream: bool):
+        text = input_text(input)
+        kind = detect_kind(text, tools)
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            n = self._seen.get(digest, 0)
+            self._seen[digest] = n + 1
+            self.stats["calls"][kind] += 1
+        # 요청 내용 + n번째 호출로 seed → 동시 실행 순서와 무관하게 재현 가능
+        rng = random.Random(f"{self.config.seed}:{digest}:{n}")
+
+        latency_ms = sample_latency_ms(self.config.latency[kind], rng) * self.config.latency_scale
+        failed = rng.random() < self.config.error_rate
+        output = self._scripted(kind)
+        if output is None:
+            output = default_output(kind, text, rng)
+        resp = FakeResponse(
+            id="resp_" + uuid.UUID(int=rng.getrandbits(128)).hex,
+            model=model,
+            output_text=output,
+            usage=FakeUsage(_approx_tokens(text), _approx_tokens(output)),
+            kind=kind,
+            latency_ms=latency_ms,
+        )
+        with self._lock:
+            self.stats["sleep_ms"] += latency_ms
+
+        if failed:
+            # 실패도 어느 정도 기다린 뒤 돌아옴(rate limit / 서버 오류 응답 시간)
+            self._sleep(latency_ms * FIRST_TOKEN_FRAC / 1000.0)
+            with self._lock:
+                self.stats["errors"] += 1
+            status = 429 if rng.random() < 0.5 else 500
+            raise FakeLLMError(f"fake {kind} 호출 실패(status={status})", status)
+
+        if stream:
+            return FakeStream(stream_events(resp, self._sleep))
+        self._sleep(latency_ms / 1000.0)
+        return resp
+
+
+# =========================
+# HTTP 서버 모드(POST /v1/responses)
+# =========================
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    client: FakeLLMClient = None  # make_server 에서 설정
+
+    def log_message(self, fmt, *args) -> None:
+        pass
+
+    def _json(self, status: int, obj: Dict[str, Any]) -> None:
+        data = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") in ("/healthz", "/v1/stats"):
+            with self.client._lock:
+                stats = json.loads(json.dumps(self.client.stats))
+            self._json(200, {"ok": True, **stats})
+        else:
+            self._json(404, {"error": {"message": f"not found: {self.path}"}})
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != "/v1/responses":
+            self._json(404, {"error": {"message": f"not found: {self.path}"}})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", "0"))) or b"{}")
+        except ValueError:
+            self._json(400, {"error": {"message": "invalid JSON"}})
+            return
+        stream = bool(body.pop("stream", False))
+        try:
+            out = self.client.responses.create(**body, stream=stream)
+        except FakeLLMError as e:
+            self._json(e.status_code, {"error": {"message": str(e), "type": "fake_error", "code": e.status_code}})
+            return
+        if not stream:
+            self._json(200, out.to_dict())
+            return
+
+        # SSE: openai SDK 의 stream=True 가 읽는 형식
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        with out:
+            for seq, ev in enumerate(out):
+                data = {"type": ev.type, "sequence_number": seq}
+                if ev.type == "response.output_text.delta":
+                    data.update({"delta": ev.delta, "output_index": 0, "content_index": 0})
+                if ev.response is not None:
+                    data["response"] = ev.response.to_dict()
+                self.wfile.write(f"event: {ev.type}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        self.close_connection = True
+
+
+def make_server(host: str, port: int, client: Optional[FakeLLMClient] = None) -> ThreadingHTTPServer:
+    handler = type("FakeLLMHandler", (_Handler,), {"client": client or FakeLLMClient.from_env()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def run(args: argparse.Namespace) -> None:
+    config = FakeLLMConfig.from_env()
+    if args.latency:
+        config.latency = parse_latency(args.latency)
+    if args.latency_scale is not None:
+        config.latency_scale = args.latency_scale
+    if args.error_rate is not None:
+        config.error_rate = args.error_rate
+    server = make_server(args.host, args.port, FakeLLMClient(config))
+    print(f"[fake_llm] http://{args.host}:{server.server_port}/v1  (HIGHFOUR_FAKE_LLM 에 이 주소 지정)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8808)
+    p.add_argument("--latency", default="", help='kind별 지연 분포, 예: "intent=fixed:100;*=lognormal:800,0.4"')
+    p.add_argument("--latency_scale", type=float, default=None, help="지연 배율(0이면 지연 없음)")
+    p.add_argument("--error_rate", type=float, default=None, help="호출당 오류 확률")
+    return p
+
+
+if __name__ == "__main__":
+    run(build_argparser().parse_args())
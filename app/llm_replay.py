@@ -0,0 +1,298 @@
+"""
+app/llm_replay.py
+
+LLM 호출 기록 / 재생(record / replay) client — 같은 입력이면 같은 응답·지연으로 성능 회귀 테스트를 결정적으로
+
+사용:
+- 기록: HIGHFOUR_LLM_REPLAY=ml/artifacts/llm_store.jsonl.gz HIGHFOUR_LLM_REPLAY_MODE=record
+        → 실제(또는 fake) client 호출을 그대로 통과시키면서 응답 / usage / 지연을 저장
+- 재생: HIGHFOUR_LLM_REPLAY=... (MODE 기본 replay) → 네트워크 / API 키 없이 저장된 응답 반환
+        HIGHFOUR_LLM_REPLAY_LATENCY=original(기록된 지연만큼 대기) | zero | 배율(예: 0.5)
+- auto: 정확히 같은 요청 기록은 재생, 없는 것만 실제 호출 후 기록
+- 정보: python -m app.llm_replay --store ml/artifacts/llm_store.jsonl.gz
+
+저장 형식:
+- JSONL(경로가 .gz 로 끝나면 gzip) 한 줄 = 호출 1건, 추가만 함(append)
+  {"key", "kind", "model", "text", "output_text", "input_tokens", "output_tokens", "latency_ms", "recorded_at"}
+- key = 요청(model / input / tools / 나머지 인자, stream 제외)의 정규화 JSON sha256 앞 32자
+- 같은 key가 여러 번 기록되면 마지막 것 사용
+
+재생 미스(key 없음):
+- auto: 실제 호출 후 기록(유사 기록으로 대체하지 않음)
+- replay: 같은 kind(app.fake_llm.detect_kind) 기록 중 가변 부분(kind 기록들의 공통 앞/뒤 템플릿을 뺀 부분, 1건이면 전체)의
+  문자 3-gram Jaccard 유사도가 가장 높은 것을 사용(min_similarity 이상일 때만), 그래도 없으면 ReplayMiss
+- 에이전트는 client.responses.create(...).output_text 만 쓰므로 수정 없이 동작
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
+
+from app.fake_llm import FakeResponse, FakeStream, FakeUsage, detect_kind, input_text, stream_events
+
+MODES = ("replay", "record", "auto")
+
+
+class ReplayMiss(LookupError):
+    """replay 모드에서 요청에 맞는 기록이 없음(유사 기록도 없음)."""
+
+
+@dataclass
+class ReplayRecord:
+    key: str
+    kind: str
+    model: str
+    text: str
+    output_text: str
+    input_tokens: int
+    output_tokens: int
+    latency_ms: float
+    recorded_at: float = 0.0
+
+
+def request_key(kwargs: Dict[str, Any]) -> str:
+    canon = {k: v for k, v in kwargs.items() if k != "stream" and v is not None}
+    blob = json.dumps(canon, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+
+def _trigrams(text: str) -> FrozenSet[str]:
+    text = " ".join(text.split())
+    return frozenset(text[i:i + 3] for i in range(max(len(text) - 2, 1)))
+
+
+def _jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _common_suffix(texts: List[str]) -> str:
+    return os.path.commonprefix([t[::-1] for t in texts])[::-1]
+
+
+# =========================
+# 저장소
+# =========================
+class ReplayStore:
+    """JSONL(.gz) 기록 저장소: 메모리 dict + 추가 기록(append). 스레드 안전."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._records: Dict[str, ReplayRecord] = {}
+        self._by_kind: Dict[str, List[ReplayRecord]] = {}
+        # kind -> (공통 앞부분, 공통 뒷부분, [(record, 가변 부분 3-gram)]) — 기록이 늘면 다시 계산
+        self._fuzzy_index: Dict[str, Tuple[str, str, List[Tuple[ReplayRecord, FrozenSet[str]]]]] = {}
+        if self.path.exists():
+            with self._open("rt") as f:
+                for line in f:
+                    if line.strip():
+                        self._add(ReplayRecord(**json.loads(line)))
+
+    def _open(self, mode: str):
+        if self.path.suffix == ".gz":
+            return gzip.open(self.path, mode, encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def _add(self, rec: ReplayRecord) -> None:
+        prev = self._records.get(rec.key)
+        self._records[rec.key] = rec
+        bucket = self._by_kind.setdefault(rec.kind, [])
+        if prev is not None:
+            bucket.remove(prev)
+        bucket.append(rec)
+        self._fuzzy_index.pop(rec.kind, None)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, key: str) -> Optional[ReplayRecord]:
+        return self._records.get(key)
+
+    def put(self, rec: ReplayRecord) -> None:
+        line = json.dumps(rec.__dict__, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._add(rec)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._open("at") as f:
+                f.write(line)
+
+    def nearest(self, kind: str, text: str, min_similarity: float) -> Tuple[Optional[ReplayRecord], float]:
+        """같은 kind 기록 중 템플릿을 뺀 가변 부분이 가장 비슷한 기록."""
+        with self._lock:
+            index = self._fuzzy_index.get(kind)
+            if index is None:
+                recs = self._by_kind.get(kind, [])
+                if not recs:
+                    return None, 0.0
+                texts = [r.text for r in recs]
+                # 기록이 1건이면 템플릿을 알 수 없으므로 전체 텍스트로 비교
+                prefix, suffix = (os.path.commonprefix(texts), _common_suffix(texts)) if len(texts) > 1 else ("", "")
+                index = (prefix, suffix, [(r, _trigrams(self._variable(r.text, prefix, suffix))) for r in recs])
+                self._fuzzy_index[kind] = index
+        prefix, suffix, entries = index
+        query = _trigrams(self._variable(text, prefix, suffix))
+        best, best_sim = None, -1.0
+        for rec, grams in entries:
+            sim = _jaccard(query, grams)
+            if sim > best_sim:
+                best, best_sim = rec, sim
+        return (best, best_sim) if best_sim >= min_similarity else (None, best_sim)
+
+    @staticmethod
+    def _variable(text: str, prefix: str, suffix: str) -> str:
+        start = len(os.path.commonprefix([text, prefix]))
+        end = len(text) - len(_common_suffix([text[start:], suffix]))
+        return text[start:end]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        out = {}
+        for kind, recs in sorted(self._by_kind.items()):
+            out[kind] = {
+                "records": len(recs),
+                "avg_latency_ms": sum(r.latency_ms for r in recs) / len(recs),
+                "avg_input_tokens": sum(r.input_tokens for r in recs) / len(recs),
+                "avg_output_tokens": sum(r.output_tokens for r in recs) / len(recs),
+            }
+        return out
+
+
+# =========================
+# client
+# =========================
+class _ReplayResponses:
+    def __init__(self, client: "ReplayLLMClient"):
+        self._client = client
+
+    def create(self, **kwargs):
+        return self._client._create(kwargs)
+
+
+class ReplayLLMClient:
+    """openai.OpenAI 대역: client.responses.create(...) 기록 / 재생."""
+
+    def __init__(
+        self,
+        store: Union[str, Path, ReplayStore],
+        mode: str = "replay",
+        inner=None,
+        latency: Union[str, float] = "original",
+        min_similarity: float = 0.5,
+        sleep=time.sleep,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"mode는 {MODES} 중 하나여야 합니다: {mode!r}")
+        if mode != "replay" and inner is None:
+            raise ValueError(f"mode={mode} 에는 실제 호출할 inner client 가 필요합니다.")
+        self.store = store if isinstance(store, ReplayStore) else ReplayStore(store)
+        self.mode = mode
+        self.inner = inner
+        self.latency_scale = {"original": 1.0, "zero": 0.0}.get(latency) if isinstance(latency, str) else None
+        if self.latency_scale is None:
+            self.latency_scale = float(latency)
+        self.min_similarity = float(min_similarity)
+        self.responses = _ReplayResponses(self)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "fuzzy_hits": 0, "misses": 0, "recorded": 0}
+
+    @classmethod
+    def from_env(cls, inner=None) -> "ReplayLLMClient":
+        latency = os.getenv("HIGHFOUR_LLM_REPLAY_LATENCY", "original")
+        return cls(
+            os.environ["HIGHFOUR_LLM_REPLAY"],
+            mode=os.getenv("HIGHFOUR_LLM_REPLAY_MODE", "replay"),
+            inner=inner,
+            latency=latency if latency in ("original", "zero") else float(latency),
+            min_similarity=float(os.getenv("HIGHFOUR_LLM_REPLAY_MIN_SIM", "0.5")),
+        )
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def _create(self, kwargs: Dict[str, Any]):
+        key = request_key(kwargs)
+        text = input_text(kwargs.get("input"))
+        kind = detect_kind(text, kwargs.get("tools"))
+
+        rec = None if self.mode == "record" else self.store.get(key)
+        if rec is not None:
+            self._count("hits")
+        elif self.mode == "replay":
+            # 유사 기록 대체는 replay 만: auto 는 정확히 같은 기록이 없으면 실제 호출 후 기록해야 저장소가 채워짐
+            rec, _ = self.store.nearest(kind, text, self.min_similarity)
+            if rec is not None:
+                self._count("fuzzy_hits")
+        if rec is not None:
+            return self._replay(rec, stream=bool(kwargs.get("stream")))
+
+        self._count("misses")
+        if self.mode == "replay":
+            raise ReplayMiss(f"기록 없음: kind={kind} key={key}")
+        return self._record(key, kind, text, kwargs)
+
+    def _replay(self, rec: ReplayRecord, stream: bool):
+        resp = FakeResponse(
+            id="resp_" + rec.key,
+            model=rec.model,
+            output_text=rec.output_text,
+            usage=FakeUsage(rec.input_tokens, rec.output_tokens),
+            kind=rec.kind,
+            latency_ms=rec.latency_ms * self.latency_scale,
+        )
+        if stream:
+            return FakeStream(stream_events(resp, self._sleep))
+        if resp.latency_ms > 0:
+            self._sleep(resp.latency_ms / 1000.0)
+        return resp
+
+    def _record(self, key: str, kind: str, text: str, kwargs: Dict[str, Any]):
+        if kwargs.get("stream"):
+            # 스트림은 기록하지 않고 통과(에이전트는 stream 을 쓰지 않음)
+            return self.inner.responses.create(**kwargs)
+        t0 = time.perf_counter()
+        resp = self.inner.responses.create(**kwargs)
+        latency_ms = (time.perf_counter() - t0) * 1000.0
+        usage = getattr(resp, "usage", None)
+        self.store.put(ReplayRecord(
+            key=key,
+            kind=kind,
+            model=str(getattr(resp, "model", None) or kwargs.get("model", "")),
+            text=text,
+            output_text=getattr(resp, "output_text", None) or "",
+            input_tokens=int(getattr(usage, "input_tokens", 0) or 0),
+            output_tokens=int(getattr(usage, "output_tokens", 0) or 0),
+            latency_ms=float(latency_ms),
+            recorded_at=time.time(),
+        ))
+        self._count("recorded")
+        return resp
+
+
+def run(args: argparse.Namespace) -> None:
+    store = ReplayStore(args.store)
+    print(f"[llm_replay] {store.path} : {len(store)} records")
+    for kind, s in store.summary().items():
+        print(f"  {kind:9s} n={s['records']:5d} | latency avg={s['avg_latency_ms']:8.1f}ms | "
+              f"tokens in={s['avg_input_tokens']:7.1f} out={s['avg_output_tokens']:7.1f}")
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--store", default=os.getenv("HIGHFOUR_LLM_REPLAY", "ml/artifacts/llm_store.jsonl.gz"))
+    return p
+
+
+if __name__ == "__main__":
+    run(build_argparser().parse_args())
@@ -1,7 +1,9 @@
 # app/main.py
+# openai / numpy 예측 모듈 같은 무거운 import는 create_orchestrator() 안에서(모듈 import는 가볍게)
 
-from openai import OpenAI
-from app.config import OPENAI_API_KEY
+import os
+import threading
+from typing import Optional
 
 from agents import (
     SymptomAgent,
@@ -11,16 +13,65 @@ from agents import (
     IntentGuardAgent,
 )
 from agents.orchestrator import Orchestrator
-from tools import MLPredictTool
 
+# 시작 시 ML 모델을 미리 로드 + 더미 예측(첫 사용자 요청의 cold start 제거). "0"이면 첫 요청 때 로드
+ML_WARMUP = os.getenv("HIGHFOUR_ML_WARMUP", "1") != "0"
 
-def create_orchestrator() -> Orchestrator:
+# 설정하면 get_orchestrator() 가 로컬 파이프라인 대신 app.server(HTTP API)를 호출 (예: http://127.0.0.1:8080)
+API_URL = os.getenv("HIGHFOUR_API_URL", "")
+
+# LLM 대역(app/fake_llm.py): "1" → 프로세스 내부 FakeLLMClient, "http://.../v1" → 로컬 fake 서버를 openai SDK로 호출
+FAKE_LLM = os.getenv("HIGHFOUR_FAKE_LLM", "")
+
+# LLM 기록/재생 저장소(app/llm_replay.py). HIGHFOUR_LLM_REPLAY_MODE=replay(기본) 면 실제 client 를 만들지 않음
+LLM_REPLAY = os.getenv("HIGHFOUR_LLM_REPLAY", "")
+LLM_REPLAY_MODE = os.getenv("HIGHFOUR_LLM_REPLAY_MODE", "replay")
+
+# 단계별 span / 지연 히스토그램(app/tracing.py). "0"이면 계측 프록시 없이 생성
+TRACING = os.getenv("HIGHFOUR_TRACING", "1") != "0"
+
+_ORCHESTRATOR: Optional[Orchestrator] = None
+_ORCHESTRATOR_LOCK = threading.Lock()
+
+
+def _create_llm_client():
+    if LLM_REPLAY:
+        from app.llm_replay import ReplayLLMClient
+
+        inner = None if LLM_REPLAY_MODE == "replay" else _create_base_llm_client()
+        return ReplayLLMClient.from_env(inner=inner)
+    return _create_base_llm_client()
+
+
+def _create_base_llm_client():
+    if FAKE_LLM.startswith(("http://", "https://")):
+        from openai import OpenAI
+
+        return OpenAI(api_key="fake", base_url=FAKE_LLM)
+    if FAKE_LLM and FAKE_LLM != "0":
+        from app.fake_llm import FakeLLMClient
+
+        return FakeLLMClient.from_env()
 
-    # 1️⃣ GPT-5.2 Client 단일 생성
-    llm_client = OpenAI(
-        api_key=OPENAI_API_KEY
+    from openai import OpenAI
+
+    from app.config import get_openai_api_key
+
+    return OpenAI(
+        api_key=get_openai_api_key()
     )
 
+
+def create_orchestrator() -> Orchestrator:
+    from tools import MLPredictTool
+
+    # 1️⃣ GPT-5.2 Client 단일 생성 (HIGHFOUR_FAKE_LLM / HIGHFOUR_LLM_REPLAY 면 대역, API 키 불필요)
+    llm_client = _create_llm_client()
+    if TRACING:
+        from app.tracing import TracedLLMClient
+
+        llm_client = TracedLLMClient(llm_client)
+
     # 2️⃣ Agents (모두 동일한 llm 공유)
     symptom_agent = SymptomAgent(llm_client)
     safety_agent = SafetyAgent(llm_client)
@@ -30,6 +81,8 @@ def create_orchestrator() -> Orchestrator:
 
     # 3️⃣ ML Tool
     ml_predict_tool = MLPredictTool()
+    if ML_WARMUP:
+        ml_predict_tool.warmup()
 
     # 4️⃣ Orchestrator
     orchestrator = Orchestrator(
@@ -40,5 +93,30 @@ def create_orchestrator() -> Orchestrator:
         ml_predict_tool=ml_predict_tool,
         intent_guard_agent=intent_guard_agent,
     )
+    if TRACING:
+        from app.tracing import instrument_orchestrator
+
+        orchestrator = instrument_orchestrator(orchestrator)
 
     return orchestrator
+
+
+def get_orchestrator() -> Orchestrator:
+    """
+    프로세스 단위 공유 Orchestrator(최초 1회 생성, 여러 스레드에서 동시에 불려도 1번만 생성).
+    Orchestrator / 에이전트 / OpenAI client 는 요청별 상태가 없어서 세션끼리 공유해도 안전.
+    HIGHFOUR_API_URL 이 있으면 원격 API 서버를 쓰는 RemoteOrchestrator(모델 / LLM client 로드 안 함).
+    """
+    global _ORCHESTRATOR
+    orch = _ORCHESTRATOR
+    if orch is not None:
+        return orch
+    with _ORCHESTRATOR_LOCK:
+        if _ORCHESTRATOR is None:
+            if API_URL:
+                from app.remote_client import RemoteOrchestrator
+
+                _ORCHESTRATOR = RemoteOrchestrator(API_URL)
+            else:
+                _ORCHESTRATOR = create_orchestrator()
+        return _ORCHESTRATOR
@@ -0,0 +1,55 @@
+"""
+app/remote_client.py
+
+app.server 를 호출하는 원격 Orchestrator (Streamlit 이 모델 / LLM client 를 직접 들지 않고 API 서버에 위임)
+
+- HIGHFOUR_API_URL=http://127.0.0.1:8080 이면 app.main.get_orchestrator() 가 이 객체를 반환
+- Orchestrator 와 같은 메서드 시그니처(handle_user_input / handle_hospital_request)
+- on_stage 는 서버 응답의 "stages" 를 받은 뒤 순서대로 다시 호출(진행 표시가 요청 종료 시점에 한꺼번에 갱신됨)
+"""
+
+from __future__ import annotations
+
+import json
+import urllib.error
+import urllib.request
+from typing import Any, Dict, Optional
+
+from agents.orchestrator import StageCallback, _emit
+
+
+class RemoteOrchestrator:
+    def __init__(self, base_url: str, timeout: float = 120.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = float(timeout)
+
+    def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        req = urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                return json.loads(resp.read())
+        except urllib.error.HTTPError as e:
+            try:
+                msg = json.loads(e.read()).get("error", "")
+            except ValueError:
+                msg = ""
+            raise RuntimeError(f"API 서버 오류 {e.code}: {msg or e.reason}") from None
+
+    def handle_user_input(
+        self,
+        user_input: str,
+        user_location: Optional[str] = None,
+        on_stage: Optional[StageCallback] = None,
+    ) -> Dict[str, Any]:
+        out = self._post("/v1/user_input", {"user_input": user_input, "user_location": user_location})
+        for stage in out.pop("stages", []):
+            _emit(on_stage, stage)
+        return out
+
+    def handle_hospital_request(self, symptoms, topk, user_location: Optional[str] = None) -> Dict[str, Any]:
+        return self._post("/v1/hospital", {"symptoms": symptoms, "topk": topk, "user_location": user_location})
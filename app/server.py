@@ -0,0 +1,433 @@
+"""
+app/server.py
+
+Headless HTTP/JSON 서버 (Streamlit 없이 Orchestrator 제공, 부하 테스트 / API 클라이언트용)
+
+실행 예시:
+python -m app.server --port 8080                  # 단일 프로세스
+python -m app.server --port 8080 --workers 4      # prefork: 부모가 ML 모델을 로드한 뒤 fork → 자식끼리 모델 메모리 공유
+                                                  # (부모는 예측하지 않음, 자식마다 예측 warmup)
+
+엔드포인트(JSON):
+- POST /v1/user_input  {"user_input": str, "user_location": str|null}  → handle_user_input 결과 + "stages"
+- POST /v1/hospital    {"symptoms": [...], "topk": [...], "user_location": str}  → handle_hospital_request 결과
+- GET  /healthz        → {"ok": true, "pid", "inflight"}
+- GET  /v1/stats       → 요청 수 / 단계별 동시 실행·거절 수 / span 지연 요약
+- GET  /metrics        → Prometheus text(app.tracing 히스토그램 / 카운터)
+
+동작:
+- asyncio 로 연결 / HTTP 파싱(표준 라이브러리만, keep-alive 지원), 파이프라인은 스레드 풀에서 실행
+  (에이전트 / OpenAI client 호출이 동기 함수라서)
+- 상류 단계(intent / symptoms / ml / safety / explain / hospital)마다 동시 실행 수 상한(StageLimiter)
+  · 자리가 나기를 --stage_wait_sec 만큼 기다리고, 못 얻으면 503 (LLM rate limit / CPU 과부하 보호)
+  · 서버 전체 동시 요청은 --max_inflight (넘치면 --queue_wait_sec 대기 후 503)
+- 종료: SIGTERM / SIGINT → 새 연결 받지 않음 → 진행 중 요청이 끝날 때까지(--grace_sec) 기다린 뒤 종료
+  · prefork 부모는 자식에게 SIGTERM 전달 후 모두 끝날 때까지 대기, 비정상 종료한 자식은 다시 띄움
+- Streamlit 은 HIGHFOUR_API_URL 을 주면 이 서버를 원격 백엔드로 사용(app/remote_client.py)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+from agents.orchestrator import Orchestrator
+from app import tracing
+
+MAX_BODY_BYTES = 1 << 20
+STAGES = ("intent", "symptoms", "ml", "safety", "explain", "hospital")
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class StageBusy(RuntimeError):
+    """단계 동시 실행 상한에 걸려 자리를 얻지 못함(→ 503)."""
+
+
+# =========================
+# 단계별 동시 실행 상한
+# =========================
+class StageLimiter:
+    """단계 이름 -> BoundedSemaphore. 파이프라인 스레드에서 사용(스레드 안전)."""
+
+    def __init__(self, limits: Dict[str, int], wait_sec: float = 10.0):
+        self.limits = dict(limits)
+        self.wait_sec = float(wait_sec)
+        self._sems = {stage: threading.BoundedSemaphore(max(int(n), 1)) for stage, n in self.limits.items()}
+        self._lock = threading.Lock()
+        self.inflight = {stage: 0 for stage in self.limits}
+        self.rejected = {stage: 0 for stage in self.limits}
+
+    @contextmanager
+    def slot(self, stage: str):
+        sem = self._sems[stage]
+        if not sem.acquire(timeout=self.wait_sec):
+            with self._lock:
+                self.rejected[stage] += 1
+            raise StageBusy(f"'{stage}' 단계가 혼잡합니다(동시 {self.limits[stage]}개 제한).")
+        with self._lock:
+            self.inflight[stage] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.inflight[stage] -= 1
+            sem.release()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {s: {"limit": self.limits[s], "inflight": self.inflight[s], "rejected": self.rejected[s]}
+                    for s in self.limits}
+
+
+def parse_limits(spec: str, default: int, ml_default: int) -> Dict[str, int]:
+    """"intent=8,hospital=4" → 단계별 상한(지정 안 한 LLM 단계는 default, ml은 ml_default)."""
+    limits = {stage: default for stage in STAGES}
+    limits["ml"] = ml_default
+    for part in (spec or "").split(","):
+        if "=" in part:
+            k, v = part.split("=", 1)
+            if k.strip() not in limits:
+                raise ValueError(f"알 수 없는 단계: {k.strip()!r} (가능: {STAGES})")
+            limits[k.strip()] = int(v)
+    return limits
+
+
+class _Limited:
+    """에이전트 / ML 툴 프록시: method 호출을 stage 슬롯 안에서 실행, 나머지 속성은 그대로 전달."""
+
+    def __init__(self, target, stage: str, limiter: StageLimiter, method: str = "run"):
+        self._target = target
+        self._stage = stage
+        self._limiter = limiter
+        self._method = method
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name != self._method:
+            return attr
+
+        def call(*args, **kwargs):
+            with self._limiter.slot(self._stage):
+                return attr(*args, **kwargs)
+
+        return call
+
+
+def limit_orchestrator(orch: Orchestrator, limiter: StageLimiter) -> Orchestrator:
+    # type(orch): TracedOrchestrator 면 요청 루트 span 유지
+    return type(orch)(
+        intent_guard_agent=_Limited(orch.intent_guard_agent, "intent", limiter),
+        symptom_agent=_Limited(orch.symptom_agent, "symptoms", limiter),
+        safety_agent=_Limited(orch.safety_agent, "safety", limiter),
+        explain_agent=_Limited(orch.explain_agent, "explain", limiter),
+        hospital_search_agent=_Limited(orch.hospital_search_agent, "hospital", limiter),
+        ml_predict_tool=_Limited(orch.ml_predict_tool, "ml", limiter, method="predict"),
+    )
+
+
+# =========================
+# HTTP 서버
+# =========================
+class ApiServer:
+    def __init__(
+        self,
+        orchestrator: Orchestrator,
+        limiter: StageLimiter,
+        max_inflight: int = 64,
+        queue_wait_sec: float = 5.0,
+        grace_sec: float = 30.0,
+    ):
+        self.orchestrator = limit_orchestrator(orchestrator, limiter)
+        self.limiter = limiter
+        self.max_inflight = int(max_inflight)
+        self.queue_wait_sec = float(queue_wait_sec)
+        self.grace_sec = float(grace_sec)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_inflight, thread_name_prefix="api")
+        self.inflight = 0
+        self.counts = {"requests": 0, "ok": 0, "client_error": 0, "busy": 0, "error": 0}
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._conns: set = set()
+        self._stopping = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+
+    # ---- 라우팅 ----
+    def _user_input(self, body: dict) -> dict:
+        text = body.get("user_input")
+        if not isinstance(text, str) or not text.strip():
+            raise ValueError("user_input(str)이 필요합니다.")
+        stages = []
+        result = self.orchestrator.handle_user_input(
+            user_input=text,
+            user_location=body.get("user_location"),
+            on_stage=lambda stage, info: stages.append(stage),
+        )
+        return {**result, "stages": stages}
+
+    def _hospital(self, body: dict) -> dict:
+        if not isinstance(body.get("symptoms"), list):
+            raise ValueError("symptoms(list)가 필요합니다.")
+        return self.orchestrator.handle_hospital_request(
+            symptoms=body["symptoms"],
+            topk=body.get("topk") or [],
+            user_location=body.get("user_location"),
+        )
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        if path == "/healthz":
+            return 200, {"ok": not self._stopping, "pid": os.getpid(), "inflight": self.inflight}
+        if path == "/v1/stats":
+            return 200, {"pid": os.getpid(), "inflight": self.inflight, "counts": dict(self.counts),
+                         "stages": self.limiter.stats(), "spans": tracing.stats()}
+        if path == "/metrics":
+            return 200, tracing.export_prometheus()
+        routes = {"/v1/user_input": self._user_input, "/v1/hospital": self._hospital}
+        if path not in routes:
+            return 404, {"error": f"not found: {path}"}
+        if method != "POST":
+            return 405, {"error": "POST only"}
+
+        self.counts["requests"] += 1
+        try:
+            payload = json.loads(body or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("JSON object가 필요합니다.")
+        except ValueError as e:
+            self.counts["client_error"] += 1
+            return 400, {"error": str(e)}
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_wait_sec)
+        except asyncio.TimeoutError:
+            self.counts["busy"] += 1
+            return 503, {"error": "서버가 혼잡합니다. 잠시 후 다시 시도해주세요."}
+        self.inflight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, routes[path], payload)
+            self.counts["ok"] += 1
+            return 200, result
+        except ValueError as e:
+            self.counts["client_error"] += 1
+            return 400, {"error": str(e)}
+        except StageBusy as e:
+            self.counts["busy"] += 1
+            return 503, {"error": str(e)}
+        except Exception as e:
+            self.counts["error"] += 1
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            self.inflight -= 1
+            self._slots.release()
+
+    # ---- 연결 처리(HTTP/1.1, keep-alive) ----
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        parts = line.decode("latin-1").strip().split()
+        if len(parts) != 3:
+            raise ValueError("잘못된 요청 줄")
+        method, target, _ = parts
+        headers: Dict[str, str] = {}
+        while True:
+            h = await reader.readline()
+            if h in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = h.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+        n = int(headers.get("content-length", "0") or 0)
+        if n > MAX_BODY_BYTES:
+            raise OverflowError(n)
+        body = await reader.readexactly(n) if n else b""
+        return method.upper(), target.split("?", 1)[0], headers, body
+
+    @staticmethod
+    def _write(writer: asyncio.StreamWriter, status: int, obj: Any, keep_alive: bool) -> None:
+        # str 이면 text(Prometheus exposition), 나머지는 JSON
+        if isinstance(obj, str):
+            data, ctype = obj.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            data, ctype = json.dumps(obj, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {ctype}\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + data)
+
+    async def handle_conn(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._conns.add(task)
+        try:
+            while not self._stopping:
+                try:
+                    req = await self._read_request(reader)
+                except OverflowError:
+                    self._write(writer, 413, {"error": "본문이 너무 큽니다."}, keep_alive=False)
+                    break
+                except (ValueError, asyncio.IncompleteReadError):
+                    self._write(writer, 400, {"error": "잘못된 HTTP 요청"}, keep_alive=False)
+                    break
+                if req is None:
+                    break
+                method, path, headers, body = req
+                status, obj = await self.dispatch(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close" and not self._stopping
+                self._write(writer, status, obj, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._conns.discard(task)
+            writer.close()
+
+    # ---- 시작 / 종료 ----
+    async def serve(self, sock: Optional[socket.socket] = None, host: str = "127.0.0.1", port: int = 8080) -> None:
+        self._slots = asyncio.Semaphore(self.max_inflight)
+        if sock is not None:
+            self._server = await asyncio.start_server(self.handle_conn, sock=sock, backlog=1024)
+        else:
+            self._server = await asyncio.start_server(self.handle_conn, host=host, port=port, backlog=1024)
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        if threading.current_thread() is threading.main_thread():
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                self._loop.add_signal_handler(sig, self._stop_event.set)
+        print(f"[app.server] pid={os.getpid()} listening", flush=True)
+        await self._stop_event.wait()
+        await self.shutdown()
+
+    def stop(self) -> None:
+        """다른 스레드에서 종료 요청(벤치 / 임베딩용, 메인 스레드 실행이면 SIGTERM 과 같음)."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
+
+    async def shutdown(self) -> None:
+        """새 연결 중단 → 진행 중 요청 완료 대기(grace_sec) → 남은 유휴 연결 정리."""
+        self._stopping = True
+        self._server.close()
+        deadline = time.monotonic() + self.grace_sec
+        while self.inflight > 0 and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        for task in list(self._conns):
+            task.cancel()
+        await self._server.wait_closed()
+        self.executor.shutdown(wait=False)
+        print(f"[app.server] pid={os.getpid()} stopped (inflight={self.inflight})", flush=True)
+
+
+# =========================
+# 실행(단일 / prefork)
+# =========================
+def _make_server(args: argparse.Namespace) -> ApiServer:
+    from app.main import create_orchestrator
+
+    limits = parse_limits(args.stage_limits, default=args.llm_concurrency, ml_default=args.ml_concurrency)
+    return ApiServer(
+        create_orchestrator(),
+        StageLimiter(limits, wait_sec=args.stage_wait_sec),
+        max_inflight=args.max_inflight,
+        queue_wait_sec=args.queue_wait_sec,
+        grace_sec=args.grace_sec,
+    )
+
+
+def _serve_prefork(args: argparse.Namespace) -> None:
+    # 부모: ML 모델 로드만 하고 소켓을 열고 fork → 자식은 copy-on-write 로 모델 메모리 공유
+    # 예측 warmup 은 하지 않음: xgboost 예측은 OpenMP 스레드 풀을 만들고(libgomp 는 fork 안전하지 않음)
+    # fork 된 자식의 첫 예측이 멈출 수 있음 → 자식이 create_orchestrator() 에서 각자 warmup
+    from tools.ml_predict_tools import MLPredictTool
+
+    MLPredictTool().warmup(predict=False)
+    sock = socket.create_server((args.host, args.port), backlog=1024)
+    sock.set_inheritable(True)
+
+    children: Dict[int, float] = {}
+    stopping = False
+
+    def spawn() -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                # OpenAI client(httpx)는 fork 이후 자식에서 생성
+                asyncio.run(_make_server(args).serve(sock=sock))
+            except Exception as e:
+                print(f"[app.server] worker {os.getpid()} 실패: {type(e).__name__}: {e}", flush=True)
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = time.time()
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(args.workers):
+        spawn()
+    print(f"[app.server] prefork parent={os.getpid()} workers={list(children)} on {args.host}:{args.port}", flush=True)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        started = children.pop(pid, None)
+        if not stopping and started is not None:
+            # 바로 죽는 자식을 무한히 다시 띄우지 않도록 짧게 쉼
+            if time.time() - started < 1.0:
+                time.sleep(1.0)
+            spawn()
+    sock.close()
+
+
+def run(args: argparse.Namespace) -> None:
+    if args.workers > 1:
+        _serve_prefork(args)
+    else:
+        asyncio.run(_make_server(args).serve(host=args.host, port=args.port))
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--host", default=os.getenv("HIGHFOUR_API_HOST", "127.0.0.1"))
+    p.add_argument("--port", type=int, default=int(os.getenv("HIGHFOUR_API_PORT", "8080")))
+    p.add_argument("--workers", type=int, default=1, help="prefork 워커 프로세스 수(1이면 단일 프로세스)")
+    p.add_argument("--max_inflight", type=int, default=64, help="워커당 동시 처리 요청 수")
+    p.add_argument("--queue_wait_sec", type=float, default=5.0, help="동시 처리 자리 대기 시간(초과 시 503)")
+    p.add_argument("--llm_concurrency", type=int, default=16, help="LLM 단계별 동시 호출 상한(워커당)")
+    p.add_argument("--ml_concurrency", type=int, default=os.cpu_count() or 4, help="ML 예측 동시 실행 상한")
+    p.add_argument("--stage_limits", default="", help='단계별 상한 덮어쓰기, 예: "intent=8,hospital=4"')
+    p.add_argument("--stage_wait_sec", type=float, default=10.0, help="단계 자리 대기 시간(초과 시 503)")
+    p.add_argument("--grace_sec", type=float, default=30.0, help="종료 시 진행 중 요청 대기 시간")
+    return p
+
+
+if __name__ == "__main__":
+    run(build_argparser().parse_args())
@@ -0,0 +1,359 @@
+"""
+app/tracing.py
+
+Orchestrator 파이프라인 단계별 tracing + 지연 히스토그램 (프로세스 내부, 외부 의존성 없음)
+
+- span: request / hospital_request(루트) 아래 intent / symptoms / ml / safety / explain / hospital
+  · 속성: model, input_tokens / output_tokens(응답 usage), cache_hit(ML: LRU / 답 테이블), error, 단계별 결과 요약
+  · ML span 은 답한 backend 와 fallback_from(기본 백엔드 실패 시) 포함 → ml_fallback_total 카운터
+  · 현재 span 은 contextvars 로 전달(스레드 / asyncio 모두 요청별로 분리)
+- 지속 시간 → span 이름별 LatencyHistogram(HDR 방식 로그 버킷, 상대 오차 ~1%)
+  · export_prometheus(): Prometheus text(histogram + 토큰 / 오류 / 캐시 카운터) — app.server GET /metrics
+  · HIGHFOUR_TRACE_FILE 이 있으면 요청 1건 = JSONL 1줄(루트 + 자식 span), HIGHFOUR_TRACE_SAMPLE 비율만 기록
+- 계측 방식: 에이전트 / ML 툴 / LLM client 를 프록시로 감쌈(에이전트 코드 수정 없음)
+  · instrument_orchestrator(orch) → TracedOrchestrator, create_orchestrator() 가 HIGHFOUR_TRACING=1(기본)이면 적용
+- 오버헤드: span 1개당 수~십수 µs(프록시 + contextvar set/reset + 히스토그램 버킷 증가), LLM 호출(수백 ms~수 초) 대비 무시 가능
+  · 측정: python -m bench.tracing_overhead(fake LLM 지연 0, 계측 없음 vs instrument_orchestrator 요청당 차이)
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from agents.orchestrator import Orchestrator, StageCallback
+
+TRACE_FILE = os.getenv("HIGHFOUR_TRACE_FILE", "")
+TRACE_SAMPLE = float(os.getenv("HIGHFOUR_TRACE_SAMPLE", "1.0"))
+
+# 히스토그램 상대 정밀도(버킷 경계가 1%씩 증가) / Prometheus 로 내보낼 고정 버킷(초)
+_GROWTH = 1.01
+_LOG_GROWTH = math.log(_GROWTH)
+PROM_BUCKETS_SEC = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 60.0)
+
+
+# =========================
+# 히스토그램 / 카운터
+# =========================
+class LatencyHistogram:
+    """ms 값 로그 버킷 히스토그램(버킷 i = [GROWTH^(i-1), GROWTH^i)). 스레드 안전."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    @staticmethod
+    def _index(ms: float) -> int:
+        return math.ceil(math.log(ms) / _LOG_GROWTH) if ms > 1e-3 else -695  # 1µs 이하는 한 버킷
+
+    def observe(self, ms: float) -> None:
+        i = self._index(ms)
+        with self._lock:
+            self._buckets[i] = self._buckets.get(i, 0) + 1
+            self.count += 1
+            self.sum_ms += ms
+            if ms > self.max_ms:
+                self.max_ms = ms
+
+    def percentile(self, q: float) -> float:
+        """q(0~100) 백분위수(버킷 상한, 상대 오차 ~1%)."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, math.ceil(self.count * q / 100.0))
+            seen = 0
+            for i in sorted(self._buckets):
+                seen += self._buckets[i]
+                if seen >= rank:
+                    return min(_GROWTH ** i, self.max_ms)
+        return self.max_ms
+
+    def cumulative(self, bounds_ms) -> List[int]:
+        """각 상한(ms) 이하 누적 개수(Prometheus le 버킷)."""
+        with self._lock:
+            items = sorted(self._buckets.items())
+        out, seen, j = [], 0, 0
+        for b in bounds_ms:
+            limit = self._index(b)
+            while j < len(items) and items[j][0] <= limit:
+                seen += items[j][1]
+                j += 1
+            out.append(seen)
+        return out
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ms": self.sum_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+        }
+
+
+_LOCK = threading.Lock()
+_HISTOGRAMS: Dict[str, LatencyHistogram] = {}
+_COUNTERS: Dict[tuple, float] = {}  # (metric, span) -> 값
+
+
+def _histogram(name: str) -> LatencyHistogram:
+    h = _HISTOGRAMS.get(name)
+    if h is None:
+        with _LOCK:
+            h = _HISTOGRAMS.setdefault(name, LatencyHistogram())
+    return h
+
+
+def _inc(metric: str, span: str, value: float = 1.0) -> None:
+    with _LOCK:
+        _COUNTERS[(metric, span)] = _COUNTERS.get((metric, span), 0.0) + value
+
+
+def stats() -> Dict[str, Dict[str, float]]:
+    """span 이름별 지연 요약(count / mean / p50 / p95 / p99 / max)."""
+    return {name: h.summary() for name, h in sorted(_HISTOGRAMS.items())}
+
+
+def reset() -> None:
+    with _LOCK:
+        _HISTOGRAMS.clear()
+        _COUNTERS.clear()
+
+
+def export_prometheus() -> str:
+    lines = [
+        "# HELP highfour_span_duration_seconds Orchestrator stage duration",
+        "# TYPE highfour_span_duration_seconds histogram",
+    ]
+    bounds_ms = [b * 1000.0 for b in PROM_BUCKETS_SEC]
+    for name, h in sorted(_HISTOGRAMS.items()):
+        for b, n in zip(PROM_BUCKETS_SEC, h.cumulative(bounds_ms)):
+            lines.append(f'highfour_span_duration_seconds_bucket{{span="{name}",le="{b}"}} {n}')
+        lines.append(f'highfour_span_duration_seconds_bucket{{span="{name}",le="+Inf"}} {h.count}')
+        lines.append(f'highfour_span_duration_seconds_sum{{span="{name}"}} {h.sum_ms / 1000.0:.6f}')
+        lines.append(f'highfour_span_duration_seconds_count{{span="{name}"}} {h.count}')
+    with _LOCK:
+        counters = sorted(_COUNTERS.items())
+    for metric in sorted({m for (m, _), _ in counters}):
+        lines.append(f"# TYPE highfour_{metric} counter")
+        for (m, span), v in counters:
+            if m == metric:
+                lines.append(f'highfour_{metric}{{span="{span}"}} {v:g}')
+    return "\n".join(lines) + "\n"
+
+
+# =========================
+# span
+# =========================
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start: float = field(default_factory=time.time)
+    duration_ms: float = 0.0
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    children: List["Span"] = field(default_factory=list)  # 루트 span 만 사용(트리 전체 평탄화)
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration_ms": round(self.duration_ms, 3),
+            **({"attrs": self.attrs} if self.attrs else {}),
+        }
+        if self.children:
+            d["spans"] = [c.to_dict() for c in self.children]
+        return d
+
+
+_CURRENT: ContextVar[Optional[Span]] = ContextVar("highfour_span", default=None)
+_ROOT: ContextVar[Optional[Span]] = ContextVar("highfour_root_span", default=None)
+_WRITE_LOCK = threading.Lock()
+_TRACE_FH = None
+
+
+@contextmanager
+def start_span(name: str, **attrs) -> Iterator[Span]:
+    parent = _CURRENT.get()
+    root = _ROOT.get()
+    span = Span(
+        name=name,
+        trace_id=parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}",
+        span_id=f"{random.getrandbits(64):016x}",
+        parent_id=parent.span_id if parent is not None else None,
+        attrs=attrs,
+    )
+    tok = _CURRENT.set(span)
+    root_tok = _ROOT.set(span) if root is None else None
+    t0 = time.perf_counter()
+    try:
+        yield span
+    except BaseException as e:
+        span.attrs["error"] = f"{type(e).__name__}: {e}"
+        _inc("span_errors_total", name)
+        raise
+    finally:
+        span.duration_ms = (time.perf_counter() - t0) * 1000.0
+        _CURRENT.reset(tok)
+        _histogram(name).observe(span.duration_ms)
+        if root_tok is not None:
+            _ROOT.reset(root_tok)
+            _finish_trace(span)
+        else:
+            root.children.append(span)
+
+
+def current_span() -> Optional[Span]:
+    return _CURRENT.get()
+
+
+def annotate(**attrs) -> None:
+    """현재 span 에 속성 추가(span 밖이면 무시)."""
+    span = _CURRENT.get()
+    if span is not None:
+        span.attrs.update(attrs)
+
+
+def record_usage(model: Optional[str], usage: Any) -> None:
+    """LLM 응답 usage 를 현재 span 에 누적 + 토큰 카운터."""
+    span = _CURRENT.get()
+    if span is None:
+        return
+    n_in = int(getattr(usage, "input_tokens", 0) or 0)
+    n_out = int(getattr(usage, "output_tokens", 0) or 0)
+    if model:
+        span.attrs["model"] = model
+    span.attrs["input_tokens"] = span.attrs.get("input_tokens", 0) + n_in
+    span.attrs["output_tokens"] = span.attrs.get("output_tokens", 0) + n_out
+    span.attrs["llm_calls"] = span.attrs.get("llm_calls", 0) + 1
+    _inc("llm_input_tokens_total", span.name, n_in)
+    _inc("llm_output_tokens_total", span.name, n_out)
+
+
+def _finish_trace(root: Span) -> None:
+    global _TRACE_FH
+    if not TRACE_FILE or (TRACE_SAMPLE < 1.0 and random.random() >= TRACE_SAMPLE):
+        return
+    line = json.dumps(root.to_dict(), ensure_ascii=False) + "\n"
+    with _WRITE_LOCK:
+        if _TRACE_FH is None:
+            os.makedirs(os.path.dirname(os.path.abspath(TRACE_FILE)), exist_ok=True)
+            _TRACE_FH = open(TRACE_FILE, "a", encoding="utf-8", buffering=1)
+        _TRACE_FH.write(line)
+
+
+# =========================
+# 계측 프록시
+# =========================
+class _Responses:
+    def __init__(self, inner):
+        self._inner = inner
+
+    def create(self, **kwargs):
+        resp = self._inner.create(**kwargs)
+        if not kwargs.get("stream"):
+            record_usage(getattr(resp, "model", None) or kwargs.get("model"), getattr(resp, "usage", None))
+        return resp
+
+
+class TracedLLMClient:
+    """LLM client 프록시: responses.create 응답의 model / usage 를 현재 span 에 기록."""
+
+    def __init__(self, inner):
+        self._inner = inner
+        self.responses = _Responses(inner.responses)
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+
+class _Traced:
+    """에이전트 / ML 툴 프록시: method 호출을 span 으로 감쌈(describe: 결과 → span 속성)."""
+
+    def __init__(self, target, span: str, method: str = "run", describe: Optional[Callable[[Any], Dict]] = None):
+        self._target = target
+        self._span = span
+        self._method = method
+        self._describe = describe
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name != self._method:
+            return attr
+
+        def call(*args, **kwargs):
+            with start_span(self._span) as span:
+                out = attr(*args, **kwargs)
+                if self._describe is not None:
+                    span.attrs.update(self._describe(out))
+                return out
+
+        return call
+
+
+def _describe_ml(out) -> Dict[str, Any]:
+    source = out[0].get("source") if out else None
+    if source is None:
+        return {}
+    hit = source != "model"
+    _inc("ml_cache_hits_total" if hit else "ml_cache_misses_total", "ml")
+    attrs = {"cache_hit": hit, "source": source, "model_version": out[0].get("model_version"),
+             "backend": out[0].get("backend")}
+    fallback_from = out[0].get("fallback_from")
+    if fallback_from:
+        # 기본 백엔드 실패 → fallback 백엔드가 답함(조용히 넘어가지 않도록 별도 카운터)
+        _inc("ml_fallback_total", "ml")
+        attrs["fallback_from"] = fallback_from
+    return attrs
+
+
+class TracedOrchestrator(Orchestrator):
+    """요청마다 루트 span(request / hospital_request)을 여는 Orchestrator."""
+
+    def handle_user_input(
+        self,
+        user_input: str,
+        user_location: Optional[str] = None,
+        on_stage: Optional[StageCallback] = None,
+    ) -> Dict[str, Any]:
+        with start_span("request") as span:
+            out = super().handle_user_input(user_input, user_location=user_location, on_stage=on_stage)
+            span.attrs["type"] = out.get("type")
+            return out
+
+    def handle_hospital_request(self, symptoms, topk, user_location: Optional[str] = None) -> Dict[str, Any]:
+        with start_span("hospital_request"):
+            return super().handle_hospital_request(symptoms, topk, user_location=user_location)
+
+
+def instrument_orchestrator(orch: Orchestrator) -> TracedOrchestrator:
+    """에이전트 / ML 툴을 span 프록시로 감싼 TracedOrchestrator(LLM client 는 create_orchestrator 에서 감쌈)."""
+    return TracedOrchestrator(
+        intent_guard_agent=_Traced(orch.intent_guard_agent, "intent",
+                                   describe=lambda o: {"intent": o.get("intent")}),
+        symptom_agent=_Traced(orch.symptom_agent, "symptoms", describe=lambda o: {"n_symptoms": len(o)}),
+        safety_agent=_Traced(orch.safety_agent, "safety",
+                             describe=lambda o: {"is_emergency": bool(o.get("is_emergency"))}),
+        explain_agent=_Traced(orch.explain_agent, "explain"),
+        hospital_search_agent=_Traced(orch.hospital_search_agent, "hospital",
+                                      describe=lambda o: {"status": o.get("status"),
+                                                          "n_hospitals": len(o.get("hospitals") or [])}),
+        ml_predict_tool=_Traced(orch.ml_predict_tool, "ml", method="predict", describe=_describe_ml),
+    )
@@ -0,0 +1,2 @@
+# HighFour/bench/__init__.py
+# 서빙 경로 벤치마크 스크립트 모음 (python -m bench.<name>)
@@ -0,0 +1,112 @@
+"""
+anytime(점진 평가) XGBoost 오프라인 통계
+
+실행 예시:
+python -m bench.anytime --n_rows 2000 --chunks 10,20,40 --patience 1,2,3 --margins 0.5,1.0,2.0
+python -m bench.anytime --time_budget_ms 5 --out ml/artifacts/anytime_bench.json
+
+동작:
+- split 캐시의 test split 앞 n_rows 행을 요청 1건씩(단일 행) 평가
+- 기준: 전체 라운드 평가(xgb 백엔드와 동일) top-5
+- 설정(chunk_rounds × patience × min_margin)마다
+  · avg_rounds / rounds_frac : 평균 사용 라운드(전체 대비 비율)
+  · top5_set_disagree        : 상위 5 집합이 전체 평가와 다른 요청 비율
+  · top5_order_disagree      : 상위 5 순서까지 다른 요청 비율
+  · hit@5                    : 정답 기준 hit@5 (전체 평가 값과 비교)
+  · p50/p99_ms               : 단일 요청 지연
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ml.train.split import load_split_cache
+from tools.anytime_backend import AnytimeXGBBackend, _topk_order
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _run_config(backend: AnytimeXGBBackend, X: np.ndarray, y: np.ndarray, **opts) -> tuple[dict, np.ndarray]:
+    """요청 1건씩 anytime 평가 → (통계, 행별 상위 5 (N, 5))."""
+    times, rounds, tops = [], [], []
+    for i in range(len(X)):
+        t0 = time.perf_counter()
+        P, r = backend.predict_proba_anytime(X[i:i + 1], **opts)
+        times.append((time.perf_counter() - t0) * 1000.0)
+        rounds.append(int(r[0]))
+        tops.append(_topk_order(P, 5)[0])
+    tops = np.asarray(tops)
+    rounds = np.asarray(rounds)
+    row = {
+        **opts,
+        "avg_rounds": float(rounds.mean()),
+        "rounds_frac": float(rounds.mean() / backend.num_rounds),
+        "hit@5": float((tops == y[:, None]).any(axis=1).mean()),
+        "p50_ms": float(np.percentile(times, 50)),
+        "p99_ms": float(np.percentile(times, 99)),
+    }
+    return row, tops
+
+
+def run(args: argparse.Namespace) -> dict:
+    artifacts_dir = Path(args.artifacts_dir)
+    cache_dir = Path(args.cache_dir) if args.cache_dir else artifacts_dir / "split_cache"
+    split = load_split_cache(cache_dir, mmap=True)
+    X = np.asarray(split.X_test[: args.n_rows], dtype=np.float32)
+    y = np.asarray(split.y_test[: args.n_rows])
+
+    backend = AnytimeXGBBackend(artifacts_dir=artifacts_dir).load()
+    backend.predict_proba(X[:1])  # 워밍업
+
+    # 기준: 한 청크로 전체 라운드 평가(xgb 백엔드와 같은 결과)
+    full, ref_top = _run_config(backend, X, y, chunk_rounds=backend.num_rounds, time_budget_ms=0.0)
+    ref_sorted = np.sort(ref_top, axis=1)
+
+    rows = []
+    grid = itertools.product(
+        [int(v) for v in args.chunks.split(",")],
+        [int(v) for v in args.patience.split(",")],
+        [float(v) for v in args.margins.split(",")],
+    )
+    for chunk, patience, margin in grid:
+        row, tops = _run_config(backend, X, y, chunk_rounds=chunk, patience=patience,
+                                min_margin=margin, time_budget_ms=args.time_budget_ms)
+        row["top5_set_disagree"] = float((np.sort(tops, axis=1) != ref_sorted).any(axis=1).mean())
+        row["top5_order_disagree"] = float((tops != ref_top).any(axis=1).mean())
+        rows.append(row)
+        print(f"chunk={chunk:3d} patience={patience} margin={margin:.2f} | rounds={row['avg_rounds']:.1f} "
+              f"({row['rounds_frac']:.2%}) | set_dis={row['top5_set_disagree']:.4f} "
+              f"order_dis={row['top5_order_disagree']:.4f} | hit@5={row['hit@5']:.4f} | "
+              f"p50={row['p50_ms']:.3f} p99={row['p99_ms']:.3f}")
+
+    result = {"n_rows": int(len(X)), "num_rounds": backend.num_rounds, "full": full, "configs": rows}
+    print(f"\nfull: rounds={full['avg_rounds']:.0f} hit@5={full['hit@5']:.4f} "
+          f"p50={full['p50_ms']:.3f} p99={full['p99_ms']:.3f}")
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[saved] {out}")
+    return result
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--artifacts_dir", default=str(REPO_ROOT / "ml" / "artifacts"))
+    p.add_argument("--cache_dir", default="", help="split 캐시 경로(기본: artifacts_dir/split_cache)")
+    p.add_argument("--n_rows", type=int, default=2000, help="평가할 test 행 수(요청 1건씩)")
+    p.add_argument("--chunks", default="10,20,40", help="chunk_rounds 후보(쉼표 구분)")
+    p.add_argument("--patience", default="1,2,3", help="patience 후보")
+    p.add_argument("--margins", default="0.5,1.0,2.0", help="min_margin 후보")
+    p.add_argument("--time_budget_ms", type=float, default=0.0, help="요청별 시간 예산(0이면 없음)")
+    p.add_argument("--out", default="", help="결과 JSON 경로(기본: 저장 안 함)")
+    return p
+
+
+if __name__ == "__main__":
+    run(build_argparser().parse_args())
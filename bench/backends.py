@@ -0,0 +1,174 @@
+"""
+예측 백엔드 벤치마크 (저장된 test split 기준)
+
+실행 예시:
+python -m bench.backends --backends xgb,logistic,catboost,rf --target_hit5 0.95
+python -m bench.backends --artifacts_dir ml/artifacts --out ml/artifacts/backend_bench.json
+python -m bench.backends --backends rf,rf_array --cold     # pickle vs 배열 포맷 cold 로드
+
+동작:
+- split 캐시(artifacts_dir/split_cache, run_all / train_* 가 생성)의 test split을 memmap으로 로드
+- 백엔드마다 별도 프로세스(spawn)에서 측정 → 다른 백엔드의 import / 메모리가 섞이지 않음
+  · load_sec     : create_backend(...) 로드 시간 (--cold: 측정 전 모델 파일을 페이지 캐시에서 내림)
+  · first_ms     : 로드 후 첫 요청 지연(mmap 백엔드는 여기서 페이지를 읽음)
+  · rss_mb       : 로드 직후 프로세스 최대 RSS (rss_peak_mb: 평가까지 끝난 뒤, mmap으로 읽힌 페이지 포함)
+  · model_bytes  : artifact_paths() 파일 크기 합
+  · hit@1/5, mrr : evaluate_model(청크 스트리밍)
+  · p50/p99      : 단일 행(요청 1건) 지연
+  · rows_per_sec : 배치(--batch_size) 처리량
+- hit@5 >= --target_hit5 를 만족하는 백엔드 중 p99 지연이 가장 작은 것을 추천
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+COLUMNS = ["backend", "status", "hit@1", "hit@5", "mrr", "load_sec", "first_ms", "rss_mb", "model_bytes",
+           "infer_p50_ms", "infer_p99_ms", "rows_per_sec"]
+
+
+def _max_rss_mb() -> float:
+    import resource
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: bytes
+    return rss / (1024.0 * 1024.0) if sys.platform == "darwin" else rss / 1024.0
+
+
+def _evict_page_cache(paths: List[Path]) -> None:
+    """모델 파일을 페이지 캐시에서 내려 cold 로드를 흉내(posix_fadvise 미지원 OS는 건너뜀)."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for p in paths:
+        if not p.exists():
+            continue
+        fd = os.open(p, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def _bench_one(name: str, artifacts_dir: str, cache_dir: str, batch_size: int, n_samples: int, cold: bool = False) -> dict:
+    """워커 프로세스: 백엔드 하나를 로드/평가/지연 측정."""
+    import numpy as np
+
+    from ml.train.eval_metrics import evaluate_model, inference_latency_ms
+    from ml.train.split import load_split_cache
+    from tools.predict_backends import create_backend
+
+    row = {"backend": name}
+    try:
+        split = load_split_cache(cache_dir, mmap=True)
+        rss_before = _max_rss_mb()
+
+        backend = create_backend(name, artifacts_dir=Path(artifacts_dir), load=False)
+        if cold:
+            _evict_page_cache(backend.artifact_paths())
+        t0 = time.perf_counter()
+        backend.load()
+        row["load_sec"] = time.perf_counter() - t0
+        row["rss_mb"] = _max_rss_mb()
+        row["rss_delta_mb"] = row["rss_mb"] - rss_before
+        row["model_bytes"] = int(sum(p.stat().st_size for p in backend.artifact_paths() if p.exists()))
+
+        if list(backend.feature_names) != list(split.feature_names) or list(backend.classes) != list(split.classes):
+            raise ValueError("split 캐시의 피처/클래스가 모델 아티팩트와 다릅니다(같은 artifacts_dir로 학습했는지 확인)")
+
+        X_test, y_test = split.X_test, split.y_test
+        t0 = time.perf_counter()
+        backend.predict_proba(np.asarray(X_test[:1], dtype=np.float32))
+        row["first_ms"] = (time.perf_counter() - t0) * 1000.0
+
+        row.update(evaluate_model(backend.predict_proba, X_test, y_test, num_classes=len(backend.classes)))
+        row.update(inference_latency_ms(backend.predict_proba, X_test, n_samples=n_samples))
+
+        xb = np.asarray(X_test[:batch_size], dtype=np.float32)
+        backend.predict_proba(xb[:1])
+        t0 = time.perf_counter()
+        backend.predict_proba(xb)
+        row["rows_per_sec"] = len(xb) / max(time.perf_counter() - t0, 1e-9)
+        row["rss_peak_mb"] = _max_rss_mb()
+        row["status"] = "ok"
+    except Exception as e:
+        row["status"] = "failed"
+        row["error"] = f"{type(e).__name__}: {e}"
+        row["traceback"] = traceback.format_exc()
+    return row
+
+
+def pick_backend(rows: List[dict], target_hit5: float) -> dict | None:
+    """hit@5 목표를 만족하는 백엔드 중 p99 지연(동률이면 메모리)이 가장 작은 것."""
+    ok = [r for r in rows if r.get("status") == "ok" and r.get("hit@5", 0.0) >= target_hit5]
+    if not ok:
+        return None
+    return min(ok, key=lambda r: (r["infer_p99_ms"], r["rss_mb"]))
+
+
+def run(args: argparse.Namespace) -> dict:
+    artifacts_dir = Path(args.artifacts_dir)
+    cache_dir = Path(args.cache_dir) if args.cache_dir else artifacts_dir / "split_cache"
+    names = [n.strip() for n in args.backends.split(",") if n.strip()]
+
+    rows = []
+    # 백엔드마다 새 프로세스(max_tasks_per_child 대신 풀을 매번 생성) → RSS를 독립적으로 측정
+    ctx = mp.get_context("spawn")
+    for name in names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as ex:
+            row = ex.submit(
+                _bench_one, name, str(artifacts_dir), str(cache_dir), args.batch_size, args.n_samples, args.cold,
+            ).result()
+        rows.append(row)
+        if row["status"] != "ok":
+            print(f"[{name}] 실패: {row['error']}")
+
+    best = pick_backend(rows, args.target_hit5)
+    result = {
+        "target_hit5": args.target_hit5,
+        "recommended": best["backend"] if best else None,
+        "results": rows,
+    }
+
+    print("\n===== BACKEND BENCH =====")
+    print(" | ".join(COLUMNS))
+    for r in rows:
+        vals = []
+        for c in COLUMNS:
+            v = r.get(c, "")
+            vals.append(f"{v:.4f}" if isinstance(v, float) else str(v))
+        print(" | ".join(vals))
+    print(f"\n추천 백엔드(hit@5 >= {args.target_hit5}): {result['recommended']}")
+
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[saved] {out}")
+    return result
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--artifacts_dir", default=str(REPO_ROOT / "ml" / "artifacts"))
+    p.add_argument("--cache_dir", default="", help="split 캐시 경로(기본: artifacts_dir/split_cache)")
+    p.add_argument("--backends", default="xgb,logistic,logistic_np,nb,student,catboost,rf,rf_array", help="쉼표 구분 백엔드 이름")
+    p.add_argument("--target_hit5", type=float, default=0.95)
+    p.add_argument("--batch_size", type=int, default=1024, help="처리량 측정 배치 크기")
+    p.add_argument("--n_samples", type=int, default=200, help="단일 행 지연 측정 횟수")
+    p.add_argument("--cold", action="store_true", help="로드 전 모델 파일을 페이지 캐시에서 내림(cold 로드 측정)")
+    p.add_argument("--out", default="", help="결과 JSON 경로(기본: 저장 안 함)")
+    return p
+
+
+if __name__ == "__main__":
+    run(build_argparser().parse_args())
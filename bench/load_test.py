@@ -0,0 +1,280 @@
+"""
+Orchestrator 부하 테스트 / 처리량 벤치마크 (동시 요청 수별 단계 지연 + 포화 지점)
+
+실행 예시:
+python -m bench.load_test --concurrency 1,4,16,64 --requests 200
+python -m bench.load_test --latency_scale 0.05 --out ml/artifacts/load_test.json
+python -m bench.load_test --baseline ml/artifacts/load_test.json --threshold 0.10   # 회귀면 exit 1
+python -m bench.load_test --api_url http://127.0.0.1:8080   # app.server 대상(종단 지연만)
+
+동작:
+- 한/영 사용자 메시지 코퍼스(--corpus: 한 줄에 1개, 기본: 내장 목록)를 Orchestrator.handle_user_input 에 반복 투입
+- LLM 은 app.fake_llm(HIGHFOUR_FAKE_LLM=1, 지연 분포 × --latency_scale, --error_rate)
+  · --llm replay 면 app.llm_replay 기록(--replay_store, 기록된 지연 × --latency_scale) 재생
+  · --llm env 면 환경 변수 설정 그대로(예: HIGHFOUR_FAKE_LLM=http://... 로 fake HTTP 서버)
+- 동시성 레벨마다 스레드 c개가 요청 --requests 개를 나눠서 처리(closed loop, 같은 프로세스의 공유 orchestrator)
+- 지표(레벨별): rps, 오류 수, 종단 p50/p95/p99, 단계별 p50/p95/p99
+  · 단계 지연 = on_stage 콜백 사이 간격(intent / symptoms / candidates / safety / explanation / hospital)
+- 포화 지점: 동시성을 올려도 rps 증가가 --sat_gain 미만이 되는 첫 레벨 직전
+- --baseline: 같은 동시성 레벨의 종단 p95 증가 / rps 감소가 --threshold 를 넘으면 회귀로 표시
+  · 측정 조건(llm / latency_scale / error_rate / corpus_size / 동시성 레벨)이 baseline 과 다르면
+    비교하지 않고 측정 전에 에러로 종료
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+DEFAULT_CORPUS = [
+    "어제부터 기침이 나고 열이 있어요",
+    "머리가 깨질 것처럼 아프고 속이 메스꺼워요",
+    "가슴이 답답하고 숨쉬기가 힘들어요",
+    "배가 살살 아프고 설사를 3번 했어요",
+    "목이 따갑고 콧물이 계속 나요",
+    "요즘 잠을 잘 못 자고 불안해요",
+    "허리가 아파서 오래 앉아 있기 힘들어요",
+    "눈이 충혈되고 가려워요",
+    "I have had a cough and fever since yesterday",
+    "Sharp chest pain when I breathe deeply",
+    "My stomach hurts and I feel nauseous after eating",
+    "I feel dizzy and my heart is racing",
+    "skin rash with itching on both arms",
+    "sore throat and runny nose for three days",
+    "아파요",
+    "오늘 날씨 어때?",
+]
+PCTS = (50, 95, 99)
+
+
+def load_corpus(path: str) -> List[str]:
+    if not path:
+        return list(DEFAULT_CORPUS)
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [ln.strip() for ln in lines if ln.strip() and not ln.startswith("#")]
+
+
+def _pcts(values: List[float]) -> Dict[str, float]:
+    import numpy as np
+
+    if not values:
+        return {}
+    return {f"p{p}_ms": float(np.percentile(values, p)) for p in PCTS}
+
+
+def _run_level(orch, corpus: List[str], concurrency: int, n_requests: int, location: str,
+               per_stage: bool = True) -> dict:
+    """동시성 1레벨: 스레드 c개가 요청 n개를 나눠 처리(per_stage=False 면 종단 지연만)."""
+    lock = threading.Lock()
+    next_idx = [0]
+    e2e: List[float] = []
+    stages: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+
+    def one(i: int) -> None:
+        marks = []
+        t0 = time.perf_counter()
+        try:
+            orch.handle_user_input(
+                user_input=corpus[i % len(corpus)],
+                user_location=location,
+                on_stage=(lambda stage, info: marks.append((stage, time.perf_counter()))) if per_stage else None,
+            )
+        except Exception as e:
+            with lock:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+            return
+        t1 = time.perf_counter()
+        with lock:
+            e2e.append((t1 - t0) * 1000.0)
+            prev = t0
+            for stage, t in marks:
+                stages.setdefault(stage, []).append((t - prev) * 1000.0)
+                prev = t
+
+    def worker() -> None:
+        while True:
+            with lock:
+                i = next_idx[0]
+                next_idx[0] += 1
+            if i >= n_requests:
+                return
+            one(i)
+
+    t_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        for f in [ex.submit(worker) for _ in range(concurrency)]:
+            f.result()
+    elapsed = time.perf_counter() - t_start
+
+    return {
+        "concurrency": concurrency,
+        "requests": n_requests,
+        "ok": len(e2e),
+        "errors": errors,
+        "elapsed_sec": float(elapsed),
+        "rps": float(len(e2e) / elapsed) if elapsed > 0 else 0.0,
+        "e2e": _pcts(e2e),
+        "stages": {stage: {"n": len(v), **_pcts(v)} for stage, v in stages.items()},
+    }
+
+
+def find_saturation(rows: List[dict], sat_gain: float) -> dict:
+    """rps 증가율이 sat_gain 미만이 되기 직전 레벨(끝까지 늘면 마지막 레벨, saturated=False)."""
+    best = max(rows, key=lambda r: r["rps"])
+    for prev, cur in zip(rows, rows[1:]):
+        if cur["rps"] < prev["rps"] * (1.0 + sat_gain):
+            return {"saturated": True, "concurrency": prev["concurrency"], "rps": prev["rps"], "max_rps": best["rps"]}
+    return {"saturated": False, "concurrency": rows[-1]["concurrency"], "rps": rows[-1]["rps"], "max_rps": best["rps"]}
+
+
+BASELINE_KEYS = ("llm", "latency_scale", "error_rate", "corpus_size", "concurrency")
+
+
+def check_baseline_config(config: dict, baseline: dict) -> None:
+    """측정 조건이 baseline 과 같은지 확인(다르면 비교 결과가 의미 없으므로 ValueError)."""
+    base = dict(baseline)
+    if "concurrency" not in base:  # 레벨 목록을 따로 저장하지 않은 결과
+        base["concurrency"] = [r["concurrency"] for r in baseline.get("results", [])]
+    diff = [f"{k}: baseline={base.get(k)!r} current={config.get(k)!r}" for k in BASELINE_KEYS
+            if base.get(k) != config.get(k)]
+    if diff:
+        raise ValueError("baseline 과 측정 조건이 다릅니다 → " + "; ".join(diff))
+
+
+def compare_baseline(rows: List[dict], baseline: dict, threshold: float) -> List[dict]:
+    """같은 동시성 레벨끼리 종단 p95 / rps 비교 → 회귀 목록."""
+    base = {r["concurrency"]: r for r in baseline.get("results", [])}
+    out = []
+    for r in rows:
+        b = base.get(r["concurrency"])
+        if b is None:
+            continue
+        checks = [
+            ("e2e_p95_ms", r["e2e"].get("p95_ms"), b["e2e"].get("p95_ms"), True),
+            ("rps", r["rps"], b["rps"], False),
+        ]
+        for metric, cur, old, higher_is_worse in checks:
+            if not cur or not old:
+                continue
+            change = (cur - old) / old
+            if (change if higher_is_worse else -change) > threshold:
+                out.append({"concurrency": r["concurrency"], "metric": metric, "baseline": old, "current": cur,
+                            "change": float(change)})
+    return out
+
+
+def _make_orchestrator(args: argparse.Namespace):
+    if args.api_url:
+        from app.remote_client import RemoteOrchestrator
+
+        return RemoteOrchestrator(args.api_url)
+    if args.llm == "fake":
+        os.environ["HIGHFOUR_FAKE_LLM"] = "1"
+        os.environ["HIGHFOUR_FAKE_LLM_LATENCY_SCALE"] = str(args.latency_scale)
+        os.environ["HIGHFOUR_FAKE_LLM_ERROR_RATE"] = str(args.error_rate)
+        os.environ["HIGHFOUR_FAKE_LLM_SEED"] = str(args.seed)
+    elif args.llm == "replay":
+        os.environ["HIGHFOUR_LLM_REPLAY"] = args.replay_store
+        os.environ["HIGHFOUR_LLM_REPLAY_MODE"] = "replay"
+        os.environ["HIGHFOUR_LLM_REPLAY_LATENCY"] = str(args.latency_scale)
+    os.chdir(REPO_ROOT)  # 에이전트 기본 프롬프트 / vocab 경로가 레포 루트 기준
+
+    from app.main import create_orchestrator
+
+    return create_orchestrator()
+
+
+def run(args: argparse.Namespace) -> dict:
+    corpus = load_corpus(args.corpus)
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    config = {
+        "llm": "api" if args.api_url else args.llm,
+        "latency_scale": args.latency_scale,
+        "error_rate": args.error_rate,
+        "corpus_size": len(corpus),
+        "concurrency": levels,
+    }
+    baseline = None
+    if args.baseline:
+        # 조건이 다른 baseline 이면 측정 전에 종료
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        try:
+            check_baseline_config(config, baseline)
+        except ValueError as e:
+            raise SystemExit(f"[baseline] {e}")
+    orch = _make_orchestrator(args)
+
+    # 워밍업(모델 / 프롬프트 캐시, 스레드 풀) — 측정에서 제외
+    per_stage = not args.api_url  # 원격은 단계 이벤트가 응답과 함께 한꺼번에 옴
+    _run_level(orch, corpus, 1, min(len(corpus), args.warmup), args.location, per_stage)
+
+    rows = []
+    for c in levels:
+        row = _run_level(orch, corpus, c, max(args.requests, c), args.location, per_stage)
+        rows.append(row)
+        e = row["e2e"]
+        print(f"c={c:4d} | rps={row['rps']:8.2f} | e2e p50={e.get('p50_ms', 0):8.1f} p95={e.get('p95_ms', 0):8.1f} "
+              f"p99={e.get('p99_ms', 0):8.1f}ms | ok={row['ok']} err={sum(row['errors'].values())}")
+        for stage, s in row["stages"].items():
+            print(f"         {stage:12s} p50={s.get('p50_ms', 0):8.1f} p95={s.get('p95_ms', 0):8.1f} "
+                  f"p99={s.get('p99_ms', 0):8.1f}ms (n={s['n']})")
+
+    sat = find_saturation(rows, args.sat_gain)
+    print(f"[saturation] {'c=' + str(sat['concurrency']) if sat['saturated'] else '도달 안 함'} "
+          f"rps={sat['rps']:.2f} (max {sat['max_rps']:.2f})")
+
+    result = {
+        **config,
+        "results": rows,
+        "saturation": sat,
+        "regressions": [],
+    }
+    if baseline is not None:
+        result["regressions"] = compare_baseline(rows, baseline, args.threshold)
+        for reg in result["regressions"]:
+            print(f"[REGRESSION] c={reg['concurrency']} {reg['metric']}: {reg['baseline']:.2f} → "
+                  f"{reg['current']:.2f} ({reg['change']:+.1%})")
+        if not result["regressions"]:
+            print(f"[baseline] 회귀 없음(threshold {args.threshold:.0%})")
+
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[saved] {out}")
+    return result
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--concurrency", default="1,4,16,64", help="쉼표 구분 동시성 레벨(오름차순)")
+    p.add_argument("--requests", type=int, default=200, help="레벨당 요청 수")
+    p.add_argument("--warmup", type=int, default=8, help="측정 전 워밍업 요청 수")
+    p.add_argument("--corpus", default="", help="사용자 메시지 파일(한 줄에 1개, 기본: 내장 코퍼스)")
+    p.add_argument("--location", default="서울시 강남구", help="user_location(응급이면 병원 검색 단계 포함)")
+    p.add_argument("--llm", choices=["fake", "replay", "env"], default="fake",
+                   help="fake: app.fake_llm / replay: app.llm_replay 기록 / env: 환경 변수 설정 그대로")
+    p.add_argument("--replay_store", default="ml/artifacts/llm_store.jsonl.gz", help="--llm replay 기록 경로")
+    p.add_argument("--latency_scale", type=float, default=0.1, help="LLM 지연 배율(fake 분포 / replay 기록 지연)")
+    p.add_argument("--error_rate", type=float, default=0.0, help="fake LLM 오류율")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--api_url", default="", help="app.server 주소(지정 시 HTTP로 호출, 단계 지연 없음)")
+    p.add_argument("--sat_gain", type=float, default=0.10, help="포화 판정: 다음 레벨 rps 증가율 하한")
+    p.add_argument("--baseline", default="", help="비교할 이전 결과 JSON")
+    p.add_argument("--threshold", type=float, default=0.10, help="회귀 판정 비율(p95 증가 / rps 감소)")
+    p.add_argument("--out", default="", help="결과 JSON 경로(기본: 저장 안 함)")
+    return p
+
+
+if __name__ == "__main__":
+    _result = run(build_argparser().parse_args())
+    sys.exit(1 if _result["regressions"] else 0)
@@ -0,0 +1,117 @@
+"""
+마이크로 배칭 vs 요청별 예측 동시성 벤치마크
+
+실행 예시:
+python -m bench.micro_batch --backend xgb --concurrency 1,16,128 --n_requests 4000
+python -m bench.micro_batch --max_rows 64 --max_wait_ms 2 --nthread 4 --out ml/artifacts/micro_batch_bench.json
+
+동작:
+- split 캐시의 test split 행을 요청 1건(단일 행)씩 사용
+- 동시 호출자 수(--concurrency)마다 스레드 c개가 요청을 나눠서 연속으로 보냄(closed loop)
+  · direct : 호출자마다 backend.predict_proba(1행)  (공유 부스터 1개)
+  · batched: MicroBatcher.submit(1행).result()      (배경 스레드가 모아서 predict)
+- 지표: rows_per_sec(전체 처리량), p50/p99_ms(요청 지연), avg_batch(배치당 평균 행 수)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from ml.train.split import load_split_cache
+from tools.micro_batcher import MicroBatcher
+from tools.predict_backends import create_backend
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _drive(call: Callable[[np.ndarray], np.ndarray], X: np.ndarray, concurrency: int) -> dict:
+    """스레드 concurrency개가 X 행을 나눠 1건씩 호출. 처리량 / 지연 분위수."""
+    lat = [[] for _ in range(concurrency)]
+    start = threading.Barrier(concurrency + 1)
+
+    def worker(w: int) -> None:
+        start.wait()
+        for i in range(w, len(X), concurrency):
+            t = time.perf_counter()
+            call(X[i:i + 1])
+            lat[w].append((time.perf_counter() - t) * 1000.0)
+
+    threads = [threading.Thread(target=worker, args=(w,), daemon=True) for w in range(concurrency)]
+    for t in threads:
+        t.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    ms = np.concatenate([np.asarray(v) for v in lat if v])
+    return {
+        "rows_per_sec": float(len(X) / max(elapsed, 1e-9)),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    artifacts_dir = Path(args.artifacts_dir)
+    cache_dir = Path(args.cache_dir) if args.cache_dir else artifacts_dir / "split_cache"
+    split = load_split_cache(cache_dir, mmap=True)
+    X = np.asarray(split.X_test[: args.n_requests], dtype=np.float32)
+
+    options = {"nthread": args.nthread} if args.nthread and args.backend in ("xgb", "xgb_anytime") else {}
+    backend = create_backend(args.backend, artifacts_dir=artifacts_dir, **options)
+    backend.predict_proba(X[:1])  # 워밍업
+
+    rows = []
+    for c in [int(v) for v in args.concurrency.split(",")]:
+        direct = _drive(backend.predict_proba, X, c)
+
+        batcher = MicroBatcher(backend.predict_proba, max_rows=args.max_rows, max_wait_ms=args.max_wait_ms)
+        batched = _drive(batcher.predict, X, c)
+        batched["avg_batch"] = batcher.avg_batch_rows()
+        batcher.close()
+
+        row = {"concurrency": c, "direct": direct, "batched": batched}
+        rows.append(row)
+        print(f"c={c:4d} | direct: {direct['rows_per_sec']:9.1f} rows/s p50={direct['p50_ms']:.3f} "
+              f"p99={direct['p99_ms']:.3f} | batched: {batched['rows_per_sec']:9.1f} rows/s "
+              f"p50={batched['p50_ms']:.3f} p99={batched['p99_ms']:.3f} avg_batch={batched['avg_batch']:.1f}")
+
+    result = {
+        "backend": args.backend,
+        "nthread": args.nthread,
+        "max_rows": args.max_rows,
+        "max_wait_ms": args.max_wait_ms,
+        "n_requests": int(len(X)),
+        "results": rows,
+    }
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[saved] {out}")
+    return result
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--artifacts_dir", default=str(REPO_ROOT / "ml" / "artifacts"))
+    p.add_argument("--cache_dir", default="", help="split 캐시 경로(기본: artifacts_dir/split_cache)")
+    p.add_argument("--backend", default="xgb")
+    p.add_argument("--concurrency", default="1,16,128", help="동시 호출자 수 후보(쉼표 구분)")
+    p.add_argument("--n_requests", type=int, default=4000, help="설정별 총 요청 수(test 행)")
+    p.add_argument("--max_rows", type=int, default=64, help="배치 최대 행 수")
+    p.add_argument("--max_wait_ms", type=float, default=2.0, help="배치 최대 대기(ms)")
+    p.add_argument("--nthread", type=int, default=0, help="xgb 부스터 스레드 수(0이면 기본값)")
+    p.add_argument("--out", default="", help="결과 JSON 경로(기본: 저장 안 함)")
+    return p
+
+
+if __name__ == "__main__":
+    run(build_argparser().parse_args())
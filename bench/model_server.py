@@ -0,0 +1,189 @@
+"""
+워커 N개: 프로세스 내 모델 vs 모델 서버(Unix 소켓) 메모리 / 지연 비교
+
+실행 예시:
+python -m bench.model_server --workers 1,4,8 --backend xgb --n_requests 500
+python -m bench.model_server --workers 8 --out ml/artifacts/model_server_bench.json
+
+동작:
+- 워커 N개를 동시에 띄움(spawn 프로세스, 실제 Streamlit / API 워커처럼 각자 import + 로드)
+  · inproc : 워커마다 create_backend(backend) 로 모델을 직접 로드
+  · server : 모델 서버 프로세스 1개(python -m tools.model_server)를 띄우고 워커는 "remote" 백엔드 사용
+- 워커마다 test split 행을 요청 1건씩 n_requests 번 예측 → 지연 p50/p99
+- 메모리: 모든 워커가 요청을 마친 시점(아직 살아 있음)의 RSS / PSS(공유 페이지를 나눠 계산, Linux) 합
+  · server 모드 합계에는 서버 프로세스 메모리도 포함
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _proc_mem_mb(pid: int) -> dict:
+    """/proc/<pid> 의 RSS / PSS(MB). PSS를 못 읽으면 RSS로 대신."""
+    rss = pss = 0.0
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                rss = int(line.split()[1]) / 1024.0
+        pss = rss
+        rollup = Path(f"/proc/{pid}/smaps_rollup")
+        if rollup.exists():
+            for line in rollup.read_text().splitlines():
+                if line.startswith("Pss:"):
+                    pss = int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return {"rss_mb": rss, "pss_mb": pss}
+
+
+def _worker(mode: str, backend: str, artifacts_dir: str, cache_dir: str, socket_path: str, n_requests: int,
+            ready, release, out) -> None:
+    """워커 프로세스: 로드 → 요청 n_requests 건 → 결과 전달 → 모든 워커 측정 끝날 때까지 대기."""
+    try:
+        from ml.train.split import load_split_cache
+        from tools.predict_backends import create_backend
+
+        split = load_split_cache(cache_dir, mmap=True)
+        X = np.asarray(split.X_test[:n_requests], dtype=np.float32)
+        t0 = time.perf_counter()
+        if mode == "inproc":
+            be = create_backend(backend, artifacts_dir=Path(artifacts_dir))
+        else:
+            be = create_backend("remote", artifacts_dir=Path(artifacts_dir), socket_path=socket_path, target=backend)
+        be.predict_proba(X[:1])
+        load_sec = time.perf_counter() - t0
+
+        ms = []
+        for i in range(len(X)):
+            t = time.perf_counter()
+            be.predict_proba(X[i:i + 1])
+            ms.append((time.perf_counter() - t) * 1000.0)
+        out.put({"pid": os.getpid(), "status": "ok", "load_sec": load_sec, "ms": ms})
+    except Exception as e:
+        out.put({"pid": os.getpid(), "status": "failed", "error": f"{type(e).__name__}: {e}"})
+    ready.set()
+    release.wait(timeout=300)
+
+
+def _start_server(backend: str, artifacts_dir: str, socket_path: str, timeout: float = 120.0) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "tools.model_server", "--backends", backend, "--socket", socket_path,
+         "--artifacts_dir", artifacts_dir],
+        cwd=str(REPO_ROOT),
+    )
+    from tools.model_server import RemoteBackend
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"모델 서버가 종료됨(exit={proc.returncode})")
+        try:
+            RemoteBackend(socket_path=socket_path)._call({"op": "ping"})
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise TimeoutError("모델 서버가 준비되지 않았습니다.")
+
+
+def _run_mode(mode: str, n_workers: int, args: argparse.Namespace, cache_dir: str, socket_path: str) -> dict:
+    ctx = mp.get_context("spawn")
+    server = None
+    t0 = time.perf_counter()
+    if mode == "server":
+        server = _start_server(args.backend, args.artifacts_dir, socket_path)
+    out, release = ctx.Queue(), ctx.Event()
+    readies = [ctx.Event() for _ in range(n_workers)]
+    procs = [
+        ctx.Process(target=_worker, args=(mode, args.backend, args.artifacts_dir, cache_dir, socket_path,
+                                          args.n_requests, readies[i], release, out))
+        for i in range(n_workers)
+    ]
+    try:
+        for p in procs:
+            p.start()
+        results = [out.get(timeout=600) for _ in procs]
+        for ev in readies:
+            ev.wait(timeout=60)
+        ready_sec = time.perf_counter() - t0
+
+        # 모든 워커가 살아 있는 상태에서 메모리 측정
+        mem = [_proc_mem_mb(p.pid) for p in procs]
+        if server is not None:
+            mem.append(_proc_mem_mb(server.pid))
+    finally:
+        release.set()
+        for p in procs:
+            p.join(timeout=30)
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    failed = [r for r in results if r["status"] != "ok"]
+    if failed:
+        return {"mode": mode, "workers": n_workers, "status": "failed", "error": failed[0]["error"]}
+    ms = np.concatenate([np.asarray(r["ms"]) for r in results])
+    return {
+        "mode": mode,
+        "workers": n_workers,
+        "status": "ok",
+        "total_rss_mb": float(sum(m["rss_mb"] for m in mem)),
+        "total_pss_mb": float(sum(m["pss_mb"] for m in mem)),
+        "server_pss_mb": float(mem[-1]["pss_mb"]) if server is not None else 0.0,
+        "worker_load_sec": float(np.mean([r["load_sec"] for r in results])),
+        "ready_sec": float(ready_sec),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    artifacts_dir = Path(args.artifacts_dir)
+    cache_dir = str(Path(args.cache_dir) if args.cache_dir else artifacts_dir / "split_cache")
+    socket_path = os.path.join(tempfile.mkdtemp(prefix="highfour_bench_"), "model.sock")
+
+    rows = []
+    for n in [int(v) for v in args.workers.split(",")]:
+        for mode in ("inproc", "server"):
+            row = _run_mode(mode, n, args, cache_dir, socket_path)
+            rows.append(row)
+            if row["status"] != "ok":
+                print(f"[{mode} x{n}] 실패: {row['error']}")
+                continue
+            print(f"{mode:6s} x{n:2d} | rss={row['total_rss_mb']:8.1f}MB pss={row['total_pss_mb']:8.1f}MB | "
+                  f"load={row['worker_load_sec']:.2f}s | p50={row['p50_ms']:.3f} p99={row['p99_ms']:.3f}")
+
+    result = {"backend": args.backend, "n_requests": args.n_requests, "results": rows}
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[saved] {out}")
+    return result
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--artifacts_dir", default=str(REPO_ROOT / "ml" / "artifacts"))
+    p.add_argument("--cache_dir", default="", help="split 캐시 경로(기본: artifacts_dir/split_cache)")
+    p.add_argument("--backend", default="xgb", help="워커(inproc) / 서버(server)가 로드할 백엔드")
+    p.add_argument("--workers", default="1,4,8", help="워커 수 후보(쉼표 구분)")
+    p.add_argument("--n_requests", type=int, default=500, help="워커별 요청 수")
+    p.add_argument("--out", default="", help="결과 JSON 경로(기본: 저장 안 함)")
+    return p
+
+
+if __name__ == "__main__":
+    run(build_argparser().parse_args())
@@ -0,0 +1,116 @@
+"""
+Streamlit 세션 시작 비용 벤치마크(세션별 orchestrator vs 공유 orchestrator)
+
+실행 예시:
+python -m bench.sessions --n_sessions 200
+python -m bench.sessions --modes shared,per_session --out ml/artifacts/sessions_bench.json
+
+동작:
+- 모드마다 별도 프로세스(spawn)에서 세션 n개를 차례로 시작(세션 상태 dict를 계속 들고 있음 = 살아 있는 세션)
+  · per_session_cold : 세션마다 create_orchestrator() + 프롬프트/vocab 파일 캐시 비움(이전 동작)
+  · per_session      : 세션마다 create_orchestrator() (파일은 프로세스 캐시 사용)
+  · shared           : get_orchestrator() 공유(세션 상태에는 대화 기록 / 마지막 결과만)
+- 지표: 세션 시작 지연(first / p50 / p99 / total), 세션 n개 보유 후 RSS 증가, 파이썬 힙 증가(tracemalloc)
+- LLM 호출은 하지 않음(OPENAI_API_KEY 가 없으면 자리표시 값으로 client만 생성)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _rss_mb() -> float:
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    import resource
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024.0 * 1024.0) if sys.platform == "darwin" else rss / 1024.0
+
+
+def _bench_mode(mode: str, n_sessions: int, warmup: bool) -> dict:
+    """워커 프로세스: 세션 n개 시작."""
+    import tracemalloc
+
+    import numpy as np
+
+    os.chdir(REPO_ROOT)  # 에이전트 기본 프롬프트 경로가 레포 루트 기준
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench-placeholder")
+    os.environ["HIGHFOUR_ML_WARMUP"] = "1" if warmup else "0"
+
+    from agents.prompts.loader import load_prompt, read_text_cached
+    from app.main import create_orchestrator, get_orchestrator
+
+    sessions, ms = [], []
+    rss0 = _rss_mb()
+    tracemalloc.start()
+    heap0 = tracemalloc.get_traced_memory()[0]
+    for _ in range(n_sessions):
+        t0 = time.perf_counter()
+        if mode == "shared":
+            state = {"messages": [], "last_context": None}
+            get_orchestrator()
+        else:
+            if mode == "per_session_cold":
+                load_prompt.cache_clear()
+                read_text_cached.cache_clear()
+            state = {"orchestrator": create_orchestrator(), "messages": [], "last_context": None}
+        ms.append((time.perf_counter() - t0) * 1000.0)
+        sessions.append(state)
+    heap1 = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return {
+        "mode": mode,
+        "n_sessions": n_sessions,
+        "first_ms": float(ms[0]),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "total_sec": float(sum(ms) / 1000.0),
+        "rss_delta_mb": float(_rss_mb() - rss0),
+        "py_heap_delta_mb": float((heap1 - heap0) / (1024.0 * 1024.0)),
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    rows = []
+    ctx = mp.get_context("spawn")
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as ex:
+            row = ex.submit(_bench_mode, mode, args.n_sessions, args.warmup).result()
+        rows.append(row)
+        print(f"{mode:17s} | first={row['first_ms']:8.1f}ms p50={row['p50_ms']:7.2f}ms p99={row['p99_ms']:7.2f}ms "
+              f"total={row['total_sec']:.2f}s | rss +{row['rss_delta_mb']:.1f}MB heap +{row['py_heap_delta_mb']:.1f}MB")
+
+    result = {"n_sessions": args.n_sessions, "warmup": args.warmup, "results": rows}
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[saved] {out}")
+    return result
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--n_sessions", type=int, default=200)
+    p.add_argument("--modes", default="per_session_cold,per_session,shared", help="쉼표 구분 모드")
+    p.add_argument("--warmup", action="store_true", help="create_orchestrator 에서 ML warmup 실행(기본: 끔)")
+    p.add_argument("--out", default="", help="결과 JSON 경로(기본: 저장 안 함)")
+    return p
+
+
+if __name__ == "__main__":
+    run(build_argparser().parse_args())
@@ -0,0 +1,125 @@
+"""
+시작 시간(cold start) 단계별 벤치마크
+
+실행 예시:
+python -m bench.startup --formats json,ubj --repeats 3
+python -m bench.startup --backend xgb --out ml/artifacts/startup_bench.json
+
+동작:
+- 설정(모델 형식 × warmup 여부)마다 새 파이썬 프로세스를 --repeats 번 띄워 단계별 시간을 재고 중앙값 사용
+  · import_numpy      : numpy import
+  · import_app_main   : app.main import(openai / 예측 모듈은 create_orchestrator 안에서 import)
+  · import_openai     : openai import(설치되어 있을 때)
+  · import_ml_tools   : tools.ml_predict_tools import
+  · load_mappings     : feature_names / label_mapping 로드
+  · load_model        : 백엔드 모델 로드(json vs ubj)
+  · warmup            : warmup() 더미 배치(--warmup 설정에서만)
+  · first_predict     : 첫 predict_topk_with_scores
+  · second_predict    : 두 번째(다른 입력, 캐시 영향 없음)
+- 측정 프로세스에서는 LRU 캐시 / 답 테이블을 끄고 모델 경로만 측정
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+PHASES = ["import_numpy", "import_app_main", "import_openai", "import_ml_tools", "load_mappings", "load_model",
+          "warmup", "first_predict", "second_predict"]
+
+
+def _child(backend: str, warmup: bool) -> dict:
+    """측정 프로세스: 단계별 초(dict)."""
+    out = {}
+
+    def timed(name, fn):
+        t0 = time.perf_counter()
+        r = fn()
+        out[name] = time.perf_counter() - t0
+        return r
+
+    timed("import_numpy", lambda: __import__("numpy"))
+    timed("import_app_main", lambda: __import__("app.main"))
+    try:
+        timed("import_openai", lambda: __import__("openai"))
+    except ImportError:
+        pass
+    mpt = timed("import_ml_tools", lambda: __import__("tools.ml_predict_tools", fromlist=["_"]))
+    active = timed("load_mappings", mpt._active)
+    timed("load_model", lambda: mpt.get_backend(backend))
+    if warmup:
+        timed("warmup", lambda: mpt.warmup([backend]))
+    fn = active.feature_names
+    timed("first_predict", lambda: mpt.predict_topk_with_scores(fn[:2], backend=backend))
+    timed("second_predict", lambda: mpt.predict_topk_with_scores(fn[2:4], backend=backend))
+    return out
+
+
+def _spawn(backend: str, fmt: str, warmup: bool) -> dict:
+    env = {
+        **os.environ,
+        "HIGHFOUR_XGB_FORMAT": fmt,
+        "HIGHFOUR_ML_CACHE_SIZE": "0",
+        "HIGHFOUR_ANSWER_TABLE": "0",
+        "HIGHFOUR_ML_WATCH_SEC": "0",
+    }
+    cmd = [sys.executable, "-m", "bench.startup", "--child", "--backend", backend]
+    if warmup:
+        cmd.append("--warmup")
+    proc = subprocess.run(cmd, cwd=str(REPO_ROOT), env=env, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run(args: argparse.Namespace) -> dict:
+    import numpy as np
+
+    rows = []
+    for fmt in [f.strip() for f in args.formats.split(",") if f.strip()]:
+        for warmup in (False, True):
+            runs = [_spawn(args.backend, fmt, warmup) for _ in range(args.repeats)]
+            row = {"format": fmt, "warmup": warmup}
+            for ph in PHASES:
+                vals = [r[ph] for r in runs if ph in r]
+                if vals:
+                    row[f"{ph}_ms"] = float(np.median(vals) * 1000.0)
+            row["ready_ms"] = sum(row.get(f"{ph}_ms", 0.0) for ph in PHASES[:-2])
+            rows.append(row)
+
+    print("\n===== STARTUP (median ms) =====")
+    cols = ["format", "warmup", *[f"{ph}_ms" for ph in PHASES], "ready_ms"]
+    print(" | ".join(cols))
+    for r in rows:
+        print(" | ".join(f"{r[c]:.1f}" if isinstance(r.get(c), float) else str(r.get(c, "-")) for c in cols))
+
+    result = {"backend": args.backend, "repeats": args.repeats, "results": rows}
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[saved] {out}")
+    return result
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--backend", default="xgb")
+    p.add_argument("--formats", default="json,ubj", help="xgb 모델 형식 후보(HIGHFOUR_XGB_FORMAT)")
+    p.add_argument("--repeats", type=int, default=3, help="설정별 프로세스 실행 횟수(중앙값)")
+    p.add_argument("--out", default="", help="결과 JSON 경로(기본: 저장 안 함)")
+    p.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    p.add_argument("--warmup", action="store_true", help=argparse.SUPPRESS)
+    return p
+
+
+if __name__ == "__main__":
+    _args = build_argparser().parse_args()
+    if _args.child:
+        print(json.dumps(_child(_args.backend, _args.warmup)))
+    else:
+        run(_args)
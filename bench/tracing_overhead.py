@@ -0,0 +1,143 @@
+"""
+tracing 계측 오버헤드 벤치마크 (Orchestrator.handle_user_input: 계측 없음 vs instrument_orchestrator)
+
+실행 예시:
+python -m bench.tracing_overhead --rounds 5 --requests 200
+python -m bench.tracing_overhead --max_overhead_pct 5 --out ml/artifacts/tracing_overhead.json   # 초과면 exit 1
+
+동작:
+- LLM 은 app.fake_llm(HIGHFOUR_FAKE_LLM=1, 지연 0) → 요청 시간 = 에이전트 / ML / 파이프라인 자체 비용
+- 같은 프로세스에서 create_orchestrator() 를 app.main.TRACING 끄고 / 켜고 한 번씩 생성
+  · traced = TracedLLMClient + instrument_orchestrator(서버와 같은 계측 경로)
+  · 두 orchestrator 모두 코퍼스 전체로 워밍업(ML LRU / 프롬프트 캐시)한 뒤 측정
+- 라운드마다 plain / traced 를 번갈아(순서도 교대) --requests 개씩 단일 스레드로 실행 → 시간에 따른 드리프트 상쇄
+- 지표: 요청당 mean / p50 / p95(ms), 요청당 span 수, 오버헤드(요청당 µs, %)
+  · 두 설정은 같은 코퍼스 메시지를 같은 순서로 처리 → 오버헤드 = 같은 메시지끼리 (traced - plain) 차이의 중앙값
+    (코퍼스에 병원 검색 포함 / 미포함 요청이 섞여 분포가 두 봉우리라 p50 끼리 빼면 흔들림)
+  · % = 오버헤드 / plain 요청 시간 중앙값(--max_overhead_pct 판정 기준)
+  · HIGHFOUR_TRACE_FILE 을 지정하면 JSONL 기록 비용도 포함됨(기본: 미지정 → 히스토그램만)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from bench.load_test import load_corpus
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _make_orchestrators(seed: int):
+    os.environ["HIGHFOUR_FAKE_LLM"] = "1"
+    os.environ["HIGHFOUR_FAKE_LLM_LATENCY_SCALE"] = "0"
+    os.environ["HIGHFOUR_FAKE_LLM_ERROR_RATE"] = "0"
+    os.environ["HIGHFOUR_FAKE_LLM_SEED"] = str(seed)
+    os.chdir(REPO_ROOT)  # 에이전트 기본 프롬프트 / vocab 경로가 레포 루트 기준
+
+    import app.main as main
+
+    # TRACING 은 모듈 상수 → 생성 시점에만 바꿔서 계측 없음 / 있음 두 가지를 만듦
+    tracing = main.TRACING
+    try:
+        main.TRACING = False
+        plain = main.create_orchestrator()
+        main.TRACING = True
+        traced = main.create_orchestrator()
+    finally:
+        main.TRACING = tracing
+    return plain, traced
+
+
+def _time_requests(orch, corpus: List[str], n_requests: int, location: str, start: int) -> List[float]:
+    ms = []
+    for i in range(start, start + n_requests):
+        t0 = time.perf_counter()
+        orch.handle_user_input(user_input=corpus[i % len(corpus)], user_location=location)
+        ms.append((time.perf_counter() - t0) * 1000.0)
+    return ms
+
+
+def _summary(ms: List[float]) -> Dict[str, float]:
+    a = np.asarray(ms)
+    return {
+        "n": int(a.size),
+        "mean_ms": float(a.mean()),
+        "p50_ms": float(np.percentile(a, 50)),
+        "p95_ms": float(np.percentile(a, 95)),
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    corpus = load_corpus(args.corpus)
+    plain, traced = _make_orchestrators(args.seed)
+
+    from app import tracing
+
+    for orch in (plain, traced):
+        _time_requests(orch, corpus, len(corpus), args.location, 0)
+    tracing.reset()
+
+    times: Dict[str, List[float]] = {"plain": [], "traced": []}
+    for r in range(args.rounds):
+        order = [("plain", plain), ("traced", traced)]
+        for name, orch in (order if r % 2 == 0 else order[::-1]):
+            times[name].extend(_time_requests(orch, corpus, args.requests, args.location, r * args.requests))
+
+    n_spans = sum(s["count"] for s in tracing.stats().values())
+    plain_s, traced_s = _summary(times["plain"]), _summary(times["traced"])
+    diff_ms = np.asarray(times["traced"]) - np.asarray(times["plain"])
+    overhead_us = float(np.median(diff_ms)) * 1000.0
+    overhead_mean_us = float(diff_ms.mean()) * 1000.0
+    overhead_pct = overhead_us / 1000.0 / plain_s["p50_ms"] * 100.0 if plain_s["p50_ms"] > 0 else 0.0
+    spans_per_request = n_spans / max(len(times["traced"]), 1)
+
+    for name, s in (("plain", plain_s), ("traced", traced_s)):
+        print(f"{name:6s} | mean={s['mean_ms']:8.3f} p50={s['p50_ms']:8.3f} p95={s['p95_ms']:8.3f}ms (n={s['n']})")
+    print(f"[overhead] median {overhead_us:+.1f}µs/request ({overhead_pct:+.2f}%) | mean {overhead_mean_us:+.1f}µs "
+          f"| spans/request={spans_per_request:.1f}")
+
+    result = {
+        "rounds": args.rounds,
+        "requests": args.requests,
+        "corpus_size": len(corpus),
+        "plain": plain_s,
+        "traced": traced_s,
+        "overhead_us": float(overhead_us),
+        "overhead_mean_us": float(overhead_mean_us),
+        "overhead_pct": float(overhead_pct),
+        "spans_per_request": float(spans_per_request),
+        "exceeded": bool(args.max_overhead_pct and overhead_pct > args.max_overhead_pct),
+    }
+    if result["exceeded"]:
+        print(f"[REGRESSION] tracing 오버헤드 {overhead_pct:.2f}% > {args.max_overhead_pct:.2f}%")
+
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[saved] {out}")
+    return result
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--rounds", type=int, default=5, help="plain / traced 교대 라운드 수")
+    p.add_argument("--requests", type=int, default=200, help="라운드당 설정별 요청 수")
+    p.add_argument("--corpus", default="", help="사용자 메시지 파일(한 줄에 1개, 기본: bench.load_test 내장 코퍼스)")
+    p.add_argument("--location", default="서울시 강남구", help="user_location(응급이면 병원 검색 단계 포함)")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--max_overhead_pct", type=float, default=0.0, help="오버헤드 상한(%%, 0: 검사 안 함)")
+    p.add_argument("--out", default="", help="결과 JSON 경로(기본: 저장 안 함)")
+    return p
+
+
+if __name__ == "__main__":
+    _result = run(build_argparser().parse_args())
+    sys.exit(1 if _result["exceeded"] else 0)
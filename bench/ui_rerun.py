@@ -0,0 +1,114 @@
+"""
+Streamlit 화면 rerun 시간 벤치마크(대화 기록 길이별)
+
+실행 예시:
+python -m bench.ui_rerun --history 100 --pages 0,30 --reruns 20
+python -m bench.ui_rerun --out ml/artifacts/ui_rerun_bench.json
+
+동작:
+- streamlit.testing(AppTest)로 run.py 를 실행, session_state 에 합성 대화 기록(--history 개)을 넣고 rerun 시간 측정
+  · 사용자/assistant 번갈아, assistant 5개 중 1개는 병원 5곳(좌표 포함) 결과, 나머지는 질문 목록
+- HIGHFOUR_UI_HISTORY_PAGE 값(--pages, 0이면 전체 렌더링)마다 별도 프로세스에서 측정(모듈 상수라서)
+- 지표: first_ms(첫 실행, 캐시 비어 있음) / p50_ms / p99_ms(이후 rerun) / elements(렌더링된 요소 수)
+- LLM / 모델 호출 없음(기록 렌더링만 측정)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def synth_history(n: int) -> list:
+    msgs = []
+    for i in range(n):
+        if i % 2 == 0:
+            msgs.append({"role": "user", "content": f"증상 설명 {i}: 어제부터 기침이 나고 열이 있어요", "payload": {}})
+        elif (i // 2) % 5 == 4:
+            hospitals = [
+                {
+                    "name": f"병원 {i}-{j}",
+                    "address": f"서울시 강남구 테헤란로 {100 + j}",
+                    "phone": "02-000-0000",
+                    "latitude": 37.50 + 0.001 * j + 0.0001 * i,
+                    "longitude": 127.03 + 0.001 * j,
+                    "department": "내과",
+                }
+                for j in range(5)
+            ]
+            msgs.append({"role": "assistant", "content": "🏥 가까운 병원 정보를 가져왔어요.",
+                         "payload": {"hospital_info": {"status": "ok", "hospitals": hospitals}}})
+        else:
+            msgs.append({"role": "assistant", "content": "증상과 관련해 고려할 수 있는 내용을 안내해드릴게요. " * 5,
+                         "payload": {"questions": ["언제부터 시작됐나요?", "열이 있나요?"]}})
+    return msgs
+
+
+def _bench_page(page: int, history: int, reruns: int) -> dict:
+    import numpy as np
+    from streamlit.testing.v1 import AppTest
+
+    os.environ["HIGHFOUR_UI_HISTORY_PAGE"] = str(page)
+    os.chdir(REPO_ROOT)
+    at = AppTest.from_file(str(REPO_ROOT / "run.py"), default_timeout=120)
+    at.session_state["messages"] = synth_history(history)
+    at.session_state["last_context"] = None
+
+    t0 = time.perf_counter()
+    at.run()
+    first_ms = (time.perf_counter() - t0) * 1000.0
+    if at.exception:
+        raise RuntimeError(str(at.exception))
+
+    ms = []
+    for _ in range(reruns):
+        t0 = time.perf_counter()
+        at.run()
+        ms.append((time.perf_counter() - t0) * 1000.0)
+    return {
+        "page": page,
+        "history": history,
+        "first_ms": float(first_ms),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "elements": int(sum(1 for _ in at.main)),
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    rows = []
+    ctx = mp.get_context("spawn")
+    for page in [int(v) for v in args.pages.split(",")]:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as ex:
+            row = ex.submit(_bench_page, page, args.history, args.reruns).result()
+        rows.append(row)
+        label = "all" if page == 0 else str(page)
+        print(f"page={label:>4s} | first={row['first_ms']:8.1f}ms | rerun p50={row['p50_ms']:8.1f}ms "
+              f"p99={row['p99_ms']:8.1f}ms | elements={row['elements']}")
+
+    result = {"history": args.history, "reruns": args.reruns, "results": rows}
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[saved] {out}")
+    return result
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--history", type=int, default=100, help="합성 대화 기록 메시지 수")
+    p.add_argument("--pages", default="0,30", help="HIGHFOUR_UI_HISTORY_PAGE 후보(0이면 전체 렌더링)")
+    p.add_argument("--reruns", type=int, default=20, help="측정할 rerun 횟수")
+    p.add_argument("--out", default="", help="결과 JSON 경로(기본: 저장 안 함)")
+    return p
+
+
+if __name__ == "__main__":
+    run(build_argparser().parse_args())
@@ -0,0 +1,209 @@
+"""
+답 테이블(자주 나오는 증상 조합의 미리 계산된 예측) 생성 스크립트
+
+실행 예시:
+python -m ml.train.build_answer_table --backend xgb --topk 10
+python -m ml.train.build_answer_table --log_jsonl logs/symptoms.jsonl --replay_jsonl logs/symptoms_recent.jsonl
+
+키 후보:
+- 단일 증상 전부 (F개)
+- 증상 쌍 전부 (F·(F-1)/2개, --no_pairs 로 생략)
+- 학습 데이터(split 캐시 train) / 로그(--log_jsonl)에서 자주 나온 3개 이상 조합
+  (--min_count 이상, 크기 <= --max_set_size, 빈도 상위 --max_frequent 개)
+  · 로그 형식: 한 줄에 {"symptoms": ["headache", "nausea", ...]}
+
+값: 서빙과 같은 백엔드 예측 → temperature(TEMPERATURE_T) → 상위 --topk (내림차순, 확률 float32)
+
+저장 위치: 활성 모델 디렉토리(버전 구조면 versions/<CURRENT>/answer_table, 아니면 artifacts_dir/answer_table)
+  meta.json 의 model_version 이 서빙 중인 버전과 다르면 서빙에서 쓰지 않음
+
+리포트(answer_table/report.json):
+- 엔트리 수 / 용량 / 파일 크기 / 생성 시간
+- 재생 트래픽 적중률(--replay_jsonl, 없으면 test split 행을 대용으로 사용)과 조회 vs 모델 지연
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from .split import load_split_cache
+
+from tools.answer_table import TABLE_DIRNAME, AnswerTable, file_stamps, mask_words, write_table
+from tools.artifact_versions import resolve_current
+from tools.ml_predict_tools import TEMPERATURE_T, _apply_temperature_on_proba, _backend_options
+from tools.predict_backends import create_backend
+
+
+def _unpack(words: np.ndarray, num_features: int) -> np.ndarray:
+    """(N, W) uint64 -> (N, F) float32 0/1."""
+    bits = np.unpackbits(np.ascontiguousarray(words).view(np.uint8), axis=1, bitorder="little")
+    return bits[:, :num_features].astype(np.float32)
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    return np.unpackbits(np.ascontiguousarray(words).view(np.uint8), axis=1).sum(axis=1)
+
+
+def _symptoms_to_X(records: List[List[str]], feature_names: List[str]) -> np.ndarray:
+    pos = {f: i for i, f in enumerate(feature_names)}
+    X = np.zeros((len(records), len(feature_names)), dtype=np.uint8)
+    for r, symptoms in enumerate(records):
+        for s in symptoms:
+            j = pos.get(str(s).strip())
+            if j is not None:
+                X[r, j] = 1
+    return X
+
+
+def _read_log(path: Path) -> List[List[str]]:
+    out = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line:
+            out.append(list(json.loads(line).get("symptoms", [])))
+    return out
+
+
+def single_and_pair_keys(num_features: int, pairs: bool = True) -> np.ndarray:
+    X = np.eye(num_features, dtype=np.uint8)
+    keys = [mask_words(X)]
+    if pairs:
+        a, b = np.triu_indices(num_features, k=1)
+        for s in range(0, len(a), 20000):
+            Xp = np.zeros((len(a[s:s + 20000]), num_features), dtype=np.uint8)
+            rows = np.arange(len(Xp))
+            Xp[rows, a[s:s + 20000]] = 1
+            Xp[rows, b[s:s + 20000]] = 1
+            keys.append(mask_words(Xp))
+    return np.concatenate(keys, axis=0)
+
+
+def frequent_keys(X: np.ndarray, min_size: int, max_size: int, min_count: int, max_keys: int) -> np.ndarray:
+    """행 마스크 빈도 상위(크기 min_size~max_size, min_count 이상)."""
+    words = np.concatenate([mask_words(X[s:s + 50000]) for s in range(0, len(X), 50000)], axis=0)
+    uniq, counts = np.unique(words, axis=0, return_counts=True)
+    size = _popcount(uniq)
+    keep = (size >= min_size) & (size <= max_size) & (counts >= min_count)
+    uniq, counts = uniq[keep], counts[keep]
+    order = np.argsort(-counts, kind="stable")[:max_keys]
+    return uniq[order]
+
+
+def run(args: argparse.Namespace) -> dict:
+    artifacts_dir = Path(args.artifacts_dir)
+    cache_dir = Path(args.cache_dir) if args.cache_dir else artifacts_dir / "split_cache"
+    split = load_split_cache(cache_dir, mmap=True)
+    fn = split.feature_names
+    F = len(fn)
+
+    version, model_dir = resolve_current(artifacts_dir)
+    # 서빙과 같은 옵션(XGB 모델 포맷 등)으로 만들어야 model_files 기록이 서빙 쪽 검사와 일치
+    backend = create_backend(args.backend, artifacts_dir=model_dir, **_backend_options(args.backend))
+    if backend.feature_names != fn or backend.classes != split.classes:
+        raise ValueError("split 캐시와 모델의 피처/클래스 순서가 다릅니다.")
+
+    t0 = time.time()
+    sources = {}
+    parts = [single_and_pair_keys(F, pairs=not args.no_pairs)]
+    sources["single_pair"] = int(len(parts[0]))
+    parts.append(frequent_keys(split.X_train, 3, args.max_set_size, args.min_count, args.max_frequent))
+    sources["train_frequent"] = int(len(parts[-1]))
+    if args.log_jsonl:
+        X_log = _symptoms_to_X(_read_log(Path(args.log_jsonl)), fn)
+        parts.append(frequent_keys(X_log, 1, args.max_set_size, args.min_count, args.max_frequent))
+        sources["log_frequent"] = int(len(parts[-1]))
+    keys = np.unique(np.concatenate(parts, axis=0), axis=0)
+
+    # 예측(청크) → temperature → 상위 K (내림차순)
+    K = int(args.topk)
+    top_idx = np.empty((len(keys), K), dtype=np.int16)
+    top_prob = np.empty((len(keys), K), dtype=np.float32)
+    for s in range(0, len(keys), args.chunk_size):
+        P = backend.predict_proba(_unpack(keys[s:s + args.chunk_size], F))
+        P = _apply_temperature_on_proba(P, T=TEMPERATURE_T)
+        idx = np.argpartition(P, -K, axis=1)[:, -K:]
+        order = np.argsort(-np.take_along_axis(P, idx, axis=1), axis=1, kind="stable")
+        idx = np.take_along_axis(idx, order, axis=1)
+        top_idx[s:s + len(P)] = idx
+        top_prob[s:s + len(P)] = np.take_along_axis(P, idx, axis=1)
+
+    meta = {
+        "backend": args.backend,
+        "temperature": float(TEMPERATURE_T),
+        "model_version": version or "local",
+        "model_files": file_stamps(backend.artifact_paths()),
+        "num_features": F,
+        "num_classes": len(split.classes),
+        "sources": sources,
+    }
+    table_dir = write_table(model_dir / TABLE_DIRNAME, keys, top_idx, top_prob, meta, load_factor=args.load_factor)
+    build_sec = time.time() - t0
+
+    # 재생 트래픽 적중률 / 지연
+    table = AnswerTable(table_dir)
+    if args.replay_jsonl:
+        X_replay = _symptoms_to_X(_read_log(Path(args.replay_jsonl)), fn)
+        replay_source = str(args.replay_jsonl)
+    else:
+        X_replay = np.asarray(split.X_test[: args.replay_rows])
+        replay_source = "test_split"
+    words = mask_words(X_replay)
+    hits, lookup_ms = 0, []
+    for w in words:
+        t = time.perf_counter()
+        hits += table.lookup_words(w) is not None
+        lookup_ms.append((time.perf_counter() - t) * 1000.0)
+    model_ms = []
+    for i in range(min(len(X_replay), 200)):
+        t = time.perf_counter()
+        backend.predict_proba(X_replay[i:i + 1])
+        model_ms.append((time.perf_counter() - t) * 1000.0)
+
+    report = {
+        "entries": int(table.meta["entries"]),
+        "capacity": int(table.meta["capacity"]),
+        "table_bytes": table.nbytes(),
+        "build_sec": float(build_sec),
+        "sources": sources,
+        "replay_source": replay_source,
+        "replay_n": int(len(words)),
+        "hit_rate": float(hits / max(len(words), 1)),
+        "lookup_p50_ms": float(np.percentile(lookup_ms, 50)) if lookup_ms else 0.0,
+        "lookup_p99_ms": float(np.percentile(lookup_ms, 99)) if lookup_ms else 0.0,
+        "model_p50_ms": float(np.percentile(model_ms, 50)) if model_ms else 0.0,
+        "model_p99_ms": float(np.percentile(model_ms, 99)) if model_ms else 0.0,
+    }
+    (table_dir / "report.json").write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print("\n===== ANSWER TABLE =====")
+    for k, v in report.items():
+        print(f"{k}: {v:.4f}" if isinstance(v, float) else f"{k}: {v}")
+    print(f"\n[saved] {table_dir}")
+    return report
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--artifacts_dir", default="ml/artifacts")
+    p.add_argument("--cache_dir", default="", help="split 캐시 경로(기본: artifacts_dir/split_cache)")
+    p.add_argument("--backend", default="xgb", help="값을 계산할 예측 백엔드(서빙 백엔드와 같아야 사용됨)")
+    p.add_argument("--topk", type=int, default=10, help="엔트리별 저장할 상위 클래스 수")
+    p.add_argument("--no_pairs", action="store_true", help="증상 쌍 전체 열거 생략")
+    p.add_argument("--max_set_size", type=int, default=6, help="빈도 기반 조합의 최대 크기")
+    p.add_argument("--min_count", type=int, default=2, help="빈도 기반 조합의 최소 등장 횟수")
+    p.add_argument("--max_frequent", type=int, default=50000, help="소스별 빈도 기반 조합 최대 수")
+    p.add_argument("--log_jsonl", default="", help="요청 로그(JSONL, {\"symptoms\": [...]})")
+    p.add_argument("--replay_jsonl", default="", help="적중률 측정용 재생 트래픽(JSONL, 없으면 test split)")
+    p.add_argument("--replay_rows", type=int, default=20000, help="test split 대용 재생 시 행 수")
+    p.add_argument("--load_factor", type=float, default=0.5)
+    p.add_argument("--chunk_size", type=int, default=4096)
+    return p
+
+
+if __name__ == "__main__":
+    run(build_argparser().parse_args())
@@ -0,0 +1,362 @@
+"""
+XGBoost teacher -> 경량 student 증류 학습 스크립트
+
+실행 예시:
+python -m ml.train.distill_student --csv ml/train/Final_Augmented_dataset_Diseases_and_Symptoms.csv --arch mlp --hidden 256
+python -m ml.train.distill_student --csv ... --arch linear --epochs 15
+
+구조:
+- teacher: outdir/xgb_model.json (또는 --teacher)
+- soft label: teacher 확률에 서빙과 같은 temperature(TEMPERATURE_T) 적용 → q ∝ p^(1/T)
+  · 메모리를 위해 행마다 상위 --target_topk 개만 float16으로 보관(재정규화)
+- 학습 입력: train split + 합성 증상 부분집합(--n_synth)
+  · 실제 사용자는 증상을 일부만 말하므로, train 행의 활성 증상 중 1~--synth_max_keep 개만 남긴 입력을
+    teacher에게 다시 물어 그 분포를 따라하게 한다
+- student(NumPy, 의존성 없음):
+  · linear : z = b + Σ_{활성 f} W[f]
+  · mlp    : h = relu(b1 + Σ_{활성 f} W1[f]),  z = h @ W2 + b2
+  · soft cross-entropy + Adam, val에서 teacher top-5 일치율이 가장 좋은 epoch 사용
+- 서빙(tools/student_backend.py, 예측 백엔드 이름 "student"):
+  · student는 log p / T 를 흉내 내므로 softmax(T · z) 로 원래 스케일의 확률을 복원
+  · 이후 temperature / Top-K 후처리는 다른 백엔드와 동일
+
+산출물(outdir/student):
+- W1.npy, b1.npy (+ mlp면 W2.npy, b2.npy)
+- meta.json           : 구조, logit_scale(T), 학습 파라미터
+- student_report.json : fidelity(teacher와 top-1/top-5 일치), hit@k, 지연(teacher 대비)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+import xgboost as xgb
+
+from .split import load_and_split_cached
+from .eval_metrics import evaluate_model, inference_latency_ms, iter_predict_chunks
+from .train_xgb import symptom_dropout
+
+# 서빙 코드(tools/)의 temperature 설정을 그대로 사용(python -m 으로 레포 루트에서 실행)
+from tools.ml_predict_tools import TEMPERATURE_T, _apply_temperature_on_proba
+
+STUDENT_DIRNAME = "student"
+
+
+# =========================
+# 데이터: soft label / 합성 입력
+# =========================
+def teacher_soft_targets(
+    predict_fn, X: np.ndarray, T: float, topk: int, chunk_size: int = 4096
+) -> Tuple[np.ndarray, np.ndarray]:
+    """teacher 확률 -> temperature 적용 -> 행마다 상위 topk (클래스 int16, 확률 float16, 합 1)."""
+    n = len(X)
+    idx = np.empty((n, topk), dtype=np.int16)
+    val = np.empty((n, topk), dtype=np.float16)
+    for s, P in iter_predict_chunks(predict_fn, X, chunk_size):
+        Q = _apply_temperature_on_proba(P.reshape(len(P), -1), T=T)
+        top = np.argpartition(Q, -topk, axis=1)[:, -topk:]
+        q = np.take_along_axis(Q, top, axis=1)
+        idx[s:s + len(P)] = top
+        val[s:s + len(P)] = q / q.sum(axis=1, keepdims=True)
+    return idx, val
+
+
+def synth_subsets(X: np.ndarray, n: int, max_keep: int, seed: int, chunk: int = 20000) -> np.ndarray:
+    """train 행을 n개 뽑아 활성 증상 중 1~max_keep 개만 무작위로 남긴 입력(uint8)."""
+    rng = np.random.RandomState(seed)
+    rows = rng.randint(0, len(X), size=n)
+    out = np.zeros((n, X.shape[1]), dtype=np.uint8)
+    for s in range(0, n, chunk):
+        Xb = np.asarray(X[rows[s:s + chunk]]) > 0
+        n_act = Xb.sum(axis=1)
+        keep = np.minimum(rng.randint(1, max_keep + 1, size=len(Xb)), np.maximum(n_act, 1))
+        # 활성 증상에만 난수 점수 → 점수 순위가 keep 미만인 증상만 남김
+        score = np.where(Xb, rng.rand(*Xb.shape), -1.0)
+        rank = np.argsort(np.argsort(-score, axis=1), axis=1)
+        out[s:s + len(Xb)] = (Xb & (rank < keep[:, None])).astype(np.uint8)
+    return out
+
+
+def _topk_idx(P: np.ndarray, k: int) -> np.ndarray:
+    return np.argpartition(P, -k, axis=1)[:, -k:]
+
+
+def _overlap(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """행별 상위 k 인덱스 집합 겹침 개수."""
+    return (a[:, :, None] == b[:, None, :]).any(axis=2).sum(axis=1)
+
+
+def fidelity(teacher_fn, student_fn, X: np.ndarray, chunk_size: int = 4096) -> Dict[str, float]:
+    """teacher / student 상위 1·5 일치율(청크 단위, 전체 proba 행렬을 만들지 않음)."""
+    top1 = top5 = 0.0
+    for s in range(0, len(X), chunk_size):
+        xb = np.asarray(X[s:s + chunk_size])
+        P_t, P_s = teacher_fn(xb), student_fn(xb)
+        top1 += float((P_t.argmax(axis=1) == P_s.argmax(axis=1)).sum())
+        top5 += float(_overlap(_topk_idx(P_t, 5), _topk_idx(P_s, 5)).sum()) / 5.0
+    n = max(len(X), 1)
+    return {"top1_agreement": top1 / n, "top5_agreement": top5 / n}
+
+
+# =========================
+# student (NumPy)
+# =========================
+def init_params(arch: str, num_features: int, num_classes: int, hidden: int, seed: int) -> Dict[str, np.ndarray]:
+    rng = np.random.RandomState(seed)
+    if arch == "linear":
+        return {
+            "W1": np.zeros((num_features, num_classes), dtype=np.float32),
+            "b1": np.zeros(num_classes, dtype=np.float32),
+        }
+    return {
+        "W1": (rng.randn(num_features, hidden) * np.sqrt(2.0 / num_features)).astype(np.float32),
+        "b1": np.zeros(hidden, dtype=np.float32),
+        "W2": (rng.randn(hidden, num_classes) * np.sqrt(1.0 / hidden)).astype(np.float32),
+        "b2": np.zeros(num_classes, dtype=np.float32),
+    }
+
+
+def _softmax(z: np.ndarray) -> np.ndarray:
+    z = z - z.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+def student_logits(params: Dict[str, np.ndarray], X: np.ndarray) -> np.ndarray:
+    a = X @ params["W1"] + params["b1"]
+    if "W2" not in params:
+        return a
+    return np.maximum(a, 0.0) @ params["W2"] + params["b2"]
+
+
+def _grads(params: Dict[str, np.ndarray], X: np.ndarray, Q: np.ndarray, l2: float) -> Tuple[float, Dict[str, np.ndarray]]:
+    """soft cross-entropy -Σ q log softmax(z) 의 평균과 gradient."""
+    B = len(X)
+    a = X @ params["W1"] + params["b1"]
+    if "W2" in params:
+        h = np.maximum(a, 0.0)
+        z = h @ params["W2"] + params["b2"]
+    else:
+        z = a
+    P = _softmax(z)
+    loss = float(-(Q * np.log(np.clip(P, 1e-12, 1.0))).sum() / B)
+
+    dz = (P - Q) / B
+    g: Dict[str, np.ndarray] = {}
+    if "W2" in params:
+        g["W2"] = h.T @ dz + l2 * params["W2"]
+        g["b2"] = dz.sum(axis=0)
+        da = (dz @ params["W2"].T) * (a > 0)
+    else:
+        da = dz
+    g["W1"] = X.T @ da + l2 * params["W1"]
+    g["b1"] = da.sum(axis=0)
+    return loss, g
+
+
+class _Adam:
+    def __init__(self, params: Dict[str, np.ndarray], lr: float, beta1: float = 0.9, beta2: float = 0.999, eps: float = 1e-8):
+        self.lr, self.beta1, self.beta2, self.eps = lr, beta1, beta2, eps
+        self.m = {k: np.zeros_like(v) for k, v in params.items()}
+        self.v = {k: np.zeros_like(v) for k, v in params.items()}
+        self.t = 0
+
+    def step(self, params: Dict[str, np.ndarray], grads: Dict[str, np.ndarray]) -> None:
+        self.t += 1
+        c1 = 1.0 - self.beta1 ** self.t
+        c2 = 1.0 - self.beta2 ** self.t
+        for k, g in grads.items():
+            self.m[k] = self.beta1 * self.m[k] + (1.0 - self.beta1) * g
+            self.v[k] = self.beta2 * self.v[k] + (1.0 - self.beta2) * (g * g)
+            params[k] -= (self.lr * (self.m[k] / c1) / (np.sqrt(self.v[k] / c2) + self.eps)).astype(np.float32)
+
+
+def _dense_targets(idx: np.ndarray, val: np.ndarray, num_classes: int) -> np.ndarray:
+    Q = np.zeros((len(idx), num_classes), dtype=np.float32)
+    np.put_along_axis(Q, idx.astype(np.int64), val.astype(np.float32), axis=1)
+    return Q
+
+
+def save_student(params: Dict[str, np.ndarray], out_dir: Path, meta: dict) -> Path:
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    meta_path = out_dir / "meta.json"
+    if meta_path.exists():
+        meta_path.unlink()
+    for name in ("W1", "b1", "W2", "b2"):
+        if name in params:
+            # 서빙 프로세스가 mmap 중인 파일을 덮어쓰지 않도록 임시 파일에 쓰고 교체
+            tmp = out_dir / f"{name}.tmp.npy"
+            np.save(tmp, np.ascontiguousarray(params[name], dtype=np.float32))
+            os.replace(tmp, out_dir / f"{name}.npy")
+        elif (out_dir / f"{name}.npy").exists():
+            (out_dir / f"{name}.npy").unlink()
+    meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    return out_dir
+
+
+# =========================
+# 학습
+# =========================
+def train(args: argparse.Namespace) -> dict:
+    outdir = Path(args.outdir)
+    student_dir = outdir / STUDENT_DIRNAME
+
+    split = load_and_split_cached(
+        csv_path=args.csv,
+        artifacts_dir=outdir,
+        test_size=args.test_size,
+        val_size=args.val_size,
+        random_seed=args.seed,
+        min_count_per_class=args.min_count,
+        rare_label=args.rare_label,
+    )
+    num_classes = len(split.classes)
+    fn = split.feature_names
+    T = float(args.temperature)
+
+    teacher_path = Path(args.teacher) if args.teacher else outdir / "xgb_model.json"
+    teacher = xgb.Booster()
+    teacher.load_model(str(teacher_path))
+    if args.nthread > 0:
+        teacher.set_param({"nthread": args.nthread})
+
+    def teacher_predict(x):
+        return teacher.predict(xgb.DMatrix(np.asarray(x, dtype=np.float32), feature_names=fn)).reshape(len(x), -1)
+
+    # 1) 입력 풀: train (+ 약한 dropout) + 합성 부분집합
+    t0 = time.time()
+    X_parts = [np.asarray(split.X_train, dtype=np.uint8)]
+    if args.symptom_drop_p > 0:
+        X_parts[0] = symptom_dropout(X_parts[0], drop_p=args.symptom_drop_p, seed=args.seed)
+    if args.n_synth > 0:
+        X_parts.append(synth_subsets(split.X_train, args.n_synth, args.synth_max_keep, seed=args.seed + 1))
+    X_pool = np.concatenate(X_parts, axis=0)
+    del X_parts
+
+    # 2) teacher soft label (상위 target_topk만)
+    q_idx, q_val = teacher_soft_targets(teacher_predict, X_pool, T=T, topk=args.target_topk)
+    X_val = np.asarray(split.X_val, dtype=np.float32)
+    val_top5_teacher = None
+    if len(X_val) > 0:
+        val_top5_teacher = np.concatenate([_topk_idx(P, 5) for _, P in iter_predict_chunks(teacher_predict, X_val)])
+    print(f">>> teacher 라벨링 완료: {len(X_pool)} rows ({time.time() - t0:.1f}s)")
+
+    # 3) student 학습
+    params = init_params(args.arch, len(fn), num_classes, args.hidden, args.seed)
+    opt = _Adam(params, lr=args.lr)
+    rng = np.random.RandomState(args.seed)
+    best = {"epoch": -1, "val_top5_agreement": -1.0}
+    best_params = {k: v.copy() for k, v in params.items()}
+    history = []
+
+    t0 = time.time()
+    for epoch in range(1, args.epochs + 1):
+        perm = rng.permutation(len(X_pool))
+        losses = []
+        for s in range(0, len(perm), args.batch_size):
+            b = perm[s:s + args.batch_size]
+            Xb = X_pool[b].astype(np.float32)
+            Qb = _dense_targets(q_idx[b], q_val[b], num_classes)
+            loss, g = _grads(params, Xb, Qb, args.l2)
+            opt.step(params, g)
+            losses.append(loss)
+
+        rec = {"epoch": epoch, "loss": float(np.mean(losses))}
+        if val_top5_teacher is not None:
+            # 순위만 비교하므로 softmax(T · z) 대신 logits 그대로
+            val_top5 = _topk_idx(student_logits(params, X_val), 5)
+            rec["val_top5_agreement"] = float(_overlap(val_top5_teacher, val_top5).mean() / 5.0)
+            if rec["val_top5_agreement"] > best["val_top5_agreement"]:
+                best = dict(rec)
+                best_params = {k: v.copy() for k, v in params.items()}
+        else:
+            best, best_params = dict(rec), {k: v.copy() for k, v in params.items()}
+        history.append(rec)
+        print(f"  epoch {epoch:02d}: " + ", ".join(f"{k}={v:.4f}" for k, v in rec.items() if k != "epoch"))
+    train_time = time.time() - t0
+
+    meta = {
+        "model_type": "DistilledStudent",
+        "arch": args.arch,
+        "hidden": int(args.hidden) if args.arch == "mlp" else 0,
+        "logit_scale": T,
+        "num_features": len(fn),
+        "num_classes": num_classes,
+        "teacher": teacher_path.name,
+        "teacher_rounds": int(teacher.num_boosted_rounds()),
+        "best_epoch": int(best["epoch"]),
+        "params": vars(args),
+        "train_rows": int(len(X_pool)),
+        "train_time_sec": float(train_time),
+        "history": history,
+    }
+    save_student(best_params, student_dir, meta)
+
+    # 4) 평가: 서빙 코드(tools.student_backend)로 fidelity / hit@k / 지연
+    from tools.student_backend import StudentBackend
+
+    student = StudentBackend(artifacts_dir=outdir).load()
+    report = {
+        "fidelity": fidelity(teacher_predict, student.predict_proba, split.X_test),
+        "student": {
+            **evaluate_model(student.predict_proba, split.X_test, split.y_test, num_classes=num_classes),
+            **inference_latency_ms(student.predict_proba, split.X_test),
+        },
+        "teacher": {
+            **evaluate_model(teacher_predict, split.X_test, split.y_test, num_classes=num_classes),
+            **inference_latency_ms(teacher_predict, split.X_test),
+        },
+    }
+
+    meta["metrics"] = {**report["fidelity"], **report["student"]}
+    (student_dir / "meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    (student_dir / "student_report.json").write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print("\n===== STUDENT vs TEACHER =====")
+    print(f"top1_agreement: {report['fidelity']['top1_agreement']:.4f}")
+    print(f"top5_agreement: {report['fidelity']['top5_agreement']:.4f}")
+    print("model | hit@1 | hit@5 | mrr | p50_ms | p99_ms")
+    for name in ("student", "teacher"):
+        m = report[name]
+        print(f"{name} | {m['hit@1']:.4f} | {m['hit@5']:.4f} | {m['mrr']:.4f} | "
+              f"{m['infer_p50_ms']:.3f} | {m['infer_p99_ms']:.3f}")
+    print(f"\n[saved] {student_dir}")
+    return report
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--csv", required=True, help="학습 CSV 경로")
+    p.add_argument("--outdir", default="ml/artifacts", help="산출물 저장 경로(student는 outdir/student)")
+    p.add_argument("--teacher", default="", help="teacher 모델 경로(기본: outdir/xgb_model.json)")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--nthread", type=int, default=0, help="teacher 예측 스레드 수(0이면 xgboost 기본)")
+    p.add_argument("--test_size", type=float, default=0.20)
+    p.add_argument("--val_size", type=float, default=0.10)
+    p.add_argument("--min_count", type=int, default=10)
+    p.add_argument("--rare_label", type=str, default="__RARE__")
+
+    p.add_argument("--temperature", type=float, default=TEMPERATURE_T, help="soft label temperature(서빙과 동일 권장)")
+    p.add_argument("--target_topk", type=int, default=32, help="행마다 보관할 teacher 상위 클래스 수")
+    p.add_argument("--n_synth", type=int, default=200000, help="합성 증상 부분집합 행 수")
+    p.add_argument("--synth_max_keep", type=int, default=4, help="합성 입력에 남길 최대 증상 수")
+    p.add_argument("--symptom_drop_p", type=float, default=0.10)
+
+    p.add_argument("--arch", choices=["linear", "mlp"], default="mlp")
+    p.add_argument("--hidden", type=int, default=256)
+    p.add_argument("--epochs", type=int, default=10)
+    p.add_argument("--batch_size", type=int, default=1024)
+    p.add_argument("--lr", type=float, default=1e-3)
+    p.add_argument("--l2", type=float, default=1e-6)
+    return p
+
+
+if __name__ == "__main__":
+    args = build_argparser().parse_args()
+    train(args)
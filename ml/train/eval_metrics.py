@@ -1,27 +1,42 @@
 """
-평가 지표 모음: Hit@K, MRR, Macro F1, Entropy, Confidence, ECE(선택)
+평가 지표 모음: Hit@K, MRR, Macro F1, Entropy, Confidence, ECE(선택), 추론 지연
 - 멀티클래스 확률 출력(proba: [N, C]) 기준
+- StreamingEvaluator: 확률 행렬을 청크 단위로 받아 같은 지표를 한 번에 누적(메모리 O(chunk × C))
 """
 from __future__ import annotations
 
+import time
+from typing import Callable, Dict, Iterable, Iterator, Sequence, Tuple
+
 import numpy as np
 from sklearn.metrics import f1_score
 
 
+def true_rank(y_true: np.ndarray, proba: np.ndarray) -> np.ndarray:
+    """
+    정답 클래스 순위(1부터) = 1 + #(p > p_true) + #(p == p_true, 인덱스가 더 앞).
+    stable argsort(-p) 순위와 같음 → 동점이 있어도 hit@k / MRR / StreamingEvaluator 가 같은 값.
+    """
+    y = np.asarray(y_true).reshape(-1).astype(np.int64)
+    P = np.asarray(proba)
+    p_true = P[np.arange(len(y)), y]
+    greater = np.count_nonzero(P > p_true[:, None], axis=1)
+    ties_before = np.count_nonzero((P == p_true[:, None]) & (np.arange(P.shape[1])[None, :] < y[:, None]), axis=1)
+    return greater + ties_before + 1
+
+
 def hit_at_k(y_true: np.ndarray, proba: np.ndarray, k: int = 5) -> float:
-    """Hit@K (=Top-K Accuracy)."""
-    y_true = np.asarray(y_true).reshape(-1)
+    """Hit@K (=Top-K Accuracy). 동점은 인덱스 순(stable)으로 순위를 매긴다(argpartition 의 임의 순서 X)."""
     P = np.asarray(proba)
     if k >= P.shape[1]:
         return 1.0
-    topk = np.argpartition(P, -k, axis=1)[:, -k:]
-    return float(np.mean(np.any(topk == y_true[:, None], axis=1)))
+    return float(np.mean(true_rank(y_true, P) <= k))
 
 
 def mrr(y_true: np.ndarray, proba: np.ndarray) -> float:
-    """MRR(Mean Reciprocal Rank)."""
+    """MRR(Mean Reciprocal Rank). 동점은 인덱스 순(stable)으로 순위를 매긴다."""
     y_true = np.asarray(y_true).reshape(-1)
-    order = np.argsort(-np.asarray(proba), axis=1)
+    order = np.argsort(-np.asarray(proba), axis=1, kind="stable")
     ranks = np.where(order == y_true[:, None])[1] + 1
     return float(np.mean(1.0 / ranks))
 
@@ -60,3 +75,172 @@ def expected_calibration_error(conf: np.ndarray, correct: np.ndarray, n_bins: in
         conf_bin = conf[m].mean()
         ece += (m.mean()) * abs(acc_bin - conf_bin)
     return float(ece)
+
+
+def inference_latency_ms(
+    predict_fn: Callable[[np.ndarray], np.ndarray],
+    X: np.ndarray,
+    n_samples: int = 100,
+    seed: int = 42,
+) -> Dict[str, float]:
+    """
+    단일 행(요청 1건) 추론 지연(ms)의 p50/p99.
+    - predict_fn: (1, F) 배열 -> (1, C) 확률
+    - 첫 호출(워밍업)은 측정에서 제외
+    """
+    X = np.asarray(X)
+    rng = np.random.RandomState(seed)
+    idx = rng.randint(0, len(X), size=min(n_samples, len(X)))
+    predict_fn(X[idx[:1]])
+
+    times = []
+    for i in idx:
+        t0 = time.perf_counter()
+        predict_fn(X[i:i + 1])
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return {
+        "infer_p50_ms": float(np.percentile(times, 50)),
+        "infer_p99_ms": float(np.percentile(times, 99)),
+    }
+
+
+# =========================
+# 청크 스트리밍 평가
+# =========================
+class StreamingEvaluator:
+    """
+    확률 청크를 누적해 hit@k / MRR / macro-F1 / entropy / top1 confidence / ECE를 한 번에 계산.
+
+    - 정답 순위: rank = 1 + #(p > p_true) + #(p == p_true, 인덱스가 더 앞)  → 정렬 없이 비교 횟수로 계산
+      (true_rank: mrr의 stable argsort와 동일한 순위. hit@k = rank <= k, hit_at_k 도 같은 순위 사용)
+    - macro-F1: 클래스별 tp / 정답 수 / 예측 수 누적(confusion 대각 + 행/열 합)
+      → sklearn f1_score(average="macro", zero_division=0)와 같은 정의(등장한 라벨 평균)
+    - ECE: expected_calibration_error와 같은 구간(linspace) 경계를 searchsorted + bincount로 누적
+    - 메모리: 상태는 O(C + n_bins), 청크 하나 처리 시 O(chunk × C)
+    """
+
+    def __init__(self, num_classes: int, ks: Sequence[int] = (1, 3, 5), n_bins: int = 15, eps: float = 1e-12):
+        self.num_classes = int(num_classes)
+        self.ks = tuple(int(k) for k in ks)
+        self.n_bins = int(n_bins)
+        self.eps = float(eps)
+
+        self.n = 0
+        self._hits = {k: 0 for k in self.ks}
+        self._rr_sum = 0.0
+        self._tp = np.zeros(self.num_classes, dtype=np.int64)
+        self._true_cnt = np.zeros(self.num_classes, dtype=np.int64)
+        self._pred_cnt = np.zeros(self.num_classes, dtype=np.int64)
+        self._entropy_sum = 0.0
+        self._conf_sum = 0.0
+        self._bins = np.linspace(0.0, 1.0, self.n_bins + 1)
+        self._bin_cnt = np.zeros(self.n_bins, dtype=np.float64)
+        self._bin_correct = np.zeros(self.n_bins, dtype=np.float64)
+        self._bin_conf = np.zeros(self.n_bins, dtype=np.float64)
+
+    def update(self, y_true: np.ndarray, proba: np.ndarray) -> None:
+        y = np.asarray(y_true).reshape(-1).astype(np.int64)
+        P = np.asarray(proba)
+        n = len(y)
+        if n == 0:
+            return
+        if P.shape != (n, self.num_classes):
+            raise ValueError(f"proba shape {P.shape} != ({n}, {self.num_classes})")
+
+        rows = np.arange(n)
+
+        # 1) 순위(비교 횟수)
+        rank = true_rank(y, P)
+        for k in self.ks:
+            self._hits[k] += int(np.count_nonzero(rank <= k))
+        self._rr_sum += float(np.sum(1.0 / rank))
+
+        # 2) confusion 누적(macro-F1)
+        y_pred = np.argmax(P, axis=1)
+        correct = y_pred == y
+        self._tp += np.bincount(y[correct], minlength=self.num_classes)
+        self._true_cnt += np.bincount(y, minlength=self.num_classes)
+        self._pred_cnt += np.bincount(y_pred, minlength=self.num_classes)
+
+        # 3) entropy / top1 confidence
+        Pc = np.clip(P, self.eps, 1.0)
+        self._entropy_sum += float(np.sum(-np.sum(Pc * np.log(Pc), axis=1)))
+        conf = P[rows, y_pred]
+        self._conf_sum += float(np.sum(conf))
+
+        # 4) ECE 구간 누적(마지막 구간만 오른쪽 닫힘)
+        valid = (conf >= 0.0) & (conf <= 1.0)
+        b = np.searchsorted(self._bins, conf[valid], side="right") - 1
+        b = np.minimum(b, self.n_bins - 1)
+        self._bin_cnt += np.bincount(b, minlength=self.n_bins)
+        self._bin_correct += np.bincount(b, weights=correct[valid].astype(np.float64), minlength=self.n_bins)
+        self._bin_conf += np.bincount(b, weights=conf[valid].astype(np.float64), minlength=self.n_bins)
+
+        self.n += n
+
+    def result(self) -> Dict[str, float]:
+        if self.n == 0:
+            raise ValueError("평가할 샘플이 없습니다.")
+        out: Dict[str, float] = {}
+        for k in self.ks:
+            out[f"hit@{k}"] = 1.0 if k >= self.num_classes else self._hits[k] / self.n
+        out["mrr"] = self._rr_sum / self.n
+
+        denom = self._true_cnt + self._pred_cnt
+        present = denom > 0
+        f1 = 2.0 * self._tp[present] / denom[present]
+        out["macro_f1"] = float(f1.mean()) if f1.size else 0.0
+
+        out["entropy_mean"] = self._entropy_sum / self.n
+        out["top1_conf_mean"] = self._conf_sum / self.n
+
+        nz = self._bin_cnt > 0
+        acc_bin = self._bin_correct[nz] / self._bin_cnt[nz]
+        conf_bin = self._bin_conf[nz] / self._bin_cnt[nz]
+        out["ece"] = float(np.sum((self._bin_cnt[nz] / self.n) * np.abs(acc_bin - conf_bin)))
+        return {k: float(v) for k, v in out.items()}
+
+
+def iter_predict_chunks(
+    predict_fn: Callable[[np.ndarray], np.ndarray],
+    X: np.ndarray,
+    chunk_size: int = 4096,
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """모델을 chunk_size 행씩 예측 → (시작 인덱스, proba 청크) 생성기."""
+    for start in range(0, len(X), chunk_size):
+        yield start, predict_fn(np.asarray(X[start:start + chunk_size]))
+
+
+def evaluate_streaming(
+    y_true: np.ndarray,
+    proba_chunks: Iterable[np.ndarray],
+    num_classes: int,
+    ks: Sequence[int] = (1, 3, 5),
+    n_bins: int = 15,
+) -> Dict[str, float]:
+    """y_true 순서대로 이어지는 proba 청크 iterable을 평가."""
+    y_true = np.asarray(y_true).reshape(-1)
+    ev = StreamingEvaluator(num_classes, ks=ks, n_bins=n_bins)
+    pos = 0
+    for P in proba_chunks:
+        n = len(P)
+        ev.update(y_true[pos:pos + n], P)
+        pos += n
+    if pos != len(y_true):
+        raise ValueError(f"proba 행 수({pos})가 y_true 길이({len(y_true)})와 다릅니다.")
+    return ev.result()
+
+
+def evaluate_model(
+    predict_fn: Callable[[np.ndarray], np.ndarray],
+    X: np.ndarray,
+    y_true: np.ndarray,
+    num_classes: int,
+    chunk_size: int = 4096,
+    ks: Sequence[int] = (1, 3, 5),
+    n_bins: int = 15,
+) -> Dict[str, float]:
+    """전체 proba 행렬을 만들지 않고 청크 단위로 예측하며 평가."""
+    return evaluate_streaming(
+        y_true, (P for _, P in iter_predict_chunks(predict_fn, X, chunk_size)), num_classes, ks=ks, n_bins=n_bins
+    )
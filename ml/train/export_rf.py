@@ -0,0 +1,128 @@
+"""
+RandomForest(sklearn) -> 배열 포맷 변환 (tools/rf_array_backend.py 서빙용, 예측 백엔드 이름 "rf_array")
+
+실행 예시(이미 학습된 rf_model.pkl 변환):
+python -m ml.train.export_rf --artifacts_dir ml/artifacts --top_n 16
+
+포맷(artifacts_dir/rf_array, 모두 .npy → np.load(mmap_mode="r")):
+- feature   (M,) int16   : 노드 분기 피처(리프는 0)
+- threshold (M,) float32 : x[feature] <= threshold 이면 왼쪽
+- left/right(M,) int32   : 자식의 전역 노드 번호(리프는 자기 자신 → 깊이만큼 돌려도 제자리)
+- leaf_id   (M,) int32   : 리프 행 번호(내부 노드는 -1)
+- roots     (T,) int32   : 트리별 루트 노드 번호
+- leaf_cls  (L, N) int16   : 리프별 상위 N개 클래스(label id)
+- leaf_prob (L, N) float16 : 리프별 상위 N개 클래스 비율
+- meta.json : 트리 수, 최대 깊이, top_n, 피처/클래스 수, 원본 pkl 정보(마지막에 기록)
+
+pickle 대비:
+- 리프마다 (클래스 수) 길이의 value 배열 대신 상위 N개만 float16 → 파일/메모리 크기 대폭 감소
+- 상위 N개 밖의 클래스 비율은 버림(트리 평균 후 행 단위 재정규화)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+ARRAY_DIRNAME = "rf_array"
+ARRAY_NAMES = ("feature", "threshold", "left", "right", "leaf_id", "roots", "leaf_cls", "leaf_prob")
+
+
+def export_forest(model, out_dir: Path, num_classes: int, top_n: int = 16, source: Path | None = None) -> Path:
+    """
+    학습된 sklearn RandomForestClassifier를 배열 포맷으로 저장.
+    - model.classes_ 는 정수 label id(= label_mapping.json 인덱스)라고 가정
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    model_classes = np.asarray(model.classes_).astype(np.int64)
+    top_n = int(min(top_n, len(model_classes)))
+
+    feats, thrs, lefts, rights, leaf_ids, roots = [], [], [], [], [], []
+    leaf_cls, leaf_prob = [], []
+    offset, n_leaves, max_depth = 0, 0, 0
+
+    for est in model.estimators_:
+        t = est.tree_
+        n = t.node_count
+        is_leaf = t.children_left < 0
+        idx = np.arange(n, dtype=np.int64)
+
+        roots.append(offset)
+        feats.append(np.where(is_leaf, 0, t.feature).astype(np.int16))
+        thrs.append(np.where(is_leaf, 0.0, t.threshold).astype(np.float32))
+        lefts.append((np.where(is_leaf, idx, t.children_left) + offset).astype(np.int32))
+        rights.append((np.where(is_leaf, idx, t.children_right) + offset).astype(np.int32))
+
+        lid = np.full(n, -1, dtype=np.int32)
+        lid[is_leaf] = np.arange(n_leaves, n_leaves + int(is_leaf.sum()), dtype=np.int32)
+        leaf_ids.append(lid)
+
+        # 리프 분포(버전에 따라 count 또는 비율) → 비율로 정규화 후 상위 N개
+        v = t.value[is_leaf, 0, :].astype(np.float64)
+        v = v / np.maximum(v.sum(axis=1, keepdims=True), 1e-12)
+        top = np.argpartition(v, -top_n, axis=1)[:, -top_n:]
+        leaf_cls.append(model_classes[top].astype(np.int16))
+        leaf_prob.append(np.take_along_axis(v, top, axis=1).astype(np.float16))
+
+        max_depth = max(max_depth, int(t.max_depth))
+        n_leaves += int(is_leaf.sum())
+        offset += n
+
+    arrays = {
+        "feature": np.concatenate(feats),
+        "threshold": np.concatenate(thrs),
+        "left": np.concatenate(lefts),
+        "right": np.concatenate(rights),
+        "leaf_id": np.concatenate(leaf_ids),
+        "roots": np.asarray(roots, dtype=np.int32),
+        "leaf_cls": np.concatenate(leaf_cls),
+        "leaf_prob": np.concatenate(leaf_prob),
+    }
+
+    meta_path = out_dir / "meta.json"
+    if meta_path.exists():
+        meta_path.unlink()
+    for name, arr in arrays.items():
+        tmp = out_dir / f"{name}.tmp.npy"
+        np.save(tmp, np.ascontiguousarray(arr))
+        os.replace(tmp, out_dir / f"{name}.npy")
+
+    meta = {
+        "model_type": "RandomForestArray",
+        "n_trees": len(roots),
+        "n_nodes": int(offset),
+        "n_leaves": int(n_leaves),
+        "max_depth": int(max_depth),
+        "top_n": top_n,
+        "num_features": int(model.n_features_in_),
+        "num_classes": int(num_classes),
+    }
+    if source is not None and Path(source).exists():
+        st = Path(source).stat()
+        meta.update({"source": Path(source).name, "source_size": int(st.st_size), "source_mtime_ns": int(st.st_mtime_ns)})
+    meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    return out_dir
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--artifacts_dir", default="ml/artifacts", help="rf_model.pkl / label_mapping.json 경로")
+    p.add_argument("--pkl", default="", help="변환할 pickle(기본: artifacts_dir/rf_model.pkl)")
+    p.add_argument("--top_n", type=int, default=16, help="리프별로 남길 상위 클래스 수")
+    return p
+
+
+if __name__ == "__main__":
+    import joblib
+
+    args = build_argparser().parse_args()
+    artifacts_dir = Path(args.artifacts_dir)
+    pkl = Path(args.pkl) if args.pkl else artifacts_dir / "rf_model.pkl"
+    classes = json.loads((artifacts_dir / "label_mapping.json").read_text(encoding="utf-8"))["classes"]
+
+    out = export_forest(joblib.load(pkl), artifacts_dir / ARRAY_DIRNAME, len(classes), top_n=args.top_n, source=pkl)
+    print(f"[saved] {out}")
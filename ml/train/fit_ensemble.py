@@ -0,0 +1,170 @@
+"""
+앙상블 구성 학습 스크립트 (tools/ensemble_backend.py, 예측 백엔드 이름 "ensemble")
+
+실행 예시:
+python -m ml.train.fit_ensemble --members xgb,logistic_np,nb,rf_array,catboost --deadline_ms 80
+(각 멤버는 미리 학습되어 artifacts_dir에 있어야 함. split은 run_all / train_* 가 만든 split_cache 사용)
+
+동작:
+1) 멤버별 temperature 보정: val split NLL을 최소로 하는 T (p' ∝ p^(1/T), 로그 격자 탐색)
+2) 가중치: 보정된 멤버 분포의 혼합 Σ w_i p'_i 의 val NLL 최소화(EM, 가중치는 합 1)
+3) test split 평가: 앙상블 / 단일 멤버 hit@k·MRR, 단일 행 지연 p50/p99
+   · 앙상블 정확도는 마감 없이(모든 멤버), 지연은 --deadline_ms 적용 상태로 측정
+
+산출물(artifacts_dir):
+- ensemble_config.json : 멤버 / 가중치 / temperature / deadline_ms
+- ensemble_report.json : 앙상블 vs 단일 모델 정확도·꼬리 지연, 마감 초과 통계
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from .split import load_split_cache
+from .eval_metrics import evaluate_model, inference_latency_ms, iter_predict_chunks
+
+from tools.ensemble_backend import CONFIG_FILENAME, DEFAULT_MEMBER_WORKERS, EnsembleBackend, calibrate
+from tools.predict_backends import create_backend
+
+TEMPERATURE_GRID = np.exp(np.linspace(np.log(0.25), np.log(8.0), 31))
+
+
+def fit_temperature(P: np.ndarray, y: np.ndarray, eps: float = 1e-12) -> tuple[float, np.ndarray]:
+    """val NLL 최소 temperature와 그 때의 정답 클래스 보정 확률 (N,)."""
+    logP = np.log(np.clip(P, eps, 1.0))
+    best_t, best_nll, best_pt = 1.0, np.inf, None
+    rows = np.arange(len(y))
+    for t in TEMPERATURE_GRID:
+        z = logP / t
+        z -= z.max(axis=1, keepdims=True)
+        log_norm = np.log(np.exp(z).sum(axis=1))
+        log_pt = z[rows, y] - log_norm
+        nll = float(-log_pt.mean())
+        if nll < best_nll:
+            best_t, best_nll, best_pt = float(t), nll, np.exp(log_pt)
+    return best_t, best_pt
+
+
+def fit_mixture_weights(p_true: np.ndarray, n_iter: int = 200, tol: float = 1e-7) -> np.ndarray:
+    """
+    p_true: (N, M) 멤버별 정답 클래스 보정 확률.
+    혼합 Σ w_i p_i 의 NLL을 최소화하는 w (EM: w_i ← mean_n w_i p_ni / Σ_j w_j p_nj).
+    """
+    M = p_true.shape[1]
+    w = np.full(M, 1.0 / M)
+    prev = np.inf
+    for _ in range(n_iter):
+        mix = np.maximum(p_true @ w, 1e-300)
+        nll = float(-np.log(mix).mean())
+        w = (p_true * w / mix[:, None]).mean(axis=0)
+        w /= w.sum()
+        if prev - nll < tol:
+            break
+        prev = nll
+    return w
+
+
+def run(args: argparse.Namespace) -> dict:
+    artifacts_dir = Path(args.artifacts_dir)
+    cache_dir = Path(args.cache_dir) if args.cache_dir else artifacts_dir / "split_cache"
+    split = load_split_cache(cache_dir, mmap=True)
+    names = [n.strip() for n in args.members.split(",") if n.strip()]
+    y_val = np.asarray(split.y_val)
+    if len(y_val) == 0:
+        raise ValueError("val split이 비어 있습니다(--val_size > 0 으로 split을 다시 만드세요).")
+
+    # 1) 멤버별 temperature + 정답 확률
+    members: List[dict] = []
+    backends = {}
+    p_true_cols = []
+    for name in names:
+        be = backends[name] = create_backend(name, artifacts_dir=artifacts_dir)
+        if be.classes != split.classes or be.feature_names != split.feature_names:
+            raise ValueError(f"{name}: split 캐시와 피처/클래스 순서가 다릅니다.")
+        t0 = time.time()
+        P_val = np.concatenate([P for _, P in iter_predict_chunks(be.predict_proba, split.X_val)], axis=0)
+        t, pt = fit_temperature(P_val, y_val)
+        del P_val
+        members.append({"name": name, "temperature": t})
+        p_true_cols.append(pt)
+        print(f"  {name}: temperature={t:.3f}, val_nll={float(-np.log(np.maximum(pt, 1e-12)).mean()):.4f} "
+              f"({time.time() - t0:.1f}s)")
+
+    # 2) 혼합 가중치(EM)
+    w = fit_mixture_weights(np.stack(p_true_cols, axis=1))
+    for m, wi in zip(members, w):
+        m["weight"] = float(wi)
+    print(">>> weights: " + ", ".join(f"{m['name']}={m['weight']:.3f}" for m in members))
+
+    # 3) test 평가
+    num_classes = len(split.classes)
+    X_test, y_test = split.X_test, split.y_test
+    report: Dict[str, dict] = {"single": {}}
+    for m in members:
+        be = backends[m["name"]]
+
+        def calibrated(x, _be=be, _t=m["temperature"]):
+            return calibrate(_be.predict_proba(x), _t)
+
+        report["single"][m["name"]] = {
+            **evaluate_model(calibrated, X_test, y_test, num_classes=num_classes),
+            **inference_latency_ms(calibrated, X_test, n_samples=args.n_samples),
+        }
+
+    ens = EnsembleBackend(artifacts_dir=artifacts_dir, members=members, deadline_ms=0.0,
+                          member_workers=args.member_workers).load()
+    report["ensemble"] = evaluate_model(ens.predict_proba, X_test, y_test, num_classes=num_classes)
+
+    # 지연: 마감 적용(실제 서빙 조건)
+    ens.deadline_ms = float(args.deadline_ms)
+    report["ensemble"].update(inference_latency_ms(ens.predict_proba, X_test, n_samples=args.n_samples))
+    report["ensemble"]["deadline_ms"] = float(args.deadline_ms)
+    report["ensemble"]["deadline_stats"] = dict(ens.stats)
+    ens.close()
+
+    best_single = max(report["single"].items(), key=lambda kv: kv[1]["hit@5"])
+    report["summary"] = {
+        "best_single": best_single[0],
+        "hit@5_gain": report["ensemble"]["hit@5"] - best_single[1]["hit@5"],
+        "mrr_gain": report["ensemble"]["mrr"] - best_single[1]["mrr"],
+        "p99_cost_ms": report["ensemble"]["infer_p99_ms"] - best_single[1]["infer_p99_ms"],
+    }
+
+    cfg = {
+        "members": members,
+        "deadline_ms": float(args.deadline_ms),
+        "member_workers": int(args.member_workers),
+        "fit": {"split": "val", "objective": "mixture_nll", "val_n": int(len(y_val))},
+        "metrics": {k: v for k, v in report["ensemble"].items() if k != "deadline_stats"},
+    }
+    (artifacts_dir / CONFIG_FILENAME).write_text(json.dumps(cfg, ensure_ascii=False, indent=2), encoding="utf-8")
+    (artifacts_dir / "ensemble_report.json").write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print("\n===== ENSEMBLE vs SINGLE =====")
+    print("model | hit@1 | hit@5 | mrr | p50_ms | p99_ms")
+    for name, m in [*report["single"].items(), ("ensemble", report["ensemble"])]:
+        print(f"{name} | {m['hit@1']:.4f} | {m['hit@5']:.4f} | {m['mrr']:.4f} | "
+              f"{m['infer_p50_ms']:.3f} | {m['infer_p99_ms']:.3f}")
+    print(f"\n[saved] {artifacts_dir / CONFIG_FILENAME}")
+    return report
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--artifacts_dir", default="ml/artifacts")
+    p.add_argument("--cache_dir", default="", help="split 캐시 경로(기본: artifacts_dir/split_cache)")
+    p.add_argument("--members", default="xgb,logistic_np,nb", help="쉼표 구분 예측 백엔드 이름")
+    p.add_argument("--deadline_ms", type=float, default=80.0, help="요청별 마감(0이면 모든 멤버를 기다림)")
+    p.add_argument("--member_workers", type=int, default=DEFAULT_MEMBER_WORKERS,
+                   help="멤버별 executor 스레드 수(동시 요청 수에 맞춤)")
+    p.add_argument("--n_samples", type=int, default=200, help="단일 행 지연 측정 횟수")
+    return p
+
+
+if __name__ == "__main__":
+    run(build_argparser().parse_args())
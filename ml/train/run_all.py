@@ -0,0 +1,218 @@
+"""
+여러 모델 일괄 학습 드라이버
+
+실행 예시:
+python -m ml.train.run_all --csv ml/train/Final_Augmented_dataset_Diseases_and_Symptoms.csv --models xgb,logistic,nb,rf --jobs 2
+python -m ml.train.run_all --csv ... --model_args "xgb=--max_depth 6 --eta 0.2"
+
+동작:
+- CSV는 드라이버에서 한 번만 파싱 → split_cache/*.npy 로 저장
+- 각 워커 프로세스는 np.load(mmap_mode="r")로 같은 페이지 캐시를 공유(모델마다 CSV 재파싱 X)
+- 모델별 학습은 ProcessPool에서 병렬 실행. 잡마다 스레드 예산(총 스레드 / 동시 잡 수)을 주어
+  XGBoost/CatBoost/RF/BLAS 스레드가 코어를 과다 구독하지 않게 한다.
+
+산출물(outdir):
+- 각 학습 스크립트의 기존 산출물(xgb_model.json, logistic_model.json, ...)
+- model_comparison.json / model_comparison.csv : 정확도, 학습 시간, 모델 크기, 추론 지연 비교표
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import multiprocessing as mp
+import os
+import shlex
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from importlib import import_module
+from pathlib import Path
+from typing import Dict, List
+
+# .split(numpy / pandas)은 함수 안에서 import: spawn 워커가 이 모듈을 불러올 때 numpy가 먼저 로드되면
+# _init_worker의 스레드 환경변수가 BLAS/OpenMP에 적용되지 않음
+
+
+# 모델명 -> 학습 모듈 / 스레드 인자 / 대표 모델 파일(크기 측정용)
+MODEL_SPECS: Dict[str, dict] = {
+    "xgb": {"module": "train_xgb", "thread_arg": "--nthread", "artifacts": ["xgb_model.json"]},
+    "catboost": {"module": "train_catboost", "thread_arg": "--thread_count", "artifacts": ["catboost_model.cbm"]},
+    "rf": {"module": "train_rf", "thread_arg": "--n_jobs", "artifacts": ["rf_model.pkl"]},
+    "logistic": {"module": "train_logistic", "thread_arg": None, "artifacts": ["logistic_model.json"]},
+    "nb": {"module": "train_nb", "thread_arg": None, "artifacts": ["nb_np/delta.npy", "nb_np/base.npy"]},
+}
+
+# BLAS/OpenMP 스레드 수를 제어하는 환경변수(워커 initializer에서 numpy 등 라이브러리 로드 전에 설정)
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "VECLIB_MAXIMUM_THREADS")
+
+COMPARISON_COLUMNS = [
+    "model", "status", "hit@1", "hit@5", "mrr", "macro_f1",
+    "train_time_sec", "wall_time_sec", "model_bytes", "infer_p50_ms", "infer_p99_ms", "threads",
+]
+
+
+def _init_worker(threads: int) -> None:
+    """ProcessPool initializer: 작업(=numpy import)보다 먼저 실행되어 스레드 환경변수가 실제로 적용됨."""
+    for var in _THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+
+
+def _run_job(model: str, csv_path: str, cache_dir: str, outdir: str, threads: int, extra_argv: List[str]) -> dict:
+    """워커 프로세스: 캐시된 split(memmap)으로 모델 하나를 학습하고 비교표 한 줄을 반환."""
+    from .split import load_split_cache
+
+    spec = MODEL_SPECS[model]
+    row = {"model": model, "threads": threads}
+    t0 = time.time()
+    try:
+        mod = import_module(f"{__package__}.{spec['module']}")
+        argv = ["--csv", csv_path, "--outdir", outdir, *extra_argv]
+        if spec["thread_arg"]:
+            argv += [spec["thread_arg"], str(threads)]
+        args = mod.build_argparser().parse_args(argv)
+
+        split = load_split_cache(cache_dir, mmap=True)
+        try:
+            from threadpoolctl import threadpool_limits  # sklearn 의존성으로 함께 설치됨
+        except ImportError:
+            threadpool_limits = None
+
+        if threadpool_limits is not None:
+            with threadpool_limits(limits=threads):
+                metrics = mod.train(args, split=split) or {}
+        else:
+            metrics = mod.train(args, split=split) or {}
+
+        row.update(metrics)
+        row["status"] = "ok"
+    except Exception as e:
+        row["status"] = f"error: {type(e).__name__}: {e}"
+        traceback.print_exc()
+    row["wall_time_sec"] = float(time.time() - t0)
+    row["model_bytes"] = int(sum(
+        (Path(outdir) / f).stat().st_size for f in spec["artifacts"] if (Path(outdir) / f).exists()
+    ))
+    return row
+
+
+def _parse_model_args(items: List[str]) -> Dict[str, List[str]]:
+    """--model_args "xgb=--max_depth 6" 형태를 {"xgb": ["--max_depth", "6"]}로 변환."""
+    out: Dict[str, List[str]] = {}
+    for item in items or []:
+        name, sep, rest = item.partition("=")
+        if not sep or name not in MODEL_SPECS:
+            raise ValueError(f"--model_args 형식 오류: {item!r} (예: \"xgb=--max_depth 6\")")
+        out.setdefault(name, []).extend(shlex.split(rest))
+    return out
+
+
+def _write_comparison(outdir: Path, rows: List[dict]) -> None:
+    (outdir / "model_comparison.json").write_text(json.dumps(rows, ensure_ascii=False, indent=2), encoding="utf-8")
+    with open(outdir / "model_comparison.csv", "w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=COMPARISON_COLUMNS, extrasaction="ignore")
+        w.writeheader()
+        for r in rows:
+            w.writerow(r)
+
+
+def _print_table(rows: List[dict]) -> None:
+    print("\n===== MODEL COMPARISON =====")
+    print(" | ".join(COMPARISON_COLUMNS))
+    for r in rows:
+        cells = []
+        for c in COMPARISON_COLUMNS:
+            v = r.get(c, "-")
+            cells.append(f"{v:.4f}" if isinstance(v, float) else str(v))
+        print(" | ".join(cells))
+
+
+def run(args: argparse.Namespace) -> List[dict]:
+    from .split import load_and_split_cached
+
+    outdir = Path(args.outdir)
+    outdir.mkdir(parents=True, exist_ok=True)
+
+    models = [m.strip() for m in args.models.split(",") if m.strip()]
+    unknown = [m for m in models if m not in MODEL_SPECS]
+    if unknown:
+        raise ValueError(f"알 수 없는 모델: {unknown} (가능: {sorted(MODEL_SPECS)})")
+    model_args = _parse_model_args(args.model_args)
+
+    # 1) split 한 번만 생성(또는 캐시 재사용)
+    cache_dir = Path(args.cache_dir) if args.cache_dir else outdir / "split_cache"
+    t0 = time.time()
+    load_and_split_cached(
+        csv_path=args.csv,
+        artifacts_dir=outdir,
+        cache_dir=cache_dir,
+        test_size=args.test_size,
+        val_size=args.val_size,
+        random_seed=args.seed,
+        min_count_per_class=args.min_count,
+        rare_label=args.rare_label,
+    )
+    print(f">>> split 준비 완료 ({time.time() - t0:.1f}s): {cache_dir}")
+
+    # 2) 스레드 예산
+    total_threads = args.threads if args.threads > 0 else (os.cpu_count() or 1)
+    jobs = max(1, min(args.jobs, len(models)))
+    per_job = max(1, total_threads // jobs)
+    print(f">>> 모델 {len(models)}개 / 동시 잡 {jobs}개 / 잡당 스레드 {per_job}")
+
+    common_argv = [
+        "--seed", str(args.seed),
+        "--test_size", str(args.test_size),
+        "--val_size", str(args.val_size),
+        "--min_count", str(args.min_count),
+        "--rare_label", args.rare_label,
+    ]
+
+    # 3) ProcessPool 학습 (spawn: 부모의 스레드 풀 상태를 물려받지 않도록)
+    rows: Dict[str, dict] = {}
+    ctx = mp.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=ctx, initializer=_init_worker, initargs=(per_job,)) as ex:
+        futs = {
+            ex.submit(
+                _run_job, m, str(args.csv), str(cache_dir), str(outdir), per_job,
+                common_argv + model_args.get(m, []),
+            ): m
+            for m in models
+        }
+        for fut in as_completed(futs):
+            m = futs[fut]
+            try:
+                rows[m] = fut.result()
+            except Exception as e:  # 워커 프로세스 자체가 죽은 경우
+                rows[m] = {"model": m, "status": f"error: {type(e).__name__}: {e}", "threads": per_job}
+            print(f">>> [{m}] {rows[m]['status']}")
+
+    ordered = [rows[m] for m in models]
+    _write_comparison(outdir, ordered)
+    _print_table(ordered)
+    print(f"\n[saved] {outdir / 'model_comparison.json'}")
+    return ordered
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--csv", required=True, help="학습 CSV 경로")
+    p.add_argument("--outdir", default="ml/artifacts", help="산출물 저장 경로")
+    p.add_argument("--cache_dir", default=None, help="split 캐시 경로(기본: outdir/split_cache)")
+    p.add_argument("--models", default="xgb,catboost,rf,logistic,nb", help="쉼표 구분 모델 목록")
+    p.add_argument("--jobs", type=int, default=2, help="동시에 학습할 모델 수(프로세스 수)")
+    p.add_argument("--threads", type=int, default=0, help="전체 스레드 예산(0이면 CPU 코어 수)")
+    p.add_argument("--model_args", action="append", default=[],
+                   help='모델별 추가 인자. 예: --model_args "xgb=--max_depth 6 --eta 0.2"')
+
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--test_size", type=float, default=0.20)
+    p.add_argument("--val_size", type=float, default=0.10)
+    p.add_argument("--min_count", type=int, default=10)
+    p.add_argument("--rare_label", default="__RARE__")
+    return p
+
+
+if __name__ == "__main__":
+    args = build_argparser().parse_args()
+    run(args)
@@ -0,0 +1,396 @@
+"""
+XGBoost 하이퍼파라미터 탐색 (CPU 전용, Successive Halving / Hyperband)
+
+실행 예시:
+python -m ml.train.search_xgb --csv ml/train/Final_Augmented_dataset_Diseases_and_Symptoms.csv --workers 4
+python -m ml.train.search_xgb --csv ... --mode sha --n_trials 27 --objective mrr --max_p99_ms 15
+
+동작:
+- split은 run_all과 같은 split_cache(memmap)를 재사용 → CSV 재파싱 없음
+- 각 trial은 ProcessPool 워커에서 학습(워커당 스레드 예산 = threads / workers)
+- 부스팅 라운드를 자원(budget)으로 하는 Successive Halving:
+    rung마다 상위 1/reduction 만 살아남고, 살아남은 trial은 이전 rung 체크포인트에서 이어서 학습(xgb_model=)
+- 목적함수: val split의 hit@5 / MRR (eval_metrics), --max_p99_ms 를 주면 단일 행 p99 지연 초과 trial은 탈락
+- trial 이력은 history.jsonl 에 한 줄씩 기록 → 같은 명령을 다시 실행하면 끝난 평가는 건너뛰고 재개
+  · 첫 줄은 설정 지문(split 캐시 키 / seed / symptom_drop_p / max_p99_ms / 탐색 공간 코드 해시)
+  · 지문이 다르면(인자를 바꿔 다시 실행) 재개하지 않고 에러 → --restart 로 이전 이력 / 체크포인트를 치우고 새로 시작
+- numpy / xgboost 는 함수 안에서 import: spawn 워커가 이 모듈을 불러올 때 _init_worker 의 스레드 환경변수가
+  라이브러리 로드보다 먼저 적용되도록(run_all 과 같은 방식)
+
+산출물(outdir):
+- search_xgb/history.jsonl        : trial 평가 이력
+- search_xgb/trial_XXXX.ubj       : trial별 체크포인트
+- train_config_search.json        : 최적 설정(train_config.json과 같은 형식)
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import inspect
+import json
+import math
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# numpy / xgboost / .split / .eval_metrics / .train_xgb 는 함수 안에서 import (모듈 docstring 참고)
+
+OBJECTIVES = ("hit@5", "mrr", "hit@5_mrr")
+
+# 워커 프로세스별 캐시(DMatrix는 워커마다 한 번만 생성)
+_WORKER: Dict[str, object] = {}
+
+
+# =========================
+# 탐색 공간
+# =========================
+def sample_params(trial_id: int, seed: int) -> dict:
+    """trial_id로 결정되는 샘플링(재개 시 같은 trial은 같은 설정)."""
+    import numpy as np
+
+    rng = np.random.RandomState(seed * 100003 + trial_id)
+    return {
+        "max_depth": int(rng.randint(4, 11)),
+        "eta": float(math.exp(rng.uniform(math.log(0.03), math.log(0.3)))),
+        "subsample": float(rng.uniform(0.6, 1.0)),
+        "colsample_bytree": float(rng.uniform(0.5, 1.0)),
+        "lambda": float(math.exp(rng.uniform(math.log(0.1), math.log(10.0)))),
+        "min_child_weight": float(math.exp(rng.uniform(math.log(1.0), math.log(20.0)))),
+        "max_bin": int(rng.choice([64, 128, 256])),
+    }
+
+
+def _full_params(space_params: dict, num_class: int, seed: int, nthread: int) -> dict:
+    """train_xgb.train과 같은 키 구성(CPU hist)."""
+    params = {
+        "objective": "multi:softprob",
+        "eval_metric": "mlogloss",
+        "num_class": num_class,
+        **space_params,
+        "seed": seed,
+        "tree_method": "hist",
+    }
+    if nthread > 0:
+        params["nthread"] = nthread
+    return params
+
+
+def _score(rec: dict, objective: str) -> float:
+    if not rec.get("feasible", True):
+        return float("-inf")
+    if objective == "hit@5_mrr":
+        return 0.5 * (rec["hit@5"] + rec["mrr"])
+    return float(rec[objective])
+
+
+# =========================
+# 워커
+# =========================
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "VECLIB_MAXIMUM_THREADS")
+
+
+def _init_worker(cache_dir: str, drop_p: float, seed: int, nthread: int) -> None:
+    """ProcessPool initializer: 스레드 환경변수를 먼저 설정한 뒤 numpy / xgboost 를 처음 import."""
+    for var in _THREAD_ENV_VARS:
+        os.environ[var] = str(max(1, nthread))
+    import numpy as np
+    import xgboost as xgb
+
+    from .split import load_split_cache
+    from .train_xgb import symptom_dropout
+
+    split = load_split_cache(cache_dir, mmap=True)
+    X_train = np.asarray(split.X_train)
+    if drop_p > 0:
+        X_train = symptom_dropout(X_train, drop_p=drop_p, seed=seed)
+    _WORKER.update(
+        dtrain=xgb.DMatrix(X_train, label=split.y_train, feature_names=split.feature_names),
+        X_val=split.X_val,
+        y_val=np.asarray(split.y_val),
+        feature_names=split.feature_names,
+        num_class=len(split.classes),
+        nthread=nthread,
+        seed=seed,
+    )
+
+
+def _evaluate(trial_id: int, space_params: dict, rounds: int, ckpt_path: str, max_p99_ms: float) -> dict:
+    """trial 하나를 rounds까지 학습(체크포인트가 있으면 이어서)하고 val 지표를 반환."""
+    import xgboost as xgb
+
+    from .eval_metrics import evaluate_model, inference_latency_ms
+
+    t0 = time.time()
+    params = _full_params(space_params, _WORKER["num_class"], _WORKER["seed"], _WORKER["nthread"])
+
+    prev = None
+    done = 0
+    ckpt = Path(ckpt_path)
+    if ckpt.exists():
+        prev = xgb.Booster()
+        prev.load_model(str(ckpt))
+        done = prev.num_boosted_rounds()
+        if done > rounds:
+            prev, done = None, 0
+
+    if rounds > done:
+        booster = xgb.train(params, _WORKER["dtrain"], num_boost_round=rounds - done, xgb_model=prev)
+        tmp = ckpt.with_suffix(".tmp.ubj")
+        booster.save_model(str(tmp))
+        os.replace(tmp, ckpt)
+    else:
+        booster = prev
+
+    feature_names = _WORKER["feature_names"]
+
+    def predict_fn(x):
+        return booster.predict(xgb.DMatrix(x, feature_names=feature_names))
+
+    m = evaluate_model(predict_fn, _WORKER["X_val"], _WORKER["y_val"], num_classes=_WORKER["num_class"])
+    rec = {
+        "trial_id": trial_id,
+        "rounds": int(rounds),
+        "params": space_params,
+        "hit@1": m["hit@1"],
+        "hit@5": m["hit@5"],
+        "mrr": m["mrr"],
+        "feasible": True,
+    }
+    if max_p99_ms > 0:
+        lat = inference_latency_ms(predict_fn, _WORKER["X_val"], n_samples=50)
+        rec.update(lat)
+        rec["feasible"] = lat["infer_p99_ms"] <= max_p99_ms
+    rec["eval_time_sec"] = float(time.time() - t0)
+    return rec
+
+
+# =========================
+# 이력(재개)
+# =========================
+def config_fingerprint(config: dict) -> str:
+    raw = json.dumps(config, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
+
+
+def _search_config(args: argparse.Namespace, split_cache_key: str) -> dict:
+    """trial 결과에 영향을 주는 설정(같으면 이력 / 체크포인트 재사용 가능)."""
+    return {
+        "split_cache_key": split_cache_key,  # CSV(경로/크기/수정시각) + test/val 비율 + seed + min_count + rare_label
+        "seed": int(args.seed),
+        "symptom_drop_p": float(args.symptom_drop_p),
+        "max_p99_ms": float(args.max_p99_ms),
+        "space": hashlib.sha1(inspect.getsource(sample_params).encode("utf-8")).hexdigest(),
+    }
+
+
+def _load_history(path: Path, fingerprint: str) -> Dict[Tuple[int, int], dict]:
+    """이력 로드. 첫 줄의 설정 지문이 fingerprint 와 다르면 ValueError(다른 설정의 결과를 재사용하지 않음)."""
+    hist: Dict[Tuple[int, int], dict] = {}
+    if not path.exists():
+        return hist
+    header_seen = False
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            rec = json.loads(line)
+        except json.JSONDecodeError:
+            continue  # 중단 시 잘린 마지막 줄
+        if not header_seen:
+            header_seen = True
+            if rec.get("config_fingerprint") != fingerprint:
+                raise ValueError(
+                    f"{path} 는 다른 설정(seed / split / symptom_drop_p / max_p99_ms / 탐색 공간)으로 만든 이력입니다 "
+                    f"(기록: {rec.get('config')}). 새로 시작하려면 --restart"
+                )
+            continue
+        hist[(int(rec["trial_id"]), int(rec["rounds"]))] = rec
+    return hist
+
+
+def _reset_history(search_dir: Path, history_path: Path, config: dict, fingerprint: str) -> None:
+    """이전 이력은 history.<시각>.jsonl 로 옮기고 trial 체크포인트는 삭제, 새 이력 첫 줄에 설정 지문 기록."""
+    if history_path.exists():
+        history_path.rename(search_dir / f"history.{time.strftime('%Y%m%d-%H%M%S')}.jsonl")
+    for ckpt in search_dir.glob("trial_*.ubj"):
+        ckpt.unlink()
+    _append_history(history_path, {"config_fingerprint": fingerprint, "config": config})
+
+
+def _append_history(path: Path, rec: dict) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+
+# =========================
+# Successive Halving / Hyperband
+# =========================
+def _brackets(args: argparse.Namespace) -> List[Tuple[int, int]]:
+    """(trial 수, 시작 rounds) 리스트."""
+    eta, r_min, R = args.reduction, args.min_rounds, args.max_rounds
+    if args.mode == "sha":
+        return [(args.n_trials, r_min)]
+    s_max = int(math.floor(math.log(R / r_min) / math.log(eta) + 1e-9))
+    out = []
+    for s in range(s_max, -1, -1):
+        n = int(math.ceil((s_max + 1) / (s + 1) * eta ** s))
+        r = max(r_min, int(round(R * eta ** (-s))))
+        out.append((n, r))
+    return out
+
+
+def search(args: argparse.Namespace) -> dict:
+    from .split import load_and_split_cached
+
+    outdir = Path(args.outdir)
+    search_dir = outdir / "search_xgb"
+    search_dir.mkdir(parents=True, exist_ok=True)
+    history_path = search_dir / "history.jsonl"
+
+    cache_dir = Path(args.cache_dir) if args.cache_dir else outdir / "split_cache"
+    split = load_and_split_cached(
+        csv_path=args.csv,
+        artifacts_dir=outdir,
+        cache_dir=cache_dir,
+        test_size=args.test_size,
+        val_size=args.val_size,
+        random_seed=args.seed,
+        min_count_per_class=args.min_count,
+        rare_label=args.rare_label,
+    )
+    num_class = len(split.classes)
+
+    split_meta = json.loads((cache_dir / "split_meta.json").read_text(encoding="utf-8"))
+    config = _search_config(args, split_meta.get("cache_key") or "")
+    fingerprint = config_fingerprint(config)
+    if args.restart or not history_path.exists():
+        _reset_history(search_dir, history_path, config, fingerprint)
+    history = _load_history(history_path, fingerprint)
+    if history:
+        print(f">>> 이력 {len(history)}건 로드 → 끝난 평가는 건너뜀")
+
+    total_threads = args.threads if args.threads > 0 else (os.cpu_count() or 1)
+    workers = max(1, args.workers)
+    nthread = max(1, total_threads // workers)
+
+    ctx = mp.get_context("spawn")
+    all_records: List[dict] = []
+    next_trial = 0
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(str(cache_dir), args.symptom_drop_p, args.seed, nthread),
+    ) as ex:
+        for b, (n, r0) in enumerate(_brackets(args)):
+            trial_ids = list(range(next_trial, next_trial + n))
+            next_trial += n
+            configs = {t: sample_params(t, args.seed) for t in trial_ids}
+            survivors = trial_ids
+            rounds = r0
+            rung = 0
+            print(f"\n===== bracket {b}: trials={n}, start_rounds={r0} =====")
+            while True:
+                results: Dict[int, dict] = {}
+                pending = {}
+                for t in survivors:
+                    if (t, rounds) in history:
+                        results[t] = history[(t, rounds)]
+                        continue
+                    ckpt = search_dir / f"trial_{t:04d}.ubj"
+                    pending[t] = ex.submit(_evaluate, t, configs[t], rounds, str(ckpt), args.max_p99_ms)
+                for t, fut in pending.items():
+                    rec = fut.result()
+                    rec.update({"bracket": b, "rung": rung})
+                    _append_history(history_path, rec)
+                    history[(t, rounds)] = rec
+                    results[t] = rec
+
+                ranked = sorted(survivors, key=lambda t: _score(results[t], args.objective), reverse=True)
+                best = results[ranked[0]]
+                print(f"  rung {rung} rounds={rounds}: {len(survivors)} trials, "
+                      f"best trial={best['trial_id']} {args.objective}={_score(best, args.objective):.4f}")
+                all_records.extend(results.values())
+
+                if rounds >= args.max_rounds or len(survivors) <= 1:
+                    break
+                survivors = ranked[: max(1, len(survivors) // args.reduction)]
+                rounds = min(args.max_rounds, rounds * args.reduction)
+                rung += 1
+
+    feasible = [r for r in all_records if r.get("feasible", True)]
+    if not feasible:
+        raise RuntimeError("지연 제약(--max_p99_ms)을 만족하는 trial이 없습니다.")
+    best = max(feasible, key=lambda r: (_score(r, args.objective), -r["rounds"]))
+
+    params = _full_params(best["params"], num_class, args.seed, 0)
+    cfg = {
+        "csv": str(Path(args.csv).resolve()),
+        "outdir": str(outdir.resolve()),
+        "params": params,
+        "num_boost_round": int(best["rounds"]),
+        "early_stopping_rounds": None,
+        "symptom_drop_p": args.symptom_drop_p,
+        "metrics": {
+            "split": "val",
+            "hit@1": best["hit@1"],
+            "hit@5": best["hit@5"],
+            "mrr": best["mrr"],
+            **({"infer_p99_ms": best["infer_p99_ms"]} if "infer_p99_ms" in best else {}),
+            "search_objective": args.objective,
+            "search_trial_id": int(best["trial_id"]),
+            "search_evaluations": len(history),
+        },
+    }
+    out_path = outdir / "train_config_search.json"
+    out_path.write_text(json.dumps(cfg, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    bp = best["params"]
+    print("\n===== BEST =====")
+    print(json.dumps(cfg["metrics"], ensure_ascii=False, indent=2))
+    print(
+        "재학습 명령:\n"
+        f"python -m ml.train.train_xgb --csv {args.csv} --outdir {args.outdir} "
+        f"--max_depth {bp['max_depth']} --eta {bp['eta']:.5g} --subsample {bp['subsample']:.4g} "
+        f"--colsample_bytree {bp['colsample_bytree']:.4g} --l2 {bp['lambda']:.5g} "
+        f"--min_child_weight {bp['min_child_weight']:.5g} --max_bin {bp['max_bin']} "
+        f"--num_boost_round {best['rounds']} --symptom_drop_p {args.symptom_drop_p}"
+    )
+    print(f"\n[saved] {out_path}")
+    return cfg
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--csv", required=True, help="학습 CSV 경로")
+    p.add_argument("--outdir", default="ml/artifacts", help="산출물 저장 경로")
+    p.add_argument("--cache_dir", default=None, help="split 캐시 경로(기본: outdir/split_cache)")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--test_size", type=float, default=0.20)
+    p.add_argument("--val_size", type=float, default=0.10)
+    p.add_argument("--min_count", type=int, default=10)
+    p.add_argument("--rare_label", type=str, default="__RARE__")
+    p.add_argument("--symptom_drop_p", type=float, default=0.10)
+
+    p.add_argument("--mode", choices=["hyperband", "sha"], default="hyperband")
+    p.add_argument("--n_trials", type=int, default=27, help="sha 모드의 초기 trial 수")
+    p.add_argument("--min_rounds", type=int, default=25, help="최소 부스팅 라운드(첫 rung)")
+    p.add_argument("--max_rounds", type=int, default=400, help="최대 부스팅 라운드")
+    p.add_argument("--reduction", type=int, default=3, help="rung마다 1/reduction 만 유지")
+
+    p.add_argument("--objective", choices=OBJECTIVES, default="hit@5")
+    p.add_argument("--max_p99_ms", type=float, default=0.0, help="단일 행 p99 지연 상한(ms). 0이면 제약 없음")
+
+    p.add_argument("--workers", type=int, default=2, help="동시 trial 프로세스 수")
+    p.add_argument("--threads", type=int, default=0, help="전체 스레드 예산(0이면 CPU 코어 수)")
+    p.add_argument("--restart", action="store_true", help="이전 이력 / 체크포인트를 치우고 새로 시작")
+    return p
+
+
+if __name__ == "__main__":
+    args = build_argparser().parse_args()
+    search(args)
@@ -8,15 +8,17 @@
 저장 산출물(artifacts):
 - label_mapping.json : classes(인덱스->라벨명), rare_label, min_count
 - feature_names.json : 피처명 리스트
+- split_cache/       : (선택) 분리 결과 .npy 캐시 → 여러 학습 프로세스가 memmap으로 공유
 """
 from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+import hashlib
 import json
 
 
@@ -82,6 +84,24 @@ def make_train_val_test(
     return final_train_idx, val_idx, test_idx
 
 
+def _compact_features(X_df: pd.DataFrame) -> pd.DataFrame:
+    """0/1 데이터면 uint8로 축소."""
+    vals = pd.unique(X_df.values.ravel())
+    ok01 = True
+    for v in vals[:1000]:
+        if pd.isna(v):
+            continue
+        try:
+            iv = int(v)
+        except Exception:
+            ok01 = False
+            break
+        if iv not in (0, 1):
+            ok01 = False
+            break
+    return X_df.astype(np.uint8 if ok01 else np.float32)
+
+
 def load_and_split(
     csv_path: str | Path,
     artifacts_dir: str | Path,
@@ -102,21 +122,7 @@ def load_and_split(
     y_raw = df["diseases"].astype(str)
     X_df = df.drop(columns=["diseases"])
 
-    # 0/1 데이터면 uint8로 축소
-    vals = pd.unique(X_df.values.ravel())
-    ok01 = True
-    for v in vals[:1000]:
-        if pd.isna(v):
-            continue
-        try:
-            iv = int(v)
-        except Exception:
-            ok01 = False
-            break
-        if iv not in (0, 1):
-            ok01 = False
-            break
-    X_df = X_df.astype(np.uint8 if ok01 else np.float32)
+    X_df = _compact_features(X_df)
 
     # 희귀 클래스 묶기
     vc = y_raw.value_counts()
@@ -139,15 +145,191 @@ def load_and_split(
         min_count_per_class=int(min_count_per_class),
     )
 
+    _write_split_artifacts(artifacts_dir, split)
+    return split
+
+
+def load_and_split_compatible(
+    csv_path: str | Path,
+    classes: List[str],
+    feature_names: List[str],
+    rare_label: str = "__RARE__",
+    min_count_per_class: int = 10,
+    test_size: float = 0.20,
+    val_size: float = 0.10,
+    random_seed: int = 42,
+    map_unknown_to_rare: bool = False,
+) -> SplitData:
+    """
+    기존 label_mapping.json / feature_names.json 기준으로 CSV를 읽어 분리한다(warm start용).
+    - 피처 집합이 다르면 ValueError (순서만 다르면 기존 순서로 재정렬)
+    - 기존 classes에 없는 라벨이 있으면 ValueError
+      (map_unknown_to_rare=True면 rare_label로 묶음 — 원래 학습에서 희귀 클래스였던 라벨용)
+    - 아티팩트 파일은 덮어쓰지 않는다(인덱스 호환 유지)
+    """
+    df = pd.read_csv(Path(csv_path))
+    if "diseases" not in df.columns:
+        raise ValueError("CSV에 'diseases' 컬럼이 필요합니다.")
+
+    y_raw = df["diseases"].astype(str)
+    X_df = df.drop(columns=["diseases"])
+
+    cols = set(X_df.columns)
+    missing = [f for f in feature_names if f not in cols]
+    extra = [c for c in X_df.columns if c not in set(feature_names)]
+    if missing or extra:
+        raise ValueError(
+            "피처 집합이 기존 feature_names.json과 다릅니다 → warm start 불가(전체 재학습 필요). "
+            f"누락 {len(missing)}개 {missing[:10]}, 추가 {len(extra)}개 {extra[:10]}"
+        )
+    X_df = _compact_features(X_df[list(feature_names)])
+
+    cls2id = {c: i for i, c in enumerate(classes)}
+    unknown = sorted(set(pd.unique(y_raw)) - set(cls2id))
+    if unknown:
+        if map_unknown_to_rare and rare_label in cls2id:
+            y_raw = y_raw.where(y_raw.isin(list(cls2id)), other=rare_label)
+        else:
+            raise ValueError(
+                "기존 label_mapping.json에 없는 라벨이 있습니다 → warm start 불가(전체 재학습 필요). "
+                f"{len(unknown)}개 {unknown[:10]} "
+                "(원래 희귀 클래스였다면 --map_unknown_to_rare 사용)"
+            )
+    y = np.array([cls2id[v] for v in y_raw], dtype=np.int32)
+
+    tr_idx, va_idx, te_idx = make_train_val_test(y, test_size=test_size, val_size=val_size, seed=random_seed)
+    X = X_df.values
+    return SplitData(
+        X_train=X[tr_idx], y_train=y[tr_idx],
+        X_val=X[va_idx], y_val=y[va_idx],
+        X_test=X[te_idx], y_test=y[te_idx],
+        feature_names=list(feature_names),
+        classes=list(classes),
+        rare_label=rare_label,
+        min_count_per_class=int(min_count_per_class),
+    )
+
+
+def _write_split_artifacts(artifacts_dir: Path, split: SplitData) -> None:
+    """label_mapping.json / feature_names.json 저장."""
     (artifacts_dir / "label_mapping.json").write_text(
         json.dumps(
-            {"classes": classes, "rare_label": rare_label, "min_count_per_class": int(min_count_per_class)},
+            {"classes": split.classes, "rare_label": split.rare_label, "min_count_per_class": int(split.min_count_per_class)},
             ensure_ascii=False, indent=2
         ),
         encoding="utf-8"
     )
     (artifacts_dir / "feature_names.json").write_text(
-        json.dumps({"feature_names": feature_names}, ensure_ascii=False, indent=2),
+        json.dumps({"feature_names": split.feature_names}, ensure_ascii=False, indent=2),
         encoding="utf-8"
     )
-    return split
+
+
+# =========================
+# split 캐시(.npy + memmap)
+# =========================
+SPLIT_ARRAYS = ("X_train", "y_train", "X_val", "y_val", "X_test", "y_test")
+
+
+def _split_cache_key(csv_path: Path, **split_params) -> str:
+    """CSV 파일(경로/크기/수정시각) + 분리 파라미터로 캐시 키 생성."""
+    st = csv_path.stat()
+    payload = {
+        "csv": str(csv_path.resolve()),
+        "size": int(st.st_size),
+        "mtime_ns": int(st.st_mtime_ns),
+        **split_params,
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
+
+
+def save_split_cache(split: SplitData, cache_dir: str | Path, cache_key: Optional[str] = None) -> Path:
+    """
+    SplitData를 cache_dir에 저장한다.
+    - 배열: <name>.npy (np.load(mmap_mode="r")로 프로세스 간 공유 가능)
+    - 메타: split_meta.json (feature_names/classes/rare_label/min_count/cache_key)
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for name in SPLIT_ARRAYS:
+        np.save(cache_dir / f"{name}.npy", np.ascontiguousarray(getattr(split, name)))
+    meta = {
+        "cache_key": cache_key,
+        "feature_names": list(split.feature_names),
+        "classes": list(split.classes),
+        "rare_label": split.rare_label,
+        "min_count_per_class": int(split.min_count_per_class),
+    }
+    # 메타는 마지막에 쓴다 → 메타가 있으면 배열 저장이 끝난 캐시
+    (cache_dir / "split_meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    return cache_dir
+
+
+def load_split_cache(cache_dir: str | Path, mmap: bool = True) -> SplitData:
+    """save_split_cache로 저장한 캐시 로드. mmap=True면 배열을 읽기 전용 memmap으로 연다."""
+    cache_dir = Path(cache_dir)
+    meta_path = cache_dir / "split_meta.json"
+    if not meta_path.exists():
+        raise FileNotFoundError(f"split 캐시를 찾을 수 없음: {cache_dir.resolve()}")
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    mode = "r" if mmap else None
+    arrays = {name: np.load(cache_dir / f"{name}.npy", mmap_mode=mode) for name in SPLIT_ARRAYS}
+    return SplitData(
+        **arrays,
+        feature_names=list(meta["feature_names"]),
+        classes=list(meta["classes"]),
+        rare_label=str(meta["rare_label"]),
+        min_count_per_class=int(meta["min_count_per_class"]),
+    )
+
+
+def load_and_split_cached(
+    csv_path: str | Path,
+    artifacts_dir: str | Path,
+    cache_dir: str | Path | None = None,
+    test_size: float = 0.20,
+    val_size: float = 0.10,
+    random_seed: int = 42,
+    min_count_per_class: int = 10,
+    rare_label: str = "__RARE__",
+    mmap: bool = True,
+) -> SplitData:
+    """
+    load_and_split + 디스크 캐시.
+    - CSV/파라미터가 같으면 CSV를 다시 파싱하지 않고 캐시(memmap)를 반환
+    - cache_dir 기본값: artifacts_dir/split_cache
+    """
+    csv_path = Path(csv_path)
+    artifacts_dir = Path(artifacts_dir)
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
+    cache_dir = Path(cache_dir) if cache_dir is not None else artifacts_dir / "split_cache"
+
+    key = _split_cache_key(
+        csv_path,
+        test_size=test_size,
+        val_size=val_size,
+        random_seed=random_seed,
+        min_count_per_class=int(min_count_per_class),
+        rare_label=rare_label,
+    )
+    meta_path = cache_dir / "split_meta.json"
+    if meta_path.exists():
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("cache_key") == key:
+            split = load_split_cache(cache_dir, mmap=mmap)
+            _write_split_artifacts(artifacts_dir, split)
+            return split
+        meta_path.unlink()
+
+    split = load_and_split(
+        csv_path=csv_path,
+        artifacts_dir=artifacts_dir,
+        test_size=test_size,
+        val_size=val_size,
+        random_seed=random_seed,
+        min_count_per_class=min_count_per_class,
+        rare_label=rare_label,
+    )
+    save_split_cache(split, cache_dir, cache_key=key)
+    return load_split_cache(cache_dir, mmap=mmap) if mmap else split
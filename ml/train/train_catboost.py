@@ -10,6 +10,7 @@ CatBoost 학습 스크립트
 from __future__ import annotations
 
 import argparse
+import dataclasses
 import json
 import time
 from pathlib import Path
@@ -18,8 +19,8 @@ import numpy as np
 import pandas as pd
 from catboost import CatBoostClassifier, Pool
 
-from .split import load_and_split
-from .eval_metrics import hit_at_k, mrr, macro_f1, entropy_of_prediction, mean_top1_confidence
+from .split import SplitData, load_and_split
+from .eval_metrics import evaluate_model, inference_latency_ms
 
 def _detect_catboost_gpu() -> bool:
     """CUDA 기반 CatBoost GPU 사용 가능 여부를 최대한 안전하게 감지."""
@@ -32,31 +33,47 @@ def _detect_catboost_gpu() -> bool:
 
 
 
-def train(args: argparse.Namespace) -> None:
+def _fillna_split(split: SplitData) -> SplitData:
+    """공유 split(run_all 캐시)에도 CSV 경로와 같은 NaN→0 정제를 적용(memmap은 읽기 전용이라 NaN이 있을 때만 복사)."""
+    fixed = {}
+    for name in ("X_train", "X_val", "X_test"):
+        X = getattr(split, name)
+        if np.issubdtype(X.dtype, np.floating) and np.isnan(X).any():
+            fixed[name] = np.nan_to_num(X, nan=0.0)
+    if fixed:
+        n_nan = sum(int(np.isnan(getattr(split, k)).sum()) for k in fixed)
+        print(f">>> 공유 split에서 NaN 데이터 발견 ({n_nan}개). 자동 정제 중...")
+        split = dataclasses.replace(split, **fixed)
+    return split
+
+
+def train(args: argparse.Namespace, split: SplitData | None = None) -> dict:
+    """split을 넘기면 CSV 파싱을 건너뛴다(run_all 드라이버에서 공유 split 사용, NaN 정제는 동일하게 적용)."""
     outdir = Path(args.outdir)
     outdir.mkdir(parents=True, exist_ok=True)
 
-   
-    raw_df = pd.read_csv(args.csv)
-    if raw_df.isna().sum().sum() > 0:
-        print(f">>> NaN 데이터 발견 ({raw_df.isna().sum().sum()}개). 자동 정제 중...")
-        raw_df = raw_df.fillna(0)
-        clean_csv = Path(args.csv).parent / "temp_clean_dataset.csv"
-        raw_df.to_csv(clean_csv, index=False)
-        target_csv = str(clean_csv)
+    if split is None:
+        raw_df = pd.read_csv(args.csv)
+        if raw_df.isna().sum().sum() > 0:
+            print(f">>> NaN 데이터 발견 ({raw_df.isna().sum().sum()}개). 자동 정제 중...")
+            raw_df = raw_df.fillna(0)
+            clean_csv = Path(args.csv).parent / "temp_clean_dataset.csv"
+            raw_df.to_csv(clean_csv, index=False)
+            target_csv = str(clean_csv)
+        else:
+            target_csv = args.csv
+
+        split = load_and_split(
+            csv_path=target_csv,
+            artifacts_dir=outdir,
+            test_size=args.test_size,
+            val_size=args.val_size,
+            random_seed=args.seed,
+            min_count_per_class=args.min_count,
+            rare_label=args.rare_label,
+        )
     else:
-        target_csv = args.csv
-
-   
-    split = load_and_split(
-        csv_path=target_csv,
-        artifacts_dir=outdir,
-        test_size=args.test_size,
-        val_size=args.val_size,
-        random_seed=args.seed,
-        min_count_per_class=args.min_count,
-        rare_label=args.rare_label,
-    )
+        split = _fillna_split(split)
 
 
     params = {
@@ -68,6 +85,8 @@ def train(args: argparse.Namespace) -> None:
         "verbose": 50,
         "allow_writing_files": False 
     }
+    if args.thread_count > 0:
+        params["thread_count"] = args.thread_count
     
     # GPU 사용 정책
     # - 기본: GPU가 있으면 자동으로 GPU 사용
@@ -121,19 +140,11 @@ def train(args: argparse.Namespace) -> None:
 
 
     print("지표 계산 중")
-    proba_test = model.predict_proba(split.X_test)
-    y_pred = np.argmax(proba_test, axis=1)
-
     metrics = {
-        "hit@1": hit_at_k(split.y_test, proba_test, k=1),
-        "hit@3": hit_at_k(split.y_test, proba_test, k=3),
-        "hit@5": hit_at_k(split.y_test, proba_test, k=5),
-        "mrr": mrr(split.y_test, proba_test),
-        "macro_f1": macro_f1(split.y_test, y_pred),
-        "entropy_mean": float(entropy_of_prediction(proba_test).mean()),
-        "top1_conf_mean": mean_top1_confidence(proba_test),
+        **evaluate_model(model.predict_proba, split.X_test, split.y_test, num_classes=len(split.classes)),
         "train_time_sec": float(train_time)
     }
+    metrics.update(inference_latency_ms(model.predict_proba, split.X_test))
 
     print("\n===== CATBOOST 결과 =====")
     for k, v in metrics.items():
@@ -187,6 +198,7 @@ def train(args: argparse.Namespace) -> None:
     (outdir / "train_config_catboost.json").write_text(json.dumps(cfg, indent=2), encoding="utf-8")
     
     print(f"\n[Saved] 3개의 산출물이 {outdir}에 생성되었습니다.")
+    return metrics
 
 
 def build_argparser() -> argparse.ArgumentParser:
@@ -203,6 +215,7 @@ def build_argparser() -> argparse.ArgumentParser:
     p.add_argument("--iterations", type=int, default=500)
     p.add_argument("--depth", type=int, default=6)
     p.add_argument("--lr", type=float, default=0.1)
+    p.add_argument("--thread_count", type=int, default=-1, help="학습 스레드 수(-1이면 CatBoost 기본값)")
 
     # GPU 관련 옵션
     # - 기본 동작: GPU가 있으면 자동으로 GPU 사용
@@ -0,0 +1,230 @@
+"""
+계층형(2단계) 질병 분류기 학습 스크립트
+
+실행 예시:
+python -m ml.train.train_hier --csv ml/train/Final_Augmented_dataset_Diseases_and_Symptoms.csv --n_clusters 40
+
+구조:
+- 클래스별 증상 프로파일(학습 데이터에서 클래스별 피처 평균)을 KMeans로 묶어 질병 클러스터 생성
+- 1단계: 증상 -> 클러스터(약 30~60개) XGBoost softprob
+- 2단계: 클러스터별 XGBoost softprob(클러스터 안의 질병만 분류)
+- 추론: 상위 top_clusters 개 클러스터의 2단계 모델만 실행, p(질병) = p(클러스터) * p(질병 | 클러스터)
+  → 요청당 678 클래스 전체 트리 대신 (클러스터 수 + 상위 클러스터 내부 클래스 수) 만큼의 트리만 평가
+
+산출물(ml/artifacts/hier):
+- hier_meta.json     : 클러스터 -> 클래스 인덱스, 학습 파라미터, 지표
+- stage1.ubj         : 1단계 부스터
+- cluster_XXX.ubj    : 2단계 부스터(클래스가 2개 이상인 클러스터만)
+- hier_report.json   : hit@5 / 지연 비교(현재 flat xgb_model.json 대비)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import xgboost as xgb
+
+from .split import load_and_split_cached
+from .eval_metrics import evaluate_model, inference_latency_ms
+from .train_xgb import symptom_dropout
+
+
+def class_profiles(X: np.ndarray, y: np.ndarray, num_classes: int, chunk: int = 20000) -> np.ndarray:
+    """클래스별 피처 평균(C, F). 청크 단위 누적으로 float 복사본을 한 번에 만들지 않는다."""
+    F = X.shape[1]
+    sums = np.zeros((num_classes, F), dtype=np.float64)
+    for s in range(0, len(X), chunk):
+        np.add.at(sums, np.asarray(y[s:s + chunk]), np.asarray(X[s:s + chunk], dtype=np.float64))
+    counts = np.bincount(np.asarray(y), minlength=num_classes).astype(np.float64)
+    return sums / np.maximum(counts, 1.0)[:, None]
+
+
+def cluster_classes(profiles: np.ndarray, n_clusters: int, seed: int) -> List[List[int]]:
+    """L2 정규화한 프로파일을 KMeans로 묶어 클러스터별 클래스 인덱스 리스트 반환(빈 클러스터 제거)."""
+    from sklearn.cluster import KMeans
+
+    norm = np.linalg.norm(profiles, axis=1, keepdims=True)
+    Z = profiles / np.maximum(norm, 1e-12)
+    km = KMeans(n_clusters=n_clusters, n_init=10, random_state=seed)
+    assign = km.fit_predict(Z)
+    clusters = [sorted(np.where(assign == c)[0].tolist()) for c in range(n_clusters)]
+    return [c for c in clusters if c]
+
+
+def _xgb_params(args: argparse.Namespace, num_class: int) -> dict:
+    params = {
+        "objective": "multi:softprob",
+        "eval_metric": "mlogloss",
+        "num_class": num_class,
+        "max_depth": args.max_depth,
+        "eta": args.eta,
+        "subsample": args.subsample,
+        "colsample_bytree": args.colsample_bytree,
+        "min_child_weight": args.min_child_weight,
+        "seed": args.seed,
+        "tree_method": "hist",
+    }
+    if args.nthread > 0:
+        params["nthread"] = args.nthread
+    return params
+
+
+def _fit(params: dict, X_tr, y_tr, X_va, y_va, feature_names, args) -> xgb.Booster:
+    dtrain = xgb.DMatrix(X_tr, label=y_tr, feature_names=feature_names)
+    if len(y_va) > 0:
+        dval = xgb.DMatrix(X_va, label=y_va, feature_names=feature_names)
+        return xgb.train(
+            params, dtrain,
+            num_boost_round=args.num_boost_round,
+            evals=[(dval, "val")],
+            early_stopping_rounds=args.early_stopping_rounds,
+            verbose_eval=False,
+        )
+    return xgb.train(params, dtrain, num_boost_round=min(args.num_boost_round, 200))
+
+
+def train(args: argparse.Namespace) -> dict:
+    outdir = Path(args.outdir)
+    hier_dir = outdir / "hier"
+    hier_dir.mkdir(parents=True, exist_ok=True)
+
+    split = load_and_split_cached(
+        csv_path=args.csv,
+        artifacts_dir=outdir,
+        test_size=args.test_size,
+        val_size=args.val_size,
+        random_seed=args.seed,
+        min_count_per_class=args.min_count,
+        rare_label=args.rare_label,
+    )
+    num_classes = len(split.classes)
+    fn = split.feature_names
+
+    # 1) 클래스 프로파일 -> 클러스터
+    t0 = time.time()
+    profiles = class_profiles(split.X_train, split.y_train, num_classes)
+    clusters = cluster_classes(profiles, args.n_clusters, args.seed)
+    cluster_of = np.empty(num_classes, dtype=np.int32)
+    for ci, members in enumerate(clusters):
+        cluster_of[members] = ci
+    sizes = [len(c) for c in clusters]
+    print(f">>> 클러스터 {len(clusters)}개 (크기 min={min(sizes)}, max={max(sizes)}, mean={np.mean(sizes):.1f})")
+
+    X_train = np.asarray(split.X_train)
+    if args.symptom_drop_p > 0:
+        X_train = symptom_dropout(X_train, drop_p=args.symptom_drop_p, seed=args.seed)
+    y_train = np.asarray(split.y_train)
+    X_val, y_val = np.asarray(split.X_val), np.asarray(split.y_val)
+
+    # 2) 1단계: 클러스터 분류
+    stage1 = _fit(
+        _xgb_params(args, len(clusters)),
+        X_train, cluster_of[y_train], X_val, cluster_of[y_val], fn, args,
+    )
+    stage1.save_model(str(hier_dir / "stage1.ubj"))
+    print(f">>> stage1 완료: {stage1.num_boosted_rounds()} rounds")
+
+    # 3) 2단계: 클러스터별 분류
+    stage2_rounds = {}
+    for ci, members in enumerate(clusters):
+        if len(members) < 2:
+            continue
+        local = np.full(num_classes, -1, dtype=np.int32)
+        local[members] = np.arange(len(members), dtype=np.int32)
+        tr = local[y_train] >= 0
+        va = local[y_val] >= 0
+        booster = _fit(
+            _xgb_params(args, len(members)),
+            X_train[tr], local[y_train[tr]],
+            X_val[va], local[y_val[va]],
+            fn, args,
+        )
+        booster.save_model(str(hier_dir / f"cluster_{ci:03d}.ubj"))
+        stage2_rounds[ci] = booster.num_boosted_rounds()
+        print(f"  cluster {ci:03d}: classes={len(members)}, rounds={stage2_rounds[ci]}")
+    train_time = time.time() - t0
+
+    meta = {
+        "model_type": "HierarchicalXGB",
+        "num_classes": num_classes,
+        "clusters": clusters,
+        "top_clusters": args.top_clusters,
+        "stage1_rounds": int(stage1.num_boosted_rounds()),
+        "stage2_rounds": {str(k): int(v) for k, v in stage2_rounds.items()},
+        "params": vars(args),
+        "train_time_sec": float(train_time),
+    }
+    (hier_dir / "hier_meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    # 4) 평가: 서빙 코드(tools.hier_backend)로 hit@5/지연 측정 + 현재 flat 모델과 비교
+    from tools.hier_backend import HierarchicalPredictor
+
+    hier = HierarchicalPredictor(model_dir=hier_dir, top_clusters=args.top_clusters, artifacts_dir=outdir)
+    hier.load()
+    report = {
+        "hierarchical": {
+            **evaluate_model(hier.predict_proba, split.X_test, split.y_test, num_classes=num_classes),
+            **inference_latency_ms(hier.predict_proba, split.X_test),
+            "trees_per_request_max": hier.max_trees_per_request(),
+        }
+    }
+    flat_path = outdir / "xgb_model.json"
+    if flat_path.exists() and not args.skip_flat:
+        flat = xgb.Booster()
+        flat.load_model(str(flat_path))
+
+        def flat_predict(x):
+            return flat.predict(xgb.DMatrix(x, feature_names=fn))
+
+        report["flat"] = {
+            **evaluate_model(flat_predict, split.X_test, split.y_test, num_classes=num_classes),
+            **inference_latency_ms(flat_predict, split.X_test),
+            "trees_per_request_max": int(flat.num_boosted_rounds() * num_classes),
+        }
+
+    meta["metrics"] = report["hierarchical"]
+    (hier_dir / "hier_meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    (hier_dir / "hier_report.json").write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print("\n===== HIERARCHICAL vs FLAT =====")
+    print("model | hit@1 | hit@5 | mrr | p50_ms | p99_ms | trees/request")
+    for name, m in report.items():
+        print(f"{name} | {m['hit@1']:.4f} | {m['hit@5']:.4f} | {m['mrr']:.4f} | "
+              f"{m['infer_p50_ms']:.3f} | {m['infer_p99_ms']:.3f} | {m['trees_per_request_max']}")
+    print(f"\n[saved] {hier_dir}")
+    return report
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--csv", required=True, help="학습 CSV 경로")
+    p.add_argument("--outdir", default="ml/artifacts", help="산출물 저장 경로(모델은 outdir/hier)")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--nthread", type=int, default=0)
+    p.add_argument("--test_size", type=float, default=0.20)
+    p.add_argument("--val_size", type=float, default=0.10)
+    p.add_argument("--min_count", type=int, default=10)
+    p.add_argument("--rare_label", type=str, default="__RARE__")
+
+    p.add_argument("--n_clusters", type=int, default=40, help="질병 클러스터 수(권장 30~60)")
+    p.add_argument("--top_clusters", type=int, default=3, help="추론 시 2단계를 실행할 상위 클러스터 수")
+
+    p.add_argument("--max_depth", type=int, default=6)
+    p.add_argument("--eta", type=float, default=0.15)
+    p.add_argument("--subsample", type=float, default=0.9)
+    p.add_argument("--colsample_bytree", type=float, default=0.8)
+    p.add_argument("--min_child_weight", type=float, default=3.0)
+    p.add_argument("--num_boost_round", type=int, default=1000)
+    p.add_argument("--early_stopping_rounds", type=int, default=30)
+    p.add_argument("--symptom_drop_p", type=float, default=0.10)
+    p.add_argument("--skip_flat", action="store_true", help="flat xgb_model.json 비교 생략")
+    return p
+
+
+if __name__ == "__main__":
+    args = build_argparser().parse_args()
+    train(args)
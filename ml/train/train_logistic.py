@@ -1,5 +1,7 @@
 # 실행 명령어
 # python -m ml.train.train_logistic --csv ml/train/Final_Augmented_dataset_Diseases_and_Symptoms.csv
+from __future__ import annotations
+
 import argparse
 import json
 import time
@@ -9,22 +11,24 @@ import numpy as np
 
 from sklearn.linear_model import LogisticRegression
 
-from .split import load_and_split
-from .eval_metrics import hit_at_k, mrr, macro_f1, entropy_of_prediction, mean_top1_confidence
+from .split import SplitData, load_and_split
+from .eval_metrics import evaluate_model, inference_latency_ms
 
-def train(args: argparse.Namespace) -> None:
+def train(args: argparse.Namespace, split: SplitData | None = None) -> dict:
+    """split을 넘기면 CSV 파싱을 건너뛴다(run_all 드라이버에서 공유 split 사용)."""
     outdir = Path(args.outdir)
     outdir.mkdir(parents=True, exist_ok=True)
 
-    split = load_and_split(
-        csv_path=args.csv,
-        artifacts_dir=outdir,
-        test_size=args.test_size,
-        val_size=args.val_size,
-        random_seed=args.seed,
-        min_count_per_class=args.min_count,
-        rare_label=args.rare_label,
-    )
+    if split is None:
+        split = load_and_split(
+            csv_path=args.csv,
+            artifacts_dir=outdir,
+            test_size=args.test_size,
+            val_size=args.val_size,
+            random_seed=args.seed,
+            min_count_per_class=args.min_count,
+            rare_label=args.rare_label,
+        )
 
     model = LogisticRegression(
         C=args.C,
@@ -37,19 +41,11 @@ def train(args: argparse.Namespace) -> None:
     model.fit(split.X_train, split.y_train)
     train_time = time.time() - t0
 
-    proba_test = model.predict_proba(split.X_test)
-    y_pred = model.predict(split.X_test)
-
     metrics = {
-        "hit@1": hit_at_k(split.y_test, proba_test, k=1),
-        "hit@3": hit_at_k(split.y_test, proba_test, k=3),
-        "hit@5": hit_at_k(split.y_test, proba_test, k=5),
-        "mrr": mrr(split.y_test, proba_test),
-        "macro_f1": macro_f1(split.y_test, y_pred),
-        "entropy_mean": float(entropy_of_prediction(proba_test).mean()),
-        "top1_conf_mean": mean_top1_confidence(proba_test),
+        **evaluate_model(model.predict_proba, split.X_test, split.y_test, num_classes=len(split.classes)),
         "train_time_sec": float(train_time)
     }
+    metrics.update(inference_latency_ms(model.predict_proba, split.X_test))
 
     print("\n===== LOGISTIC REGRESSION 결과 =====")
     for k, v in metrics.items():
@@ -86,6 +82,7 @@ def train(args: argparse.Namespace) -> None:
     }
     (outdir / "train_config_logistic.json").write_text(json.dumps(cfg, indent=2), encoding="utf-8")
     print(f"\n[Saved] {model_json_path}")
+    return metrics
 
 
 def build_argparser() -> argparse.ArgumentParser:
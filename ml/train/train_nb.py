@@ -3,11 +3,20 @@
 
 """
 Bernoulli Naive Bayes 학습
+
+산출물(outdir):
+- nb_model.json : 파라미터 / 지표
+- nb_np/        : 서빙용 배열(tools/nb_backend.py, 예측 백엔드 이름 "nb")
+  · delta.npy (F, C) float32 = log p(f=1|c) - log p(f=0|c)
+  · base.npy  (C,)   float32 = log p(c) + Σ_f log p(f=0|c)   (증상이 하나도 없을 때의 점수)
+  · meta.json        : 피처/클래스 수, binarize 임계값
+  → 점수 = base + Σ_{활성 f} delta[f]  (BernoulliNB joint log-likelihood와 동일)
 """
 from __future__ import annotations
 
 import argparse
 import json
+import os
 import time
 from pathlib import Path
 
@@ -16,24 +25,66 @@ import pandas as pd
 from sklearn.naive_bayes import BernoulliNB
 
 
-from split import load_and_split
-from eval_metrics import hit_at_k, mean_top1_confidence
+try:
+    from .split import SplitData, load_and_split
+    from .eval_metrics import evaluate_model, inference_latency_ms
+except ImportError:  # python ml/train/train_nb.py 처럼 스크립트로 직접 실행한 경우
+    from split import SplitData, load_and_split
+    from eval_metrics import evaluate_model, inference_latency_ms
+
+
+def export_nb_arrays(model: BernoulliNB, out_dir: Path, num_classes: int) -> Path:
+    """
+    feature_log_prob_ / class_log_prior_ 를 서빙용 (delta, base) 배열로 변환해 저장.
+    - 열 순서는 label id(= label_mapping.json 의 classes 인덱스)
+    - 학습에 등장하지 않은 라벨은 base=-inf (확률 0)
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    flp = np.asarray(model.feature_log_prob_, dtype=np.float64)  # (C_seen, F) = log p(f=1|c)
+    neg = np.log1p(-np.exp(flp))                                  # log p(f=0|c)
+    cols = np.asarray(model.classes_).astype(np.int64)
+
+    delta = np.zeros((flp.shape[1], num_classes), dtype=np.float32)
+    delta[:, cols] = (flp - neg).T
+    base = np.full(num_classes, -np.inf, dtype=np.float32)
+    base[cols] = model.class_log_prior_ + neg.sum(axis=1)
+
+    meta_path = out_dir / "meta.json"
+    if meta_path.exists():
+        meta_path.unlink()
+    # 서빙 프로세스가 mmap 중인 파일을 덮어쓰지 않도록 임시 파일에 쓰고 교체
+    for name, arr in (("delta", delta), ("base", base)):
+        tmp = out_dir / f"{name}.tmp.npy"
+        np.save(tmp, arr)
+        os.replace(tmp, out_dir / f"{name}.npy")
+    meta = {
+        "model_type": "BernoulliNB",
+        "num_features": int(delta.shape[0]),
+        "num_classes": int(num_classes),
+        "binarize": model.binarize,
+        "dtype": "float32",
+    }
+    meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    return out_dir
 
 
-def train(args: argparse.Namespace) -> None:
+def train(args: argparse.Namespace, split: SplitData | None = None) -> dict:
+    """split을 넘기면 CSV 파싱을 건너뛴다(run_all 드라이버에서 공유 split 사용)."""
     outdir = Path(args.outdir)
     outdir.mkdir(parents=True, exist_ok=True)
 
-   
-    split = load_and_split(
-        csv_path=args.csv,
-        artifacts_dir=outdir,
-        test_size=args.test_size,
-        val_size=args.val_size,
-        random_seed=args.seed,
-        min_count_per_class=args.min_count,
-        rare_label=args.rare_label,
-    )
+    if split is None:
+        split = load_and_split(
+            csv_path=args.csv,
+            artifacts_dir=outdir,
+            test_size=args.test_size,
+            val_size=args.val_size,
+            random_seed=args.seed,
+            min_count_per_class=args.min_count,
+            rare_label=args.rare_label,
+        )
 
     
     X_train = np.nan_to_num(split.X_train, nan=0.0)
@@ -48,17 +99,13 @@ def train(args: argparse.Namespace) -> None:
 
     
     print("지표 계산 중")
-    proba_test = model.predict_proba(X_test)
-
     metrics = {
-        "hit@1": hit_at_k(split.y_test, proba_test, k=1),
-        "hit@3": hit_at_k(split.y_test, proba_test, k=3),
-        "hit@5": hit_at_k(split.y_test, proba_test, k=5),
-        "top1_conf_mean": mean_top1_confidence(proba_test),
+        **evaluate_model(model.predict_proba, X_test, split.y_test, num_classes=len(split.classes)),
         "train_time_sec": float(train_time),
         "num_classes": int(len(split.classes)),
         "test_n": int(len(split.y_test)),
     }
+    metrics.update(inference_latency_ms(model.predict_proba, X_test))
 
     print("\n===== NB TEST METRICS =====")
     for k, v in metrics.items():
@@ -73,8 +120,12 @@ def train(args: argparse.Namespace) -> None:
     }
     with open(model_path, "w", encoding="utf-8") as f:
         json.dump(cfg, f, ensure_ascii=False, indent=2)
-    
+
+    nb_dir = export_nb_arrays(model, outdir / "nb_np", num_classes=len(split.classes))
+
     print(f"\n[saved] {model_path}")
+    print(f"[saved] {nb_dir}")
+    return metrics
 
 def build_argparser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser()
@@ -26,8 +26,9 @@ import joblib
 import pandas as pd
 from sklearn.preprocessing import LabelEncoder
 
-from .split import load_and_split
-from .eval_metrics import hit_at_k, mrr, macro_f1, entropy_of_prediction, mean_top1_confidence
+from .split import SplitData, load_and_split
+from .eval_metrics import evaluate_model, inference_latency_ms
+from .export_rf import ARRAY_DIRNAME, export_forest
 
 
 def _gpu_device_count() -> int:
@@ -59,16 +60,19 @@ def _to_numpy(x):
     return np.asarray(x)
 
 
-def train(args: argparse.Namespace) -> None:
+def train(args: argparse.Namespace, split: SplitData | None = None) -> dict:
     outdir = Path(args.outdir)
     outdir.mkdir(parents=True, exist_ok=True)
 
     # -----------------------------
     # Split 로딩 정책
+    # - split 인자를 주면: 그대로 사용(run_all 드라이버에서 공유 split)
     # - --split 을 주면: 해당 split JSON(학습/평가 공통)을 그대로 사용
     # - 없으면: 기존 방식(load_and_split)로 새로 생성
     # -----------------------------
-    if args.split is not None:
+    if split is not None:
+        pass
+    elif args.split is not None:
         sp = json.loads(Path(args.split).read_text(encoding="utf-8"))
 
         # split 파일이 가진 설정을 우선 사용(학습/평가 일치 보장)
@@ -199,7 +203,6 @@ def train(args: argparse.Namespace) -> None:
             y_train = cp.asarray(np.asarray(split.y_train))
             X_val = cp.asarray(np.asarray(split.X_val))
             y_val = cp.asarray(np.asarray(split.y_val))
-            X_test = cp.asarray(np.asarray(split.X_test))
 
             # cuML은 sklearn과 파라미터 지원 범위가 다를 수 있어 최소한으로 전달
             model = cuRF(**common_kwargs)
@@ -209,10 +212,11 @@ def train(args: argparse.Namespace) -> None:
 
             train_time = time.time() - t0
 
-            print("지표 계산 중")
-            # cuML: predict/predict_proba 결과가 cupy일 수 있음
-            proba_test = _to_numpy(model.predict_proba(X_test))
-            y_pred = _to_numpy(model.predict(X_test))
+            # cuML: predict_proba 결과가 cupy일 수 있음
+            def _cuml_predict_proba(x, _model=model):
+                return _to_numpy(_model.predict_proba(cp.asarray(np.asarray(x))))
+
+            predict_fn = _cuml_predict_proba
 
         except Exception as e:
             # 자동 모드에서만 폴백
@@ -232,22 +236,18 @@ def train(args: argparse.Namespace) -> None:
         model.fit(split.X_train, split.y_train)
         train_time = time.time() - t0
 
-        print("지표 계산 중")
-        proba_test = model.predict_proba(split.X_test)
-        y_pred = model.predict(split.X_test)
+        predict_fn = model.predict_proba
 
     # ---------- 메트릭 ----------
+    # test 전체 proba를 만들지 않고 청크 단위로 예측하며 평가
+    print("지표 계산 중")
     metrics = {
         "backend": backend,
-        "hit@1": hit_at_k(split.y_test, proba_test, k=1),
-        "hit@3": hit_at_k(split.y_test, proba_test, k=3),
-        "hit@5": hit_at_k(split.y_test, proba_test, k=5),
-        "mrr": mrr(split.y_test, proba_test),
-        "macro_f1": macro_f1(split.y_test, y_pred),
-        "entropy_mean": float(entropy_of_prediction(proba_test).mean()),
-        "top1_conf_mean": mean_top1_confidence(proba_test),
+        **evaluate_model(predict_fn, split.X_test, split.y_test, num_classes=len(split.classes)),
         "train_time_sec": float(train_time),
     }
+    if backend == "sklearn":
+        metrics.update(inference_latency_ms(model.predict_proba, split.X_test))
 
     print("\n===== RANDOM FOREST 결과 =====")
     for k, v in metrics.items():
@@ -275,6 +275,11 @@ def train(args: argparse.Namespace) -> None:
     # - cuml: 환경에 따라 직렬화가 실패할 수 있어 try/except
     if backend == "sklearn":
         joblib.dump(model, outdir / "rf_model.pkl")
+        # 서빙용 배열 포맷(tools/rf_array_backend.py, 예측 백엔드 "rf_array")
+        if args.array_top_n > 0:
+            export_forest(
+                model, outdir / ARRAY_DIRNAME, len(split.classes), top_n=args.array_top_n, source=outdir / "rf_model.pkl",
+            )
     else:
         try:
             joblib.dump(model, outdir / "rf_model_cuml.pkl")
@@ -306,6 +311,7 @@ def train(args: argparse.Namespace) -> None:
     (outdir / "train_config_rf.json").write_text(json.dumps(cfg, indent=2), encoding="utf-8")
 
     print(f"\n[Saved] 산출물이 {outdir}에 생성되었습니다.")
+    return metrics
 
 
 def build_argparser() -> argparse.ArgumentParser:
@@ -329,6 +335,7 @@ def build_argparser() -> argparse.ArgumentParser:
     p.add_argument("--no_bootstrap", action="store_true")
     p.add_argument("--class_weight", default="balanced_subsample")
     p.add_argument("--n_jobs", type=int, default=-1)
+    p.add_argument("--array_top_n", type=int, default=16, help="rf_array 내보내기 시 리프별 상위 클래스 수(0이면 생략)")
 
     # GPU 관련 옵션
     p.add_argument("--gpu", action="store_true", help="GPU 강제(cuML 필요). 실패 시 에러")
@@ -4,24 +4,49 @@ XGBoost 학습 스크립트 (GPU 지원)
 실행 예시:
 python -m ml.train.train_xgb --csv Final_Augmented_dataset_Diseases_and_Symptoms.csv --outdir ml/artifacts --gpu
 
+Warm start(기존 부스터에 라운드 추가):
+python -m ml.train.train_xgb --csv new_or_combined.csv --init_model ml/artifacts/xgb_model.json --num_boost_round 100
+- label_mapping.json / feature_names.json 은 init_model 폴더(--artifacts_ref)의 것을 그대로 사용
+- 클래스/피처 집합이 바뀌면 에러로 중단(전체 재학습 필요)
+
+체크포인트/재개:
+python -m ml.train.train_xgb --csv ... --checkpoint_every 25            # 25 라운드마다 저장
+python -m ml.train.train_xgb --csv ... --checkpoint_every 25 --resume   # 중단된 지점부터 이어서
+- 체크포인트 상태(xgb_checkpoint_state.json)에 목표 라운드 / 파라미터 / 데이터 지문을 기록
+  → --resume 시 이번 실행과 다르면(다른 데이터 / 파라미터 / 라운드) 에러로 중단
+
 산출물(ml/artifacts):
 - xgb_model.json
+- xgb_model.ubj (같은 모델의 UBJSON, 서빙 로드용)
 - label_mapping.json
 - feature_names.json
 - train_config.json
+- warm_start_report.json (warm start 시: 기존 모델 / warm start 지표 비교,
+  --full_retrain_ref 를 주면 같은 split으로 처음부터 학습한 기준 모델 지표도 함께)
 """
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import os
 import time
 from pathlib import Path
+from typing import Optional
 
 import numpy as np
 import xgboost as xgb
 
-from split import load_and_split
-from eval_metrics import hit_at_k, mrr, macro_f1, entropy_of_prediction, mean_top1_confidence
+try:
+    from .split import SplitData, load_and_split, load_and_split_compatible
+    from .eval_metrics import evaluate_model, inference_latency_ms
+except ImportError:  # python ml/train/train_xgb.py 처럼 스크립트로 직접 실행한 경우
+    from split import SplitData, load_and_split, load_and_split_compatible
+    from eval_metrics import evaluate_model, inference_latency_ms
+
+
+CHECKPOINT_NAME = "xgb_checkpoint.ubj"
+CHECKPOINT_STATE_NAME = "xgb_checkpoint_state.json"
 
 
 def symptom_dropout(X: np.ndarray, drop_p: float = 0.10, seed: int = 42) -> np.ndarray:
@@ -33,19 +58,133 @@ def symptom_dropout(X: np.ndarray, drop_p: float = 0.10, seed: int = 42) -> np.n
     return X2
 
 
-def train(args: argparse.Namespace) -> None:
+class CheckpointCallback(xgb.callback.TrainingCallback):
+    """every 라운드마다 부스터를 checkpoint_dir에 원자적으로 저장(중단 시 --resume으로 재개)."""
+
+    def __init__(self, checkpoint_dir: Path, every: int, target_rounds: int, run_state: Optional[dict] = None):
+        super().__init__()
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.every = int(every)
+        self.target_rounds = int(target_rounds)
+        self.run_state = dict(run_state or {})  # 재개 검증용(파라미터 / 데이터 지문 등)
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+    def after_iteration(self, model, epoch, evals_log) -> bool:
+        rounds = model.num_boosted_rounds()
+        if rounds % self.every == 0:
+            path = self.checkpoint_dir / CHECKPOINT_NAME
+            tmp = self.checkpoint_dir / f"tmp_{CHECKPOINT_NAME}"
+            model.save_model(str(tmp))
+            os.replace(tmp, path)
+            state = {**self.run_state, "rounds": int(rounds), "target_rounds": self.target_rounds, "saved_at": time.time()}
+            (self.checkpoint_dir / CHECKPOINT_STATE_NAME).write_text(json.dumps(state), encoding="utf-8")
+        return False
+
+
+def _load_json(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def split_fingerprint(split: SplitData) -> str:
+    """피처 / 클래스 / 배열 크기 / 라벨 배열 내용의 sha1(같은 데이터 · 같은 split 인지 확인용)."""
+    h = hashlib.sha1()
+    h.update(json.dumps([list(split.feature_names), list(split.classes)], ensure_ascii=False).encode("utf-8"))
+    for name in ("X_train", "y_train", "X_val", "y_val"):
+        h.update(f"{name}:{np.shape(getattr(split, name))}".encode("utf-8"))
+    for name in ("y_train", "y_val"):
+        h.update(np.ascontiguousarray(getattr(split, name)).tobytes())
+    return h.hexdigest()
+
+
+def _check_resume_state(state: dict, expected: dict, source: str) -> None:
+    """체크포인트 상태가 이번 실행과 같은 목표 라운드 / 파라미터 / 데이터인지. 다르면 ValueError."""
+    diff = [k for k in sorted(expected) if state.get(k) != expected[k]]
+    if diff:
+        raise ValueError(
+            f"{source}: 체크포인트가 다른 실행의 것입니다(다른 항목: {', '.join(diff)}) "
+            "→ --resume 없이 새로 학습하거나 --checkpoint_dir 를 바꾸세요"
+        )
+
+
+def _booster_num_class(booster: xgb.Booster) -> int:
+    cfg = json.loads(booster.save_config())
+    return int(cfg["learner"]["learner_model_param"]["num_class"])
+
+
+def _check_booster_compatible(booster: xgb.Booster, split: SplitData, source: str) -> None:
+    """기존 부스터의 클래스 수/피처가 split과 맞는지 확인(다르면 warm start 거부)."""
+    if booster.num_features() != len(split.feature_names):
+        raise ValueError(
+            f"{source}: 피처 수 불일치(model={booster.num_features()}, data={len(split.feature_names)}) "
+            "→ warm start 불가(전체 재학습 필요)"
+        )
+    if booster.feature_names is not None and list(booster.feature_names) != list(split.feature_names):
+        raise ValueError(f"{source}: feature_names 순서/이름이 feature_names.json과 다릅니다 → warm start 불가")
+    n_cls = _booster_num_class(booster)
+    if n_cls != len(split.classes):
+        raise ValueError(
+            f"{source}: 클래스 수 불일치(model={n_cls}, label_mapping={len(split.classes)}) "
+            "→ warm start 불가(전체 재학습 필요)"
+        )
+
+
+def evaluate_booster(booster: xgb.Booster, split: SplitData, chunk_size: int = 4096) -> dict:
+    """test 지표(hit@k/MRR/macro-F1/entropy/confidence/ECE). test 전체 proba를 만들지 않고 청크 단위로 평가."""
+    return evaluate_model(
+        lambda x: booster.predict(xgb.DMatrix(x, feature_names=split.feature_names)),
+        split.X_test, split.y_test, num_classes=len(split.classes), chunk_size=chunk_size,
+    )
+
+
+def train(args: argparse.Namespace, split: SplitData | None = None) -> dict:
+    """split을 넘기면 CSV 파싱을 건너뛴다(run_all 드라이버에서 공유 split 사용)."""
     outdir = Path(args.outdir)
     outdir.mkdir(parents=True, exist_ok=True)
 
-    split = load_and_split(
-        csv_path=args.csv,
-        artifacts_dir=outdir,
-        test_size=args.test_size,
-        val_size=args.val_size,
-        random_seed=args.seed,
-        min_count_per_class=args.min_count,
-        rare_label=args.rare_label,
-    )
+    # -----------------------------
+    # warm start: 기존 아티팩트 기준으로 split 구성
+    # -----------------------------
+    init_booster: Optional[xgb.Booster] = None
+    if args.init_model:
+        init_path = Path(args.init_model)
+        ref_dir = Path(args.artifacts_ref) if args.artifacts_ref else init_path.parent
+        feat = _load_json(ref_dir / "feature_names.json")
+        lab = _load_json(ref_dir / "label_mapping.json")
+
+        if split is None:
+            split = load_and_split_compatible(
+                csv_path=args.csv,
+                classes=list(lab["classes"]),
+                feature_names=list(feat["feature_names"]),
+                rare_label=lab.get("rare_label", args.rare_label),
+                min_count_per_class=int(lab.get("min_count_per_class", args.min_count)),
+                test_size=args.test_size,
+                val_size=args.val_size,
+                random_seed=args.seed,
+                map_unknown_to_rare=args.map_unknown_to_rare,
+            )
+        elif list(split.classes) != list(lab["classes"]) or list(split.feature_names) != list(feat["feature_names"]):
+            raise ValueError("전달된 split의 classes/feature_names가 기존 아티팩트와 다릅니다 → warm start 불가")
+
+        init_booster = xgb.Booster()
+        init_booster.load_model(str(init_path))
+        _check_booster_compatible(init_booster, split, str(init_path))
+
+        # 다른 폴더에 저장하면 매핑 파일도 함께 복사(서빙 시 인덱스 호환 유지)
+        if ref_dir.resolve() != outdir.resolve():
+            (outdir / "label_mapping.json").write_text(json.dumps(lab, ensure_ascii=False, indent=2), encoding="utf-8")
+            (outdir / "feature_names.json").write_text(json.dumps(feat, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if split is None:
+        split = load_and_split(
+            csv_path=args.csv,
+            artifacts_dir=outdir,
+            test_size=args.test_size,
+            val_size=args.val_size,
+            random_seed=args.seed,
+            min_count_per_class=args.min_count,
+            rare_label=args.rare_label,
+        )
 
     num_classes = len(split.classes)
 
@@ -55,7 +194,6 @@ def train(args: argparse.Namespace) -> None:
 
     dtrain = xgb.DMatrix(X_train, label=split.y_train, feature_names=split.feature_names)
     dval   = xgb.DMatrix(split.X_val, label=split.y_val, feature_names=split.feature_names)
-    dtest  = xgb.DMatrix(split.X_test, label=split.y_test, feature_names=split.feature_names)
 
     params = {
         "objective": "multi:softprob",
@@ -70,6 +208,8 @@ def train(args: argparse.Namespace) -> None:
         "max_bin": args.max_bin,
         "seed": args.seed,
     }
+    if args.nthread > 0:
+        params["nthread"] = args.nthread
 
     if args.gpu:
         params.update({"tree_method": "hist", "device": "cuda"})
@@ -78,37 +218,74 @@ def train(args: argparse.Namespace) -> None:
 
     watchlist = [(dtrain, "train"), (dval, "val")]
 
+    # -----------------------------
+    # 시작 부스터 / 목표 라운드 / 체크포인트
+    # -----------------------------
+    base_rounds = init_booster.num_boosted_rounds() if init_booster is not None else 0
+    target_rounds = base_rounds + args.num_boost_round
+    start_booster = init_booster
+
+    checkpoint_dir = Path(args.checkpoint_dir) if args.checkpoint_dir else outdir / "checkpoints"
+    ckpt_path = checkpoint_dir / CHECKPOINT_NAME
+    # 재개 검증용 상태(스레드 수는 결과와 무관하므로 제외)
+    run_state = {
+        "target_rounds": int(target_rounds),
+        "params": {k: v for k, v in params.items() if k != "nthread"},
+        "data": split_fingerprint(split),
+        "symptom_drop_p": float(args.symptom_drop_p),
+        "init_model": str(Path(args.init_model).resolve()) if args.init_model else None,
+    }
+    if args.resume and ckpt_path.exists():
+        state_path = checkpoint_dir / CHECKPOINT_STATE_NAME
+        state = _load_json(state_path) if state_path.exists() else {}
+        _check_resume_state(state, run_state, str(ckpt_path))
+        ckpt = xgb.Booster()
+        ckpt.load_model(str(ckpt_path))
+        _check_booster_compatible(ckpt, split, str(ckpt_path))
+        done = ckpt.num_boosted_rounds()
+        if base_rounds <= done < target_rounds:
+            print(f">>> 체크포인트에서 재개: {done}/{target_rounds} 라운드")
+            start_booster = ckpt
+        else:
+            print(f">>> 체크포인트({done} 라운드)가 이번 실행 범위와 맞지 않아 무시합니다.")
+    resumed_rounds = start_booster.num_boosted_rounds() if start_booster is not None else 0
+
+    callbacks = []
+    if args.checkpoint_every > 0:
+        callbacks.append(CheckpointCallback(checkpoint_dir, args.checkpoint_every, target_rounds, run_state=run_state))
+
+    base_metrics = None
+    if init_booster is not None:
+        base_metrics = evaluate_booster(init_booster, split)
+
     t0 = time.time()
     booster = xgb.train(
         params=params,
         dtrain=dtrain,
-        num_boost_round=args.num_boost_round,
+        num_boost_round=target_rounds - resumed_rounds,
         evals=watchlist,
         early_stopping_rounds=args.early_stopping_rounds,
         verbose_eval=args.verbose_eval,
+        xgb_model=start_booster,
+        callbacks=callbacks or None,
     )
     train_time = time.time() - t0
 
     # test 평가
-    proba_test = booster.predict(dtest)
-    y_pred = np.argmax(proba_test, axis=1)
-
     metrics = {
         "best_iteration": int(booster.best_iteration) if booster.best_iteration is not None else None,
         "best_score": float(booster.best_score) if booster.best_score is not None else None,
-        "hit@1": hit_at_k(split.y_test, proba_test, k=1),
-        "hit@3": hit_at_k(split.y_test, proba_test, k=3),
-        "hit@5": hit_at_k(split.y_test, proba_test, k=5),
-        "mrr": mrr(split.y_test, proba_test),
-        "macro_f1": macro_f1(split.y_test, y_pred),
-        "entropy_mean": float(entropy_of_prediction(proba_test).mean()),
-        "top1_conf_mean": mean_top1_confidence(proba_test),
+        **evaluate_booster(booster, split),
         "train_time_sec": float(train_time),
         "num_classes": int(num_classes),
         "train_n": int(len(split.y_train)),
         "val_n": int(len(split.y_val)),
         "test_n": int(len(split.y_test)),
     }
+    metrics.update(inference_latency_ms(
+        lambda x: booster.predict(xgb.DMatrix(x, feature_names=split.feature_names)),
+        split.X_test,
+    ))
 
     print("\n===== TEST METRICS =====")
     for k, v in metrics.items():
@@ -116,6 +293,8 @@ def train(args: argparse.Namespace) -> None:
 
     model_path = outdir / "xgb_model.json"
     booster.save_model(str(model_path))
+    # 서빙 로드용 바이너리(UBJSON). json 다음에 저장 → 수정시각이 같거나 더 새것이라 서빙에서 ubj 사용
+    booster.save_model(str(outdir / "xgb_model.ubj"))
 
     cfg = {
         "csv": str(Path(args.csv).resolve()),
@@ -126,8 +305,48 @@ def train(args: argparse.Namespace) -> None:
         "symptom_drop_p": args.symptom_drop_p,
         "metrics": metrics,
     }
+
+    if init_booster is not None:
+        # 전체 재학습 기준값은 반드시 같은 split으로 새로 학습해 평가(이전 train_config 지표는 다른 split이라 비교 불가)
+        full_ref = None
+        if args.full_retrain_ref:
+            print(f"\n>>> 같은 split으로 전체 재학습 기준 모델 학습({target_rounds} 라운드)")
+            t0 = time.time()
+            ref_booster = xgb.train(
+                params=params,
+                dtrain=dtrain,
+                num_boost_round=target_rounds,
+                evals=watchlist,
+                early_stopping_rounds=args.early_stopping_rounds,
+                verbose_eval=args.verbose_eval,
+            )
+            ref_train_time = time.time() - t0
+            full_ref = {**evaluate_booster(ref_booster, split), "train_time_sec": float(ref_train_time)}
+        cfg.update({
+            "mode": "warm_start",
+            "init_model": str(Path(args.init_model).resolve()),
+            "base_rounds": int(base_rounds),
+            "total_rounds": int(booster.num_boosted_rounds()),
+            "full_retrain_reference": full_ref,
+        })
+        report = {
+            "base_model": base_metrics,
+            "warm_start": metrics,
+            "full_retrain_reference": full_ref,
+        }
+        (outdir / "warm_start_report.json").write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+        print("\n===== WARM START vs FULL RETRAIN =====")
+        print("metric | base_model | warm_start | full_retrain(same split)")
+        for k in ("hit@1", "hit@5", "mrr", "macro_f1", "train_time_sec"):
+            cells = [report[c].get(k) if report[c] else None for c in ("base_model", "warm_start", "full_retrain_reference")]
+            print(f"{k} | " + " | ".join("-" if v is None else f"{v:.4f}" for v in cells))
+    else:
+        cfg["mode"] = "full"
+
     (outdir / "train_config.json").write_text(json.dumps(cfg, ensure_ascii=False, indent=2), encoding="utf-8")
     print(f"\n[saved] {model_path}")
+    return metrics
 
 
 def build_argparser() -> argparse.ArgumentParser:
@@ -136,6 +355,7 @@ def build_argparser() -> argparse.ArgumentParser:
     p.add_argument("--outdir", default="ml/artifacts", help="산출물 저장 경로")
     p.add_argument("--gpu", action="store_true", help="GPU 사용(device=cuda)")
     p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--nthread", type=int, default=0, help="학습 스레드 수(0이면 XGBoost 기본값)")
 
     p.add_argument("--test_size", type=float, default=0.20)
     p.add_argument("--val_size", type=float, default=0.10)
@@ -151,11 +371,23 @@ def build_argparser() -> argparse.ArgumentParser:
     p.add_argument("--min_child_weight", type=float, default=5.0)
     p.add_argument("--max_bin", type=int, default=256)
 
-    p.add_argument("--num_boost_round", type=int, default=2000)
+    p.add_argument("--num_boost_round", type=int, default=2000, help="(warm start 시) 추가할 라운드 수")
     p.add_argument("--early_stopping_rounds", type=int, default=50)
     p.add_argument("--verbose_eval", type=int, default=50)
 
     p.add_argument("--symptom_drop_p", type=float, default=0.10, help="학습 입력 증상 드랍 비율(0이면 비활성)")
+
+    # warm start
+    p.add_argument("--init_model", default=None, help="이어서 학습할 기존 부스터(xgb_model.json)")
+    p.add_argument("--artifacts_ref", default=None, help="기존 label_mapping/feature_names 폴더(기본: init_model 폴더)")
+    p.add_argument("--map_unknown_to_rare", action="store_true", help="기존 classes에 없는 라벨을 rare_label로 묶음")
+    p.add_argument("--full_retrain_ref", action="store_true",
+                   help="warm start 비교용으로 같은 split에서 처음부터 재학습한 기준 모델도 평가(학습 시간 추가)")
+
+    # 체크포인트
+    p.add_argument("--checkpoint_every", type=int, default=0, help="N 라운드마다 체크포인트 저장(0이면 비활성)")
+    p.add_argument("--checkpoint_dir", default=None, help="체크포인트 경로(기본: outdir/checkpoints)")
+    p.add_argument("--resume", action="store_true", help="체크포인트가 있으면 이어서 학습")
     return p
 
 
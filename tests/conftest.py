@@ -0,0 +1,48 @@
+import json
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def write_mappings():
+    """artifacts_dir 에 feature_names.json / label_mapping.json 을 쓰는 헬퍼(백엔드 공통 매핑)."""
+
+    def _write(artifacts_dir: Path, num_features: int, num_classes: int) -> Path:
+        artifacts_dir = Path(artifacts_dir)
+        artifacts_dir.mkdir(parents=True, exist_ok=True)
+        (artifacts_dir / "feature_names.json").write_text(
+            json.dumps({"feature_names": [f"f{i}" for i in range(num_features)]}), encoding="utf-8"
+        )
+        (artifacts_dir / "label_mapping.json").write_text(
+            json.dumps({"classes": [f"c{i}" for i in range(num_classes)]}), encoding="utf-8"
+        )
+        return artifacts_dir
+
+    return _write
+
+
+@pytest.fixture
+def make_split():
+    """0/1 증상 피처 합성 SplitData(클래스별 증상 확률 프로필에서 샘플)."""
+    import numpy as np
+
+    from ml.train.split import SplitData
+
+    def _make(num_features: int = 20, num_classes: int = 4, n: int = 400, seed: int = 0) -> SplitData:
+        rng = np.random.default_rng(seed)
+        profile = rng.random((num_classes, num_features)) * 0.5
+
+        def draw(m):
+            y = rng.integers(0, num_classes, size=m)
+            return (rng.random((m, num_features)) < profile[y]).astype(np.float32), y
+
+        (X_tr, y_tr), (X_va, y_va), (X_te, y_te) = draw(n), draw(n // 4), draw(n // 4)
+        return SplitData(
+            X_train=X_tr, y_train=y_tr, X_val=X_va, y_val=y_va, X_test=X_te, y_test=y_te,
+            feature_names=[f"f{i}" for i in range(num_features)],
+            classes=[f"c{i}" for i in range(num_classes)],
+            rare_label="__RARE__", min_count_per_class=1,
+        )
+
+    return _make
@@ -0,0 +1,95 @@
+"""답 테이블: 벡터 해시 == 단일 키 해시, write_table → AnswerTable 조회 왕복."""
+
+import numpy as np
+import pytest
+
+from tools.answer_table import AnswerTable, _hash_one, hash_words, mask_words, write_table
+
+
+@pytest.mark.parametrize("num_features", [5, 64, 65, 377])
+def test_hash_words_matches_hash_one(num_features):
+    rng = np.random.default_rng(num_features)
+    X = (rng.random((200, num_features)) < 0.05).astype(np.uint8)
+    words = mask_words(X)
+    assert words.shape == (200, (num_features + 63) // 64)
+    hashed = hash_words(words)
+    assert [int(h) for h in hashed] == [_hash_one(w) for w in words]
+
+
+def test_mask_words_bit_layout():
+    X = np.zeros((1, 70), dtype=np.uint8)
+    X[0, [0, 3, 64, 69]] = 1
+    words = mask_words(X)[0]
+    assert int(words[0]) == (1 << 0) | (1 << 3)
+    assert int(words[1]) == (1 << 0) | (1 << 5)
+
+
+def test_table_roundtrip(tmp_path):
+    F, C, K = 90, 40, 5
+    rng = np.random.default_rng(0)
+    X = (rng.random((500, F)) < 0.04).astype(np.uint8)
+    keys = np.unique(mask_words(X), axis=0)
+    P = rng.dirichlet(np.ones(C), size=len(keys)).astype(np.float32)
+    top_idx = np.argsort(-P, axis=1)[:, :K].astype(np.int16)
+    top_prob = np.take_along_axis(P, top_idx.astype(np.int64), axis=1)
+
+    write_table(tmp_path, keys, top_idx, top_prob, {"backend": "nb", "temperature": 2.5, "model_version": "v1",
+                                                   "model_files": []}, load_factor=0.9)
+    table = AnswerTable(tmp_path)
+    assert table.meta["entries"] == len(keys)
+    assert table.top_prob.dtype == np.float32
+
+    for i, w in enumerate(keys):
+        idx, prob = table.lookup_words(w)
+        assert np.array_equal(idx, top_idx[i])
+        np.testing.assert_array_equal(prob, top_prob[i])  # float32 저장 → 값 / 순서 그대로
+
+    missing = np.zeros(keys.shape[1], dtype=np.uint64)
+    missing[0] = np.uint64((1 << 63) | 1)
+    assert table.lookup_words(missing) is None
+
+    assert table.is_valid_for("nb", 2.5, [], version="v1")
+    assert not table.is_valid_for("nb", 2.5, [], version="v2")
+    assert not table.is_valid_for("xgb", 2.5, [], version="v1")
+
+
+def _small_table(seed, n=50, F=20, K=3):
+    rng = np.random.default_rng(seed)
+    keys = np.unique(mask_words((rng.random((n, F)) < 0.2).astype(np.uint8)), axis=0)
+    top_idx = np.tile(np.arange(K, dtype=np.int16), (len(keys), 1)) + np.int16(seed)
+    top_prob = np.full((len(keys), K), 1.0 / K, dtype=np.float32)
+    return keys, top_idx, top_prob
+
+
+def test_rewrite_keeps_open_table_consistent(tmp_path):
+    keys, top_idx, top_prob = _small_table(seed=0)
+    write_table(tmp_path, keys, top_idx, top_prob, {"backend": "nb"})
+    old = AnswerTable(tmp_path)
+
+    new_keys, new_idx, new_prob = _small_table(seed=7)
+    write_table(tmp_path, new_keys, new_idx, new_prob, {"backend": "nb"})
+
+    # 열려 있던 테이블은 옛 파일을 그대로 보고, 새로 열면 새 테이블
+    idx, _ = old.lookup_words(keys[0])
+    assert np.array_equal(idx, top_idx[0])
+    idx, _ = AnswerTable(tmp_path).lookup_words(new_keys[0])
+    assert np.array_equal(idx, new_idx[0])
+    assert not list(tmp_path.glob("*.tmp.npy"))
+
+
+def test_served_table_check_uses_backend_options(tmp_path, write_mappings, monkeypatch):
+    from tools import ml_predict_tools as mpt
+    from tools.answer_table import TABLE_DIRNAME, file_stamps
+
+    write_mappings(tmp_path, num_features=4, num_classes=2)
+    (tmp_path / "xgb_model.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "xgb_model.ubj").write_bytes(b"x")  # 기본 선택은 더 새로운 ubj
+    keys, top_idx, top_prob = _small_table(seed=0, F=4)
+    meta = {"backend": "xgb", "temperature": mpt.TEMPERATURE_T, "model_version": "v1",
+            "model_files": file_stamps([tmp_path / "xgb_model.json"])}
+    write_table(tmp_path / TABLE_DIRNAME, keys, top_idx, top_prob, meta)
+
+    monkeypatch.setattr(mpt, "USE_ANSWER_TABLE", True)
+    monkeypatch.setattr(mpt, "XGB_MODEL_FORMAT", "json")
+    active = mpt._ActiveModel.open("v1", tmp_path)
+    assert mpt._get_answer_table(active, "xgb") is not None
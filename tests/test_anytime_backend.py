@@ -0,0 +1,54 @@
+"""xgb_anytime: 전체 라운드 = xgb 백엔드, 사용 라운드는 호출별 반환값."""
+
+import threading
+
+import numpy as np
+import pytest
+
+xgb = pytest.importorskip("xgboost")
+
+from tools.anytime_backend import AnytimeXGBBackend  # noqa: E402
+from tools.predict_backends import create_backend  # noqa: E402
+
+
+@pytest.fixture
+def artifacts(tmp_path, write_mappings, make_split):
+    split = make_split(num_features=12, num_classes=4, n=300)
+    write_mappings(tmp_path, 12, 4)
+    dtrain = xgb.DMatrix(split.X_train, label=split.y_train, feature_names=split.feature_names)
+    booster = xgb.train({"objective": "multi:softprob", "num_class": 4, "max_depth": 3, "nthread": 1},
+                        dtrain, num_boost_round=40)
+    booster.save_model(str(tmp_path / "xgb_model.json"))
+    return tmp_path, split.X_test
+
+
+def test_full_rounds_match_xgb_backend(artifacts):
+    artifacts_dir, X = artifacts
+    full = create_backend("xgb", artifacts_dir=artifacts_dir).predict_proba(X)
+    be = create_backend("xgb_anytime", artifacts_dir=artifacts_dir, chunk_rounds=7)
+    P, rounds = be.predict_proba_anytime(X, patience=10_000)
+    np.testing.assert_allclose(P, full, atol=1e-5)
+    assert np.all(rounds == 40)
+
+
+def test_rounds_are_returned_per_call_under_concurrency(artifacts):
+    artifacts_dir, X = artifacts
+    be = AnytimeXGBBackend(artifacts_dir=artifacts_dir, chunk_rounds=5, patience=1, min_margin=0.0).load()
+    assert not hasattr(be, "rounds_used")
+
+    want = {p: be.predict_proba_anytime(X, patience=p)[1] for p in (1, 10_000)}
+    errors = []
+
+    def worker(p):
+        for _ in range(10):
+            _, rounds = be.predict_proba_anytime(X, patience=p)
+            if not np.array_equal(rounds, want[p]):
+                errors.append(p)
+
+    threads = [threading.Thread(target=worker, args=(p,)) for p in (1, 10_000, 1, 10_000)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert want[1].max() < want[10_000].min() == 40
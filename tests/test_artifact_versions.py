@@ -0,0 +1,88 @@
+"""artifact_versions: publish(하위 디렉토리 / 여러 백엔드) → verify → 스모크 → 서빙 교체."""
+
+import json
+
+import numpy as np
+import pytest
+from sklearn.naive_bayes import BernoulliNB
+
+from ml.train.train_nb import export_nb_arrays
+from tools import artifact_versions as av
+from tools.predict_backends import create_backend
+
+
+def _write_models(src, make_split, seed=0):
+    src.mkdir(parents=True)
+    split = make_split(num_features=10, num_classes=3, n=200, seed=seed)
+    (src / "feature_names.json").write_text(json.dumps({"feature_names": split.feature_names}), encoding="utf-8")
+    (src / "label_mapping.json").write_text(json.dumps({"classes": split.classes}), encoding="utf-8")
+    (src / "train_config.json").write_text(json.dumps({"seed": seed}), encoding="utf-8")
+    rng = np.random.default_rng(seed)
+    (src / "logistic_model.json").write_text(json.dumps({
+        "coef": rng.normal(size=(3, 10)).tolist(), "intercept": rng.normal(size=3).tolist(),
+        "feature_names": split.feature_names, "classes": split.classes,
+    }), encoding="utf-8")
+    create_backend("logistic_np", artifacts_dir=src)  # logistic_np/ 변환
+    export_nb_arrays(BernoulliNB().fit(split.X_train, split.y_train), src / "nb_np", num_classes=3)
+    return src
+
+
+def test_publish_keeps_subdirs_and_all_backends(tmp_path, make_split):
+    src = _write_models(tmp_path / "src", make_split)
+    art = tmp_path / "artifacts"
+    version = av.publish_version(src, art, backends=["logistic_np", "nb"])
+
+    vdir = av.version_dir(art, version)
+    manifest = av.verify_version(vdir)
+    assert {"nb_np/delta.npy", "nb_np/meta.json", "logistic_np/W.npy", "logistic_np/meta.json"} <= set(manifest["files"])
+    assert manifest["backends"] == ["logistic_np", "nb"]
+    assert av.resolve_current(art) == (version, vdir)
+
+    for name in ("logistic_np", "nb"):
+        res = av.smoke_check(create_backend(name, artifacts_dir=vdir), vdir)
+        assert res["top1_agree"] == 1.0
+
+    # 같은 내용이면 같은 버전
+    assert av.publish_version(src, art, backends=["logistic_np", "nb"], activate=False) == version
+
+
+def test_verify_detects_tampering(tmp_path, make_split):
+    src = _write_models(tmp_path / "src", make_split)
+    art = tmp_path / "artifacts"
+    vdir = av.version_dir(art, av.publish_version(src, art, backends=["nb"]))
+    np.save(vdir / "nb_np" / "base.npy", np.zeros(3, dtype=np.float32))
+    with pytest.raises(ValueError, match="nb_np/base.npy"):
+        av.verify_version(vdir)
+
+
+def test_failed_publish_removes_tmp_dir(tmp_path, make_split):
+    src = _write_models(tmp_path / "src", make_split)
+    meta = json.loads((src / "nb_np" / "meta.json").read_text(encoding="utf-8"))
+    meta["num_features"] = 99  # 로드 단계에서 실패
+    (src / "nb_np" / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    art = tmp_path / "artifacts"
+    with pytest.raises(ValueError):
+        av.publish_version(src, art, backends=["logistic_np", "nb"])
+    assert not list((art / av.VERSIONS_DIRNAME).iterdir())
+    assert av.read_current(art) is None
+
+
+def test_serving_swaps_to_new_version(tmp_path, make_split, monkeypatch):
+    from tools import ml_predict_tools as mpt
+
+    art = tmp_path / "artifacts"
+    v1 = av.publish_version(_write_models(tmp_path / "src1", make_split, seed=0), art, backends=["logistic_np", "nb"])
+    monkeypatch.setattr(mpt, "ARTIFACTS_DIR", art)
+    monkeypatch.setattr(mpt, "MODEL_BACKEND", "logistic_np")
+    monkeypatch.setattr(mpt, "WATCH_SEC", 0.0)
+    monkeypatch.setattr(mpt, "_ACTIVE", None)
+    monkeypatch.setattr(mpt, "_WATCHER", None)
+
+    assert mpt.model_version() == v1
+    assert mpt.get_backend("nb").artifacts_dir == av.version_dir(art, v1)  # fallback 도 같은 버전에서
+
+    v2 = av.publish_version(_write_models(tmp_path / "src2", make_split, seed=1), art, backends=["logistic_np", "nb"])
+    assert v2 != v1
+    assert mpt.reload_model() == v2
+    assert mpt.get_backend("logistic_np").artifacts_dir == av.version_dir(art, v2)
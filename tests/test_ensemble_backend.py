@@ -0,0 +1,98 @@
+"""ensemble 백엔드: 멤버별 동시 실행 / 마감 / 늦은 작업 추적."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from tools import predict_backends
+from tools.ensemble_backend import EnsembleBackend
+from tools.predict_backends import PredictBackend
+
+
+class _FastBackend(PredictBackend):
+    name = "fast"
+
+    def _load(self):
+        pass
+
+    def _predict_proba(self, X):
+        P = np.zeros((X.shape[0], len(self.classes)), dtype=np.float32)
+        P[:, 0] = 1.0
+        return P
+
+
+class _SlowBackend(PredictBackend):
+    """gate 가 열릴 때까지(또는 delay 만큼) 붙잡혀 있는 멤버."""
+
+    name = "slow"
+    gate = threading.Event()
+    delay = 0.0
+    calls = 0
+    _calls_lock = threading.Lock()
+
+    def _load(self):
+        pass
+
+    def _predict_proba(self, X):
+        with self._calls_lock:
+            type(self).calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        else:
+            self.gate.wait(timeout=5.0)
+        P = np.zeros((X.shape[0], len(self.classes)), dtype=np.float32)
+        P[:, 1] = 1.0
+        return P
+
+
+@pytest.fixture
+def artifacts(tmp_path, write_mappings, monkeypatch):
+    monkeypatch.setitem(predict_backends._REGISTRY, "fast", f"{__name__}:_FastBackend")
+    monkeypatch.setitem(predict_backends._REGISTRY, "slow", f"{__name__}:_SlowBackend")
+    _SlowBackend.gate = threading.Event()
+    _SlowBackend.delay = 0.0
+    _SlowBackend.calls = 0
+    return write_mappings(tmp_path, num_features=4, num_classes=2)
+
+
+def _ensemble(artifacts, **kw):
+    members = [{"name": "fast", "weight": 1.0}, {"name": "slow", "weight": 1.0}]
+    return EnsembleBackend(artifacts_dir=artifacts, members=members, **kw).load()
+
+
+def test_concurrent_requests_do_not_serialise_per_member(artifacts):
+    _SlowBackend.delay = 0.2
+    ens = _ensemble(artifacts, deadline_ms=0.0, member_workers=4)
+    X = np.zeros((1, 4), dtype=np.float32)
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        outs = list(ex.map(lambda _: ens.predict_proba(X), range(4)))
+    elapsed = time.perf_counter() - t0
+    ens.close()
+
+    for P in outs:
+        np.testing.assert_allclose(P, [[0.5, 0.5]])
+    assert elapsed < 0.6  # 멤버 안에서 줄 서면 4 × 0.2s
+
+
+def test_all_late_futures_are_tracked(artifacts):
+    ens = _ensemble(artifacts, deadline_ms=20.0, member_workers=2)
+    X = np.zeros((1, 4), dtype=np.float32)
+
+    for _ in range(2):  # 늦은 작업 2개 → 작업자 2개를 모두 차지
+        np.testing.assert_allclose(ens.predict_proba(X), [[1.0, 0.0]])
+    assert len(ens._late["slow"]) == 2
+
+    ens.predict_proba(X)  # slow 는 건너뜀(새 작업 없음)
+    assert _SlowBackend.calls == 2
+    assert ens.stats["late"]["slow"] == 3
+
+    _SlowBackend.gate.set()
+    for f in list(ens._late["slow"]):
+        f.result(timeout=5.0)
+    np.testing.assert_allclose(ens.predict_proba(X), [[0.5, 0.5]])
+    assert _SlowBackend.calls == 3 and not ens._late["slow"]
+    ens.close()
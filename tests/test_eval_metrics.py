@@ -0,0 +1,72 @@
+"""StreamingEvaluator(청크 누적) vs 기준 함수(hit_at_k / mrr / macro_f1 / ECE ...) 일치 확인."""
+
+import numpy as np
+import pytest
+
+from ml.train.eval_metrics import (
+    StreamingEvaluator,
+    entropy_of_prediction,
+    evaluate_streaming,
+    expected_calibration_error,
+    hit_at_k,
+    macro_f1,
+    mean_top1_confidence,
+    mrr,
+)
+
+
+def _reference(y, P, ks=(1, 3, 5)):
+    y_pred = np.argmax(P, axis=1)
+    out = {f"hit@{k}": hit_at_k(y, P, k=k) for k in ks}
+    out["mrr"] = mrr(y, P)
+    out["macro_f1"] = macro_f1(y, y_pred)
+    out["entropy_mean"] = float(entropy_of_prediction(P).mean())
+    out["top1_conf_mean"] = mean_top1_confidence(P)
+    out["ece"] = expected_calibration_error(P.max(axis=1), y_pred == y)
+    return out
+
+
+def _synthetic(n=3000, C=23, ties=False, seed=0):
+    rng = np.random.default_rng(seed)
+    if ties:
+        # 작은 정수 점수 → 행마다 동점이 많음
+        P = rng.integers(0, 4, size=(n, C)).astype(np.float64) + 1e-3
+    else:
+        P = rng.dirichlet(np.full(C, 0.3), size=n)
+    P /= P.sum(axis=1, keepdims=True)
+    y = rng.integers(0, C, size=n)
+    return y, P
+
+
+@pytest.mark.parametrize("ties", [False, True])
+@pytest.mark.parametrize("chunk", [1, 97, 5000])
+def test_streaming_matches_reference(ties, chunk):
+    y, P = _synthetic(ties=ties)
+    got = evaluate_streaming(y, (P[s:s + chunk] for s in range(0, len(P), chunk)), num_classes=P.shape[1])
+    want = _reference(y, P)
+    for key, value in want.items():
+        assert got[key] == pytest.approx(value, abs=1e-9), key
+
+
+def test_hit_at_k_ties_use_stable_order():
+    # 모든 클래스 동점이면 인덱스가 앞선 k개가 상위 k
+    P = np.full((4, 6), 1.0 / 6)
+    y = np.array([0, 2, 3, 5])
+    assert hit_at_k(y, P, k=3) == pytest.approx(0.5)
+    order = np.argsort(-P, axis=1, kind="stable")[:, :3]
+    assert hit_at_k(y, P, k=3) == pytest.approx(np.mean(np.any(order == y[:, None], axis=1)))
+
+
+def test_hit_at_k_matches_sorted_topk_without_ties():
+    y, P = _synthetic(seed=1)
+    for k in (1, 5, 10):
+        topk = np.argsort(-P, axis=1)[:, :k]
+        assert hit_at_k(y, P, k=k) == pytest.approx(np.mean(np.any(topk == y[:, None], axis=1)))
+
+
+def test_streaming_rejects_shape_mismatch_and_empty():
+    ev = StreamingEvaluator(num_classes=5)
+    with pytest.raises(ValueError):
+        ev.result()
+    with pytest.raises(ValueError):
+        ev.update(np.zeros(3, dtype=int), np.zeros((3, 4)))
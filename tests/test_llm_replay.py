@@ -0,0 +1,76 @@
+"""ReplayLLMClient 기록 → 재생 왕복: 정확 일치 / auto 미스 기록 / replay 유사 대체 / ReplayMiss."""
+
+import pytest
+
+from app.fake_llm import FakeLLMClient, FakeLLMConfig
+from app.llm_replay import ReplayLLMClient, ReplayMiss, ReplayStore
+
+PROMPT = "다음 증상 설명을 쉽게 풀어서 설명하라.\n사용자 입력: {}\n답변:"
+
+
+def _ask(client, user_text):
+    return client.responses.create(model="gpt-5.2", input=PROMPT.format(user_text))
+
+
+@pytest.fixture
+def inner():
+    return FakeLLMClient(FakeLLMConfig(latency_scale=0.0), sleep=lambda s: None)
+
+
+def _client(store, mode, inner=None):
+    return ReplayLLMClient(store, mode=mode, inner=inner, latency="zero", sleep=lambda s: None)
+
+
+def _inner_calls(inner):
+    return sum(inner.stats["calls"].values())
+
+
+def test_record_then_replay_exact_hit(tmp_path, inner):
+    path = tmp_path / "store.jsonl.gz"
+    recorded = _ask(_client(path, "record", inner), "머리가 아프고 열이 나요")
+    assert _inner_calls(inner) == 1
+
+    replay = _client(ReplayStore(path), "replay")  # 파일에서 다시 읽음
+    got = _ask(replay, "머리가 아프고 열이 나요")
+    assert got.output_text == recorded.output_text
+    assert replay.stats["hits"] == 1 and replay.stats["fuzzy_hits"] == 0
+
+
+def test_auto_miss_calls_inner_and_records(tmp_path, inner):
+    path = tmp_path / "store.jsonl"
+    auto = _client(path, "auto", inner)
+    _ask(auto, "머리가 아프고 열이 나요")
+
+    # 비슷한 요청이라도 정확히 같은 기록이 없으면 유사 기록으로 대체하지 않고 실제 호출
+    resp = _ask(auto, "머리가 아프고 열이 조금 나요")
+    assert _inner_calls(inner) == 2
+    assert auto.stats == {"hits": 0, "fuzzy_hits": 0, "misses": 2, "recorded": 2}
+    assert len(ReplayStore(path)) == 2
+
+    # 기록된 요청은 다시 호출하지 않고 재생
+    again = _ask(auto, "머리가 아프고 열이 조금 나요")
+    assert again.output_text == resp.output_text
+    assert _inner_calls(inner) == 2 and auto.stats["hits"] == 1
+
+
+def test_replay_falls_back_to_similar_record(tmp_path, inner):
+    path = tmp_path / "store.jsonl"
+    recorder = _client(path, "record", inner)
+    near = _ask(recorder, "머리가 아프고 열이 나요")
+    _ask(recorder, "발목을 삐어서 붓고 걷기 힘들어요")
+
+    replay = _client(path, "replay")
+    got = _ask(replay, "머리가 아프고 열이 조금 나요")
+    assert got.output_text == near.output_text
+    assert replay.stats["fuzzy_hits"] == 1 and replay.stats["hits"] == 0
+
+
+def test_replay_miss_raises(tmp_path, inner):
+    path = tmp_path / "store.jsonl"
+    _ask(_client(path, "record", inner), "머리가 아프고 열이 나요")
+
+    replay = _client(path, "replay")
+    with pytest.raises(ReplayMiss):
+        # 다른 kind(safety) 기록은 없음
+        replay.responses.create(model="gpt-5.2", input="응급 상황 여부를 판단하라: 가슴 통증")
+    assert replay.stats["misses"] == 1
@@ -0,0 +1,49 @@
+"""load_test: baseline 조건 확인 / 회귀 판정."""
+
+import json
+
+import pytest
+
+from bench import load_test
+
+CONFIG = {"llm": "fake", "latency_scale": 0.1, "error_rate": 0.0, "corpus_size": 20, "concurrency": [1, 4]}
+
+
+def _row(c, p95, rps):
+    return {"concurrency": c, "e2e": {"p95_ms": p95}, "rps": rps}
+
+
+def _baseline(**over):
+    rows = [_row(1, 100.0, 10.0), _row(4, 120.0, 30.0)]
+    return {**CONFIG, **over, "results": rows}
+
+
+def test_same_config_compares_and_flags_regressions():
+    load_test.check_baseline_config(CONFIG, _baseline())
+    regs = load_test.compare_baseline([_row(1, 100.0, 10.0), _row(4, 150.0, 25.0)], _baseline(), threshold=0.10)
+    assert {(r["concurrency"], r["metric"]) for r in regs} == {(4, "e2e_p95_ms"), (4, "rps")}
+
+
+@pytest.mark.parametrize("key, value", [
+    ("llm", "replay"), ("latency_scale", 0.05), ("error_rate", 0.1), ("corpus_size", 21), ("concurrency", [1, 4, 16]),
+])
+def test_mismatched_config_is_rejected(key, value):
+    with pytest.raises(ValueError, match=key):
+        load_test.check_baseline_config(CONFIG, _baseline(**{key: value}))
+
+
+def test_levels_fall_back_to_results_for_old_baselines():
+    old = _baseline()
+    del old["concurrency"]
+    load_test.check_baseline_config(CONFIG, old)
+    with pytest.raises(ValueError, match="concurrency"):
+        load_test.check_baseline_config({**CONFIG, "concurrency": [1]}, old)
+
+
+def test_run_exits_before_measuring_on_mismatch(tmp_path, monkeypatch):
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps(_baseline(latency_scale=0.5)), encoding="utf-8")
+    monkeypatch.setattr(load_test, "_make_orchestrator", lambda args: pytest.fail("측정을 시작하면 안 됨"))
+    args = load_test.build_argparser().parse_args(["--concurrency", "1,4", "--baseline", str(path)])
+    with pytest.raises(SystemExit, match="latency_scale"):
+        load_test.run(args)
@@ -0,0 +1,52 @@
+"""logistic_np(.npy memmap, 활성 피처 행 합) vs logistic(JSON dense 행렬곱) 확률 일치."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from tools.logistic_backend import NPY_DIRNAME
+from tools.predict_backends import create_backend
+
+
+def _write_model(artifacts_dir, num_features, num_classes, seed=0):
+    rng = np.random.default_rng(seed)
+    (artifacts_dir / "logistic_model.json").write_text(json.dumps({
+        "coef": rng.normal(size=(num_classes, num_features)).tolist(),
+        "intercept": rng.normal(size=num_classes).tolist(),
+        "feature_names": [f"f{i}" for i in range(num_features)],
+        "classes": [f"c{i}" for i in range(num_classes)],
+    }), encoding="utf-8")
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_numpy_backend_matches_json_logits(tmp_path, write_mappings, mmap):
+    write_mappings(tmp_path, num_features=30, num_classes=6)
+    _write_model(tmp_path, 30, 6)
+
+    rng = np.random.default_rng(1)
+    X = (rng.random((257, 30)) < 0.1).astype(np.float32)
+    X[0] = 0.0          # 활성 피처 없는 행 → intercept 만
+    X[1, :3] = 0.5      # 0/1 이 아닌 값도 가중합
+
+    want = create_backend("logistic", artifacts_dir=tmp_path).predict_proba(X)
+    got = create_backend("logistic_np", artifacts_dir=tmp_path, mmap=mmap, chunk_rows=64).predict_proba(X)
+    np.testing.assert_allclose(got, want, atol=1e-5)
+    assert (tmp_path / NPY_DIRNAME / "meta.json").exists()
+
+
+def test_numpy_backend_reconverts_when_json_changes(tmp_path, write_mappings):
+    write_mappings(tmp_path, num_features=8, num_classes=3)
+    _write_model(tmp_path, 8, 3, seed=0)
+    create_backend("logistic_np", artifacts_dir=tmp_path)
+
+    _write_model(tmp_path, 8, 3, seed=5)
+    src = tmp_path / "logistic_model.json"
+    st = src.stat()
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    X = np.eye(8, dtype=np.float32)
+    want = create_backend("logistic", artifacts_dir=tmp_path).predict_proba(X)
+    got = create_backend("logistic_np", artifacts_dir=tmp_path).predict_proba(X)
+    np.testing.assert_allclose(got, want, atol=1e-5)
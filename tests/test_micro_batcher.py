@@ -0,0 +1,78 @@
+"""MicroBatcher: 배치로 묶기 / 예외 전파 / 종료 후 요청."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from tools.micro_batcher import BatcherClosed, MicroBatcher
+
+
+def _double(X):
+    return X * 2.0
+
+
+def test_queued_requests_are_batched_and_routed_back():
+    gate = threading.Event()
+    sizes = []
+
+    def predict(X):
+        gate.wait(timeout=5.0)  # 요청을 모두 넣을 때까지 첫 배치를 붙잡아 둠
+        sizes.append(X.shape[0])
+        return _double(X)
+
+    mb = MicroBatcher(predict, max_rows=8, max_wait_ms=50.0)
+    xs = [np.full(3, i, dtype=np.float32) for i in range(17)]
+    futures = [mb.submit(x) for x in xs]
+    gate.set()
+    outs = [f.result(timeout=5.0) for f in futures]
+    mb.close(timeout=5.0)
+
+    for x, out in zip(xs, outs):
+        np.testing.assert_array_equal(out, x * 2.0)
+    assert sum(sizes) == 17 and max(sizes) <= 8
+    assert mb.stats["requests"] == 17 and mb.stats["batches"] == len(sizes) <= 4
+
+
+def test_predict_error_fails_every_future_in_batch():
+    def boom(X):
+        raise ValueError("bad batch")
+
+    mb = MicroBatcher(boom, max_rows=4, max_wait_ms=20.0)
+    futures = [mb.submit(np.zeros(2)) for _ in range(3)]
+    for f in futures:
+        with pytest.raises(ValueError, match="bad batch"):
+            f.result(timeout=5.0)
+    assert mb.stats["errors"] >= 1
+    mb.close(timeout=5.0)
+
+
+def test_close_drains_accepted_requests_and_rejects_new_ones():
+    mb = MicroBatcher(_double, max_rows=2, max_wait_ms=0.0)
+    futures = [mb.submit(np.full(2, i, dtype=np.float32)) for i in range(5)]
+    mb.close(timeout=5.0)
+    for i, f in enumerate(futures):
+        np.testing.assert_array_equal(f.result(timeout=1.0), [2.0 * i, 2.0 * i])
+    with pytest.raises(BatcherClosed):
+        mb.submit(np.zeros(2))
+
+
+def test_submit_racing_close_never_hangs():
+    mb = MicroBatcher(_double, max_rows=4, max_wait_ms=1.0)
+    accepted = []
+
+    def submitter():
+        for _ in range(200):
+            try:
+                accepted.append(mb.submit(np.ones(2)))
+            except BatcherClosed:
+                return
+
+    threads = [threading.Thread(target=submitter) for _ in range(4)]
+    for t in threads:
+        t.start()
+    mb.close(timeout=5.0)
+    for t in threads:
+        t.join()
+    for f in accepted:
+        np.testing.assert_array_equal(f.result(timeout=5.0), [2.0, 2.0])
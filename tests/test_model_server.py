@@ -0,0 +1,92 @@
+"""모델 서버: 버전 구조 서빙 / 감시 교체 / 클라이언트 매핑 검사 / 캐시 키의 서버 버전."""
+
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from tools import artifact_versions as av
+from tools import ml_predict_tools as mpt
+from tools import model_server
+from tools.model_server import ModelServer, RemoteBackend
+from tools.predict_backends import create_backend
+
+F, C = 6, 3
+
+
+def _publish(src, art, write_mappings, seed):
+    write_mappings(src, F, C)
+    (src / "train_config.json").write_text(json.dumps({"seed": seed}), encoding="utf-8")
+    rng = np.random.default_rng(seed)
+    (src / "logistic_model.json").write_text(json.dumps({
+        "coef": (3.0 * rng.normal(size=(C, F))).tolist(), "intercept": rng.normal(size=C).tolist(),
+    }), encoding="utf-8")
+    create_backend("logistic_np", artifacts_dir=src)
+    return av.publish_version(src, art, backends=["logistic_np"])
+
+
+def _wait_for(cond, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        if time.monotonic() > deadline:
+            raise AssertionError("timeout")
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def served(tmp_path, write_mappings):
+    art = tmp_path / "art"
+    v1 = _publish(tmp_path / "src1", art, write_mappings, seed=0)
+    server = ModelServer(str(tmp_path / "m.sock"), ["logistic_np"], artifacts_dir=art, watch_sec=0.05)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, art, v1
+    server.shutdown()
+    server.server_close()
+
+
+def test_server_serves_current_version_and_swaps(served, tmp_path, write_mappings):
+    server, art, v1 = served
+    client = RemoteBackend(socket_path=server.socket_path).load()
+    X = np.eye(F, dtype=np.float32)
+    assert client.served_version() == v1
+    want = create_backend("logistic_np", artifacts_dir=av.version_dir(art, v1)).predict_proba(X)
+    np.testing.assert_allclose(client.predict_proba(X), want, atol=1e-6)
+
+    v2 = _publish(tmp_path / "src2", art, write_mappings, seed=1)
+    _wait_for(lambda: client.served_version(refresh=True) == v2)
+    want = create_backend("logistic_np", artifacts_dir=av.version_dir(art, v2)).predict_proba(X)
+    np.testing.assert_allclose(client.predict_proba(X), want, atol=1e-6)
+    np.testing.assert_allclose(client.predict_proba(X[:1]), want[:1], atol=1e-6)  # 배처 경로
+
+
+def test_client_rejects_mismatched_mappings(served, tmp_path, write_mappings, monkeypatch):
+    server, _, _ = served
+    monkeypatch.setattr(model_server, "DEFAULT_SOCKET", server.socket_path)
+    local = write_mappings(tmp_path / "client", F, C + 1)  # 클라이언트 쪽 클래스가 다름
+    active = mpt._ActiveModel.open("local", local)
+    with pytest.raises(ValueError):
+        active.backend("remote")
+
+
+def test_remote_results_use_server_version_and_invalidate_cache(served, tmp_path, write_mappings, monkeypatch):
+    server, art, v1 = served
+    monkeypatch.setattr(model_server, "DEFAULT_SOCKET", server.socket_path)
+    monkeypatch.setattr(mpt, "ARTIFACTS_DIR", write_mappings(tmp_path / "client", F, C))  # 평면 구조("local")
+    monkeypatch.setattr(mpt, "ARTIFACT_CHECK_SEC", 0.0)
+    monkeypatch.setattr(mpt, "USE_ANSWER_TABLE", False)
+    monkeypatch.setattr(mpt, "BATCH_WAIT_MS", 0.0)
+    monkeypatch.setattr(mpt, "_CACHE", mpt._PredictionLRU(64))
+    monkeypatch.setattr(mpt, "_ACTIVE", None)
+    monkeypatch.setattr(mpt, "_WATCHER", None)
+
+    first = mpt.predict_topk_with_scores(["f0", "f2"], topk=2, backend="remote")
+    again = mpt.predict_topk_with_scores(["f0", "f2"], topk=2, backend="remote")
+    assert first[0]["model_version"] == v1 and again[0]["source"] == "cache"
+
+    v2 = _publish(tmp_path / "src2", art, write_mappings, seed=1)
+    _wait_for(lambda: server.model.version == v2)
+    after = mpt.predict_topk_with_scores(["f0", "f2"], topk=2, backend="remote")
+    assert after[0]["model_version"] == v2 and after[0]["source"] == "model"
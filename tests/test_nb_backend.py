@@ -0,0 +1,63 @@
+"""nb 백엔드(delta / base 배열) vs sklearn BernoulliNB.predict_proba."""
+
+import numpy as np
+import pytest
+from sklearn.naive_bayes import BernoulliNB
+
+from ml.train.train_nb import export_nb_arrays
+from tools.nb_backend import NaiveBayesBackend
+from tools.predict_backends import _expand_columns
+
+
+def _fit(num_features=40, num_classes=7, n=600, missing_class=None, seed=0):
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, num_classes, size=n)
+    if missing_class is not None:
+        y[y == missing_class] = (missing_class + 1) % num_classes
+    profile = rng.random((num_classes, num_features)) * 0.4
+    X = (rng.random((n, num_features)) < profile[y]).astype(np.float32)
+    return BernoulliNB(alpha=1.0).fit(X, y), X
+
+
+@pytest.mark.parametrize("missing_class", [None, 3])
+def test_nb_arrays_match_sklearn(tmp_path, write_mappings, missing_class):
+    F, C = 40, 7
+    model, X = _fit(F, C, missing_class=missing_class)
+    artifacts = write_mappings(tmp_path, F, C)
+    export_nb_arrays(model, artifacts / "nb_np", num_classes=C)
+
+    backend = NaiveBayesBackend(artifacts_dir=artifacts, chunk_rows=64)
+    got = backend.predict_proba(X[:300])
+    want = _expand_columns(model.predict_proba(X[:300]), model.classes_, C)
+
+    np.testing.assert_allclose(got, want, atol=1e-5)
+    if missing_class is not None:
+        assert np.all(got[:, missing_class] == 0.0)
+
+
+def test_nb_no_active_features_uses_base(tmp_path, write_mappings):
+    F, C = 12, 4
+    model, _ = _fit(F, C, n=200)
+    artifacts = write_mappings(tmp_path, F, C)
+    export_nb_arrays(model, artifacts / "nb_np", num_classes=C)
+
+    got = NaiveBayesBackend(artifacts_dir=artifacts).predict_proba(np.zeros((2, F), dtype=np.float32))
+    np.testing.assert_allclose(got, model.predict_proba(np.zeros((2, F))), atol=1e-5)
+
+
+def test_export_replaces_files_without_touching_open_memmap(tmp_path, write_mappings):
+    F, C = 12, 4
+    artifacts = write_mappings(tmp_path, F, C)
+    model_a, X = _fit(F, C, n=200, seed=0)
+    export_nb_arrays(model_a, artifacts / "nb_np", num_classes=C)
+    old = NaiveBayesBackend(artifacts_dir=artifacts)
+    before = old.predict_proba(X[:20])
+
+    model_b, _ = _fit(F, C, n=200, seed=9)
+    export_nb_arrays(model_b, artifacts / "nb_np", num_classes=C)
+
+    # 기존 memmap 은 옛 inode 를 그대로 보고, 새로 로드하면 새 모델
+    np.testing.assert_array_equal(old.predict_proba(X[:20]), before)
+    new = NaiveBayesBackend(artifacts_dir=artifacts).predict_proba(X[:20])
+    np.testing.assert_allclose(new, _expand_columns(model_b.predict_proba(X[:20]), model_b.classes_, C), atol=1e-5)
+    assert not list((artifacts / "nb_np").glob("*.tmp.npy"))
@@ -0,0 +1,86 @@
+"""예측 백엔드 레지스트리: create_backend / register_backend / available_backends."""
+
+import json
+
+import numpy as np
+import pytest
+
+from tools import predict_backends
+from tools.predict_backends import PredictBackend, available_backends, create_backend, register_backend
+
+
+class _UniformBackend(PredictBackend):
+    """테스트용: 모든 클래스에 같은 확률."""
+
+    name = "uniform"
+
+    def __init__(self, artifacts_dir=None, scale: float = 1.0):
+        super().__init__(artifacts_dir=artifacts_dir)
+        self.scale = scale
+        self.load_calls = 0
+
+    def _load(self) -> None:
+        self.load_calls += 1
+
+    def _predict_proba(self, X):
+        return np.full((X.shape[0], len(self.classes)), 1.0 / len(self.classes), dtype=np.float32)
+
+
+def test_unknown_backend_raises_value_error():
+    with pytest.raises(ValueError):
+        create_backend("no-such-backend")
+
+
+def test_builtin_backends_are_registered():
+    names = available_backends()
+    for name in ("xgb", "catboost", "rf", "rf_array", "logistic", "logistic_np", "nb", "student"):
+        assert name in names
+    assert names == sorted(names)
+
+
+def test_register_and_create_backend(tmp_path, write_mappings, monkeypatch):
+    monkeypatch.setitem(predict_backends._REGISTRY, "uniform", f"{__name__}:_UniformBackend")
+    write_mappings(tmp_path, num_features=5, num_classes=3)
+
+    lazy = create_backend("uniform", artifacts_dir=tmp_path, load=False, scale=2.0)
+    assert isinstance(lazy, _UniformBackend) and not lazy.loaded and lazy.scale == 2.0
+
+    be = create_backend("uniform", artifacts_dir=tmp_path)
+    assert be.loaded and be.load_calls == 1
+    assert be.feature_names == [f"f{i}" for i in range(5)]
+    assert be.classes == ["c0", "c1", "c2"]
+
+    # 1차원 입력은 (1, F)로, 두 번째 load()는 다시 읽지 않음
+    P = be.predict_proba(np.zeros(5))
+    assert P.shape == (1, 3)
+    be.load()
+    assert be.load_calls == 1
+
+
+def test_register_backend_defers_import(monkeypatch):
+    monkeypatch.setitem(predict_backends._REGISTRY, "missing", "no_such_module:Backend")
+    register_backend("missing", "no_such_module:Backend")  # 등록만으로는 import 하지 않음
+    assert "missing" in available_backends()
+    with pytest.raises(ModuleNotFoundError):
+        create_backend("missing", load=False)
+
+
+def test_logistic_json_backend_aligns_columns(tmp_path, write_mappings):
+    write_mappings(tmp_path, num_features=3, num_classes=2)
+    rng = np.random.default_rng(0)
+    coef = rng.normal(size=(2, 3))
+    intercept = rng.normal(size=2)
+    # 모델 파일은 클래스/피처 순서가 뒤집혀 저장됨 → 매핑 순서로 정렬돼야 함
+    (tmp_path / "logistic_model.json").write_text(json.dumps({
+        "coef": coef[::-1, ::-1].tolist(),
+        "intercept": intercept[::-1].tolist(),
+        "feature_names": ["f2", "f1", "f0"],
+        "classes": ["c1", "c0"],
+    }), encoding="utf-8")
+
+    X = np.array([[1, 0, 1], [0, 1, 0]], dtype=np.float32)
+    z = X @ coef.T + intercept
+    want = np.exp(z - z.max(axis=1, keepdims=True))
+    want /= want.sum(axis=1, keepdims=True)
+    got = create_backend("logistic", artifacts_dir=tmp_path).predict_proba(X)
+    np.testing.assert_allclose(got, want, atol=1e-5)
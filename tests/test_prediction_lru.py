@@ -0,0 +1,51 @@
+"""예측 LRU 캐시(_PredictionLRU): 순서 / 용량 / 무효화 / 카운터."""
+
+import numpy as np
+import pytest
+
+from tools.ml_predict_tools import _PredictionLRU
+
+
+def _row(v):
+    return np.full(3, v, dtype=np.float64)
+
+
+def test_lru_eviction_order_and_counters():
+    cache = _PredictionLRU(maxsize=2)
+    cache.put(("xgb", "a"), _row(1))
+    cache.put(("xgb", "b"), _row(2))
+    assert cache.get(("xgb", "a"))[0] == 1  # a 가 최근 사용 → b 가 다음 제거 대상
+    cache.put(("xgb", "c"), _row(3))
+
+    assert cache.get(("xgb", "b")) is None
+    assert cache.get(("xgb", "a")) is not None
+    assert cache.get(("xgb", "c")) is not None
+    assert cache.info() == {"hits": 3, "misses": 1, "evictions": 1, "invalidations": 0, "size": 2, "maxsize": 2}
+
+
+def test_lru_rows_are_read_only_float32_copies():
+    cache = _PredictionLRU(maxsize=4)
+    src = _row(0.5)
+    cache.put(("nb", "k"), src)
+    src[0] = 9.0
+    row = cache.get(("nb", "k"))
+    assert row.dtype == np.float32 and row[0] == pytest.approx(0.5)
+    with pytest.raises(ValueError):
+        row[0] = 1.0
+
+
+def test_lru_invalidate_by_backend():
+    cache = _PredictionLRU(maxsize=8)
+    cache.put(("xgb", "a"), _row(1))
+    cache.put(("nb", "a"), _row(2))
+    cache.invalidate("xgb")
+    assert cache.get(("xgb", "a")) is None
+    assert cache.get(("nb", "a")) is not None
+    cache.invalidate()
+    assert cache.info()["size"] == 0 and cache.info()["invalidations"] == 2
+
+
+def test_lru_disabled():
+    cache = _PredictionLRU(maxsize=0)
+    cache.put(("xgb", "a"), _row(1))
+    assert cache.get(("xgb", "a")) is None
@@ -0,0 +1,47 @@
+"""rf_array 배열 순회 vs sklearn RandomForestClassifier.predict_proba."""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from ml.train.export_rf import export_forest
+from tools.predict_backends import _expand_columns
+from tools.rf_array_backend import RFArrayBackend
+
+
+def _data(num_features=30, num_classes=6, n=800, seed=0):
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, num_classes, size=n)
+    profile = rng.random((num_classes, num_features)) * 0.5
+    X = (rng.random((n, num_features)) < profile[y]).astype(np.float32)
+    return X, y
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 256])
+def test_rf_array_matches_sklearn(tmp_path, write_mappings, chunk_rows):
+    F, C = 30, 6
+    X, y = _data(F, C)
+    model = RandomForestClassifier(n_estimators=15, max_depth=8, random_state=0).fit(X, y)
+    artifacts = write_mappings(tmp_path, F, C)
+    export_forest(model, artifacts / "rf_array", num_classes=C, top_n=C)  # top_n = C → 잘라내는 클래스 없음
+
+    got = RFArrayBackend(artifacts_dir=artifacts, chunk_rows=chunk_rows).predict_proba(X[:200])
+    want = model.predict_proba(X[:200])
+    np.testing.assert_allclose(got, want, atol=2e-3)  # 리프 비율 float16
+
+
+def test_rf_array_missing_class_and_top_n(tmp_path, write_mappings):
+    F, C = 30, 6
+    X, y = _data(F, C, seed=1)
+    y[y == 2] = 0  # 학습에 없는 클래스 2
+    model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+    artifacts = write_mappings(tmp_path, F, C)
+    export_forest(model, artifacts / "rf_array", num_classes=C, top_n=3)
+
+    got = RFArrayBackend(artifacts_dir=artifacts).predict_proba(X[:100])
+    want = _expand_columns(model.predict_proba(X[:100]), model.classes_, C)
+    assert got.shape == (100, C)
+    np.testing.assert_allclose(got.sum(axis=1), 1.0, atol=1e-5)
+    assert np.all(got[:, 2] == 0.0)
+    # 상위 3개만 남겨도 1위는 거의 그대로
+    assert np.mean(got.argmax(axis=1) == want.argmax(axis=1)) > 0.95
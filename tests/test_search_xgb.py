@@ -0,0 +1,56 @@
+"""search_xgb: 이력 설정 지문 / 지연 import."""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from ml.train import search_xgb
+
+
+def _args(**kw):
+    base = {"seed": 42, "symptom_drop_p": 0.1, "max_p99_ms": 0.0}
+    base.update(kw)
+    return argparse.Namespace(**base)
+
+
+def test_history_resumes_only_with_same_fingerprint(tmp_path):
+    history = tmp_path / "history.jsonl"
+    config = search_xgb._search_config(_args(), "key-a")
+    fp = search_xgb.config_fingerprint(config)
+    search_xgb._reset_history(tmp_path, history, config, fp)
+    search_xgb._append_history(history, {"trial_id": 3, "rounds": 25, "hit@5": 0.9})
+
+    assert set(search_xgb._load_history(history, fp)) == {(3, 25)}
+
+    for changed in (_args(seed=7), _args(symptom_drop_p=0.0), _args(max_p99_ms=10.0)):
+        other = search_xgb.config_fingerprint(search_xgb._search_config(changed, "key-a"))
+        with pytest.raises(ValueError):
+            search_xgb._load_history(history, other)
+    other_split = search_xgb.config_fingerprint(search_xgb._search_config(_args(), "key-b"))
+    with pytest.raises(ValueError):
+        search_xgb._load_history(history, other_split)
+
+
+def test_reset_history_moves_old_and_drops_checkpoints(tmp_path):
+    history = tmp_path / "history.jsonl"
+    history.write_text(json.dumps({"trial_id": 0, "rounds": 25}) + "\n", encoding="utf-8")  # 지문 없는 옛 이력
+    (tmp_path / "trial_0000.ubj").write_bytes(b"x")
+    with pytest.raises(ValueError):
+        search_xgb._load_history(history, "fp")
+
+    search_xgb._reset_history(tmp_path, history, {"seed": 1}, "fp")
+    assert not (tmp_path / "trial_0000.ubj").exists()
+    assert len(list(tmp_path.glob("history.*.jsonl"))) == 1
+    assert search_xgb._load_history(history, "fp") == {}
+
+
+def test_module_import_does_not_load_numpy():
+    # spawn 워커가 모듈을 import 할 때 numpy 가 먼저 로드되면 _init_worker 의 스레드 환경변수가 무시됨
+    code = "import sys, ml.train.search_xgb, ml.train.run_all; print('numpy' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=Path(__file__).resolve().parents[1])
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,95 @@
+"""prefork 서버 스모크: --workers 2 로 띄워 워커마다 요청 1건(부모가 fork 전에 xgboost 예측을 하면 자식이 멈출 수 있음)."""
+
+import http.client
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+xgb = pytest.importorskip("xgboost")
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+# ml_predict_tools 의 ARTIFACTS_DIR 은 모듈 상수 → 테스트 모델 디렉토리로 바꾼 뒤 서버 실행
+_LAUNCHER = (
+    "import sys; from pathlib import Path; import tools.ml_predict_tools as m; "
+    "m.ARTIFACTS_DIR = Path(sys.argv[1]); from app.server import build_argparser, run; "
+    "run(build_argparser().parse_args(sys.argv[2:]))"
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def workdir(tmp_path):
+    """
+    서버 실행 디렉토리: 에이전트는 cwd 기준 상대 경로(agents/prompts, ml/artifacts/symptom_vocab.json)를 읽음
+    → agents 는 레포를 가리키는 심볼릭 링크, symptom_vocab.json 은 피처 이름으로 생성, 모델은 작은 xgb.
+    """
+    (tmp_path / "agents").symlink_to(REPO_ROOT / "agents", target_is_directory=True)
+    art = tmp_path / "ml" / "artifacts"
+    art.mkdir(parents=True)
+    for name in ("feature_names.json", "label_mapping.json"):
+        shutil.copy(REPO_ROOT / "ml" / "artifacts" / name, art / name)
+    fn = json.loads((art / "feature_names.json").read_text(encoding="utf-8"))["feature_names"]
+    (art / "symptom_vocab.json").write_text(json.dumps({"symptoms": [{"canonical": f} for f in fn]}), encoding="utf-8")
+    C = len(json.loads((art / "label_mapping.json").read_text(encoding="utf-8"))["classes"])
+    rng = np.random.default_rng(0)
+    X = (rng.random((C * 2, len(fn))) < 0.02).astype(np.float32)
+    y = np.arange(C * 2) % C
+    booster = xgb.train({"objective": "multi:softprob", "num_class": C, "max_depth": 2},
+                        xgb.DMatrix(X, label=y, feature_names=fn), num_boost_round=2)
+    booster.save_model(str(art / "xgb_model.json"))
+    return tmp_path
+
+
+def test_prefork_workers_answer_after_parent_load(workdir):
+    port = _free_port()
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT), "HIGHFOUR_FAKE_LLM": "1", "HIGHFOUR_FAKE_LLM_LATENCY_SCALE": "0",
+           "HIGHFOUR_ML_BACKEND": "xgb", "HIGHFOUR_ML_FALLBACK": "", "HIGHFOUR_XGB_NTHREAD": "0"}
+    proc = subprocess.Popen(
+        [sys.executable, "-c", _LAUNCHER, str(workdir / "ml" / "artifacts"), "--workers", "2", "--port", str(port)],
+        cwd=workdir, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    )
+    answered = {}
+    try:
+        deadline = time.monotonic() + 60.0
+        while len(answered) < 2 and time.monotonic() < deadline:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=20.0)
+            try:
+                # 같은 keep-alive 연결 = 같은 워커
+                conn.request("GET", "/healthz")
+                pid = json.loads(conn.getresponse().read())["pid"]
+                if pid in answered:
+                    continue
+                body = json.dumps({"user_input": "어제부터 기침이 나고 열이 나요", "user_location": None})
+                conn.request("POST", "/v1/user_input", body=body, headers={"Content-Type": "application/json"})
+                resp = conn.getresponse()
+                answered[pid] = (resp.status, json.loads(resp.read()))
+            except (ConnectionError, OSError):
+                time.sleep(0.1)  # 아직 listen 전
+            finally:
+                conn.close()
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            out, _ = proc.communicate(timeout=30.0)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            out, _ = proc.communicate()
+
+    assert len(answered) == 2, out
+    for status, payload in answered.values():
+        assert status == 200, payload
+        assert payload["topk"]  # ML 단계(xgb 예측)를 거친 응답
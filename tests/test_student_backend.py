@@ -0,0 +1,60 @@
+"""save_student 산출물 + student 백엔드 vs NumPy 기준 계산."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("xgboost")
+
+from ml.train.distill_student import save_student  # noqa: E402
+from tools.student_backend import STUDENT_DIRNAME, StudentBackend  # noqa: E402
+
+
+def _params(arch, F, C, H=8, seed=0):
+    rng = np.random.default_rng(seed)
+    if arch == "linear":
+        return {"W1": rng.normal(size=(F, C)), "b1": rng.normal(size=C)}
+    return {"W1": rng.normal(size=(F, H)), "b1": rng.normal(size=H),
+            "W2": rng.normal(size=(H, C)), "b2": rng.normal(size=C)}
+
+
+def _reference(params, X, logit_scale):
+    z = X @ params["W1"] + params["b1"]
+    if "W2" in params:
+        z = np.maximum(z, 0.0) @ params["W2"] + params["b2"]
+    z = logit_scale * z
+    e = np.exp(z - z.max(axis=1, keepdims=True))
+    return e / e.sum(axis=1, keepdims=True)
+
+
+def _save(artifacts, arch, params, F, C, logit_scale=1.5):
+    meta = {"arch": arch, "num_features": F, "num_classes": C, "logit_scale": logit_scale}
+    return save_student(params, artifacts / STUDENT_DIRNAME, meta)
+
+
+@pytest.mark.parametrize("arch", ["linear", "mlp"])
+def test_student_backend_matches_reference(tmp_path, write_mappings, arch):
+    F, C = 16, 5
+    artifacts = write_mappings(tmp_path, F, C)
+    params = _params(arch, F, C)
+    _save(artifacts, arch, params, F, C)
+
+    X = (np.random.default_rng(1).random((70, F)) < 0.2).astype(np.float32)
+    got = StudentBackend(artifacts_dir=artifacts, chunk_rows=32).predict_proba(X)
+    np.testing.assert_allclose(got, _reference(params, X, 1.5), atol=1e-4)
+
+
+def test_resave_keeps_open_memmap_consistent(tmp_path, write_mappings):
+    F, C = 10, 3
+    artifacts = write_mappings(tmp_path, F, C)
+    _save(artifacts, "linear", _params("linear", F, C, seed=0), F, C)
+    old = StudentBackend(artifacts_dir=artifacts)
+    X = np.eye(F, dtype=np.float32)
+    before = old.predict_proba(X)
+
+    new_params = _params("mlp", F, C, seed=3)
+    _save(artifacts, "mlp", new_params, F, C)
+
+    np.testing.assert_array_equal(old.predict_proba(X), before)
+    got = StudentBackend(artifacts_dir=artifacts).predict_proba(X)
+    np.testing.assert_allclose(got, _reference(new_params, X, 1.5), atol=1e-4)
+    assert not list((artifacts / STUDENT_DIRNAME).glob("*.tmp.npy"))
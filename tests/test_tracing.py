@@ -0,0 +1,94 @@
+"""LatencyHistogram 백분위수 / 누적 버킷 + export_prometheus 텍스트."""
+
+import re
+
+import pytest
+
+from app import tracing
+from app.tracing import PROM_BUCKETS_SEC, LatencyHistogram
+
+
+@pytest.fixture(autouse=True)
+def _clean_registry():
+    tracing.reset()
+    yield
+    tracing.reset()
+
+
+def test_percentile_within_bucket_precision():
+    h = LatencyHistogram()
+    assert h.percentile(50) == 0.0  # 비어 있으면 0
+    for ms in range(1, 1001):
+        h.observe(float(ms))
+
+    for q, want in ((50, 500.0), (95, 950.0), (99, 990.0)):
+        got = h.percentile(q)
+        assert want <= got <= want * 1.01 + 1e-9, (q, got)
+    assert h.percentile(100) == h.max_ms == 1000.0
+    assert h.percentile(0) == pytest.approx(1.0, rel=0.01)  # rank 는 최소 1
+    assert h.summary()["mean_ms"] == pytest.approx(500.5)
+
+
+def test_percentile_never_exceeds_max_and_handles_tiny_values():
+    h = LatencyHistogram()
+    h.observe(0.0)
+    h.observe(1e-4)  # 1µs 이하는 같은 버킷
+    h.observe(7.3)
+    assert h.percentile(50) <= 1e-3
+    assert h.percentile(99) == 7.3  # 버킷 상한이 max 보다 크면 max
+
+
+def test_cumulative_counts_per_bound():
+    h = LatencyHistogram()
+    for ms in (0.5, 3.0, 3.0, 40.0, 2000.0):
+        h.observe(ms)
+    assert h.cumulative([1.0, 5.0, 50.0, 1000.0, 5000.0]) == [1, 3, 4, 4, 5]
+    # 경계값과 같은 관측은 그 버킷(le)에 포함
+    assert h.cumulative([3.0]) == [3]
+    assert h.cumulative([]) == []
+
+
+def _metrics(text):
+    out = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            out[name] = float(value)
+    return out
+
+
+def test_export_prometheus_histogram_and_counters():
+    for ms in (2.0, 30.0, 30.0):
+        tracing._histogram("ml").observe(ms)
+    with tracing.start_span("intent"):
+        tracing.record_usage("gpt-5.2", type("U", (), {"input_tokens": 12, "output_tokens": 5})())
+    with pytest.raises(RuntimeError):
+        with tracing.start_span("explain"):
+            raise RuntimeError("boom")
+
+    text = tracing.export_prometheus()
+    assert text.endswith("\n")
+    assert "# TYPE highfour_span_duration_seconds histogram" in text
+    m = _metrics(text)
+
+    buckets = [m[f'highfour_span_duration_seconds_bucket{{span="ml",le="{b}"}}'] for b in PROM_BUCKETS_SEC]
+    assert buckets == sorted(buckets)  # 누적이므로 단조 증가
+    assert m['highfour_span_duration_seconds_bucket{span="ml",le="0.0025"}'] == 1
+    assert m['highfour_span_duration_seconds_bucket{span="ml",le="0.025"}'] == 1
+    assert m['highfour_span_duration_seconds_bucket{span="ml",le="0.05"}'] == 3
+    assert m['highfour_span_duration_seconds_bucket{span="ml",le="+Inf"}'] == 3
+    assert m['highfour_span_duration_seconds_count{span="ml"}'] == 3
+    assert m['highfour_span_duration_seconds_sum{span="ml"}'] == pytest.approx(0.062)
+
+    assert m['highfour_span_duration_seconds_count{span="intent"}'] == 1
+    assert m['highfour_llm_input_tokens_total{span="intent"}'] == 12
+    assert m['highfour_llm_output_tokens_total{span="intent"}'] == 5
+    assert m['highfour_span_errors_total{span="explain"}'] == 1
+    # 카운터마다 TYPE 줄 1개
+    assert len(re.findall(r"^# TYPE highfour_span_errors_total counter$", text, re.M)) == 1
+
+
+def test_export_prometheus_empty_registry():
+    text = tracing.export_prometheus()
+    assert _metrics(text) == {}
+    assert text.startswith("# HELP highfour_span_duration_seconds")
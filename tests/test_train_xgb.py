@@ -0,0 +1,51 @@
+"""train_xgb: 체크포인트 재개 검증 / warm start 비교 리포트."""
+
+import json
+
+import pytest
+
+pytest.importorskip("xgboost")
+
+from ml.train import train_xgb  # noqa: E402
+
+
+def _args(outdir, *extra):
+    return train_xgb.build_argparser().parse_args([
+        "--csv", "unused.csv", "--outdir", str(outdir), "--max_depth", "3", "--verbose_eval", "0",
+        "--nthread", "1", *extra,
+    ])
+
+
+def test_resume_rejects_checkpoint_from_other_run(tmp_path, make_split):
+    split = make_split()
+    train_xgb.train(_args(tmp_path, "--num_boost_round", "6", "--checkpoint_every", "2"), split=split)
+    state = json.loads((tmp_path / "checkpoints" / train_xgb.CHECKPOINT_STATE_NAME).read_text())
+    assert state["data"] == train_xgb.split_fingerprint(split) and state["target_rounds"] == 6
+
+    # 같은 설정이면 재개 가능(이미 목표 라운드면 체크포인트 무시 후 학습)
+    train_xgb.train(_args(tmp_path, "--num_boost_round", "6", "--checkpoint_every", "2", "--resume"), split=split)
+
+    with pytest.raises(ValueError, match="params"):
+        train_xgb.train(_args(tmp_path, "--num_boost_round", "6", "--checkpoint_every", "2", "--resume",
+                              "--eta", "0.3"), split=split)
+    with pytest.raises(ValueError, match="target_rounds"):
+        train_xgb.train(_args(tmp_path, "--num_boost_round", "8", "--checkpoint_every", "2", "--resume"), split=split)
+    with pytest.raises(ValueError, match="data"):
+        train_xgb.train(_args(tmp_path, "--num_boost_round", "6", "--checkpoint_every", "2", "--resume"),
+                        split=make_split(seed=1))
+
+
+def test_warm_start_reference_uses_same_split(tmp_path, make_split, write_mappings):
+    split = make_split()
+    write_mappings(tmp_path, len(split.feature_names), len(split.classes))  # warm start 는 기존 매핑 파일을 읽음
+    train_xgb.train(_args(tmp_path, "--num_boost_round", "4"), split=split)
+    warm = tmp_path / "warm"
+    train_xgb.train(_args(warm, "--num_boost_round", "2", "--init_model", str(tmp_path / "xgb_model.json"),
+                          "--full_retrain_ref"), split=split)
+    report = json.loads((warm / "warm_start_report.json").read_text())
+    assert set(report) == {"base_model", "warm_start", "full_retrain_reference"}
+    assert report["full_retrain_reference"]["hit@1"] is not None
+
+    train_xgb.train(_args(tmp_path / "warm2", "--num_boost_round", "2",
+                          "--init_model", str(tmp_path / "xgb_model.json")), split=split)
+    assert json.loads((tmp_path / "warm2" / "warm_start_report.json").read_text())["full_retrain_reference"] is None
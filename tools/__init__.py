@@ -1,5 +1,12 @@
 # HighFour/tools/__init__.py
+# numpy / 예측 모듈은 MLPredictTool 을 처음 쓸 때 import(패키지 import만으로는 무거운 모듈을 읽지 않음)
 
-from .ml_predict_tools import MLPredictTool
+__all__ = ["MLPredictTool"]
 
-__all__ = ["MLPredictTool"]
\ No newline at end of file
+
+def __getattr__(name):
+    if name == "MLPredictTool":
+        from .ml_predict_tools import MLPredictTool
+
+        return MLPredictTool
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
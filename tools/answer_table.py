@@ -0,0 +1,171 @@
+"""
+tools/answer_table.py
+
+자주 나오는 증상 조합의 예측 결과를 미리 계산해 둔 해시 테이블 (ml/train/build_answer_table.py 가 생성)
+
+- 키: 인식된 증상 비트마스크(377비트 → uint64 6개, feature_names.json 순서, little-endian)
+- 값: temperature 적용 후 상위 K 클래스(int16) + 확률(float32, float16은 근접한 값의 순위가 뒤집힐 수 있음)
+  · Top-K 재분배(표시용)는 상위 k개 값만으로 계산되므로 k <= K 인 요청은 모델 없이 답할 수 있음
+- 구조: open addressing(선형 탐사), 용량은 2의 거듭제곱, 해시는 워드별 splitmix64 누적
+- 파일(<모델 버전 디렉토리>/answer_table, 모두 np.load(mmap_mode="r")):
+  keys (cap, W) uint64 / used (cap,) uint8 / top_idx (cap, K) int16 / top_prob (cap, K) float32 / meta.json
+- meta.json 에 만든 백엔드 이름, temperature, 모델 버전, 모델 파일 크기/수정시각을 기록
+  → 모델 / 버전이 바뀌었거나 temperature가 다르면 테이블을 쓰지 않음(is_valid_for)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+TABLE_DIRNAME = "answer_table"
+TABLE_ARRAYS = ("keys", "used", "top_idx", "top_prob")
+
+_M64 = (1 << 64) - 1
+_C1 = 0xBF58476D1CE4E5B9
+_C2 = 0x94D049BB133111EB
+
+
+def num_words(num_features: int) -> int:
+    return (num_features + 63) // 64
+
+
+def mask_words(X: np.ndarray) -> np.ndarray:
+    """(N, F) 0/1 -> (N, W) uint64 비트마스크."""
+    X = np.asarray(X) > 0
+    n, F = X.shape
+    W = num_words(F)
+    packed = np.packbits(X, axis=1, bitorder="little")  # (N, ceil(F/8))
+    buf = np.zeros((n, W * 8), dtype=np.uint8)
+    buf[:, :packed.shape[1]] = packed
+    return buf.view("<u8").reshape(n, W)
+
+
+def hash_words(keys: np.ndarray) -> np.ndarray:
+    """(N, W) uint64 -> (N,) uint64 해시 (단일 키용 _hash_one 과 같은 값)."""
+    h = np.zeros(keys.shape[0], dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for j in range(keys.shape[1]):
+            z = h ^ keys[:, j]
+            z = (z ^ (z >> np.uint64(30))) * np.uint64(_C1)
+            z = (z ^ (z >> np.uint64(27))) * np.uint64(_C2)
+            h = z ^ (z >> np.uint64(31))
+    return h
+
+
+def _hash_one(words: Sequence[int]) -> int:
+    h = 0
+    for w in words:
+        z = h ^ int(w)
+        z = ((z ^ (z >> 30)) * _C1) & _M64
+        z = ((z ^ (z >> 27)) * _C2) & _M64
+        h = z ^ (z >> 31)
+    return h
+
+
+def file_stamps(paths: Sequence[Path]) -> List[dict]:
+    """모델 파일 식별 정보(이름, 크기, 수정시각)."""
+    out = []
+    for p in paths:
+        p = Path(p)
+        if p.exists():
+            st = p.stat()
+            out.append({"path": p.name, "size": int(st.st_size), "mtime_ns": int(st.st_mtime_ns)})
+    return out
+
+
+def write_table(
+    out_dir: Path,
+    keys: np.ndarray,
+    top_idx: np.ndarray,
+    top_prob: np.ndarray,
+    meta: dict,
+    load_factor: float = 0.5,
+) -> Path:
+    """키 (N, W) / 값을 open addressing 테이블로 저장. 중복 키는 처음 것만 사용."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    n, W = keys.shape
+    K = top_idx.shape[1]
+    cap = 1
+    while cap < max(int(n / load_factor), 1):
+        cap *= 2
+    mask = cap - 1
+
+    t_keys = np.zeros((cap, W), dtype=np.uint64)
+    t_used = np.zeros(cap, dtype=np.uint8)
+    t_idx = np.zeros((cap, K), dtype=np.int16)
+    t_prob = np.zeros((cap, K), dtype=np.float32)
+
+    slots = (hash_words(keys) & np.uint64(mask)).astype(np.int64)
+    inserted = 0
+    for i in range(n):
+        s = int(slots[i])
+        while t_used[s] and not np.array_equal(t_keys[s], keys[i]):
+            s = (s + 1) & mask
+        if t_used[s]:
+            continue
+        t_keys[s], t_used[s] = keys[i], 1
+        t_idx[s], t_prob[s] = top_idx[i], top_prob[i]
+        inserted += 1
+
+    meta_path = out_dir / "meta.json"
+    if meta_path.exists():
+        meta_path.unlink()
+    # 서빙 중인 AnswerTable 이 mmap 한 파일을 덮어쓰지 않도록 임시 파일에 쓰고 교체(meta.json 은 마지막)
+    for name, arr in zip(TABLE_ARRAYS, (t_keys, t_used, t_idx, t_prob)):
+        tmp = out_dir / f"{name}.tmp.npy"
+        np.save(tmp, arr)
+        os.replace(tmp, out_dir / f"{name}.npy")
+    meta = {**meta, "capacity": cap, "entries": inserted, "num_words": W, "topk": K}
+    meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    return out_dir
+
+
+class AnswerTable:
+    """write_table 로 만든 테이블 조회(읽기 전용, 스레드 안전)."""
+
+    def __init__(self, table_dir: Path, mmap: bool = True):
+        self.table_dir = Path(table_dir)
+        self.meta = json.loads((self.table_dir / "meta.json").read_text(encoding="utf-8"))
+        mode = "r" if mmap else None
+        for name in TABLE_ARRAYS:
+            setattr(self, name, np.load(self.table_dir / f"{name}.npy", mmap_mode=mode))
+        self.capacity = int(self.meta["capacity"])
+        self.topk = int(self.meta["topk"])
+        self._mask = self.capacity - 1
+
+    def nbytes(self) -> int:
+        return int(sum((self.table_dir / f"{name}.npy").stat().st_size for name in TABLE_ARRAYS))
+
+    def is_valid_for(
+        self, backend: str, temperature: float, model_paths: Sequence[Path], version: Optional[str] = None
+    ) -> bool:
+        """같은 백엔드 / temperature / 모델 파일(+ version 을 주면 같은 모델 버전)로 만든 테이블인지."""
+        return (
+            self.meta.get("backend") == backend
+            and (version is None or self.meta.get("model_version", "local") == version)
+            and abs(float(self.meta.get("temperature", -1.0)) - float(temperature)) < 1e-9
+            and self.meta.get("model_files") == file_stamps(model_paths)
+        )
+
+    def lookup_words(self, words: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(W,) uint64 마스크 -> (상위 K 클래스, 확률) 또는 None."""
+        key = [int(w) for w in words]
+        s = _hash_one(key) & self._mask
+        for _ in range(self.capacity):
+            if not self.used[s]:
+                return None
+            if [int(w) for w in self.keys[s]] == key:
+                return np.asarray(self.top_idx[s], dtype=np.int64), np.asarray(self.top_prob[s], dtype=np.float32)
+            s = (s + 1) & self._mask
+        return None
+
+    def lookup(self, x: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(1, F) 또는 (F,) 0/1 벡터로 조회."""
+        x = np.asarray(x).reshape(1, -1)
+        return self.lookup_words(mask_words(x)[0])
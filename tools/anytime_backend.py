@@ -0,0 +1,132 @@
+"""
+tools/anytime_backend.py
+
+XGBoost 점진 평가(anytime) 백엔드 (예측 백엔드 이름: "xgb_anytime", 모델 파일은 xgb 백엔드와 같음: ubj 우선)
+
+- 전체 라운드를 한 번에 평가하지 않고 iteration_range 청크(chunk_rounds)씩 margin을 누적
+  · predict(output_margin=True, iteration_range=(a, b)) 는 base_score 가 매번 포함되므로
+    두 번째 청크부터 base margin(b0)을 빼서 더한다:  m(0, b) = m(0, a) + m(a, b) - b0
+  · b0 는 로드 시 0 벡터로 m(0,1) + m(1,2) - m(0,2) 로 계산(입력과 무관한 상수)
+- 행마다 멈춤 조건
+  · 상위 K 클래스(순서 포함)가 patience 청크 연속으로 같고
+  · K번째와 K+1번째 margin 차이가 min_margin 이상
+  · 또는 요청 시작부터 time_budget_ms 를 넘김(다음 청크를 시작하지 않음)
+- 출력은 지금까지 누적한 margin의 softmax(전체 라운드를 다 쓰면 기존 xgb 백엔드와 동일)
+- 행별 사용 라운드는 predict_proba_anytime 의 반환값으로만 돌려줌
+  (동시 요청끼리 덮어쓰지 않도록 인스턴스에 저장하지 않음)
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .predict_backends import XGBBackend, _softmax
+
+
+def _topk_order(M: np.ndarray, k: int) -> np.ndarray:
+    """행별 상위 k 인덱스(내림차순)."""
+    idx = np.argpartition(M, -k, axis=1)[:, -k:]
+    order = np.argsort(-np.take_along_axis(M, idx, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1)
+
+
+def _kth_gap(M: np.ndarray, k: int) -> np.ndarray:
+    """행별 (K번째 margin - K+1번째 margin)."""
+    part = -np.partition(-M, (k - 1, k), axis=1)
+    return part[:, k - 1] - part[:, k]
+
+
+class AnytimeXGBBackend(XGBBackend):
+    """xgb_model.json 을 청크 단위로 평가하다가 상위 K가 안정되면 멈춤."""
+
+    name = "xgb_anytime"
+
+    def __init__(
+        self,
+        artifacts_dir: Optional[Path] = None,
+        chunk_rounds: int = 20,
+        patience: int = 2,
+        min_margin: float = 1.0,
+        time_budget_ms: float = 0.0,
+        k: int = 5,
+        nthread: Optional[int] = None,
+        model_format: Optional[str] = None,
+    ):
+        super().__init__(artifacts_dir=artifacts_dir, nthread=nthread, model_format=model_format)
+        self.chunk_rounds = int(chunk_rounds)
+        self.patience = int(patience)
+        self.min_margin = float(min_margin)
+        self.time_budget_ms = float(time_budget_ms)
+        self.k = int(k)
+
+    def _load(self) -> None:
+        super()._load()
+        self.num_rounds = int(self.booster.num_boosted_rounds())
+        self.num_classes = len(self.classes)
+        zero = self._xgb.DMatrix(np.zeros((1, len(self.feature_names)), dtype=np.float32), feature_names=self.feature_names)
+        if self.num_rounds >= 2:
+            m01 = self._margin(zero, 0, 1)
+            m12 = self._margin(zero, 1, 2)
+            m02 = self._margin(zero, 0, 2)
+            self.base_margin = (m01 + m12 - m02)[0]
+        else:
+            self.base_margin = np.zeros(self.num_classes, dtype=np.float32)
+
+    def _margin(self, dm, start: int, end: int) -> np.ndarray:
+        m = self.booster.predict(dm, output_margin=True, iteration_range=(start, end))
+        return m.reshape(dm.num_row(), -1)
+
+    def predict_proba_anytime(
+        self,
+        X: np.ndarray,
+        chunk_rounds: Optional[int] = None,
+        patience: Optional[int] = None,
+        min_margin: Optional[float] = None,
+        time_budget_ms: Optional[float] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(확률 (N, C), 행별 사용 라운드 수 (N,)). 인자를 생략하면 생성자 설정 사용."""
+        if not self.loaded:
+            self.load()
+        t_start = time.perf_counter()
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        step = int(chunk_rounds or self.chunk_rounds)
+        patience = self.patience if patience is None else int(patience)
+        min_margin = self.min_margin if min_margin is None else float(min_margin)
+        budget = self.time_budget_ms if time_budget_ms is None else float(time_budget_ms)
+        k = min(self.k, self.num_classes - 1)
+
+        n = X.shape[0]
+        r = min(step, self.num_rounds)
+        margin = self._margin(self._xgb.DMatrix(X, feature_names=self.feature_names), 0, r)
+        rounds = np.full(n, r, dtype=np.int32)
+        stable = np.zeros(n, dtype=np.int32)
+        prev_top = _topk_order(margin, k)
+        active = np.arange(n)
+
+        while r < self.num_rounds and active.size:
+            if budget > 0 and (time.perf_counter() - t_start) * 1000.0 >= budget:
+                break
+            nxt = min(r + step, self.num_rounds)
+            dm = self._xgb.DMatrix(X[active], feature_names=self.feature_names)
+            margin[active] += self._margin(dm, r, nxt) - self.base_margin
+            rounds[active] = nxt
+            r = nxt
+
+            top = _topk_order(margin[active], k)
+            same = (top == prev_top[active]).all(axis=1)
+            stable[active] = np.where(same, stable[active] + 1, 0)
+            prev_top[active] = top
+            done = (stable[active] >= patience) & (_kth_gap(margin[active], k) >= min_margin)
+            active = active[~done]
+
+        return _softmax(margin), rounds
+
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        P, _ = self.predict_proba_anytime(X)
+        return P
@@ -0,0 +1,336 @@
+"""
+tools/artifact_versions.py
+
+ML 아티팩트 버전 관리(매니페스트 + CURRENT 포인터) / 백그라운드 감시
+
+디렉토리 구조(artifacts_dir):
+  versions/<version>/   모델 파일 + feature_names.json + label_mapping.json + train_config.json
+                        + smoke.npy(스모크 입력) + manifest.json
+  CURRENT               활성 버전 이름 한 줄(임시 파일 → os.replace 로 원자적 교체)
+
+- version = 파일 내용 해시(sha256, 상대 경로 + 파일별 sha256 정렬 후 해시)의 앞 12자리
+  → 같은 내용을 다시 publish 하면 같은 버전
+- publish: versions/.tmp-<version> 에 상대 경로 그대로 복사(copy2, 수정시각 유지) → 백엔드별 스모크 기대값 계산
+  → manifest.json 기록 → 디렉토리 이름 교체(os.replace) → (activate면) CURRENT 교체
+  · 한 버전에 기본 백엔드와 대체(fallback) 백엔드를 함께 넣음(--backends xgb,nb)
+  · 중간에 실패하면 임시 디렉토리는 지움
+- 서빙 쪽(ml_predict_tools)은 VersionWatcher 로 CURRENT 를 감시하다가 바뀌면
+  새 버전을 백그라운드로 로드 → verify_version(해시) + smoke_check 통과 시에만 교체
+- CURRENT 가 없으면(기존 평면 구조) artifacts_dir 를 그대로 사용
+
+실행 예시:
+python -m tools.artifact_versions publish --src ml/artifacts --backends xgb,nb
+python -m tools.artifact_versions activate 3f2a9c1d0b7e
+python -m tools.artifact_versions list
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .predict_backends import DEFAULT_ARTIFACTS_DIR, PredictBackend, create_backend
+
+VERSIONS_DIRNAME = "versions"
+CURRENT_FILENAME = "CURRENT"
+MANIFEST_FILENAME = "manifest.json"
+SMOKE_FILENAME = "smoke.npy"
+MAPPING_FILES = ("feature_names.json", "label_mapping.json", "train_config.json")
+
+
+# =========================
+# 해시 / 매니페스트
+# =========================
+def _sha256_file(path: Path, chunk: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def content_hash(file_hashes: Dict[str, str]) -> str:
+    """{파일 이름: sha256} -> 버전 전체 sha256 (순서 무관)."""
+    h = hashlib.sha256()
+    for name in sorted(file_hashes):
+        h.update(f"{name}:{file_hashes[name]}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def version_dir(artifacts_dir: Path, version: str) -> Path:
+    return Path(artifacts_dir) / VERSIONS_DIRNAME / version
+
+
+def read_current(artifacts_dir: Path) -> Optional[str]:
+    p = Path(artifacts_dir) / CURRENT_FILENAME
+    if not p.exists():
+        return None
+    version = p.read_text(encoding="utf-8").strip()
+    return version or None
+
+
+def resolve_current(artifacts_dir: Path) -> Tuple[Optional[str], Path]:
+    """(활성 버전 이름, 모델을 읽을 디렉토리). 버전 구조가 아니면 (None, artifacts_dir)."""
+    version = read_current(artifacts_dir)
+    if version is None:
+        return None, Path(artifacts_dir)
+    return version, version_dir(artifacts_dir, version)
+
+
+def set_current(artifacts_dir: Path, version: str) -> None:
+    """CURRENT 를 원자적으로 교체(감시 중인 워커는 다음 확인 때 새 버전을 로드)."""
+    vdir = version_dir(artifacts_dir, version)
+    if not (vdir / MANIFEST_FILENAME).exists():
+        raise FileNotFoundError(f"매니페스트가 없는 버전: {vdir}")
+    tmp = Path(artifacts_dir) / f".{CURRENT_FILENAME}.tmp"
+    tmp.write_text(version + "\n", encoding="utf-8")
+    os.replace(tmp, Path(artifacts_dir) / CURRENT_FILENAME)
+
+
+def list_versions(artifacts_dir: Path) -> List[dict]:
+    root = Path(artifacts_dir) / VERSIONS_DIRNAME
+    if not root.exists():
+        return []
+    out = []
+    for d in sorted(root.iterdir()):
+        m = d / MANIFEST_FILENAME
+        if d.is_dir() and not d.name.startswith(".") and m.exists():
+            out.append(json.loads(m.read_text(encoding="utf-8")))
+    return sorted(out, key=lambda m: m.get("created_at", 0.0))
+
+
+def verify_version(vdir: Path) -> dict:
+    """매니페스트의 파일 해시를 다시 계산해 비교. 다르면 ValueError, 같으면 매니페스트 반환."""
+    vdir = Path(vdir)
+    manifest = json.loads((vdir / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    for name, info in manifest["files"].items():
+        p = vdir / name
+        if not p.exists():
+            raise ValueError(f"[{manifest['version']}] 파일 없음: {name}")
+        if _sha256_file(p) != info["sha256"]:
+            raise ValueError(f"[{manifest['version']}] 해시 불일치: {name}")
+    return manifest
+
+
+# =========================
+# 스모크 검증
+# =========================
+def _smoke_inputs(num_features: int, n_rows: int, seed: int = 0) -> np.ndarray:
+    """증상 1~4개짜리 고정 입력(재현 가능)."""
+    rng = np.random.default_rng(seed)
+    X = np.zeros((n_rows, num_features), dtype=np.uint8)
+    for i in range(n_rows):
+        X[i, rng.choice(num_features, size=int(rng.integers(1, 5)), replace=False)] = 1
+    return X
+
+
+def smoke_check(backend: PredictBackend, vdir: Path, min_agree: float = 0.99) -> dict:
+    """
+    smoke.npy 로 예측해서
+    - 모양 (n, C) / 유한값 / 행 합 1
+    - publish 때 함께 등록한 백엔드면 top-1 일치율 >= min_agree
+    를 확인. 실패하면 ValueError.
+    """
+    vdir = Path(vdir)
+    manifest = json.loads((vdir / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    X = np.load(vdir / SMOKE_FILENAME).astype(np.float32)
+    P = np.asarray(backend.predict_proba(X))
+    if P.shape != (X.shape[0], len(backend.classes)):
+        raise ValueError(f"[{backend.name}] 스모크 출력 모양 이상: {P.shape}")
+    if not np.isfinite(P).all() or not np.allclose(P.sum(axis=1), 1.0, atol=1e-3):
+        raise ValueError(f"[{backend.name}] 스모크 출력이 확률 분포가 아님")
+    result = {"rows": int(X.shape[0])}
+    expected = manifest.get("smoke", {}).get("top1", {}).get(backend.name)
+    if expected is not None:
+        agree = float((P.argmax(axis=1) == np.asarray(expected)).mean())
+        result["top1_agree"] = agree
+        if agree < min_agree:
+            raise ValueError(f"[{backend.name}] 스모크 top-1 일치율 {agree:.3f} < {min_agree}")
+    return result
+
+
+# =========================
+# publish
+# =========================
+def _publish_files(src_dir: Path, backends: Sequence[str]) -> List[Path]:
+    """버전에 넣을 파일(백엔드별 artifact_paths + 매핑 파일). src_dir 밖의 파일이면 ValueError."""
+    files: List[Path] = []
+    for name in backends:
+        files += create_backend(name, artifacts_dir=src_dir, load=False).artifact_paths()
+    files += [src_dir / name for name in MAPPING_FILES]
+    missing = [str(p) for p in files if not p.exists()]
+    if missing:
+        raise FileNotFoundError(f"publish 할 파일이 없음: {missing}")
+    outside = [str(p) for p in files if not Path(p).resolve().is_relative_to(src_dir.resolve())]
+    if outside:
+        raise ValueError(f"src_dir 밖의 파일은 버전에 넣을 수 없음: {outside}")
+    return sorted(set(files))
+
+
+def publish_version(
+    src_dir: Path,
+    artifacts_dir: Path,
+    backends: Sequence[str] = ("xgb", "nb"),
+    activate: bool = True,
+    smoke_rows: int = 64,
+) -> str:
+    """
+    src_dir 의 모델(backends 각각의 artifact_paths) + 매핑 파일을 새 버전으로 등록. 버전 이름 반환.
+    - 첫 번째가 기본 백엔드, 나머지는 같은 버전에서 함께 로드할 대체(fallback) 백엔드
+    - 파일은 src_dir 기준 상대 경로로 복사 / 해시(nb_np/delta.npy 처럼 하위 디렉토리 유지)
+    """
+    src_dir, artifacts_dir = Path(src_dir), Path(artifacts_dir)
+    backends = list(dict.fromkeys(backends))
+    if not backends:
+        raise ValueError("publish 할 백엔드가 없습니다.")
+    files = _publish_files(src_dir, backends)
+
+    rel = {p: p.relative_to(src_dir).as_posix() for p in files}
+    hashes = {rel[p]: _sha256_file(p) for p in files}
+    digest = content_hash(hashes)
+    version = digest[:12]
+    vdir = version_dir(artifacts_dir, version)
+    if (vdir / MANIFEST_FILENAME).exists():
+        print(f"[artifact_versions] 이미 있는 버전: {version}")
+    else:
+        tmp = vdir.parent / f".tmp-{version}"
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        tmp.mkdir(parents=True)
+        try:
+            for p in files:
+                dst = tmp / rel[p]
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(p, dst)
+
+            # 스모크 기대값: 복사본으로 로드해서 계산(로드 경로까지 같이 확인)
+            loaded = [create_backend(name, artifacts_dir=tmp) for name in backends]
+            X = _smoke_inputs(len(loaded[0].feature_names), smoke_rows)
+            np.save(tmp / SMOKE_FILENAME, X)
+            top1 = {
+                name: np.asarray(be.predict_proba(X.astype(np.float32))).argmax(axis=1).astype(int).tolist()
+                for name, be in zip(backends, loaded)
+            }
+
+            manifest = {
+                "version": version,
+                "sha256": digest,
+                "created_at": time.time(),
+                "source": str(src_dir.resolve()),
+                "backend": backends[0],
+                "backends": backends,
+                "files": {name: {"sha256": h, "size": (tmp / name).stat().st_size} for name, h in hashes.items()},
+                "smoke": {"rows": int(smoke_rows), "top1": top1},
+            }
+            (tmp / MANIFEST_FILENAME).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(tmp, vdir)
+        finally:
+            # 실패하면(또는 교체 후 남은 게 있으면) 임시 디렉토리 정리
+            if tmp.exists():
+                shutil.rmtree(tmp, ignore_errors=True)
+        print(f"[artifact_versions] publish: {version} -> {vdir} (backends={','.join(backends)})")
+
+    if activate:
+        set_current(artifacts_dir, version)
+        print(f"[artifact_versions] CURRENT = {version}")
+    return version
+
+
+# =========================
+# 감시
+# =========================
+class VersionWatcher(threading.Thread):
+    """
+    CURRENT 를 interval 초마다 확인. 바뀌면 이 스레드에서 on_change(version, version_dir) 호출
+    (로드 / 검증 / 교체는 콜백이 담당, 예외가 나면 그 버전은 CURRENT 가 다시 바뀔 때까지 재시도하지 않음).
+    """
+
+    def __init__(
+        self,
+        artifacts_dir: Path,
+        on_change: Callable[[str, Path], None],
+        interval: float = 5.0,
+        current: Optional[str] = None,
+    ):
+        super().__init__(name="artifact-version-watcher", daemon=True)
+        self.artifacts_dir = Path(artifacts_dir)
+        self.on_change = on_change
+        self.interval = float(interval)
+        self.seen = current
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                version = read_current(self.artifacts_dir)
+            except OSError:
+                continue
+            if version is None or version == self.seen:
+                continue
+            self.seen = version
+            try:
+                self.on_change(version, version_dir(self.artifacts_dir, version))
+            except Exception as e:
+                print(f"[artifact_versions] 버전 {version} 적용 실패(기존 모델 유지): {type(e).__name__}: {e}")
+
+
+# =========================
+# CLI
+# =========================
+def run(args: argparse.Namespace) -> None:
+    artifacts_dir = Path(args.artifacts_dir)
+    if args.cmd == "publish":
+        backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+        publish_version(Path(args.src or artifacts_dir), artifacts_dir, backends=backends,
+                        activate=not args.no_activate, smoke_rows=args.smoke_rows)
+    elif args.cmd == "activate":
+        verify_version(version_dir(artifacts_dir, args.version))
+        set_current(artifacts_dir, args.version)
+        print(f"[artifact_versions] CURRENT = {args.version}")
+    elif args.cmd == "verify":
+        version = args.version or read_current(artifacts_dir)
+        if version is None:
+            raise SystemExit("활성 버전이 없습니다(CURRENT 없음).")
+        verify_version(version_dir(artifacts_dir, version))
+        print(f"[artifact_versions] {version}: OK")
+    else:
+        current = read_current(artifacts_dir)
+        for m in list_versions(artifacts_dir):
+            mark = "*" if m["version"] == current else " "
+            created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(m["created_at"]))
+            backends = ",".join(m.get("backends", [m["backend"]]))
+            print(f"{mark} {m['version']}  {created}  backends={backends}  files={len(m['files'])}")
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--artifacts_dir", default=str(DEFAULT_ARTIFACTS_DIR))
+    sub = p.add_subparsers(dest="cmd", required=True)
+    pub = sub.add_parser("publish", help="새 버전 등록(+활성화)")
+    pub.add_argument("--src", default="", help="모델 파일이 있는 디렉토리(기본: artifacts_dir)")
+    pub.add_argument("--backends", default="xgb,nb",
+                     help="버전에 포함할 백엔드(쉼표 구분, 첫 번째가 기본 / 나머지는 fallback)")
+    pub.add_argument("--smoke_rows", type=int, default=64)
+    pub.add_argument("--no_activate", action="store_true", help="등록만 하고 CURRENT 는 그대로")
+    act = sub.add_parser("activate", help="CURRENT 를 지정 버전으로(해시 검증 후)")
+    act.add_argument("version")
+    ver = sub.add_parser("verify", help="버전 파일 해시 검증(기본: CURRENT)")
+    ver.add_argument("version", nargs="?", default="")
+    sub.add_parser("list", help="버전 목록")
+    return p
+
+
+if __name__ == "__main__":
+    run(build_argparser().parse_args())
@@ -0,0 +1,193 @@
+"""
+tools/ensemble_backend.py
+
+여러 예측 백엔드를 동시에 실행해 합치는 앙상블 백엔드 (예측 백엔드 이름: "ensemble")
+
+- 구성: artifacts/ensemble_config.json (ml/train/fit_ensemble.py 가 val split으로 학습)
+    {"members": [{"name": "xgb", "weight": 0.6, "temperature": 1.3}, ...], "deadline_ms": 80, "member_workers": 4}
+- 멤버마다 전용 executor(member_workers 스레드)에서 동시에 실행(xgboost / numpy / catboost 네이티브 코드는 GIL을 놓음)
+  → 느린 멤버가 다른 멤버의 작업자를 차지하지 않고, 동시 요청도 멤버 안에서 줄 서지 않음
+- 멤버별 보정: p' ∝ p^(1/temperature) → 가중 평균 Σ w_i p'_i / Σ w_i
+- 요청별 마감(deadline_ms):
+  · 마감까지 끝난 멤버만으로 합침(가중치는 끝난 멤버끼리 다시 정규화)
+  · 마감까지 하나도 못 끝내면 가장 먼저 끝나는 멤버 하나를 기다려 사용
+  · 늦은 멤버는 취소되지 않고 백그라운드에서 끝까지 실행되며 결과는 버림(late 카운터 증가)
+  · 늦은 작업이 작업자를 모두 차지한 멤버에는 새 요청을 넣지 않고 빼고 합침(late 카운터 증가, 밀린 작업이 쌓이지 않음)
+    모든 멤버가 그런 상태면 그대로 넣고 먼저 끝나는 멤버를 기다림
+  · 예외가 난 멤버는 빼고 합침(모두 실패하면 RuntimeError)
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from .predict_backends import PredictBackend, create_backend
+
+CONFIG_FILENAME = "ensemble_config.json"
+DEFAULT_MEMBER_WORKERS = 4
+
+
+def calibrate(P: np.ndarray, temperature: float, eps: float = 1e-12) -> np.ndarray:
+    """p' ∝ p^(1/T). T=1이면 그대로."""
+    if temperature == 1.0:
+        return P
+    P_t = np.clip(P, eps, 1.0) ** (1.0 / temperature)
+    return P_t / P_t.sum(axis=1, keepdims=True)
+
+
+class EnsembleBackend(PredictBackend):
+    """ensemble_config.json 의 멤버들을 병렬 실행해 보정 확률을 가중 평균."""
+
+    name = "ensemble"
+
+    def __init__(
+        self,
+        artifacts_dir: Optional[Path] = None,
+        members: Optional[List[dict]] = None,
+        deadline_ms: Optional[float] = None,
+        member_workers: Optional[int] = None,
+    ):
+        super().__init__(artifacts_dir=artifacts_dir)
+        self._members_override = members
+        self._deadline_override = deadline_ms
+        self._workers_override = member_workers
+        self.members: List[dict] = []
+        self.backends: Dict[str, PredictBackend] = {}
+        self.deadline_ms = 0.0
+        self.member_workers = DEFAULT_MEMBER_WORKERS
+        self._pools: Dict[str, ThreadPoolExecutor] = {}  # 멤버 이름 -> 전용 executor(member_workers 스레드)
+        self._late: Dict[str, Set[Future]] = {}  # 멤버 이름 -> 마감을 넘겨 아직 실행 중일 수 있는 작업들
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "deadline_hits": 0, "fallback_first": 0, "late": {}, "errors": {}}
+
+    def artifact_paths(self) -> List[Path]:
+        paths = [self.artifacts_dir / CONFIG_FILENAME]
+        for be in self.backends.values():
+            paths += be.artifact_paths()
+        return paths
+
+    def _load(self) -> None:
+        if self._members_override is not None:
+            cfg = {"members": self._members_override, "deadline_ms": 0.0}
+        else:
+            cfg = json.loads(self._require(self.artifacts_dir / CONFIG_FILENAME).read_text(encoding="utf-8"))
+        self.members = [
+            {"name": m["name"], "weight": float(m.get("weight", 1.0)), "temperature": float(m.get("temperature", 1.0))}
+            for m in cfg["members"]
+            if float(m.get("weight", 1.0)) > 0
+        ]
+        if not self.members:
+            raise ValueError(f"[{self.name}] 가중치가 0보다 큰 멤버가 없습니다.")
+        if any(m["name"] == self.name for m in self.members):
+            raise ValueError(f"[{self.name}] 앙상블 멤버로 ensemble 자신을 쓸 수 없습니다.")
+        self.deadline_ms = float(self._deadline_override if self._deadline_override is not None else cfg.get("deadline_ms", 0.0))
+        workers = self._workers_override if self._workers_override is not None else cfg.get("member_workers")
+        self.member_workers = max(1, int(workers if workers is not None else DEFAULT_MEMBER_WORKERS))
+
+        for m in self.members:
+            be = create_backend(m["name"], artifacts_dir=self.artifacts_dir)
+            if be.classes != self.classes or be.feature_names != self.feature_names:
+                raise ValueError(f"[{self.name}] 멤버 {m['name']}의 피처/클래스 순서가 다릅니다.")
+            self.backends[m["name"]] = be
+        self._pools = {
+            m["name"]: ThreadPoolExecutor(max_workers=self.member_workers, thread_name_prefix=f"ensemble-{m['name']}")
+            for m in self.members
+        }
+        self._late = {m["name"]: set() for m in self.members}
+        self.stats["late"] = {m["name"]: 0 for m in self.members}
+        self.stats["errors"] = {m["name"]: 0 for m in self.members}
+
+    def _combine(self, results: Dict[str, np.ndarray]) -> np.ndarray:
+        total = 0.0
+        out = None
+        for m in self.members:
+            P = results.get(m["name"])
+            if P is None:
+                continue
+            part = m["weight"] * calibrate(np.asarray(P, dtype=np.float32), m["temperature"])
+            out = part if out is None else out + part
+            total += m["weight"]
+        return out / total
+
+    def predict_members(self, X: np.ndarray, deadline_ms: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """멤버별 원본 확률(마감까지 끝난 멤버만). deadline_ms<=0 이면 모두 기다림."""
+        if not self.loaded:
+            self.load()
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        deadline_ms = self.deadline_ms if deadline_ms is None else deadline_ms
+
+        futures, skipped = self._submit(X)
+        timeout = deadline_ms / 1000.0 if deadline_ms and deadline_ms > 0 else None
+        done, pending = wait(futures, timeout=timeout)
+
+        results: Dict[str, np.ndarray] = {}
+        errors: Dict[str, BaseException] = {}
+        fallback_first = False
+        for f in done:
+            self._collect(f, futures[f], results, errors)
+        # 마감까지 쓸 수 있는 결과가 없으면 먼저 끝나는 멤버를 기다림
+        while not results and pending:
+            more, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in more:
+                self._collect(f, futures[f], results, errors)
+            fallback_first = True
+
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            if pending:
+                self.stats["deadline_hits"] += 1
+                for f in pending:
+                    self.stats["late"][futures[f]] += 1
+                    self._late[futures[f]].add(f)
+            for name in skipped:
+                self.stats["late"][name] += 1
+            if fallback_first:
+                self.stats["fallback_first"] += 1
+            for name in errors:
+                self.stats["errors"][name] += 1
+
+        if not results:
+            name, err = next(iter(errors.items()))
+            raise RuntimeError(f"[{self.name}] 모든 멤버 예측 실패(예: {name}: {type(err).__name__}: {err})") from err
+        return results
+
+    def _submit(self, X: np.ndarray):
+        """늦은 작업이 작업자를 모두 차지한 멤버는 건너뛰고 나머지 멤버 executor 에 제출. ({future: 이름}, 건너뛴 이름들)."""
+        with self._stats_lock:
+            busy = set()
+            for name, late in self._late.items():
+                late.difference_update([f for f in late if f.done()])
+                if len(late) >= self.member_workers:
+                    busy.add(name)
+        names = [m["name"] for m in self.members]
+        if busy.issuperset(names):
+            busy = set()  # 모두 늦은 작업 중이면 건너뛸 수 없음(뒤에 줄 세우고 먼저 끝나는 멤버를 기다림)
+        futures = {
+            self._pools[name].submit(self.backends[name].predict_proba, X): name for name in names if name not in busy
+        }
+        return futures, [name for name in names if name in busy]
+
+    @staticmethod
+    def _collect(future, name: str, results: dict, errors: dict) -> None:
+        err = future.exception()
+        if err is None:
+            results[name] = future.result()
+        else:
+            errors[name] = err
+
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return self._combine(self.predict_members(X))
+
+    def close(self) -> None:
+        for pool in self._pools.values():
+            pool.shutdown(wait=False)
+        self._pools = {}
+        self._late = {name: set() for name in self._late}
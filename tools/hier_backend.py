@@ -0,0 +1,116 @@
+"""
+tools/hier_backend.py
+
+계층형(2단계) 질병 분류기 추론 (ml/train/train_hier.py 산출물 사용)
+
+- 1단계: 증상 -> 질병 클러스터 확률
+- 2단계: 상위 top_clusters 개 클러스터의 부스터만 실행
+- p(질병) = p(클러스터) * p(질병 | 클러스터), 나머지 클러스터의 질병은 0
+- 출력은 (N, C) 확률 행렬 → ml_predict_tools와 같은 temperature / Top-K 후처리를 그대로 적용
+- 예측 백엔드 레지스트리 이름: "hier" (HIGHFOUR_ML_BACKEND=hier)
+
+사용:
+    from tools.hier_backend import predict_topk_diseases
+    predict_topk_diseases(["headache", "nausea"], topk=5)
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional
+import json
+
+import numpy as np
+
+from .predict_backends import PredictBackend
+
+
+class HierarchicalPredictor(PredictBackend):
+    """2단계 모델 묶음(예측 백엔드 이름: "hier"). load() 이후 predict_proba(X: (N, F)) -> (N, C)."""
+
+    name = "hier"
+
+    def __init__(
+        self,
+        model_dir: Optional[Path] = None,
+        top_clusters: Optional[int] = None,
+        artifacts_dir: Optional[Path] = None,
+    ):
+        super().__init__(artifacts_dir=artifacts_dir)
+        self.model_dir = Path(model_dir) if model_dir is not None else self.artifacts_dir / "hier"
+        self.top_clusters = top_clusters
+        self.num_classes = 0
+        self._clusters: List[np.ndarray] = []
+        self._stage1 = None
+        self._stage2: Dict[int, object] = {}
+
+    def artifact_paths(self) -> List[Path]:
+        return sorted(self.model_dir.glob("*.ubj")) + [self.model_dir / "hier_meta.json"]
+
+    def _load(self) -> None:
+        import xgboost as xgb
+
+        self._xgb = xgb
+        meta = json.loads(self._require(self.model_dir / "hier_meta.json").read_text(encoding="utf-8"))
+
+        self.num_classes = int(meta["num_classes"])
+        if self.num_classes != len(self.classes):
+            raise ValueError(f"계층형 모델 클래스 수({self.num_classes})가 label_mapping.json({len(self.classes)})과 다릅니다.")
+        self._clusters = [np.asarray(c, dtype=np.int64) for c in meta["clusters"]]
+        if self.top_clusters is None:
+            self.top_clusters = int(meta.get("top_clusters", 3))
+
+        stage1 = xgb.Booster()
+        stage1.load_model(str(self._require(self.model_dir / "stage1.ubj")))
+        self._stage1 = stage1
+
+        self._stage2 = {}
+        for ci, members in enumerate(self._clusters):
+            if len(members) < 2:
+                continue
+            b = xgb.Booster()
+            b.load_model(str(self._require(self.model_dir / f"cluster_{ci:03d}.ubj")))
+            self._stage2[ci] = b
+
+    def _dmatrix(self, X: np.ndarray):
+        return self._xgb.DMatrix(X, feature_names=self.feature_names)
+
+    def max_trees_per_request(self) -> int:
+        """요청 1건에서 평가하는 트리 수 상한(1단계 + 가장 큰 상위 클러스터들)."""
+        assert self._stage1 is not None
+        n1 = self._stage1.num_boosted_rounds() * len(self._clusters)
+        per_cluster = sorted(
+            (b.num_boosted_rounds() * len(self._clusters[ci]) for ci, b in self._stage2.items()),
+            reverse=True,
+        )
+        return int(n1 + sum(per_cluster[: self.top_clusters]))
+
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        n = X.shape[0]
+        p1 = self._stage1.predict(self._dmatrix(X))  # (N, K)
+        if p1.ndim == 1:
+            p1 = p1.reshape(n, -1)
+
+        m = min(self.top_clusters, p1.shape[1])
+        top = np.argpartition(p1, -m, axis=1)[:, -m:]  # (N, m)
+
+        out = np.zeros((n, self.num_classes), dtype=np.float32)
+        for ci in np.unique(top):
+            rows = np.where(np.any(top == ci, axis=1))[0]
+            members = self._clusters[ci]
+            w = p1[rows, ci]
+            if len(members) == 1:
+                out[rows, members[0]] = w
+                continue
+            p2 = self._stage2[ci].predict(self._dmatrix(X[rows]))
+            if p2.ndim == 1:
+                p2 = p2.reshape(len(rows), -1)
+            out[np.ix_(rows, members)] = w[:, None] * p2
+        return out
+
+
+def predict_topk_diseases(symptoms: List[str], topk: Optional[int] = None) -> List[str]:
+    """ml_predict_tools.predict_topk_diseases와 같은 입출력(계층형 모델 사용)."""
+    from .ml_predict_tools import DEFAULT_TOPK, predict_topk_diseases as _predict
+
+    return _predict(symptoms, topk=topk or DEFAULT_TOPK, backend="hier")
@@ -0,0 +1,134 @@
+"""
+tools/logistic_backend.py
+
+로지스틱 회귀(logistic_model.json) NumPy 서빙 백엔드 (예측 백엔드 이름: "logistic_np")
+
+- logistic_model.json(coef (C, F) / intercept (C,))을 한 번만 float32 .npy로 변환
+  · W.npy : (F, C) = coef.T  → 피처 하나의 가중치가 연속된 한 행
+  · b.npy : (C,)
+  · 열/행 순서는 label_mapping.json / feature_names.json 기준으로 정렬해서 저장
+- 로드는 np.load(mmap_mode="r") → JSON 파싱 없음, 여러 프로세스가 같은 페이지 캐시 공유
+- 점수 = b + (활성 피처 행의 합) → softmax
+  · 0/1 증상 벡터는 활성 피처가 수 개뿐이라 (F × C) 행렬곱 대신 O(활성 피처 × C)
+- 원본 JSON의 크기/수정시각이 바뀌면 다음 로드 때 자동으로 다시 변환
+
+변환만 미리 하려면:
+    python -m tools.logistic_backend --artifacts_dir ml/artifacts
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .predict_backends import PredictBackend, _active_row_logits, _align_linear, _softmax
+
+SOURCE_FILENAME = "logistic_model.json"
+NPY_DIRNAME = "logistic_np"
+
+
+def _source_stamp(path: Path) -> dict:
+    st = path.stat()
+    return {"source": path.name, "source_size": int(st.st_size), "source_mtime_ns": int(st.st_mtime_ns)}
+
+
+def convert_logistic_json(
+    json_path: Path,
+    out_dir: Path,
+    feature_names: Sequence[str],
+    classes: Sequence[str],
+) -> Path:
+    """logistic_model.json -> out_dir/{W.npy, b.npy, meta.json}. meta.json을 마지막에 써서 반쯤 쓴 변환을 쓰지 않게 한다."""
+    json_path, out_dir = Path(json_path), Path(out_dir)
+    data = json.loads(json_path.read_text(encoding="utf-8"))
+    coef = np.asarray(data["coef"], dtype=np.float32)            # (C, F)
+    intercept = np.asarray(data["intercept"], dtype=np.float32)  # (C,)
+    coef, intercept = _align_linear(
+        coef, intercept, data.get("feature_names"), data.get("classes"), feature_names, classes,
+    )
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    meta_path = out_dir / "meta.json"
+    if meta_path.exists():
+        meta_path.unlink()
+    for name, arr in (("W", np.ascontiguousarray(coef.T)), ("b", intercept)):
+        tmp = out_dir / f"{name}.tmp.npy"
+        np.save(tmp, arr)
+        os.replace(tmp, out_dir / f"{name}.npy")
+
+    meta = {
+        **_source_stamp(json_path),
+        "num_features": int(coef.shape[1]),
+        "num_classes": int(coef.shape[0]),
+        "dtype": "float32",
+    }
+    meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    return out_dir
+
+
+class LogisticNumpyBackend(PredictBackend):
+    """W(F, C) / b(C,) memmap으로 활성 피처 행만 더해 softmax."""
+
+    name = "logistic_np"
+
+    def __init__(self, artifacts_dir: Optional[Path] = None, mmap: bool = True, chunk_rows: int = 1024):
+        super().__init__(artifacts_dir=artifacts_dir)
+        self.mmap = mmap
+        self.chunk_rows = int(chunk_rows)
+        self.npy_dir = self.artifacts_dir / NPY_DIRNAME
+
+    def artifact_paths(self) -> List[Path]:
+        return [self.npy_dir / "W.npy", self.npy_dir / "b.npy", self.npy_dir / "meta.json"]
+
+    def _is_stale(self, source: Path) -> bool:
+        meta_path = self.npy_dir / "meta.json"
+        if not meta_path.exists():
+            return True
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        stamp = _source_stamp(source)
+        return any(meta.get(k) != v for k, v in stamp.items()) or (
+            meta.get("num_features") != len(self.feature_names) or meta.get("num_classes") != len(self.classes)
+        )
+
+    def _load(self) -> None:
+        source = self.artifacts_dir / SOURCE_FILENAME
+        if source.exists() and self._is_stale(source):
+            convert_logistic_json(source, self.npy_dir, self.feature_names, self.classes)
+        elif not (self.npy_dir / "meta.json").exists():
+            self._require(source)
+
+        mode = "r" if self.mmap else None
+        self.W = np.load(self._require(self.npy_dir / "W.npy"), mmap_mode=mode)
+        self.b = np.asarray(np.load(self._require(self.npy_dir / "b.npy")), dtype=np.float32)
+        if self.W.shape != (len(self.feature_names), len(self.classes)):
+            raise ValueError(f"[{self.name}] W.npy 모양 {self.W.shape}이 피처/클래스 수와 다릅니다. 다시 변환하세요.")
+
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        # 큰 배치는 (nnz, C) 임시 배열이 커지지 않게 행 청크로 나눈다
+        step = self.chunk_rows
+        parts = [
+            _softmax(_active_row_logits(self.W, self.b, X[s:s + step]))
+            for s in range(0, max(X.shape[0], 1), step)
+        ]
+        return parts[0] if len(parts) == 1 else np.concatenate(parts, axis=0)
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--artifacts_dir", default="ml/artifacts", help="logistic_model.json 이 있는 경로")
+    return p
+
+
+if __name__ == "__main__":
+    args = build_argparser().parse_args()
+    backend = LogisticNumpyBackend(artifacts_dir=Path(args.artifacts_dir))
+    backend._load_mappings()
+    out = convert_logistic_json(
+        backend.artifacts_dir / SOURCE_FILENAME, backend.npy_dir, backend.feature_names, backend.classes,
+    )
+    print(f"[saved] {out}")
@@ -0,0 +1,141 @@
+"""
+tools/micro_batcher.py
+
+동시 요청을 모아 한 번에 예측하는 마이크로 배처
+
+- 요청 스레드: submit(x) → Future (결과는 (C,) 확률 행)
+- 배경 스레드 1개가 큐에서 첫 요청을 받은 뒤
+  · max_rows 행이 모이거나 max_wait_ms 가 지나면(먼저 오는 쪽)
+  · 모은 행을 (N, F)로 쌓아 predict_fn 을 한 번 호출하고 행별로 Future 에 결과를 넣음
+- 단일 행 예측마다 드는 Python → 부스터 호출 / DMatrix 생성 비용을 배치 단위로 나눠 냄
+  (부스터는 배경 스레드 하나만 쓰므로 요청 스레드끼리 부스터를 두고 경쟁하지 않음)
+- predict_fn 이 실패하면 그 배치의 모든 Future 에 같은 예외를 넣음
+- 종료(close) 후 submit 은 BatcherClosed. 종료 확인과 큐 넣기는 같은 잠금 안에서 하므로
+  close 전에 받아들인 요청은 모두 결과나 예외를 받음(Future 가 영원히 대기하지 않음)
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+_STOP = object()
+
+
+class BatcherClosed(RuntimeError):
+    """이미 종료된 배처에 요청을 넣음."""
+
+
+class MicroBatcher:
+    """predict_fn((N, F) float32) -> (N, C) 를 배치로 호출하는 배경 스레드."""
+
+    def __init__(
+        self,
+        predict_fn: Callable[[np.ndarray], np.ndarray],
+        max_rows: int = 64,
+        max_wait_ms: float = 2.0,
+        name: str = "micro-batcher",
+    ):
+        self.predict_fn = predict_fn
+        self.max_rows = max(int(max_rows), 1)
+        self.max_wait_ms = max(float(max_wait_ms), 0.0)
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()  # _closed 확인 + 큐 넣기를 close 와 원자적으로
+        self.stats: Dict[str, int] = {"requests": 0, "batches": 0, "errors": 0}
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    # ---- 요청 스레드 ----
+    def submit(self, x: np.ndarray) -> Future:
+        """(F,) 또는 (1, F) 벡터 1건 → Future[(C,) 확률]."""
+        item = (np.asarray(x, dtype=np.float32).reshape(-1), Future())
+        with self._lock:
+            if self._closed:
+                raise BatcherClosed("MicroBatcher 가 이미 종료되었습니다.")
+            self._queue.put(item)
+        return item[1]
+
+    def predict(self, x: np.ndarray, timeout: Optional[float] = None) -> np.ndarray:
+        return self.submit(x).result(timeout=timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """남은 요청을 처리한 뒤 배경 스레드 종료(스레드가 먼저 죽었으면 남은 요청은 BatcherClosed 로 실패)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout=timeout)
+        if not self._thread.is_alive():
+            self._fail_pending()
+
+    def _fail_pending(self) -> None:
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(BatcherClosed("MicroBatcher 가 요청을 처리하기 전에 종료되었습니다."))
+
+    # ---- 배경 스레드 ----
+    def _collect(self, first: Tuple[np.ndarray, Future]) -> Tuple[List[Tuple[np.ndarray, Future]], bool]:
+        """첫 요청 이후 max_rows / max_wait_ms 까지 모음. (배치, 종료 신호 여부)."""
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_rows:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run_batch(self, batch: List[Tuple[np.ndarray, Future]]) -> None:
+        batch = [(x, f) for x, f in batch if f.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        self.stats["requests"] += len(batch)
+        self.stats["batches"] += 1
+        try:
+            P = np.asarray(self.predict_fn(np.stack([x for x, _ in batch], axis=0)))
+        except Exception as e:
+            self.stats["errors"] += 1
+            for _, f in batch:
+                f.set_exception(e)
+            return
+        for i, (_, f) in enumerate(batch):
+            f.set_result(P[i])
+
+    def _loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch, stop = self._collect(item)
+            self._run_batch(batch)
+            if stop:
+                break
+        # 종료 후 남은 요청도 처리(close 직전에 들어온 것)
+        rest = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                rest.append(item)
+        for s in range(0, len(rest), self.max_rows):
+            self._run_batch(rest[s:s + self.max_rows])
+
+    def avg_batch_rows(self) -> float:
+        return self.stats["requests"] / max(self.stats["batches"], 1)
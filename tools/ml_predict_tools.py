@@ -9,6 +9,25 @@ tools/ml_predict_tools2.py
 
 추가:
 - 최초 1회만 모델/아티팩트 로드(캐시) -> 여러 번 호출해도 빠름
+- 예측 모델은 tools/predict_backends.py 레지스트리에서 선택(기본 xgb)
+  · 환경변수 HIGHFOUR_ML_BACKEND=logistic 처럼 바꾸거나, 호출 시 backend="..." 지정
+  · temperature / Top-K 후처리는 모든 백엔드에 동일하게 적용
+- 자주 나오는 증상 조합은 미리 계산한 답 테이블(tools/answer_table.py)을 먼저 조회
+  · 모델 버전 디렉토리의 answer_table 을 같은 백엔드 / temperature / 모델 파일 / 모델 버전으로 만든 경우만 사용
+  · HIGHFOUR_ANSWER_TABLE=0 이면 끔
+- 같은 증상 조합 반복 요청은 프로세스 내 LRU 캐시로 응답(clarify 루프 / 병원 재요청 등)
+  · 키: (백엔드, 모델 버전, 원격 서버 모델 버전, 인식된 증상 비트마스크, temperature) / 값: temperature 적용 후 전체 확률 행
+  · 모델 파일 크기/수정시각(원격이면 서버 모델 버전)이 바뀌면 캐시를 비우고 백엔드를 다시 로드(cache_info()로 카운터 확인)
+- 동시 요청이 많으면 마이크로 배처(tools/micro_batcher.py)로 모아서 한 번에 예측
+  · HIGHFOUR_ML_BATCH_MS > 0 이면 사용(최대 대기 ms), HIGHFOUR_ML_BATCH_ROWS 로 배치 최대 행 수
+  · xgb 계열 부스터 스레드 수는 HIGHFOUR_XGB_NTHREAD (0이면 xgboost 기본값)
+- 워커가 여러 개면 모델 서버(tools/model_server.py)에 모델을 한 번만 올리고 클라이언트 모드로 사용
+  · HIGHFOUR_ML_BACKEND=remote, 소켓 경로는 HIGHFOUR_MODEL_SOCKET (서버가 죽으면 fallback 백엔드 사용)
+- cold start: xgb 는 UBJSON(xgb_model.ubj, tools/xgb_convert.py) 우선 로드, 앱 시작 시 warmup() 호출 권장
+- 모델 버전 관리(tools/artifact_versions.py): artifacts/CURRENT 가 가리키는 versions/<version> 을 서빙
+  · 감시 스레드가 CURRENT 변경을 보면 새 버전을 백그라운드 로드 → 해시 / 스모크 검증 → 원자적 교체
+  · 예측 결과마다 model_version 포함(버전 구조가 아니면 "local")
+- 예측 결과마다 실제로 답한 backend 포함. MLPredictTool 이 fallback 백엔드로 답하면 fallback_from(원래 백엔드)도 포함
 """
 
 from __future__ import annotations
@@ -16,11 +35,19 @@ from __future__ import annotations
 from pathlib import Path
 from typing import List, Sequence, Optional
 import json
+import os
+import threading
+import time
+from collections import OrderedDict
 
 import numpy as np
-import xgboost as xgb
 
-from dataclasses import dataclass
+from .answer_table import TABLE_DIRNAME, AnswerTable
+from .artifact_versions import VersionWatcher, resolve_current, smoke_check, verify_version
+from .micro_batcher import BatcherClosed, MicroBatcher
+from .predict_backends import PredictBackend, create_backend
+
+from dataclasses import dataclass, field
 from typing import Dict, Any
 
 # =========================
@@ -45,37 +72,401 @@ TOPK_FLOOR = 0.02
 
 DEFAULT_TOPK = 5
 
+# 사용할 예측 백엔드 이름(tools/predict_backends.py 의 available_backends() 참고)
+MODEL_BACKEND = os.getenv("HIGHFOUR_ML_BACKEND", "xgb")
+# 기본 백엔드 로드/추론 실패 시 사용할 백엔드(빈 문자열이면 fallback 없음). nb는 로드/추론이 거의 공짜
+FALLBACK_BACKEND = os.getenv("HIGHFOUR_ML_FALLBACK", "nb")
+
+# 미리 계산한 답 테이블(ml/train/build_answer_table.py 로 모델 버전 디렉토리에 생성)
+USE_ANSWER_TABLE = os.getenv("HIGHFOUR_ANSWER_TABLE", "1") != "0"
+
+# 예측 LRU 캐시 크기(0이면 끔) / 모델 파일 변경 확인 주기(초)
+CACHE_SIZE = int(os.getenv("HIGHFOUR_ML_CACHE_SIZE", "4096"))
+ARTIFACT_CHECK_SEC = 1.0
+
+# 마이크로 배칭(0이면 요청마다 바로 예측) / xgb 부스터 스레드 수(0이면 기본값)
+BATCH_WAIT_MS = float(os.getenv("HIGHFOUR_ML_BATCH_MS", "0"))
+BATCH_MAX_ROWS = int(os.getenv("HIGHFOUR_ML_BATCH_ROWS", "64"))
+XGB_NTHREAD = int(os.getenv("HIGHFOUR_XGB_NTHREAD", "0"))
+# xgb 모델 파일 형식(빈 값이면 ubj가 json보다 새것일 때 ubj 사용 / "json" / "ubj")
+XGB_MODEL_FORMAT = os.getenv("HIGHFOUR_XGB_FORMAT", "")
+_XGB_BACKENDS = ("xgb", "xgb_anytime")
+
+# 버전 구조(artifacts/CURRENT)일 때 새 버전 확인 주기(초, 0이면 감시 안 함 → reload_model()로만 교체)
+WATCH_SEC = float(os.getenv("HIGHFOUR_ML_WATCH_SEC", "5"))
+# 교체된 이전 버전의 배처를 닫기 전에 진행 중인 요청이 끝나기를 기다리는 최대 시간(초)
+RETIRE_GRACE_SEC = 30.0
+
 # =========================
 # 2) 내부 캐시(최초 1회 로드)
 # =========================
-_BOOSTER: Optional[xgb.Booster] = None
-_FEATURE_NAMES: Optional[List[str]] = None
-_CLASSES: Optional[List[str]] = None
+_LOCK = threading.Lock()
+_ACTIVE: Optional["_ActiveModel"] = None  # 현재 서빙 중인 모델 버전(교체는 참조 1번 대입)
+_WATCHER: Optional[VersionWatcher] = None
+
+
+class _PredictionLRU:
+    """스레드 안전 LRU. 값은 temperature 적용 후 (C,) 확률 행(읽기 전용)."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = int(maxsize)
+        self._data: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get(self, key: tuple) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._data.get(key)
+            if row is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return row
+
+    def put(self, key: tuple, row: np.ndarray) -> None:
+        if self.maxsize <= 0:
+            return
+        row = np.array(row, dtype=np.float32)
+        row.setflags(write=False)
+        with self._lock:
+            self._data[key] = row
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, backend: Optional[str] = None) -> None:
+        """backend 키만(또는 전체) 제거."""
+        with self._lock:
+            if backend is None:
+                self._data.clear()
+            else:
+                for key in [k for k in self._data if k[0] == backend]:
+                    del self._data[key]
+            self.invalidations += 1
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+
+_CACHE = _PredictionLRU(CACHE_SIZE)
 
 
 def _load_json(path: Path) -> dict:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
+def _stamp(paths) -> tuple:
+    out = []
+    for p in paths:
+        try:
+            st = Path(p).stat()
+            out.append((str(p), st.st_size, st.st_mtime_ns))
+        except FileNotFoundError:
+            out.append((str(p), -1, -1))
+    return tuple(out)
+
+
+def _backend_stamp(backend: PredictBackend, refresh: bool = False) -> tuple:
+    """변경 감지용: 모델 파일 (경로, 크기, 수정시각) + 원격 서빙 모델 버전."""
+    return _stamp(backend.artifact_paths()), backend.served_version(refresh=refresh)
+
+
+def _backend_options(name: str) -> Dict[str, Any]:
+    if name not in _XGB_BACKENDS:
+        return {}
+    options: Dict[str, Any] = {}
+    if XGB_NTHREAD:
+        options["nthread"] = XGB_NTHREAD
+    if XGB_MODEL_FORMAT:
+        options["model_format"] = XGB_MODEL_FORMAT
+    return options
+
+
+@dataclass
+class _ActiveModel:
+    """
+    한 모델 버전(디렉토리)의 피처/클래스 + 백엔드 / 배처 / 변경 감지 상태.
+    요청은 시작할 때 잡은 _ActiveModel 하나로 끝까지 처리 → 교체 중에도 진행 중인 요청은 그대로 완료.
+    """
+    version: str
+    artifacts_dir: Path
+    feature_names: List[str]
+    classes: List[str]
+    backends: Dict[str, PredictBackend] = field(default_factory=dict)
+    batchers: Dict[str, MicroBatcher] = field(default_factory=dict)
+    stamps: Dict[str, tuple] = field(default_factory=dict)  # 백엔드 이름 -> 로드 시점 모델 파일 (크기, 수정시각)
+    checked_at: Dict[str, float] = field(default_factory=dict)
+    table_ok: Dict[str, bool] = field(default_factory=dict)  # 백엔드 이름 -> 답 테이블 사용 가능 여부
+    answer_table: Optional[AnswerTable] = None  # 이 버전 디렉토리의 답 테이블(처음 필요할 때 로드)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    refs: int = 0  # 이 버전의 배처를 쓰는 중인 요청 수(교체 후 0이 되면 배처 종료)
+    idle: threading.Condition = field(default_factory=threading.Condition)
+    closed: bool = False
+
+    @classmethod
+    def open(cls, version: str, artifacts_dir: Path) -> "_ActiveModel":
+        if not artifacts_dir.exists():
+            raise FileNotFoundError(f"artifacts 디렉토리를 찾을 수 없음: {artifacts_dir.resolve()}")
+        feat = _load_json(artifacts_dir / "feature_names.json")
+        lab = _load_json(artifacts_dir / "label_mapping.json")
+        return cls(version, artifacts_dir, list(feat["feature_names"]), list(lab["classes"]))
+
+    def backend(self, name: str) -> PredictBackend:
+        """이름별 백엔드를 최초 1회만 로드해서 재사용(여러 스레드에서 동시에 불려도 1번만 로드)."""
+        backend = self.backends.get(name)
+        if backend is not None:
+            return backend
+        with self.lock:
+            if name not in self.backends:
+                backend = create_backend(name, artifacts_dir=self.artifacts_dir, **_backend_options(name))
+                # 원격 / 앙상블 멤버 등 백엔드가 따로 읽은 매핑이 이 버전과 다르면 열 순서가 어긋남
+                if backend.classes != self.classes or backend.feature_names != self.feature_names:
+                    raise ValueError(
+                        f"[{name}] 백엔드의 피처/클래스 순서가 모델 버전 {self.version} 의 매핑과 다릅니다."
+                    )
+                self.stamps[name] = _backend_stamp(backend)
+                self.checked_at[name] = time.monotonic()
+                self.backends[name] = backend
+            return self.backends[name]
+
+    def batcher(self, name: str) -> Optional[MicroBatcher]:
+        """
+        백엔드별 마이크로 배처(최초 1회 생성). 파일이 바뀌어 다시 로드돼도 최신 백엔드를 씀.
+        교체되어 종료된 버전이면 None(새 배처 스레드를 만들지 않음 → 호출 측이 직접 예측).
+        """
+        batcher = self.batchers.get(name)
+        if batcher is not None:
+            return batcher
+        with self.lock:
+            if self.closed:
+                return None
+            if name not in self.batchers:
+                self.batchers[name] = MicroBatcher(
+                    lambda X, _name=name: self.backend(_name).predict_proba(X),
+                    max_rows=BATCH_MAX_ROWS,
+                    max_wait_ms=BATCH_WAIT_MS,
+                    name=f"micro-batcher-{name}",
+                )
+            return self.batchers[name]
+
+    def check_artifacts(self, name: str) -> None:
+        """
+        로드된 백엔드의 모델 파일(원격이면 서버 모델 버전)이 바뀌었으면(ARTIFACT_CHECK_SEC 마다 확인)
+        캐시 / 답 테이블 판정을 비우고 백엔드를 버려서 다음 요청에서 다시 로드하게 한다
+        (버전 구조가 아닌 평면 artifacts 덮어쓰기 / 모델 서버의 버전 교체 대응).
+        """
+        now = time.monotonic()
+        with self.lock:
+            backend = self.backends.get(name)
+            if backend is None or now - self.checked_at.get(name, 0.0) < ARTIFACT_CHECK_SEC:
+                return
+            self.checked_at[name] = now
+            stamp = self.stamps.get(name)
+        if _backend_stamp(backend, refresh=True) == stamp:  # 파일 stat / 서버 확인은 잠금 밖에서
+            return
+        with self.lock:
+            if self.backends.get(name) is not backend:  # 다른 스레드가 이미 버렸거나 다시 로드함
+                return
+            self.backends.pop(name)
+            self.table_ok.pop(name, None)
+            self.answer_table = None  # 테이블도 다시 만들어졌을 수 있음
+        _CACHE.invalidate(name)
+
+    def acquire(self) -> None:
+        with self.idle:
+            self.refs += 1
+
+    def release(self) -> None:
+        with self.idle:
+            self.refs -= 1
+            if self.refs <= 0:
+                self.idle.notify_all()
+
+    def close(self, grace: float = RETIRE_GRACE_SEC) -> None:
+        """(교체 후 model-retire 스레드) 진행 중인 요청이 끝나길 기다린 뒤(최대 grace 초) 배처 종료."""
+        with self.idle:
+            self.idle.wait_for(lambda: self.refs <= 0, timeout=grace)
+        with self.lock:
+            self.closed = True
+            batchers, self.batchers = list(self.batchers.values()), {}
+        for b in batchers:
+            b.close(timeout=30.0)
+
+
+def _active() -> _ActiveModel:
+    """현재 모델(최초 호출 시 CURRENT 버전 또는 평면 artifacts 로드, 버전 구조면 감시 스레드 시작)."""
+    global _ACTIVE, _WATCHER
+    active = _ACTIVE
+    if active is not None:
+        return active
+    with _LOCK:
+        if _ACTIVE is None:
+            version, model_dir = resolve_current(ARTIFACTS_DIR)
+            _ACTIVE = _ActiveModel.open(version or "local", model_dir)
+            if version is not None and WATCH_SEC > 0:
+                _WATCHER = VersionWatcher(ARTIFACTS_DIR, _on_new_version, interval=WATCH_SEC, current=version)
+                _WATCHER.start()
+        return _ACTIVE
+
+
 def _ensure_loaded() -> None:
-    global _BOOSTER, _FEATURE_NAMES, _CLASSES
-    if _BOOSTER is not None and _FEATURE_NAMES is not None and _CLASSES is not None:
-        return
+    _active()
+
+
+def _reinit_after_fork() -> None:
+    """
+    prefork 서버(app/server.py)에서 자식 프로세스 시작 시: 로드된 모델(메모리)은 그대로 공유하고
+    fork 로 사라진 스레드(감시 / 배처)와 잠금만 새로 만든다.
+    """
+    global _LOCK, _WATCHER
+    _LOCK = threading.Lock()
+    active = _ACTIVE
+    if active is not None:
+        active.lock = threading.Lock()
+        active.idle = threading.Condition()
+        active.refs = 0
+        active.batchers = {}
+    if _WATCHER is not None:
+        _WATCHER = VersionWatcher(ARTIFACTS_DIR, _on_new_version, interval=WATCH_SEC, current=_WATCHER.seen)
+        _WATCHER.start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+
+
+def _on_new_version(version: str, model_dir: Path) -> None:
+    """
+    (감시 스레드) 새 버전을 백그라운드로 로드 → 해시 검증 → 기본 백엔드 스모크 검증 → 교체.
+    실패하면 예외(기존 모델 유지). 교체 동안 예측은 막히지 않음(다른 백엔드는 새 버전에서 처음 쓸 때 로드).
+    """
+    verify_version(model_dir)
+    new = _ActiveModel.open(version, model_dir)
+    smoke_check(new.backend(MODEL_BACKEND), model_dir)
+    old = _active()
+    _swap(new)
+    print(f"[ml_predict_tools] 모델 버전 교체: {old.version} -> {version}")
 
-    if not MODEL_PATH.exists():
-        raise FileNotFoundError(f"모델 파일을 찾을 수 없음: {MODEL_PATH.resolve()}")
-    if not ARTIFACTS_DIR.exists():
-        raise FileNotFoundError(f"artifacts 디렉토리를 찾을 수 없음: {ARTIFACTS_DIR.resolve()}")
 
-    feat = _load_json(ARTIFACTS_DIR / "feature_names.json")
-    lab = _load_json(ARTIFACTS_DIR / "label_mapping.json")
+def _swap(new: _ActiveModel) -> None:
+    global _ACTIVE
+    with _LOCK:
+        old, _ACTIVE = _ACTIVE, new
+    _CACHE.invalidate()
+    if old is not None:
+        # 이전 버전의 배처는 진행 중인 요청(refs)이 끝나고 남은 요청을 처리한 뒤 종료
+        threading.Thread(target=old.close, name="model-retire", daemon=True).start()
 
-    _FEATURE_NAMES = list(feat["feature_names"])
-    _CLASSES = list(lab["classes"])
 
-    booster = xgb.Booster()
-    booster.load_model(str(MODEL_PATH))
-    _BOOSTER = booster
+def reload_model() -> str:
+    """CURRENT 를 지금 바로 다시 읽어 교체(감시 주기를 기다리지 않음). 활성 버전 반환."""
+    version, model_dir = resolve_current(ARTIFACTS_DIR)
+    if version is None:
+        _swap(_ActiveModel.open("local", model_dir))
+    elif version != _active().version:
+        _on_new_version(version, model_dir)
+    return _active().version
+
+
+def model_version() -> str:
+    """현재 서빙 중인 모델 버전(버전 구조가 아니면 "local")."""
+    return _active().version
+
+
+def warmup(backends: Optional[Sequence[str]] = None, rows: int = 8, predict: bool = True) -> Dict[str, float]:
+    """
+    첫 요청 전에 미리 호출(앱 시작 시): 매핑 / 모델 로드 + 더미 배치(rows행, 1행) 예측 + 후처리 1회.
+    → 첫 사용자 요청이 로드 / xgboost 내부 초기화 / 답 테이블 로드 비용을 치르지 않음. 단계별 초 반환.
+    predict=False 면 로드 + 답 테이블까지만(prefork 부모: fork 전에 xgboost 예측으로 OpenMP 스레드 풀을
+    만들면 자식에서 멈출 수 있음 → 예측 warmup 은 자식에서).
+    """
+    timings: Dict[str, float] = {}
+    t0 = time.perf_counter()
+    active = _active()
+    timings["mappings_sec"] = time.perf_counter() - t0
+
+    F = len(active.feature_names)
+    for name in backends or [MODEL_BACKEND]:
+        t0 = time.perf_counter()
+        be = active.backend(name)
+        timings[f"{name}_load_sec"] = time.perf_counter() - t0
+        if not predict:
+            _get_answer_table(active, name)
+            continue
+
+        t0 = time.perf_counter()
+        X = np.zeros((max(int(rows), 1), F), dtype=np.float32)
+        X[np.arange(len(X)), np.arange(len(X)) % F] = 1.0
+        P = be.predict_proba(X)
+        be.predict_proba(X[:1])
+        _topk_redistribute_row(_apply_temperature_on_proba(P[:1], T=TEMPERATURE_T)[0], k=DEFAULT_TOPK, floor=TOPK_FLOOR)
+        _get_answer_table(active, name)
+        timings[f"{name}_predict_sec"] = time.perf_counter() - t0
+    return timings
+
+
+def get_backend(name: Optional[str] = None) -> PredictBackend:
+    """현재 모델 버전의 이름별 백엔드(최초 1회 로드)."""
+    return _active().backend(name or MODEL_BACKEND)
+
+
+def _predict_backend(active: _ActiveModel, name: str, x: np.ndarray) -> np.ndarray:
+    """
+    (1, F) -> (1, C). 배칭이 켜져 있으면 배처를 거침(로드 실패 등 예외는 그대로 전달).
+    요청이 잡은 버전이 그 사이 교체되어 배처가 닫혔으면 같은 버전 백엔드로 직접 예측(fallback 백엔드로 새지 않음).
+    """
+    if BATCH_WAIT_MS > 0:
+        active.acquire()
+        try:
+            batcher = active.batcher(name)
+            if batcher is not None:
+                return batcher.predict(x)[None, :]
+        except BatcherClosed:
+            pass
+        finally:
+            active.release()
+    return active.backend(name).predict_proba(x)
+
+
+def cache_info() -> Dict[str, int]:
+    """예측 LRU 캐시 카운터(hits / misses / evictions / invalidations / size / maxsize)."""
+    return _CACHE.info()
+
+
+def cache_clear() -> None:
+    _CACHE.invalidate()
+
+
+def _get_answer_table(active: _ActiveModel, backend: str) -> Optional[AnswerTable]:
+    """active 버전 디렉토리에 backend 로 만든 유효한 테이블이 있으면 반환, 아니면 None(없거나 모델 / 버전이 다른 경우)."""
+    if not USE_ANSWER_TABLE:
+        return None
+    ok = active.table_ok.get(backend)
+    table = active.answer_table
+    if ok is None:
+        with active.lock:
+            table_dir = active.artifacts_dir / TABLE_DIRNAME
+            if active.answer_table is None and (table_dir / "meta.json").exists():
+                active.answer_table = AnswerTable(table_dir)
+            table = active.answer_table
+            ok = False
+            if table is not None:
+                paths = create_backend(
+                    backend, artifacts_dir=active.artifacts_dir, load=False, **_backend_options(backend)
+                ).artifact_paths()
+                ok = table.is_valid_for(backend, TEMPERATURE_T, paths, version=active.version)
+            active.table_ok[backend] = ok
+    return table if ok else None
 
 
 def _apply_temperature_on_proba(proba: np.ndarray, T: float, eps: float = 1e-12) -> np.ndarray:
@@ -110,7 +501,76 @@ def _build_vector_from_symptoms(symptoms: Sequence[str], feature_names: Sequence
     return x
 
 
-def predict_topk_diseases(symptoms: List[str], topk: int = DEFAULT_TOPK) -> List[str]:
+def predict_proba(symptoms: List[str], backend: Optional[str] = None) -> np.ndarray:
+    """증상 리스트 -> (1, C) 원본 확률(후처리 전). 열 순서는 현재 모델 버전의 label_mapping.json classes."""
+    active = _active()
+    x = _build_vector_from_symptoms(symptoms, active.feature_names)
+    return active.backend(backend or MODEL_BACKEND).predict_proba(x)
+
+
+def predict_topk_with_scores(
+    symptoms: List[str], topk: int = DEFAULT_TOPK, backend: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Top-K 질병과 표시용 확률 [{"label": str, "score": float, "model_version": str, "source": str, "backend": str}, ...]
+    source: "cache"(LRU) | "table"(답 테이블) | "model"(백엔드 추론) / backend: 답한 백엔드 이름
+    """
+    active = _active()  # 이 요청은 끝까지 같은 모델 버전 사용
+    name = backend or MODEL_BACKEND
+    x = _build_vector_from_symptoms(symptoms, active.feature_names)
+    active.check_artifacts(name)
+
+    def _served() -> Optional[str]:
+        """원격 백엔드면 서버가 서빙 중인 모델 버전(로드 전이거나 로컬 모델이면 None)."""
+        loaded = active.backends.get(name)
+        return loaded.served_version() if loaded is not None else None
+
+    served = _served()
+
+    def _result(idx, pk, source: str) -> List[Dict[str, Any]]:
+        return [
+            {"label": active.classes[int(i)], "score": float(p), "model_version": served or active.version,
+             "source": source, "backend": name}
+            for i, p in zip(idx, pk)
+        ]
+
+    # 0) LRU 캐시: 같은 백엔드 / 모델 버전(+서버 버전) / 증상 조합 / temperature 면 전체 확률 행 재사용(topk는 아래에서 적용)
+    bits = np.packbits(x[0] > 0).tobytes()
+    row = _CACHE.get((name, active.version, served, bits, TEMPERATURE_T))
+    source = "cache"
+
+    if row is None:
+        # 0-1) 답 테이블(temperature 적용 후 상위 K가 저장되어 있음)
+        table = _get_answer_table(active, name)
+        hit = table.lookup(x) if table is not None and topk <= table.topk else None
+        if hit is not None:
+            top_idx, top_p = hit
+            if RENORMALIZE_TOPK:
+                j, pk = _topk_redistribute_row(top_p, k=topk, floor=TOPK_FLOOR)
+                idx = top_idx[j]
+            else:
+                idx, pk = top_idx[:topk], top_p[:topk]
+            return _result(idx, pk, "table")
+
+        proba = _predict_backend(active, name, x)
+        source = "model"
+        served = _served()  # 첫 요청이면 방금 로드됨
+
+        # 1) temperature scaling (전체 분포 완만화)
+        row = _apply_temperature_on_proba(proba, T=TEMPERATURE_T)[0]
+        _CACHE.put((name, active.version, served, bits, TEMPERATURE_T), row)
+
+    # 2) topk 선택
+    if RENORMALIZE_TOPK:
+        idx, pk = _topk_redistribute_row(row, k=topk, floor=TOPK_FLOOR)
+    else:
+        idx = np.argsort(row)[-topk:][::-1]
+        pk = row[idx]
+
+    return _result(idx, pk, source)
+
+
+def predict_topk_diseases(symptoms: List[str], topk: int = DEFAULT_TOPK, backend: Optional[str] = None) -> List[str]:
     """
     입력: 증상 피처명 리스트(list[str])
     출력: Top-K 질병명 리스트(list[str])
@@ -118,24 +578,9 @@ def predict_topk_diseases(symptoms: List[str], topk: int = DEFAULT_TOPK) -> List
     예)
       predict_topk_diseases(["headache","nausea"], topk=5)
         -> ["labyrinthitis", "common cold", ...]
+      predict_topk_diseases(["headache","nausea"], backend="logistic")
     """
-    _ensure_loaded()
-    assert _BOOSTER is not None and _FEATURE_NAMES is not None and _CLASSES is not None
-
-    x = _build_vector_from_symptoms(symptoms, _FEATURE_NAMES)
-    dm = xgb.DMatrix(x, feature_names=_FEATURE_NAMES)
-    proba = _BOOSTER.predict(dm)  # (1, C)
-
-    # 1) temperature scaling (전체 분포 완만화)
-    proba = _apply_temperature_on_proba(proba, T=TEMPERATURE_T)
-
-    # 2) topk 선택
-    if RENORMALIZE_TOPK:
-        idx, _ = _topk_redistribute_row(proba[0], k=topk, floor=TOPK_FLOOR)
-    else:
-        idx = np.argsort(proba[0])[-topk:][::-1]
-
-    return [_CLASSES[int(i)] for i in idx]
+    return [r["label"] for r in predict_topk_with_scores(symptoms, topk=topk, backend=backend)]
 
 
 # alias (짧게 쓰고 싶으면)
@@ -147,11 +592,35 @@ class MLPredictTool:
     """
     Orchestrator 호환 래퍼.
     - 입력: symptoms(list[str])
-    - 출력: [{"label": str, "score": float}, ...]
+    - 출력: [{"label": str, "score": float, "model_version": str, "source": str, "backend": str}, ...]
+    - backend 로드/추론이 실패하면 fallback 백엔드(기본 nb)로 한 번 더 시도
+      → 결과 backend 는 fallback 이름, fallback_from 에 원래 백엔드(app/tracing.py 가 카운터로 집계)
     """
     topk: int = DEFAULT_TOPK
+    backend: Optional[str] = None  # None이면 MODEL_BACKEND
+    fallback: Optional[str] = FALLBACK_BACKEND
 
     def predict(self, symptoms: List[str]) -> List[Dict[str, Any]]:
-        labels = predict_topk_diseases(symptoms, topk=self.topk)
-        # 현재 함수는 확률을 반환하지 않으므로 score는 임시 0.0
-        return [{"label": lb, "score": 0.0} for lb in labels]
\ No newline at end of file
+        primary = self.backend or MODEL_BACKEND
+        try:
+            return predict_topk_with_scores(symptoms, topk=self.topk, backend=primary)
+        except Exception as e:
+            if not self.fallback or self.fallback == primary:
+                raise
+            print(f"[MLPredictTool] '{primary}' 예측 실패 → '{self.fallback}' 사용: {type(e).__name__}: {e}")
+            out = predict_topk_with_scores(symptoms, topk=self.topk, backend=self.fallback)
+            for r in out:
+                r["fallback_from"] = primary
+            return out
+
+    def warmup(self, predict: bool = True) -> Dict[str, float]:
+        """기본 백엔드(실패하면 fallback)를 미리 로드 + 더미 예측(predict=False 면 로드만). 실패해도 예외 대신 경고만 출력."""
+        primary = self.backend or MODEL_BACKEND
+        for name in [primary, self.fallback]:
+            if not name:
+                continue
+            try:
+                return warmup([name], predict=predict)
+            except Exception as e:
+                print(f"[MLPredictTool] '{name}' warmup 실패: {type(e).__name__}: {e}")
+        return {}
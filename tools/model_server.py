@@ -0,0 +1,334 @@
+"""
+tools/model_server.py
+
+로컬 모델 서버(Unix 소켓) + 클라이언트 백엔드("remote")
+
+- 워커 프로세스(Streamlit / API 서버)마다 xgboost를 import하고 678클래스 부스터를 따로 로드하면
+  RSS가 워커 수만큼 늘고 워커마다 cold 로드를 치른다
+  → 서버 프로세스 하나가 백엔드를 한 번만 로드하고, 워커는 소켓으로 예측만 요청
+- 서버
+  · 연결마다 스레드 1개(ThreadingUnixStreamServer), 한 연결에서 요청 여러 건 처리
+  · 단일 행 요청은 백엔드별 MicroBatcher 로 모아서 한 번에 예측(여러 워커 요청을 합침)
+  · artifacts_dir 가 버전 구조(CURRENT)면 그 버전을 로드하고 CURRENT 를 감시해 새 버전으로 교체
+    (ml_predict_tools 와 같은 해시 / 스모크 검증), 응답마다 서빙한 model_version 포함
+  · 실행: python -m tools.model_server --backends xgb,nb --socket /tmp/highfour_model.sock
+- 클라이언트
+  · RemoteBackend(예측 백엔드 이름 "remote"): 피처/클래스 순서를 서버에서 받아옴, 스레드별 연결 재사용
+    ml_predict_tools 는 로드 때 이 순서를 자기 매핑과 비교(다르면 에러), 서버 모델 버전이 바뀌면
+    캐시를 비우고 다시 로드(served_version)
+  · MLPredictTool 클라이언트 모드: HIGHFOUR_ML_BACKEND=remote (서버가 죽으면 fallback 백엔드 사용)
+- 프레임: 4바이트(big-endian) 헤더 길이 + JSON 헤더 + 바이너리 본문(헤더 nbytes)
+  · predict: 요청 본문 (N, F) float32 / 응답 본문 (N, C) float32
+  · info / ping: 본문 없음(ping 응답에 model_version)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .artifact_versions import VersionWatcher, resolve_current, smoke_check, verify_version
+from .micro_batcher import BatcherClosed, MicroBatcher
+from .predict_backends import DEFAULT_ARTIFACTS_DIR, PredictBackend, create_backend
+
+DEFAULT_SOCKET = os.getenv("HIGHFOUR_MODEL_SOCKET", "/tmp/highfour_model.sock")
+_HEADER = struct.Struct(">I")
+
+
+# =========================
+# 프레임 입출력
+# =========================
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("소켓이 닫혔습니다.")
+        buf += chunk
+    return bytes(buf)
+
+
+def send_frame(sock: socket.socket, header: dict, payload: bytes = b"") -> None:
+    head = json.dumps({**header, "nbytes": len(payload)}, ensure_ascii=False).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(head)) + head + payload)
+
+
+def recv_frame(sock: socket.socket) -> Tuple[dict, bytes]:
+    (n,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    header = json.loads(_recv_exact(sock, n).decode("utf-8"))
+    payload = _recv_exact(sock, int(header.get("nbytes", 0)))
+    return header, payload
+
+
+def _rss_mb() -> float:
+    """현재 RSS(MB). /proc 없는 OS는 최대 RSS로 대신."""
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    import resource
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024.0 * 1024.0) if sys.platform == "darwin" else rss / 1024.0
+
+
+# =========================
+# 서버
+# =========================
+@dataclass
+class _ServedModel:
+    """서버가 서빙 중인 모델 버전 1개(백엔드 + 배처). 교체는 ModelServer.model 참조 1번 대입."""
+    version: str
+    model_dir: Path
+    backends: Dict[str, PredictBackend]
+    batchers: Dict[str, MicroBatcher] = field(default_factory=dict)
+
+    def close(self, timeout: float = 5.0) -> None:
+        for b in self.batchers.values():
+            b.close(timeout=timeout)
+
+
+class ModelServer(socketserver.ThreadingUnixStreamServer):
+    """
+    백엔드를 한 번만 로드해 두고 Unix 소켓으로 예측을 제공.
+    artifacts_dir 가 버전 구조(CURRENT)면 그 버전을 서빙하고 watch_sec 마다 CURRENT 를 확인해
+    새 버전을 로드 → 해시 / 스모크 검증 → 교체(응답마다 model_version 포함).
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: str,
+        backends: List[str],
+        artifacts_dir: Optional[Path] = None,
+        max_rows: int = 64,
+        max_wait_ms: float = 1.0,
+        watch_sec: float = 5.0,
+    ):
+        self.socket_path = str(socket_path)
+        self.default = backends[0]
+        self.names = list(backends)
+        self.artifacts_dir = Path(artifacts_dir) if artifacts_dir is not None else DEFAULT_ARTIFACTS_DIR
+        self.max_rows = max_rows
+        self.max_wait_ms = max_wait_ms
+        version, model_dir = resolve_current(self.artifacts_dir)
+        self.model = self._open(version or "local", model_dir)
+        self.watcher: Optional[VersionWatcher] = None
+        if version is not None and watch_sec > 0:
+            self.watcher = VersionWatcher(self.artifacts_dir, self._on_new_version, interval=watch_sec, current=version)
+            self.watcher.start()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # 이전 실행이 남긴 소켓 파일
+        super().__init__(self.socket_path, _Handler)
+
+    def _open(self, version: str, model_dir: Path) -> _ServedModel:
+        backends = {name: create_backend(name, artifacts_dir=model_dir) for name in self.names}
+        model = _ServedModel(version, model_dir, backends)
+        model.batchers = {
+            name: MicroBatcher(be.predict_proba, max_rows=self.max_rows, max_wait_ms=self.max_wait_ms,
+                               name=f"batcher-{name}")
+            for name, be in backends.items()
+        }
+        return model
+
+    def _on_new_version(self, version: str, model_dir: Path) -> None:
+        """(감시 스레드) 새 버전 로드 → 검증 → 교체. 실패하면 예외(기존 모델 유지)."""
+        verify_version(model_dir)
+        new = self._open(version, model_dir)
+        try:
+            smoke_check(new.backends[self.default], model_dir)
+        except Exception:
+            new.close()
+            raise
+        old, self.model = self.model, new
+        # 이전 버전 배처는 이미 받은 요청을 처리한 뒤 종료(그 뒤 도착한 요청은 이전 백엔드로 직접 예측)
+        threading.Thread(target=old.close, name="model-retire", daemon=True).start()
+        print(f"[model_server] 모델 버전 교체: {old.version} -> {version}", flush=True)
+
+    def predict(self, name: Optional[str], X: np.ndarray) -> Tuple[np.ndarray, str]:
+        """(확률 (N, C), 예측한 모델 버전). 요청 하나는 처음 잡은 버전으로 끝까지 처리."""
+        model = self.model
+        name = name or self.default
+        if name not in model.backends:
+            raise ValueError(f"서버에 로드되지 않은 백엔드: {name!r} (로드됨: {sorted(model.backends)})")
+        if X.shape[0] == 1:
+            try:
+                return model.batchers[name].predict(X[0])[None, :], model.version
+            except BatcherClosed:
+                pass
+        return model.backends[name].predict_proba(X), model.version
+
+    def info(self) -> dict:
+        model = self.model
+        be = model.backends[self.default]
+        return {
+            "pid": os.getpid(),
+            "default": self.default,
+            "backends": sorted(model.backends),
+            "model_version": model.version,
+            "feature_names": be.feature_names,
+            "classes": be.classes,
+            "rss_mb": _rss_mb(),
+            "batch_stats": {name: dict(b.stats) for name, b in model.batchers.items()},
+        }
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self.watcher is not None:
+            self.watcher.stop()
+        self.model.close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    server: ModelServer
+
+    def handle(self) -> None:
+        sock = self.request
+        while True:
+            try:
+                header, payload = recv_frame(sock)
+            except (ConnectionError, OSError):
+                return
+            try:
+                op = header.get("op")
+                if op == "predict":
+                    n, f = header["shape"]
+                    X = np.frombuffer(payload, dtype=np.float32).reshape(n, f)
+                    P, version = self.server.predict(header.get("backend"), X)
+                    P = np.ascontiguousarray(P, dtype=np.float32)
+                    send_frame(sock, {"ok": True, "shape": list(P.shape), "model_version": version}, P.tobytes())
+                elif op == "info":
+                    send_frame(sock, {"ok": True, **self.server.info()})
+                elif op == "ping":
+                    send_frame(sock, {"ok": True, "model_version": self.server.model.version})
+                else:
+                    send_frame(sock, {"ok": False, "error": f"알 수 없는 op: {op!r}"})
+            except Exception as e:
+                send_frame(sock, {"ok": False, "error": f"{type(e).__name__}: {e}"})
+
+
+# =========================
+# 클라이언트 백엔드
+# =========================
+class RemoteBackend(PredictBackend):
+    """모델 서버에 예측을 요청하는 백엔드(이 프로세스는 모델을 로드하지 않음)."""
+
+    name = "remote"
+
+    def __init__(
+        self,
+        artifacts_dir: Optional[Path] = None,
+        socket_path: Optional[str] = None,
+        target: Optional[str] = None,
+        timeout: float = 5.0,
+    ):
+        super().__init__(artifacts_dir=artifacts_dir)
+        self.socket_path = str(socket_path or DEFAULT_SOCKET)
+        self.target = target  # None이면 서버 기본 백엔드
+        self.timeout = float(timeout)
+        self._local = threading.local()
+        self._served: Optional[str] = None  # 서버가 서빙 중인 모델 버전(로드 / served_version(refresh=True) 때 갱신)
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        return sock
+
+    def _call(self, header: dict, payload: bytes = b"") -> Tuple[dict, bytes]:
+        """스레드별 연결로 요청 1건. 연결이 끊겼으면 한 번 다시 연결."""
+        for attempt in (0, 1):
+            sock = getattr(self._local, "sock", None)
+            try:
+                if sock is None:
+                    sock = self._local.sock = self._connect()
+                send_frame(sock, header, payload)
+                resp, body = recv_frame(sock)
+                break
+            except (ConnectionError, OSError):
+                if sock is not None:
+                    sock.close()
+                self._local.sock = None
+                if attempt:
+                    raise
+        if not resp.get("ok"):
+            raise RuntimeError(f"[remote] {resp.get('error')}")
+        return resp, body
+
+    def info(self) -> dict:
+        return self._call({"op": "info"})[0]
+
+    def _load_mappings(self) -> None:
+        info = self.info()
+        self.feature_names = list(info["feature_names"])
+        self.classes = list(info["classes"])
+        self._served = info.get("model_version")
+
+    def served_version(self, refresh: bool = False) -> Optional[str]:
+        if refresh:
+            self._served = self._call({"op": "ping"})[0].get("model_version")
+        return self._served
+
+    def _load(self) -> None:
+        pass
+
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        resp, body = self._call({"op": "predict", "backend": self.target, "shape": list(X.shape)}, X.tobytes())
+        return np.frombuffer(body, dtype=np.float32).reshape(resp["shape"])
+
+
+# =========================
+# CLI
+# =========================
+def run(args: argparse.Namespace) -> None:
+    names = [n.strip() for n in args.backends.split(",") if n.strip()]
+    server = ModelServer(
+        args.socket,
+        names,
+        artifacts_dir=Path(args.artifacts_dir),
+        max_rows=args.max_rows,
+        max_wait_ms=args.max_wait_ms,
+        watch_sec=args.watch_sec,
+    )
+    # SIGTERM도 Ctrl+C 와 같이 정리(소켓 파일 삭제)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    print(f"[model_server] pid={os.getpid()} socket={args.socket} backends={names} rss={_rss_mb():.1f}MB", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix 소켓 경로")
+    p.add_argument("--backends", default="xgb", help="로드할 백엔드(쉼표 구분, 첫 번째가 기본)")
+    p.add_argument("--artifacts_dir", default=str(DEFAULT_ARTIFACTS_DIR))
+    p.add_argument("--max_rows", type=int, default=64, help="단일 행 요청 배치 최대 행 수")
+    p.add_argument("--max_wait_ms", type=float, default=1.0, help="단일 행 요청 배치 최대 대기(ms)")
+    p.add_argument("--watch_sec", type=float, default=5.0, help="버전 구조일 때 CURRENT 확인 주기(초, 0이면 감시 안 함)")
+    return p
+
+
+if __name__ == "__main__":
+    run(build_argparser().parse_args())
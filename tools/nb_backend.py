@@ -0,0 +1,62 @@
+"""
+tools/nb_backend.py
+
+Bernoulli Naive Bayes 서빙 백엔드 (예측 백엔드 이름: "nb")
+
+- ml/train/train_nb.py 가 저장한 nb_np/{delta.npy, base.npy} 사용
+- 0/1 피처 NB의 log-likelihood = base[c] + Σ_{활성 f} delta[f, c]
+  · base  : 증상이 하나도 없을 때의 점수(클래스 prior + Σ log p(f=0|c))를 학습 시 미리 계산
+  · delta : 피처가 켜졌을 때 바뀌는 양 log p(f=1|c) - log p(f=0|c)
+  → 요청 1건 비용 O(활성 피처 × C), 트리/행렬곱 없음
+- 트리 모델보다 정확도는 낮지만 로드/추론이 거의 공짜 → 기본 백엔드 실패 시 fallback 용도
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from .predict_backends import PredictBackend, _active_row_logits, _softmax
+
+NPY_DIRNAME = "nb_np"
+
+
+class NaiveBayesBackend(PredictBackend):
+    """delta(F, C) / base(C,) memmap으로 활성 피처 행만 더해 softmax."""
+
+    name = "nb"
+
+    def __init__(self, artifacts_dir: Optional[Path] = None, mmap: bool = True, chunk_rows: int = 1024):
+        super().__init__(artifacts_dir=artifacts_dir)
+        self.mmap = mmap
+        self.chunk_rows = int(chunk_rows)
+        self.npy_dir = self.artifacts_dir / NPY_DIRNAME
+
+    def artifact_paths(self) -> List[Path]:
+        return [self.npy_dir / "delta.npy", self.npy_dir / "base.npy", self.npy_dir / "meta.json"]
+
+    def _load(self) -> None:
+        meta = json.loads(self._require(self.npy_dir / "meta.json").read_text(encoding="utf-8"))
+        if meta["num_features"] != len(self.feature_names) or meta["num_classes"] != len(self.classes):
+            raise ValueError(
+                f"[{self.name}] nb_np 배열({meta['num_features']}×{meta['num_classes']})이 "
+                f"feature_names.json / label_mapping.json 과 다릅니다. train_nb.py 로 다시 학습하세요."
+            )
+        self.binarize = meta.get("binarize")
+
+        mode = "r" if self.mmap else None
+        self.delta = np.load(self._require(self.npy_dir / "delta.npy"), mmap_mode=mode)
+        self.base = np.asarray(np.load(self._require(self.npy_dir / "base.npy")), dtype=np.float32)
+
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        if self.binarize is not None:
+            X = (X > self.binarize).astype(np.float32)
+        step = self.chunk_rows
+        parts = [
+            _softmax(_active_row_logits(self.delta, self.base, X[s:s + step]))
+            for s in range(0, max(X.shape[0], 1), step)
+        ]
+        return parts[0] if len(parts) == 1 else np.concatenate(parts, axis=0)
@@ -0,0 +1,300 @@
+"""
+tools/predict_backends.py
+
+예측 백엔드 레지스트리
+
+- 공통 인터페이스: load() -> self,  predict_proba(X: (N, F) float32) -> (N, C) 확률
+  · 열 순서는 항상 label_mapping.json 의 classes, 입력 피처 순서는 feature_names.json
+- 이름 -> "모듈:클래스" 문자열로 등록 → 처음 사용할 때 import + 로드(lazy)
+  · xgboost / catboost / joblib 같은 무거운 의존성은 해당 백엔드를 고를 때만 import
+- temperature / Top-K 후처리는 백엔드가 아니라 ml_predict_tools 에서 공통으로 적용
+
+사용:
+    from tools.predict_backends import create_backend
+    be = create_backend("logistic")
+    proba = be.predict_proba(X)
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from pathlib import Path
+from typing import Dict, List, Optional
+import json
+
+import numpy as np
+
+# tools/ 의 한 단계 위 = 레포 루트
+DEFAULT_ARTIFACTS_DIR = Path(__file__).resolve().parents[1] / "ml" / "artifacts"
+
+
+# =========================
+# 공통 베이스
+# =========================
+class PredictBackend:
+    """모든 예측 백엔드의 베이스. 하위 클래스는 _load / _predict_proba 를 구현한다."""
+
+    name = "base"
+
+    def __init__(self, artifacts_dir: Optional[Path] = None):
+        self.artifacts_dir = Path(artifacts_dir) if artifacts_dir is not None else DEFAULT_ARTIFACTS_DIR
+        self.feature_names: List[str] = []
+        self.classes: List[str] = []
+        self.loaded = False
+
+    # ---- 공통 아티팩트 ----
+    def _load_json(self, filename: str) -> dict:
+        return json.loads((self.artifacts_dir / filename).read_text(encoding="utf-8"))
+
+    def _load_mappings(self) -> None:
+        self.feature_names = list(self._load_json("feature_names.json")["feature_names"])
+        self.classes = list(self._load_json("label_mapping.json")["classes"])
+
+    def _require(self, path: Path) -> Path:
+        if not path.exists():
+            raise FileNotFoundError(f"[{self.name}] 모델 파일을 찾을 수 없음: {path.resolve()}")
+        return path
+
+    # ---- 인터페이스 ----
+    def artifact_paths(self) -> List[Path]:
+        """모델 파일 목록(크기 측정 / 변경 감지용)."""
+        return []
+
+    def served_version(self, refresh: bool = False) -> Optional[str]:
+        """다른 프로세스(모델 서버)가 서빙하는 모델 버전(변경 감지 / 캐시 키용). 이 프로세스에 로드한 모델이면 None."""
+        return None
+
+    def load(self) -> "PredictBackend":
+        if not self.loaded:
+            self._load_mappings()
+            self._load()
+            self.loaded = True
+        return self
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        if not self.loaded:
+            self.load()
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        return self._predict_proba(X)
+
+    def _load(self) -> None:
+        raise NotImplementedError
+
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+
+def _softmax(z: np.ndarray) -> np.ndarray:
+    z = z - z.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+def _active_row_logits(W: np.ndarray, b: np.ndarray, X: np.ndarray) -> np.ndarray:
+    """
+    z = b + Σ_f X[:, f] · W[f]  (W: (F, C)).
+    0/1 증상 벡터는 활성 피처가 수 개뿐이라 dense 행렬곱 대신 활성 피처 행만 모아 더한다
+    (np.nonzero는 행 순서로 정렬된 좌표를 준다 → reduceat으로 행별 합).
+    """
+    n = X.shape[0]
+    Z = np.broadcast_to(b, (n, b.shape[0])).astype(np.float32, copy=True)
+    rows, cols = np.nonzero(X)
+    if rows.size == 0:
+        return Z
+
+    G = W[cols]  # (nnz, C)
+    vals = X[rows, cols]
+    if not np.all(vals == 1.0):
+        G = G * vals[:, None]
+
+    counts = np.bincount(rows, minlength=n)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    active = counts > 0
+    Z[active] += np.add.reduceat(G, starts[active], axis=0)
+    return Z
+
+
+def _expand_columns(P: np.ndarray, model_classes, num_classes: int) -> np.ndarray:
+    """
+    sklearn/CatBoost 계열은 학습에 등장한 라벨만 열로 가진다.
+    model_classes(정수 라벨 id) 기준으로 (N, C) 전체 열로 펼친다.
+    """
+    model_classes = np.asarray(model_classes).astype(np.int64).reshape(-1)
+    if P.shape[1] == num_classes and np.array_equal(model_classes, np.arange(num_classes)):
+        return P
+    out = np.zeros((P.shape[0], num_classes), dtype=P.dtype)
+    out[:, model_classes] = P
+    return out
+
+
+# =========================
+# 기본 백엔드
+# =========================
+class XGBBackend(PredictBackend):
+    """xgb_model.json (multi:softprob) 부스터."""
+
+    name = "xgb"
+    model_filename = "xgb_model.json"
+    binary_filename = "xgb_model.ubj"  # UBJSON(tools/xgb_convert.py / train_xgb 가 함께 저장), JSON보다 로드가 빠름
+
+    def __init__(
+        self,
+        artifacts_dir: Optional[Path] = None,
+        nthread: Optional[int] = None,
+        model_format: Optional[str] = None,
+    ):
+        super().__init__(artifacts_dir=artifacts_dir)
+        self.nthread = nthread  # None이면 xgboost 기본값(코어 수)
+        self.model_format = model_format  # None: ubj가 json보다 새것이면 ubj / "json" / "ubj" 강제
+
+    def model_path(self) -> Path:
+        js = self.artifacts_dir / self.model_filename
+        ubj = self.artifacts_dir / self.binary_filename
+        if self.model_format == "json":
+            return js
+        if self.model_format == "ubj":
+            return ubj
+        # json만 다시 학습된 경우(ubj가 더 오래됨)엔 json 사용
+        if ubj.exists() and (not js.exists() or ubj.stat().st_mtime_ns >= js.stat().st_mtime_ns):
+            return ubj
+        return js
+
+    def artifact_paths(self) -> List[Path]:
+        return [self.model_path()]
+
+    def _load(self) -> None:
+        import xgboost as xgb
+
+        self._xgb = xgb
+        booster = xgb.Booster()
+        booster.load_model(str(self._require(self.model_path())))
+        if self.nthread:
+            booster.set_param({"nthread": int(self.nthread)})
+        self.booster = booster
+
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        dm = self._xgb.DMatrix(X, feature_names=self.feature_names)
+        P = self.booster.predict(dm)
+        return P.reshape(X.shape[0], -1)
+
+
+class CatBoostBackend(PredictBackend):
+    """catboost_model.cbm (train_catboost.py 산출물)."""
+
+    name = "catboost"
+    model_filename = "catboost_model.cbm"
+
+    def artifact_paths(self) -> List[Path]:
+        return [self.artifacts_dir / self.model_filename]
+
+    def _load(self) -> None:
+        from catboost import CatBoostClassifier
+
+        model = CatBoostClassifier()
+        model.load_model(str(self._require(self.artifacts_dir / self.model_filename)))
+        self.model = model
+
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        P = self.model.predict_proba(X)
+        return _expand_columns(P, self.model.classes_, len(self.classes))
+
+
+class RFPickleBackend(PredictBackend):
+    """rf_model.pkl (sklearn RandomForest, joblib)."""
+
+    name = "rf"
+    model_filename = "rf_model.pkl"
+
+    def artifact_paths(self) -> List[Path]:
+        return [self.artifacts_dir / self.model_filename]
+
+    def _load(self) -> None:
+        import joblib
+
+        self.model = joblib.load(self._require(self.artifacts_dir / self.model_filename))
+        # 요청 1건 추론에서는 프로세스 풀 기동 비용이 더 크므로 단일 스레드로
+        if hasattr(self.model, "n_jobs"):
+            self.model.n_jobs = 1
+
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        P = self.model.predict_proba(X)
+        return _expand_columns(P, self.model.classes_, len(self.classes))
+
+
+class LogisticJSONBackend(PredictBackend):
+    """logistic_model.json(coef / intercept)을 dense 행렬곱 + softmax로 계산."""
+
+    name = "logistic"
+    model_filename = "logistic_model.json"
+
+    def artifact_paths(self) -> List[Path]:
+        return [self.artifacts_dir / self.model_filename]
+
+    def _load(self) -> None:
+        data = json.loads(self._require(self.artifacts_dir / self.model_filename).read_text(encoding="utf-8"))
+        coef = np.asarray(data["coef"], dtype=np.float32)          # (C, F)
+        intercept = np.asarray(data["intercept"], dtype=np.float32)  # (C,)
+        self.coef, self.intercept = _align_linear(
+            coef, intercept, data.get("feature_names"), data.get("classes"), self.feature_names, self.classes,
+        )
+
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return _softmax(X @ self.coef.T + self.intercept)
+
+
+def _align_linear(coef, intercept, model_features, model_classes, feature_names, classes):
+    """선형 모델 가중치를 feature_names.json / label_mapping.json 순서로 맞춘다(클래스 집합이 다르면 에러)."""
+    if model_features is not None and list(model_features) != list(feature_names):
+        pos = {f: i for i, f in enumerate(model_features)}
+        missing = [f for f in feature_names if f not in pos]
+        if missing:
+            raise ValueError(f"모델에 없는 피처가 있습니다: {missing[:10]}")
+        coef = coef[:, [pos[f] for f in feature_names]]
+    if model_classes is not None and list(model_classes) != list(classes):
+        pos = {c: i for i, c in enumerate(model_classes)}
+        missing = [c for c in classes if c not in pos]
+        if missing or len(model_classes) != len(classes):
+            raise ValueError(f"모델 클래스가 label_mapping.json과 다릅니다(누락 {missing[:10]})")
+        order = [pos[c] for c in classes]
+        coef, intercept = coef[order], intercept[order]
+    return np.ascontiguousarray(coef), np.ascontiguousarray(intercept)
+
+
+# =========================
+# 레지스트리
+# =========================
+_REGISTRY: Dict[str, str] = {
+    "xgb": "tools.predict_backends:XGBBackend",
+    "xgb_anytime": "tools.anytime_backend:AnytimeXGBBackend",
+    "catboost": "tools.predict_backends:CatBoostBackend",
+    "rf": "tools.predict_backends:RFPickleBackend",
+    "rf_array": "tools.rf_array_backend:RFArrayBackend",
+    "logistic": "tools.predict_backends:LogisticJSONBackend",
+    "logistic_np": "tools.logistic_backend:LogisticNumpyBackend",
+    "nb": "tools.nb_backend:NaiveBayesBackend",
+    "student": "tools.student_backend:StudentBackend",
+    "ensemble": "tools.ensemble_backend:EnsembleBackend",
+    "hier": "tools.hier_backend:HierarchicalPredictor",
+    "remote": "tools.model_server:RemoteBackend",
+}
+
+
+def register_backend(name: str, target: str) -> None:
+    """target: "패키지.모듈:클래스" (import는 create_backend 시점까지 미룸)."""
+    _REGISTRY[name] = target
+
+
+def available_backends() -> List[str]:
+    return sorted(_REGISTRY)
+
+
+def create_backend(name: str, artifacts_dir: Optional[Path] = None, load: bool = True, **options) -> PredictBackend:
+    """이름으로 백엔드 생성(+로드). 알 수 없는 이름이면 ValueError."""
+    if name not in _REGISTRY:
+        raise ValueError(f"알 수 없는 예측 백엔드: {name!r} (가능: {available_backends()})")
+    module_name, _, cls_name = _REGISTRY[name].partition(":")
+    cls = getattr(import_module(module_name), cls_name)
+    backend = cls(artifacts_dir=artifacts_dir, **options)
+    return backend.load() if load else backend
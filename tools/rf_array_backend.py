@@ -0,0 +1,81 @@
+"""
+tools/rf_array_backend.py
+
+배열 포맷 RandomForest 서빙 백엔드 (예측 백엔드 이름: "rf_array")
+
+- ml/train/export_rf.py 가 만든 artifacts/rf_array/*.npy 를 np.load(mmap_mode="r")로 로드
+  · pickle 역직렬화 없음 → 로드는 파일 매핑만, 실제 페이지는 처음 지나가는 노드만 읽힘
+- 추론: 모든 트리를 한 번에 한 깊이씩 내려감(행 × 트리 노드 번호 배열)
+  · nodes = where(x[feature[nodes]] <= threshold[nodes], left[nodes], right[nodes])
+  · 리프는 자식이 자기 자신이라 최대 깊이까지 돌려도 제자리, 모두 리프면 조기 종료
+- 리프의 상위 N개 클래스 비율(float16)을 트리 평균 → 행 단위 재정규화
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from .predict_backends import PredictBackend
+
+ARRAY_DIRNAME = "rf_array"
+ARRAY_NAMES = ("feature", "threshold", "left", "right", "leaf_id", "roots", "leaf_cls", "leaf_prob")
+
+
+class RFArrayBackend(PredictBackend):
+    """rf_array/*.npy 기반 RandomForest. 행 청크마다 (행, 트리) 단위로 동시에 순회."""
+
+    name = "rf_array"
+
+    def __init__(self, artifacts_dir: Optional[Path] = None, mmap: bool = True, chunk_rows: int = 256):
+        super().__init__(artifacts_dir=artifacts_dir)
+        self.mmap = mmap
+        self.chunk_rows = int(chunk_rows)
+        self.array_dir = self.artifacts_dir / ARRAY_DIRNAME
+
+    def artifact_paths(self) -> List[Path]:
+        return [self.array_dir / f"{name}.npy" for name in ARRAY_NAMES] + [self.array_dir / "meta.json"]
+
+    def _load(self) -> None:
+        meta = json.loads(self._require(self.array_dir / "meta.json").read_text(encoding="utf-8"))
+        if meta["num_features"] != len(self.feature_names) or meta["num_classes"] != len(self.classes):
+            raise ValueError(
+                f"[{self.name}] rf_array({meta['num_features']}×{meta['num_classes']})가 "
+                f"feature_names.json / label_mapping.json 과 다릅니다. export_rf.py 로 다시 변환하세요."
+            )
+        self.meta = meta
+        self.max_depth = int(meta["max_depth"])
+
+        mode = "r" if self.mmap else None
+        for name in ARRAY_NAMES:
+            setattr(self, name, np.load(self._require(self.array_dir / f"{name}.npy"), mmap_mode=mode))
+        # 트리 수만큼의 작은 배열은 매 요청 broadcast 하므로 메모리에 둔다
+        self.roots = np.asarray(self.roots)
+
+    def _predict_chunk(self, X: np.ndarray) -> np.ndarray:
+        n, C = X.shape[0], len(self.classes)
+        rows = np.arange(n)[:, None]
+        nodes = np.broadcast_to(self.roots, (n, self.roots.shape[0])).copy()  # (n, T)
+
+        for _ in range(self.max_depth):
+            leaf = self.leaf_id[nodes]
+            if (leaf >= 0).all():
+                break
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        leaf = self.leaf_id[nodes]                            # (n, T)
+        cls = self.leaf_cls[leaf].astype(np.int64)            # (n, T, N)
+        prob = self.leaf_prob[leaf].astype(np.float32)        # (n, T, N)
+        flat = (np.arange(n, dtype=np.int64)[:, None, None] * C + cls).ravel()
+        out = np.bincount(flat, weights=prob.ravel(), minlength=n * C).reshape(n, C).astype(np.float32)
+        return out / np.maximum(out.sum(axis=1, keepdims=True), 1e-12)
+
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        # (행 × 트리 × N) 임시 배열이 커지지 않게 행 청크로 나눈다
+        step = self.chunk_rows
+        parts = [self._predict_chunk(X[s:s + step]) for s in range(0, max(X.shape[0], 1), step)]
+        return parts[0] if len(parts) == 1 else np.concatenate(parts, axis=0)
@@ -0,0 +1,73 @@
+"""
+tools/student_backend.py
+
+증류 student 서빙 백엔드 (예측 백엔드 이름: "student")
+
+- ml/train/distill_student.py 가 만든 artifacts/student/{W1,b1[,W2,b2]}.npy + meta.json 사용
+- 첫 층은 0/1 증상 벡터라 활성 피처 행만 더함(O(활성 피처 × 폭))
+  · linear : z = b1 + Σ W1[f]
+  · mlp    : z = relu(b1 + Σ W1[f]) @ W2 + b2
+- student는 temperature 적용된 teacher 분포(log p / T)를 학습했으므로 softmax(logit_scale · z)로
+  원래 스케일을 복원 → ml_predict_tools의 temperature / Top-K 후처리를 그대로 적용
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from .predict_backends import PredictBackend, _active_row_logits, _softmax
+
+STUDENT_DIRNAME = "student"
+
+
+class StudentBackend(PredictBackend):
+    """NumPy linear / MLP student."""
+
+    name = "student"
+
+    def __init__(self, artifacts_dir: Optional[Path] = None, mmap: bool = True, chunk_rows: int = 1024):
+        super().__init__(artifacts_dir=artifacts_dir)
+        self.mmap = mmap
+        self.chunk_rows = int(chunk_rows)
+        self.student_dir = self.artifacts_dir / STUDENT_DIRNAME
+
+    def artifact_paths(self) -> List[Path]:
+        npy = [p for p in self.student_dir.glob("*.npy") if not p.name.endswith(".tmp.npy")]
+        return sorted(npy) + [self.student_dir / "meta.json"]
+
+    def _load(self) -> None:
+        meta = json.loads(self._require(self.student_dir / "meta.json").read_text(encoding="utf-8"))
+        if meta["num_features"] != len(self.feature_names) or meta["num_classes"] != len(self.classes):
+            raise ValueError(
+                f"[{self.name}] student({meta['num_features']}×{meta['num_classes']})가 "
+                f"feature_names.json / label_mapping.json 과 다릅니다. distill_student.py 로 다시 학습하세요."
+            )
+        self.meta = meta
+        self.logit_scale = float(meta.get("logit_scale", 1.0))
+
+        mode = "r" if self.mmap else None
+        self.W1 = np.load(self._require(self.student_dir / "W1.npy"), mmap_mode=mode)
+        self.b1 = np.asarray(np.load(self._require(self.student_dir / "b1.npy")), dtype=np.float32)
+        self.W2 = self.b2 = None
+        if meta["arch"] == "mlp":
+            # 두 번째 층은 매 요청 전체를 읽으므로 메모리에 올린다
+            self.W2 = np.asarray(np.load(self._require(self.student_dir / "W2.npy")), dtype=np.float32)
+            self.b2 = np.asarray(np.load(self._require(self.student_dir / "b2.npy")), dtype=np.float32)
+
+    def _logits(self, X: np.ndarray) -> np.ndarray:
+        a = _active_row_logits(self.W1, self.b1, X)
+        if self.W2 is None:
+            return a
+        return np.maximum(a, 0.0) @ self.W2 + self.b2
+
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        step = self.chunk_rows
+        parts = [
+            _softmax(self.logit_scale * self._logits(X[s:s + step]))
+            for s in range(0, max(X.shape[0], 1), step)
+        ]
+        return parts[0] if len(parts) == 1 else np.concatenate(parts, axis=0)
@@ -0,0 +1,96 @@
+"""
+tools/xgb_convert.py
+
+xgb_model.json → xgb_model.ubj(UBJSON) 변환
+
+- 678클래스 × 라운드 수만큼 트리가 있는 JSON 모델은 파싱이 느려 첫 요청(cold start)을 늦춤
+  → 같은 모델을 UBJSON으로 저장해 두면 XGBBackend 가 자동으로 ubj를 읽음(ubj가 json보다 새것일 때)
+- 변환 후 고정 입력으로 두 모델의 예측이 같은지 확인하고, 파일 크기 / 로드 시간을 비교해 출력
+- train_xgb 는 학습 때 ubj도 함께 저장하므로, 이 도구는 기존 산출물 / warm start 결과 변환용
+
+실행 예시:
+python -m tools.xgb_convert --artifacts_dir ml/artifacts
+python -m tools.xgb_convert --src ml/artifacts/versions/3f2a9c1d0b7e/xgb_model.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .predict_backends import DEFAULT_ARTIFACTS_DIR, XGBBackend
+
+
+def _timed_load(path: Path):
+    import xgboost as xgb
+
+    t0 = time.perf_counter()
+    booster = xgb.Booster()
+    booster.load_model(str(path))
+    return booster, time.perf_counter() - t0
+
+
+def convert_to_ubj(json_path: Path, ubj_path: Optional[Path] = None, check_rows: int = 64, seed: int = 0) -> dict:
+    """json 모델을 ubj로 저장(임시 파일 → os.replace) 후 예측 일치 확인. 비교 결과 dict 반환."""
+    import xgboost as xgb
+
+    json_path = Path(json_path)
+    ubj_path = Path(ubj_path) if ubj_path else json_path.with_name(XGBBackend.binary_filename)
+    booster, json_sec = _timed_load(json_path)
+
+    tmp = ubj_path.with_name(f".{ubj_path.stem}.tmp.ubj")
+    booster.save_model(str(tmp))
+    os.replace(tmp, ubj_path)
+    converted, ubj_sec = _timed_load(ubj_path)
+
+    # 증상 1~4개짜리 고정 입력으로 예측 비교
+    num_features = booster.num_features()
+    rng = np.random.default_rng(seed)
+    X = np.zeros((check_rows, num_features), dtype=np.float32)
+    for i in range(check_rows):
+        X[i, rng.choice(num_features, size=int(rng.integers(1, 5)), replace=False)] = 1.0
+    names = booster.feature_names
+    P_json = booster.predict(xgb.DMatrix(X, feature_names=names))
+    P_ubj = converted.predict(xgb.DMatrix(X, feature_names=names))
+    max_diff = float(np.abs(P_json - P_ubj).max())
+    if max_diff > 1e-6:
+        ubj_path.unlink()
+        raise ValueError(f"변환 전후 예측이 다릅니다(max |diff| = {max_diff:.3g}), ubj 삭제")
+
+    return {
+        "json_path": str(json_path),
+        "ubj_path": str(ubj_path),
+        "json_bytes": json_path.stat().st_size,
+        "ubj_bytes": ubj_path.stat().st_size,
+        "json_load_sec": json_sec,
+        "ubj_load_sec": ubj_sec,
+        "max_abs_diff": max_diff,
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    src = Path(args.src) if args.src else Path(args.artifacts_dir) / XGBBackend.model_filename
+    out = convert_to_ubj(src, Path(args.out) if args.out else None, check_rows=args.check_rows)
+    print(f"[saved] {out['ubj_path']}")
+    print(f"size: json={out['json_bytes'] / 1e6:.1f}MB -> ubj={out['ubj_bytes'] / 1e6:.1f}MB")
+    print(f"load: json={out['json_load_sec']:.3f}s -> ubj={out['ubj_load_sec']:.3f}s")
+    print(f"max |diff| = {out['max_abs_diff']:.3g}")
+    return out
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    p.add_argument("--artifacts_dir", default=str(DEFAULT_ARTIFACTS_DIR))
+    p.add_argument("--src", default="", help="변환할 json 모델(기본: artifacts_dir/xgb_model.json)")
+    p.add_argument("--out", default="", help="ubj 저장 경로(기본: src 와 같은 폴더의 xgb_model.ubj)")
+    p.add_argument("--check_rows", type=int, default=64, help="예측 일치 확인 행 수")
+    return p
+
+
+if __name__ == "__main__":
+    run(build_argparser().parse_args())
@@ -0,0 +1,106 @@
+"""
+ui/pipeline_job.py
+
+Streamlit 스크립트 밖(백그라운드 스레드)에서 도는 파이프라인 작업
+
+- 스크립트 rerun 안에서 handle_user_input 을 끝까지 기다리면 페이지 전체가 멈춤
+  → submit_* 로 공유 스레드 풀에 넘기고, 세션은 PipelineJob 만 session_state 에 들고 있음
+- 작업 스레드는 st.* 를 호출하지 않음(스크립트 컨텍스트 없음). 진행 단계 / 결과는 PipelineJob 에만 기록하고
+  UI 프래그먼트가 주기적으로 읽어서 표시
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# 프로세스 전체에서 동시에 도는 파이프라인 수(LLM 호출이 대부분이라 스레드로 충분)
+MAX_WORKERS = int(os.getenv("HIGHFOUR_UI_WORKERS", "8"))
+
+# 사용자 입력 파이프라인 단계(표시 순서). 응급이면 explanation 대신 hospital
+STAGES = ["intent", "symptoms", "candidates", "safety", "explanation"]
+STAGE_LABELS = {
+    "intent": "의도 확인",
+    "symptoms": "증상 추출",
+    "candidates": "질환 후보 예측",
+    "safety": "응급 여부 판단",
+    "explanation": "설명 작성",
+    "hospital": "병원 검색",
+}
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="pipeline")
+        return _EXECUTOR
+
+
+@dataclass
+class PipelineJob:
+    """작업 1건의 진행 상태(작업 스레드가 쓰고 UI 스레드가 읽음)."""
+    kind: str  # "user_input" | "hospital"
+    params: Dict[str, Any]
+    stages: List[str] = field(default_factory=list)  # 끝난 단계(순서대로)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def on_stage(self, stage: str, info: Dict[str, Any]) -> None:
+        with self._lock:
+            self.stages.append(stage)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "stages": list(self.stages),
+                "done": self.done,
+                "result": self.result,
+                "error": self.error,
+                "elapsed": (self.finished_at or time.time()) - self.started_at,
+            }
+
+    def _run(self, fn: Callable[[], Dict[str, Any]]) -> None:
+        try:
+            result, error = fn(), None
+        except Exception as e:
+            result, error = None, f"{type(e).__name__}: {e}"
+        with self._lock:
+            self.result, self.error = result, error
+            self.finished_at = time.time()
+
+
+def submit_user_input(orchestrator, user_input: str, user_location: Optional[str]) -> PipelineJob:
+    job = PipelineJob("user_input", {"user_input": user_input, "user_location": user_location})
+    _executor().submit(job._run, lambda: orchestrator.handle_user_input(
+        user_input=user_input,
+        user_location=user_location,
+        on_stage=job.on_stage,
+    ))
+    return job
+
+
+def submit_hospital_request(orchestrator, symptoms, topk, user_location: Optional[str]) -> PipelineJob:
+    job = PipelineJob("hospital", {"user_location": user_location})
+
+    def _call() -> Dict[str, Any]:
+        out = orchestrator.handle_hospital_request(symptoms=symptoms, topk=topk, user_location=user_location)
+        job.on_stage("hospital", {})
+        return out
+
+    _executor().submit(job._run, _call)
+    return job
@@ -1,6 +1,14 @@
+import os
+
 import streamlit as st
 import pandas as pd
-from app.main import create_orchestrator
+from app.main import get_orchestrator
+from ui.pipeline_job import STAGES, STAGE_LABELS, submit_hospital_request, submit_user_input
+
+# 한 번에 그리는 최근 메시지 수(0이면 전체). 이전 메시지는 "더 보기"로 펼침
+HISTORY_PAGE = int(os.getenv("HIGHFOUR_UI_HISTORY_PAGE", "30"))
+# 백그라운드 작업 진행 상황 확인 주기(초)
+POLL_SEC = float(os.getenv("HIGHFOUR_UI_POLL_SEC", "0.5"))
 
 
 # ================================
@@ -84,7 +92,13 @@ st.markdown(
 # ================================
 # 병원 정보 렌더링 유틸 (그대로 사용 가능)
 # ================================
-def render_hospitals(hospital_info):
+@st.cache_data(show_spinner=False, max_entries=256)
+def _map_frame(coords: tuple) -> pd.DataFrame:
+    # 같은 병원 목록의 지도 데이터는 rerun 마다 다시 만들지 않음
+    return pd.DataFrame([{"lat": lat, "lon": lon} for lat, lon in coords])
+
+
+def render_hospitals(hospital_info, show_map: bool = True):
     hospitals = hospital_info.get("hospitals", [])
     if not hospitals:
         st.warning("병원 정보를 찾지 못했습니다.")
@@ -99,20 +113,22 @@ def render_hospitals(hospital_info):
             if h.get("department"):
                 st.write(f"🩺 진료과: {h.get('department')}")
 
-    map_rows = []
-    for h in hospitals:
-        if h.get("latitude") and h.get("longitude"):
-            map_rows.append({"lat": h["latitude"], "lon": h["longitude"]})
-
-    if map_rows:
+    coords = tuple(
+        (h["latitude"], h["longitude"]) for h in hospitals if h.get("latitude") and h.get("longitude")
+    )
+    if coords and show_map:
         st.subheader("🗺️ 병원 위치 지도")
-        st.map(pd.DataFrame(map_rows))
+        st.map(_map_frame(coords))
+
+
+@st.cache_resource(show_spinner=False)
+def shared_orchestrator():
+    # orchestrator(LLM client / 에이전트 / ML 모델)는 프로세스당 1개를 모든 세션이 공유
+    return get_orchestrator()
 
 
 def init():
-    # orchestrator 1회 생성
-    if "orchestrator" not in st.session_state:
-        st.session_state.orchestrator = create_orchestrator()
+    # 세션별 상태는 대화 기록 / 마지막 분석 결과 / 진행 중 작업만 session_state 에 보관
 
     # 대화 기록
     if "messages" not in st.session_state:
@@ -122,6 +138,14 @@ def init():
     if "last_context" not in st.session_state:
         st.session_state.last_context = None
 
+    # 백그라운드에서 도는 파이프라인 작업(ui/pipeline_job.py)
+    if "pending_job" not in st.session_state:
+        st.session_state.pending_job = None
+
+    # 화면에 그리는 최근 메시지 수
+    if "history_shown" not in st.session_state:
+        st.session_state.history_shown = HISTORY_PAGE
+
 
 def add_message(role: str, content: str, payload=None):
     st.session_state.messages.append({
@@ -131,6 +155,110 @@ def add_message(role: str, content: str, payload=None):
     })
 
 
+# ================================
+# 대화 기록 렌더링(메시지별 프래그먼트)
+# ================================
+@st.fragment
+def render_message(i: int, m: dict, open_map: bool):
+    # 메시지 안의 위젯(지도 토글)을 눌러도 이 메시지만 다시 그림
+    with st.chat_message(m["role"]):
+        st.write(m["content"])
+
+        if m["payload"].get("hospital_info"):
+            # 가장 최근 병원 결과만 지도를 바로 그리고, 이전 결과는 토글로 펼침
+            show_map = open_map or st.toggle("🗺️ 지도 보기", key=f"map_{i}")
+            render_hospitals(m["payload"]["hospital_info"], show_map=show_map)
+
+        qs = m["payload"].get("questions")
+        if qs:
+            st.write("아래 중 답할 수 있는 것만 편하게 알려주세요. 🙂")
+            for q in qs:
+                st.write(f"- {q}")
+
+
+def render_history():
+    msgs = st.session_state.messages
+    shown = st.session_state.history_shown
+    start = max(0, len(msgs) - shown) if shown > 0 else 0
+
+    if start > 0 and st.button(f"이전 대화 더 보기 ({start}개)", use_container_width=True):
+        st.session_state.history_shown += HISTORY_PAGE
+        st.rerun()
+
+    last_hospital = max((i for i, m in enumerate(msgs) if m["payload"].get("hospital_info")), default=-1)
+    for i in range(start, len(msgs)):
+        render_message(i, msgs[i], i == last_hospital)
+
+
+# ================================
+# 백그라운드 작업 진행 / 결과 반영
+# ================================
+def apply_job_result(job, snap: dict):
+    if snap["error"]:
+        add_message("assistant", f"⚠️ 처리 중 오류가 발생했어요. 잠시 후 다시 시도해주세요.\n\n({snap['error']})")
+        return
+
+    result = snap["result"]
+    if job.kind == "hospital":
+        add_message("assistant", "🏥 가까운 병원 정보를 가져왔어요.", payload={
+            "hospital_info": result.get("hospital_info", {})
+        })
+        st.session_state.last_context = None
+        return
+
+    user_location = job.params.get("user_location")
+
+    # 분기 결과를 “assistant 메시지”로 저장
+    if result["type"] in ("clarify", "redirect"):
+        msg = result.get("message", "")
+        add_message("assistant", msg, payload={
+            "questions": result.get("questions", [])
+        })
+        st.session_state.last_context = None
+
+    elif result.get("is_emergency") is True:
+        msg = f"🚨 응급 가능성이 감지되었습니다.\n\n {result.get('reason','-')}\n\n가까운 의료기관 정보를 아래에 표시합니다."
+        add_message("assistant", msg, payload={
+            "hospital_info": result.get("hospital_info", {})
+        })
+        st.session_state.last_context = None
+
+    else:
+        # 비응급: 설명 + (병원 요청 버튼은 “다음 입력/버튼”으로 처리)
+        add_message("assistant", result.get("explanation", ""))
+
+        # 병원 요청을 위해 context 저장
+        st.session_state.last_context = {
+            "symptoms": result.get("symptoms", []),
+            "topk": result.get("topk", []),
+            "user_location": user_location,
+        }
+
+
+@st.fragment(run_every=POLL_SEC)
+def render_pending_job():
+    # 진행 중인 작업이 있으면 단계 진행 상황만 주기적으로 다시 그림(대화 기록은 그대로)
+    job = st.session_state.pending_job
+    if job is None:
+        return
+
+    snap = job.snapshot()
+    if not snap["done"]:
+        stages = STAGES if job.kind == "user_input" else ["hospital"]
+        done = [s for s in stages if s in snap["stages"]]
+        if "hospital" in snap["stages"] and job.kind == "user_input":
+            done = stages  # 응급: 설명 대신 병원 검색으로 끝남
+        with st.chat_message("assistant"):
+            current = next((STAGE_LABELS[s] for s in stages if s not in done), "마무리")
+            st.progress(len(done) / len(stages), text=f"🧠 {current} 중... ({snap['elapsed']:.1f}s)")
+            st.caption(" → ".join(("✅ " if s in done else "⏳ ") + STAGE_LABELS[s] for s in stages))
+        return
+
+    st.session_state.pending_job = None
+    apply_job_result(job, snap)
+    st.rerun()
+
+
 def run():
     init()
 
@@ -161,78 +289,39 @@ def run():
         if st.button("대화 초기화", use_container_width=True):
             st.session_state.messages = []
             st.session_state.last_context = None
+            st.session_state.pending_job = None
+            st.session_state.history_shown = HISTORY_PAGE
             st.rerun()
 
-    for m in st.session_state.messages:
-        with st.chat_message(m["role"]):
-            st.write(m["content"])
+    render_history()
+    # run_every 프래그먼트는 호출된 실행에서만 타이머가 돈다 → 작업이 없으면 호출하지 않아 유휴 세션의 주기 재실행을 막음
+    if st.session_state.pending_job is not None:
+        render_pending_job()
 
-            if m["payload"].get("hospital_info"):
-                render_hospitals(m["payload"]["hospital_info"])
+    busy = st.session_state.pending_job is not None
 
-            qs = m["payload"].get("questions")
-            if qs:
-                st.write("아래 중 답할 수 있는 것만 편하게 알려주세요. 🙂")
-                for q in qs:
-                    st.write(f"- {q}")
+    # 입력창 (채팅) - 작업이 도는 동안은 잠금
+    user_text = st.chat_input("예: 어제부터 기침이 나고 가슴이 답답해요", disabled=busy)
 
-    # 입력창 (채팅)
-    user_text = st.chat_input("예: 어제부터 기침이 나고 가슴이 답답해요")
-
-    if user_text:
+    if user_text and not busy:
         add_message("user", user_text)
-
-        with st.chat_message("assistant"):
-            with st.spinner("🧠 분석 중..."):
-                result = st.session_state.orchestrator.handle_user_input(
-                    user_input=user_text,
-                    user_location=user_location or None
-                )
-
-        # 분기 결과를 “assistant 메시지”로 저장
-        if result["type"] in ("clarify", "redirect"):
-            msg = result.get("message", "")
-            add_message("assistant", msg, payload={
-                "questions": result.get("questions", [])
-            })
-            st.session_state.last_context = None
-
-        elif result.get("is_emergency") is True:
-            msg = f"🚨 응급 가능성이 감지되었습니다.\n\n {result.get('reason','-')}\n\n가까운 의료기관 정보를 아래에 표시합니다."
-            add_message("assistant", msg, payload={
-                "hospital_info": result.get("hospital_info", {})
-            })
-            st.session_state.last_context = None
-
-        else:
-            # 비응급: 설명 + (병원 요청 버튼은 “다음 입력/버튼”으로 처리)
-            add_message("assistant", result.get("explanation", ""))
-
-            # 병원 요청을 위해 context 저장
-            st.session_state.last_context = {
-                "symptoms": result.get("symptoms", []),
-                "topk": result.get("topk", []),
-                "user_location": user_location or None,
-            }
-
+        st.session_state.pending_job = submit_user_input(
+            shared_orchestrator(), user_text, user_location or None
+        )
         st.rerun()
 
     # 채팅 하단에 “병원 보기” 버튼을 상시 두는 방식
     ctx = st.session_state.last_context
-    if ctx and (ctx.get("user_location")):
+    if ctx and (ctx.get("user_location")) and not busy:
         col1, col2 = st.columns(2)
         with col1:
             if st.button("📍 증상 관련 병원 보기", use_container_width=True):
-                with st.spinner("🔍 병원 검색 중..."):
-                    h = st.session_state.orchestrator.handle_hospital_request(
-                        symptoms=ctx["symptoms"],
-                        topk=ctx["topk"],
-                        user_location=ctx["user_location"],
-                    )
-                add_message("assistant", "🏥 가까운 병원 정보를 가져왔어요.", payload={
-                    "hospital_info": h.get("hospital_info", {})
-                })
-                st.session_state.last_context = None
+                st.session_state.pending_job = submit_hospital_request(
+                    shared_orchestrator(),
+                    symptoms=ctx["symptoms"],
+                    topk=ctx["topk"],
+                    user_location=ctx["user_location"],
+                )
                 st.rerun()
         with col2:
             if st.button("계속 대화하기", use_container_width=True):
@@ -242,4 +331,4 @@ def run():
 
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    run()